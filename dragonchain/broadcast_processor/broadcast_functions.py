@@ -18,7 +18,8 @@
 import re
 import time
 import os
-from typing import List, Tuple, Set
+import json
+from typing import Dict, List, Optional, Sequence, Tuple, Set
 
 from dragonchain.lib import dragonnet_config
 from dragonchain.lib.interfaces import storage
@@ -30,6 +31,9 @@ IN_FLIGHT_KEY = "broadcast:in-flight"
 BROADCAST_BLOCK_PREFIX = "broadcast:block"
 CLAIM_CHECK_KEY = "broadcast:claimcheck"
 NOTIFICATION_KEY = "broadcast:notifications"
+NOTIFICATION_RETRY_KEY = "broadcast:notifications:retry"
+NOTIFICATION_ATTEMPTS_KEY = "broadcast:notifications:attempts"
+NOTIFICATION_DEAD_LETTER_KEY = "broadcast:notifications:dead-letter"
 
 STORAGE_FOLDER = "BROADCASTS"
 
@@ -132,6 +136,77 @@ async def remove_notification_verification_for_broadcast_async(value: str) -> in
     return await redis.srem_async(NOTIFICATION_KEY, value)
 
 
+def notification_delivery_member(storage_location: str, url: str) -> str:
+    """Get the redis member used to track the delivery of a verification notification to a single url
+    Args:
+        storage_location: storage location of the verification
+        url: url the notification is sent to
+    Returns:
+        Member string for the notification retry/attempts/dead-letter keys
+    """
+    return json.dumps([storage_location, url], separators=(",", ":"))
+
+
+async def get_notification_retries_due_async() -> List[Tuple[str, str, int]]:
+    """Get the notification deliveries whose retry is scheduled for right now
+    Returns:
+        List of (storage_location, url, attempts so far) tuples (limit of 1000)
+    """
+    members = await redis.z_range_by_score_async(NOTIFICATION_RETRY_KEY, 0, int(time.time()), offset=0, count=1000)
+    if not members:
+        return []
+    pipeline = await redis.pipeline_async()
+    for member in members:
+        pipeline.hget(NOTIFICATION_ATTEMPTS_KEY, member)
+    retries = []
+    for member, attempts in zip(members, await pipeline.execute()):
+        storage_location, url = json.loads(member)
+        retries.append((storage_location, url, int(attempts or 0)))
+    return retries
+
+
+async def schedule_notification_retry_async(storage_location: str, url: str, attempts: int, time: int) -> None:
+    """Schedule a failed notification delivery to be retried
+    Args:
+        storage_location: storage location of the verification
+        url: url the notification failed to send to
+        attempts: number of attempts made so far
+        time: unix timestamp to retry the delivery at
+    """
+    member = notification_delivery_member(storage_location, url)
+    transaction = await redis.multi_exec_async()
+    transaction.hset(NOTIFICATION_ATTEMPTS_KEY, member, str(attempts))
+    transaction.zadd(NOTIFICATION_RETRY_KEY, time, member)
+    await transaction.execute()
+
+
+async def clear_notification_retry_async(storage_location: str, url: str) -> None:
+    """Remove the retry state of a notification delivery after it has succeeded
+    Args:
+        storage_location: storage location of the verification
+        url: url the notification was sent to
+    """
+    member = notification_delivery_member(storage_location, url)
+    transaction = await redis.multi_exec_async()
+    transaction.zrem(NOTIFICATION_RETRY_KEY, member)
+    transaction.hdel(NOTIFICATION_ATTEMPTS_KEY, member)
+    await transaction.execute()
+
+
+async def dead_letter_notification_async(storage_location: str, url: str) -> None:
+    """Stop retrying a notification delivery and move it to the dead-letter set
+    Args:
+        storage_location: storage location of the verification
+        url: url the notification failed to send to
+    """
+    member = notification_delivery_member(storage_location, url)
+    transaction = await redis.multi_exec_async()
+    transaction.sadd(NOTIFICATION_DEAD_LETTER_KEY, member)
+    transaction.zrem(NOTIFICATION_RETRY_KEY, member)
+    transaction.hdel(NOTIFICATION_ATTEMPTS_KEY, member)
+    await transaction.execute()
+
+
 async def get_current_block_level_async(block_id: str) -> int:
     """Get the current level of verifications that a particular block is accepting right now (async)
     Args:
@@ -152,6 +227,69 @@ def get_current_block_level_sync(block_id: str) -> int:
     return int(redis.get_sync(state_key(block_id), decode=False) or -1)
 
 
+async def get_broadcast_states_async(block_ids: Sequence[str]) -> Dict[str, Tuple[int, List[Set[str]]]]:
+    """Get the current level and the received verifications of one or more blocks in a single round trip (async)
+    Args:
+        block_ids: block_ids to fetch the broadcast state of
+    Returns:
+        Dictionary of block_id to a tuple of (current level (-1 if unknown), list of sets of chain ids which have verified it,
+        where index 0 is for L2 verifications, index 1 is for L3 verifications, etc)
+    """
+    if not block_ids:
+        return {}
+    pipeline = await redis.pipeline_async()
+    for block_id in block_ids:
+        pipeline.get(state_key(block_id))
+        for level in range(2, 6):
+            pipeline.smembers(verifications_key(block_id, level), encoding="utf8")
+    results = await pipeline.execute()
+    states: Dict[str, Tuple[int, List[Set[str]]]] = {}
+    for i, block_id in enumerate(block_ids):
+        level, *verifications = results[i * 5 : (i + 1) * 5]
+        states[block_id] = (int(level or -1), [set(x) for x in verifications])
+    return states
+
+
+# Only write a block's new schedule (and level) if its level and score are still what the broadcast processor read,
+# so a concurrent promotion by a received verification (level + 1, score 0) is never overwritten with a stale schedule.
+# KEYS are the in-flight key followed by the state key of every block, ARGV has 5 values per block (in the same order):
+# block_id, level read, score read, new score, new level ('' to leave it as it is)
+_UPDATE_BLOCK_SCHEDULES_LUA = """
+local unchanged = {}
+for i = 2, #KEYS do
+    local arg = (i - 2) * 5
+    local score = redis.call('ZSCORE', KEYS[1], ARGV[arg + 1])
+    if redis.call('GET', KEYS[i]) == ARGV[arg + 2] and score and tonumber(score) == tonumber(ARGV[arg + 3]) then
+        if ARGV[arg + 5] ~= '' then redis.call('SET', KEYS[i], ARGV[arg + 5]) end
+        redis.call('ZADD', KEYS[1], ARGV[arg + 4], ARGV[arg + 1])
+    else
+        table.insert(unchanged, ARGV[arg + 1])
+    end
+end
+return unchanged
+"""
+
+
+async def update_block_schedules_async(updates: Sequence[Tuple[str, int, float, int, Optional[int]]]) -> List[str]:
+    """Re-schedule blocks for the broadcast processor (and optionally set their new level) in a single round trip,
+    skipping every block whose state has changed since it was read (async)
+    Args:
+        updates: (block_id, level when it was read, in-flight score when it was read,
+            unix timestamp to re-schedule for checking (0 means ASAP), new level or None to leave it as it is) of each block
+    Returns:
+        List of the block_ids whose level or score had changed in the meantime (which were left as they are)
+    """
+    if not updates:
+        return []
+    keys = [IN_FLIGHT_KEY]
+    args: List[str] = []
+    for block_id, level, score, check_at, new_level in updates:
+        keys.append(state_key(block_id))
+        args.extend([block_id, str(level), str(score), str(check_at), "" if new_level is None else str(new_level)])
+    unchanged = await redis.eval_async(_UPDATE_BLOCK_SCHEDULES_LUA, keys, args)
+    return [x.decode("utf-8") for x in unchanged]
+
+
 def is_block_accepting_verifications_from_level(block_id: str, level: int) -> bool:
     """Check if a block is currently accepting verifications from a particular level (sync)
     Args:
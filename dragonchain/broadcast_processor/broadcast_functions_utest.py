@@ -15,6 +15,7 @@
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
 
+import json
 import unittest
 from unittest.mock import patch, MagicMock, AsyncMock, call, ANY
 
@@ -108,6 +109,36 @@ class BroadcastFunctionTests(unittest.IsolatedAsyncioTestCase):
         await broadcast_functions.schedule_block_for_broadcast_async("id", 123)
         mock_zadd.assert_awaited_once_with("broadcast:in-flight", 123, "id")
 
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.pipeline_async")
+    async def test_get_broadcast_states_async_uses_one_pipeline(self, mock_pipeline):
+        fake_pipeline = MagicMock(execute=AsyncMock(return_value=[b"2", {"chain1"}, set(), set(), set(), None, set(), set(), set(), set()]))
+        mock_pipeline.return_value = fake_pipeline
+        states = await broadcast_functions.get_broadcast_states_async(["a", "b"])
+        self.assertEqual(states, {"a": (2, [{"chain1"}, set(), set(), set()]), "b": (-1, [set(), set(), set(), set()])})
+        fake_pipeline.get.assert_has_calls([call("broadcast:block:a:state"), call("broadcast:block:b:state")])
+        fake_pipeline.smembers.assert_has_calls([call(f"broadcast:block:a:l{level}", encoding="utf8") for level in range(2, 6)])
+        mock_pipeline.assert_awaited_once()
+        fake_pipeline.execute.assert_awaited_once()
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.pipeline_async")
+    async def test_get_broadcast_states_async_no_op_without_blocks(self, mock_pipeline):
+        self.assertEqual(await broadcast_functions.get_broadcast_states_async([]), {})
+        mock_pipeline.assert_not_called()
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.eval_async", return_value=[b"b"])
+    async def test_update_block_schedules_async_updates_all_blocks_in_one_call(self, mock_eval):
+        self.assertEqual(await broadcast_functions.update_block_schedules_async([("a", 2, 1, 0, 3), ("b", 3, 0, 123, None)]), ["b"])
+        mock_eval.assert_awaited_once_with(
+            broadcast_functions._UPDATE_BLOCK_SCHEDULES_LUA,
+            ["broadcast:in-flight", "broadcast:block:a:state", "broadcast:block:b:state"],
+            ["a", "2", "1", "0", "3", "b", "3", "0", "123", ""],
+        )
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.eval_async")
+    async def test_update_block_schedules_async_no_op_without_updates(self, mock_eval):
+        self.assertEqual(await broadcast_functions.update_block_schedules_async([]), [])
+        mock_eval.assert_not_called()
+
     @patch("dragonchain.broadcast_processor.broadcast_functions.redis.zadd_sync")
     def test_schedule_block_sync_calls_redis_with_correct_params(self, mock_zadd):
         broadcast_functions.schedule_block_for_broadcast_sync("id", 123)
@@ -260,6 +291,54 @@ class BroadcastFunctionTests(unittest.IsolatedAsyncioTestCase):
         await broadcast_functions.remove_notification_verification_for_broadcast_async("banana")
         mock_srem.assert_awaited_once_with("broadcast:notifications", "banana")
 
+    def test_notification_delivery_member_round_trips(self):
+        member = broadcast_functions.notification_delivery_member("BLOCK/id-l2-chain", "https://example.com/hook")
+        self.assertEqual(json.loads(member), ["BLOCK/id-l2-chain", "https://example.com/hook"])
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.pipeline_async")
+    @patch("dragonchain.broadcast_processor.broadcast_functions.time.time", return_value=123)
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.z_range_by_score_async", return_value=['["loc1","url1"]', '["loc2","url2"]'])
+    async def test_get_notification_retries_due_async(self, mock_zrange, mock_time, mock_pipeline):
+        mock_pipeline.return_value = MagicMock(execute=AsyncMock(return_value=[b"2", None]))
+        retries = await broadcast_functions.get_notification_retries_due_async()
+        self.assertEqual(retries, [("loc1", "url1", 2), ("loc2", "url2", 0)])
+        mock_zrange.assert_awaited_once_with("broadcast:notifications:retry", 0, 123, offset=0, count=1000)
+        mock_pipeline.return_value.hget.assert_has_calls([call("broadcast:notifications:attempts", '["loc1","url1"]')])
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.pipeline_async")
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.z_range_by_score_async", return_value=[])
+    async def test_get_notification_retries_due_async_no_op_without_retries(self, mock_zrange, mock_pipeline):
+        self.assertEqual(await broadcast_functions.get_notification_retries_due_async(), [])
+        mock_pipeline.assert_not_called()
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.multi_exec_async")
+    async def test_schedule_notification_retry_async(self, mock_multi_exec):
+        fake_transaction = MagicMock(execute=AsyncMock())
+        mock_multi_exec.return_value = fake_transaction
+        await broadcast_functions.schedule_notification_retry_async("loc", "url", 2, 456)
+        fake_transaction.hset.assert_called_once_with("broadcast:notifications:attempts", '["loc","url"]', "2")
+        fake_transaction.zadd.assert_called_once_with("broadcast:notifications:retry", 456, '["loc","url"]')
+        fake_transaction.execute.assert_awaited_once()
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.multi_exec_async")
+    async def test_clear_notification_retry_async(self, mock_multi_exec):
+        fake_transaction = MagicMock(execute=AsyncMock())
+        mock_multi_exec.return_value = fake_transaction
+        await broadcast_functions.clear_notification_retry_async("loc", "url")
+        fake_transaction.zrem.assert_called_once_with("broadcast:notifications:retry", '["loc","url"]')
+        fake_transaction.hdel.assert_called_once_with("broadcast:notifications:attempts", '["loc","url"]')
+        fake_transaction.execute.assert_awaited_once()
+
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.multi_exec_async")
+    async def test_dead_letter_notification_async(self, mock_multi_exec):
+        fake_transaction = MagicMock(execute=AsyncMock())
+        mock_multi_exec.return_value = fake_transaction
+        await broadcast_functions.dead_letter_notification_async("loc", "url")
+        fake_transaction.sadd.assert_called_once_with("broadcast:notifications:dead-letter", '["loc","url"]')
+        fake_transaction.zrem.assert_called_once_with("broadcast:notifications:retry", '["loc","url"]')
+        fake_transaction.hdel.assert_called_once_with("broadcast:notifications:attempts", '["loc","url"]')
+        fake_transaction.execute.assert_awaited_once()
+
     @patch("dragonchain.broadcast_processor.broadcast_functions.redis.sadd_sync", return_value=1)
     def test_schedule_notification_for_broadcast_sync(self, mock_sadd):
         broadcast_functions.schedule_notification_for_broadcast_sync("banana")
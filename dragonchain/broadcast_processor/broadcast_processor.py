@@ -20,7 +20,8 @@ import re
 import time
 import json
 import asyncio
-from typing import Any, Set, Optional, cast, List, Dict
+import urllib.parse
+from typing import Any, Set, Optional, Tuple, cast, List, Dict
 
 import aiohttp
 
@@ -32,6 +33,8 @@ from dragonchain.lib.dao import block_dao
 from dragonchain.lib import dragonnet_config
 from dragonchain.lib import keys
 from dragonchain.lib import crypto
+from dragonchain.lib import metrics
+from dragonchain.lib import ttl_cache
 from dragonchain import logger
 from dragonchain import exceptions
 from dragonchain.lib.interfaces import storage
@@ -41,6 +44,17 @@ BROADCAST = os.environ["BROADCAST"]
 LEVEL = os.environ["LEVEL"]
 HTTP_REQUEST_TIMEOUT = 30  # seconds
 BROADCAST_RECEIPT_WAIT_TIME = 35  # seconds
+# Maximum number of blocks whose claim/verify/promote cycle is processed at the same time
+BROADCAST_CONCURRENCY = int(os.environ.get("BROADCAST_CONCURRENCY") or "50")
+# Serialized broadcast DTOs are kept by (block id, level) so retries and every chain of a claim reuse the same request body
+BROADCAST_DTO_CACHE_TTL = int(os.environ.get("BROADCAST_DTO_CACHE_TTL") or "600")
+BROADCAST_DTO_CACHE_SIZE = int(os.environ.get("BROADCAST_DTO_CACHE_SIZE") or "128")
+# Verification notifications: verifications read/sent at the same time, connections per endpoint, and retries of failed sends
+NOTIFICATION_CONCURRENCY = int(os.environ.get("NOTIFICATION_CONCURRENCY") or "50")
+NOTIFICATION_ENDPOINT_CONNECTIONS = int(os.environ.get("NOTIFICATION_ENDPOINT_CONNECTIONS") or "10")
+NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get("NOTIFICATION_MAX_ATTEMPTS") or "8")
+NOTIFICATION_RETRY_DELAY = int(os.environ.get("NOTIFICATION_RETRY_DELAY") or "15")  # seconds, doubled after every failed attempt
+NOTIFICATION_RETRY_MAX_DELAY = 3600  # seconds
 
 VERIFICATION_NOTIFICATION: Dict[str, List[str]] = {}
 if os.environ.get("VERIFICATION_NOTIFICATION") is not None:
@@ -52,6 +66,10 @@ _network_attr = {
     "binance": {"confirmations": bnb.CONFIRMATIONS_CONSIDERED_FINAL, "block_time": bnb.AVERAGE_BLOCK_TIME, "delay_buffer": 1.5},
 }
 _l5_wait_times: Dict[str, int] = {}  # dcID: wait in seconds
+_notification_sessions: Dict[str, aiohttp.ClientSession] = {}  # endpoint: session
+_broadcast_dto_cache = ttl_cache.TTLCache(
+    ttl=BROADCAST_DTO_CACHE_TTL, maxsize=BROADCAST_DTO_CACHE_SIZE
+)  # (block_id, level): (verifications, content)
 _log = logger.get_logger()
 # For these variables, we are sure to call setup() when initializing this module before using it, so we ignore type error for None
 _requirements: dict = {}
@@ -114,29 +132,57 @@ def set_l5_wait_time(chain_id: str) -> int:
     return broadcast_receipt_wait_time_l5
 
 
-def make_broadcast_futures(session: aiohttp.ClientSession, block_id: str, level: int, chain_ids: set) -> Optional[Set[asyncio.Task]]:
+def get_broadcast_content(block_id: str, level: int, lower_verifications: Set[str]) -> bytes:
+    """Get the serialized broadcast DTO for a block to a certain level, reusing the cached copy
+    as long as the lower level verifications it was built from have not changed
+    Args:
+        block_id: the block id to broadcast
+        level: higher level of the chains which will be broadcast to
+        lower_verifications: chain ids which have verified the block at level - 1, as read from redis (ignored for level 2)
+    Returns:
+        JSON encoded bytes of the broadcast DTO
+    Raises:
+        exceptions.NotEnoughVerifications when the block doesn't have enough verifications to broadcast to this level yet
+    """
+    verifications = frozenset(lower_verifications) if level > 2 else frozenset()
+    cached = _broadcast_dto_cache.get((block_id, level))
+    if cached is not None and cached[0] == verifications:
+        return cached[1]
+    broadcast_dto = block_dao.get_broadcast_dto(level, block_id)
+    _log.debug(f"[BROADCAST PROCESSOR] Broadcast dto for {block_id} level {level}:\n{broadcast_dto}")
+    content = json.dumps(broadcast_dto, separators=(",", ":")).encode("utf-8")
+    # Without verifications in redis, the dto was built from a storage listing which can't be checked for changes, so it isn't cached
+    if level == 2 or verifications:
+        _broadcast_dto_cache.set((block_id, level), (verifications, content))
+    return content
+
+
+def make_broadcast_futures(
+    session: aiohttp.ClientSession, block_id: str, level: int, chain_ids: set, lower_verifications: Set[str]
+) -> Optional[Set[asyncio.Task]]:
     """Initiate broadcasts for a block id to certain higher level nodes
     Args:
         session: aiohttp session to use for making http requests
         block_id: the block id to broadcast
         level: higher level of the chain_ids to broadcast to
         chain_ids: set of (level) chains to broadcast to
+        lower_verifications: chain ids which have verified the block at level - 1 (from the broadcast state read)
     Returns:
         Set of asyncio futures for the http requests initialized (None if it was not possible to get broadcast dto)
     """
     path = "/v1/enqueue"
     broadcasts = set()
     try:
-        broadcast_dto = block_dao.get_broadcast_dto(level, block_id)
+        content = get_broadcast_content(block_id, level, lower_verifications)
     except exceptions.NotEnoughVerifications as e:
         _log.warning(f"[BROADCAST PROCESSOR] {str(e)}")
         _log.info(f"[BROADCAST PROCESSOR] Will attempt to broadcast block {block_id} next run")
         broadcast_functions.increment_storage_error_sync(block_id, level)
         return None
-    _log.debug(f"[BROADCAST PROCESSOR] Sending broadcast(s) for {block_id} level {level}:\n{broadcast_dto}")
     for chain in chain_ids:
         try:
-            headers, data = authorization.generate_authenticated_request("POST", chain, path, broadcast_dto)
+            # Only the auth headers are computed per chain; every chain gets the same serialized body
+            headers, data = authorization.generate_authenticated_request_for_content("POST", chain, path, content, "application/json")
             if level != 5:
                 headers["deadline"] = str(BROADCAST_RECEIPT_WAIT_TIME)
             else:
@@ -172,168 +218,400 @@ def get_all_notification_endpoints(level: str) -> set:
     return get_notification_urls("all").union(get_notification_urls(f"l{level}"))
 
 
-async def process_verification_notifications(session: aiohttp.ClientSession) -> None:
+def get_notification_session(url: str) -> aiohttp.ClientSession:
+    """Get the pooled http session for the endpoint (scheme, host and port) of a notification url, creating it if necessary
+    Args:
+        url: notification url which will be requested
+    Returns:
+        aiohttp session with at most NOTIFICATION_ENDPOINT_CONNECTIONS open connections
+    """
+    parsed = urllib.parse.urlsplit(url)
+    endpoint = f"{parsed.scheme}://{parsed.netloc}"
+    session = _notification_sessions.get(endpoint)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=NOTIFICATION_ENDPOINT_CONNECTIONS), timeout=aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
+        )
+        _notification_sessions[endpoint] = session
+    return session
+
+
+async def close_notification_sessions() -> None:
+    """Close the pooled http sessions of all notification endpoints"""
+    for session in _notification_sessions.values():
+        await session.close()
+    _notification_sessions.clear()
+
+
+async def process_verification_notifications() -> None:
     """Main function for the verification notification broadcast system
 
-    Retrieves verifications that need to be processed and sends http requests
+    Retrieves newly scheduled verifications and deliveries due for a retry, then sends each verification
+    to its urls (up to NOTIFICATION_CONCURRENCY verifications at a time)
+    """
+    if VERIFICATION_NOTIFICATION:
+        t0 = time.time()
+        new_locations = await broadcast_functions.get_notification_verifications_for_broadcast_async()
+        retries: Dict[str, List[Tuple[str, int]]] = {}  # storage_location: [(url, attempts)]
+        for storage_location, url, attempts in await broadcast_functions.get_notification_retries_due_async():
+            retries.setdefault(storage_location, []).append((url, attempts))
+        metrics.set_queue_depth("notification", len(new_locations) + sum(len(x) for x in retries.values()))
+        semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
+        results = await asyncio.gather(
+            *[
+                process_verification_notification(semaphore, storage_location, retries.get(storage_location, []), storage_location in new_locations)
+                for storage_location in set(new_locations).union(retries)
+            ],
+            return_exceptions=True,
+        )
+        delivered = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                _log.error(f"[BROADCAST PROCESSOR] Error processing verification notification: {result!r}")
+            else:
+                delivered += result
+        if delivered:
+            elapsed = time.time() - t0
+            metrics.observe("notification", elapsed, delivered)
+            _log.info(f"[BROADCAST PROCESSOR] Delivered {delivered} verification notifications in {elapsed:.2f}s ({delivered / elapsed:.1f}/s)")
+
+
+async def process_verification_notification(semaphore: asyncio.Semaphore, storage_location: str, retries: List[Tuple[str, int]], new: bool) -> int:
+    """Read a verification from storage once, then send it to all the urls it needs to be delivered to
 
     Args:
-        session: aiohttp session for http requests
+        semaphore: semaphore limiting the number of verifications processed at the same time
+        storage_location: storage location of the verification
+        retries: (url, attempts so far) of the deliveries of this verification which are due for a retry
+        new: whether this verification was newly scheduled, and still needs to be sent to all its configured urls
+
+    Returns:
+        Number of notifications which were successfully delivered
     """
-    if VERIFICATION_NOTIFICATION:
-        futures = set()
-        for storage_location in await broadcast_functions.get_notification_verifications_for_broadcast_async():
-            verification_bytes = storage.get(storage_location)
-            level = get_level_from_storage_location(storage_location)
-            if level is None:
-                _log.error(f"Unable to parse level value from string {storage_location}. Removing verification notification from set.")
-                broadcast_functions.remove_notification_verification_for_broadcast_async(storage_location)
-                continue
+    async with semaphore:
+        level = get_level_from_storage_location(storage_location)
+        if level is None:
+            _log.error(f"Unable to parse level value from string {storage_location}. Removing verification notification from set.")
+            await broadcast_functions.remove_notification_verification_for_broadcast_async(storage_location)
+            return 0
+        deliveries = list(retries)
+        if new:
+            deliveries.extend((url, 0) for url in get_all_notification_endpoints(level))
+        try:
+            verification_bytes = await asyncio.get_event_loop().run_in_executor(None, storage.get, storage_location)
             signature = sign(verification_bytes)
-            for url in get_all_notification_endpoints(level):
-                future = send_notification_verification(session, url, verification_bytes, signature, storage_location)
-                futures.add(asyncio.create_task(future))
-            await asyncio.gather(*futures, return_exceptions=True)  # "Fire & forget"
+        except Exception:
+            _log.exception(f"Unable to read verification {storage_location} for notification.")
+            # Count this as a failed attempt for every delivery so it's retried (or dead-lettered) like a failed request
+            await asyncio.gather(*[schedule_notification_retry(storage_location, url, attempts + 1) for url, attempts in deliveries])
+            delivered = 0
+        else:
+            results = await asyncio.gather(
+                *[send_notification_verification(url, verification_bytes, signature, storage_location, attempts) for url, attempts in deliveries]
+            )
+            delivered = sum(results)
+        if new:
+            await broadcast_functions.remove_notification_verification_for_broadcast_async(storage_location)
+        return delivered
 
 
-async def send_notification_verification(
-    session: aiohttp.ClientSession, url: str, verification_bytes: bytes, signature: str, redis_list_value: str
-) -> None:
+async def send_notification_verification(url: str, verification_bytes: bytes, signature: str, storage_location: str, attempts: int) -> bool:
     """Send a notification verification to a preconfigured address
 
-    This is the actual async broadcast of a single notification at its most atomic
+    This is the actual async broadcast of a single notification at its most atomic.
+    If it fails, it is scheduled to be retried with exponential backoff
 
     Args:
-        session: aiohttp session for http requests
         url: The url to which bytes should be POSTed
         verification_bytes: the verification object read from disk as bytes
         signature: The signature of the bytes, signed by this dragonchain
-        redis_list_value: the key within a redis set which should be removed after successful http request
+        storage_location: storage location of the verification
+        attempts: number of previous attempts to deliver this notification to this url
 
     Returns:
-        None
+        True if the notification was delivered, False if not
     """
     _log.debug(f"Notification -> {url}")
     try:
-        resp = await session.post(
+        async with get_notification_session(url).post(
             url=url,
             data=verification_bytes,
             headers={"Content-Type": "application/json", "dragonchainId": keys.get_public_id(), "signature": signature},
             timeout=HTTP_REQUEST_TIMEOUT,
-        )
-        _log.debug(f"Notification <- {resp.status} {url}")
+        ) as resp:
+            _log.debug(f"Notification <- {resp.status} {url}")
+            status = resp.status
+        if status < 400:
+            if attempts:
+                await broadcast_functions.clear_notification_retry_async(storage_location, url)
+            return True
+        _log.warning(f"Verification notification to {url} failed with status {status}")
     except Exception:
         _log.exception("Unable to send verification notification.")
+    await schedule_notification_retry(storage_location, url, attempts + 1)
+    return False
 
-    await broadcast_functions.remove_notification_verification_for_broadcast_async(redis_list_value)
 
+async def schedule_notification_retry(storage_location: str, url: str, attempts: int) -> None:
+    """Schedule a failed notification delivery to be retried with exponential backoff,
+    or move it to the dead-letter set once it has failed NOTIFICATION_MAX_ATTEMPTS times
 
-async def process_blocks_for_broadcast(session: aiohttp.ClientSession) -> None:  # noqa: C901
+    Args:
+        storage_location: storage location of the verification
+        url: url the notification failed to send to
+        attempts: number of attempts made so far (including the one which just failed)
+    """
+    if attempts >= NOTIFICATION_MAX_ATTEMPTS:
+        _log.error(f"Verification notification {storage_location} to {url} failed {attempts} times. Moving to dead-letter set")
+        await broadcast_functions.dead_letter_notification_async(storage_location, url)
+    else:
+        delay = min(NOTIFICATION_RETRY_DELAY * 2 ** (attempts - 1), NOTIFICATION_RETRY_MAX_DELAY)
+        await broadcast_functions.schedule_notification_retry_async(storage_location, url, attempts, int(time.time()) + delay)
+
+
+class BroadcastRun(object):
+    """State shared between the block tasks of one run of the broadcast processor"""
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        self.session = session
+        self.semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+        # Set (stopping the claim of more blocks) when matchmaking reports insufficient funds
+        self.out_of_funds = asyncio.Event()
+        self.request_futures: Set[asyncio.Task] = set()
+        # (block_id, level read, score read, new score, new level) of the blocks to re-schedule, all written at the end of the run
+        self.schedule_updates: List[Tuple[str, int, float, int, Optional[int]]] = []
+
+
+async def process_blocks_for_broadcast(session: aiohttp.ClientSession) -> None:
     """Main function of the broadcast processor
 
-    Retrieves blocks that need to be processed, gets matchmaking claims for blocks,
-    updates claims to get new chains if existing ones aren't responding,
-    then sends broadcasts to chains, and loops
+    Retrieves blocks that need to be processed and reads all of their states at once, gets the claim of each block,
+    re-reads the verifications of the blocks which were broadcast before, then processes each block as its own task
+    (up to BROADCAST_CONCURRENCY blocks at a time). The re-schedules of all the blocks are committed together,
+    then all the sent broadcasts are waited on
 
     Args:
         session: aiohttp session for http requests
     """
-    # Unfortunately, this is a really long method because it uses a large loop which must be broken
-    # or continued at various points in the process, and so can't be necessarily easily broken up
-    request_futures: set = set()
+    run = BroadcastRun(session)
     # Get all the relevant blocks for this run (anything scheduled until 'now')
-    for block_id, score in await broadcast_functions.get_blocks_to_process_for_broadcast_async():
-        _log.info(f"[BROADCAST PROCESSOR] Checking block {block_id}")
-        current_level = await broadcast_functions.get_current_block_level_async(block_id)
-        if current_level == -1:
-            _log.warning(f"Failed to lookup current level for block {block_id}.")
-            continue
+    t0 = time.time()
+    blocks = await broadcast_functions.get_blocks_to_process_for_broadcast_async()
+    metrics.set_queue_depth("broadcast", len(blocks))
+    if blocks:
+        # The levels and verifications of all the blocks of this run are read in one round trip
+        states = await broadcast_functions.get_broadcast_states_async([block_id for block_id, _ in blocks])
+        claim_tasks = [
+            asyncio.create_task(claim_block_for_broadcast_bounded(run, block_id, score, states[block_id][0])) for block_id, score in blocks
+        ]
+        await asyncio.wait(claim_tasks)
+        claimed = [(block_id, score, task.result()) for (block_id, score), task in zip(blocks, claim_tasks) if task.result() is not None]
+        # Re-read the verifications of blocks which were already broadcast once all the claim calls are done,
+        # so chains which responded while waiting on matchmaking aren't replaced
+        new_states = await broadcast_functions.get_broadcast_states_async([block_id for block_id, score, _ in claimed if score != 0])
+        tasks = [
+            asyncio.create_task(
+                process_block_for_broadcast_bounded(run, block_id, score, states[block_id][0], new_states.get(block_id, states[block_id]), claim)
+            )
+            for block_id, score, claim in claimed
+        ]
+        if tasks:
+            await asyncio.wait(tasks)
+        # Every re-schedule and promotion of this run is committed at once, skipping blocks which changed in the meantime
+        for block_id in await broadcast_functions.update_block_schedules_async(run.schedule_updates):
+            _log.info(f"[BROADCAST PROCESSOR] Block {block_id} changed while it was being processed. Leaving its new state as it is")
+    # Wait for all the broadcasts in this run to finish before returning/looping
+    await asyncio.gather(*run.request_futures, return_exceptions=True)
+    if blocks:
+        metrics.observe("broadcast", time.time() - t0, len(blocks))
+    if run.out_of_funds.is_set():
+        _log.warning("[BROADCAST PROCESSOR] Out of funds! Will not broadcast anything for 30 minutes")
+        await asyncio.sleep(1800)  # Sleep for 30 minutes if insufficient funds
+
+
+async def claim_block_for_broadcast_bounded(run: BroadcastRun, block_id: str, score: float, level: int) -> Optional[dict]:
+    """Get the claim of a block once there's room under the concurrency limit, isolating any errors to this block
+    Args:
+        run: state of the current broadcast processor run
+        block_id: block id to get the claim for
+        score: current broadcast score of the block (0 if it hasn't been broadcast at its current level yet)
+        level: current level of the block, as read at the start of the run
+    Returns:
+        The matchmaking claim of the block, or None if the block can't be processed any further in this run
+    """
+    async with run.semaphore:
+        if run.out_of_funds.is_set():
+            return None
         try:
-            claim: Any = matchmaking.get_or_create_claim_check(block_id, _requirements)
-        except exceptions.InsufficientFunds:
-            _log.warning("[BROADCAST PROCESSOR] Out of funds! Will not broadcast anything for 30 minutes")
-            await asyncio.sleep(1800)  # Sleep for 30 minutes if insufficient funds
-            break
-        except exceptions.UnableToUpdate:
-            _log.warning("Matchmaking does not have enough matches to create a claim check")
-            # Schedule this block for 5 minutes later, so we don't spam matchmaking every second if there aren't matches available
-            await broadcast_functions.schedule_block_for_broadcast_async(block_id, int(time.time()) + 300)
-            continue
-        except exceptions.NotFound:
-            _log.warning(
-                f"Matchmaking does not have record of claim for block {block_id}."
-                "Presumably closed. Saving to unfinished claim and removing from broadcast system."
+            return await claim_block_for_broadcast(run, block_id, score, level)
+        except Exception:
+            # The block keeps its score in the in-flight set, so it is retried on the next run
+            _log.exception(f"[BROADCAST PROCESSOR] Error getting the claim of block {block_id} for broadcast")
+            return None
+
+
+async def claim_block_for_broadcast(run: BroadcastRun, block_id: str, score: float, level: int) -> Optional[dict]:
+    """Get or create the matchmaking claim for a block
+    Args:
+        run: state of the current broadcast processor run
+        block_id: block id to get the claim for
+        score: current broadcast score of the block (0 if it hasn't been broadcast at its current level yet)
+        level: current level of the block, as read at the start of the run
+    Returns:
+        The matchmaking claim of the block, or None if the block can't be processed any further in this run
+    """
+    _log.info(f"[BROADCAST PROCESSOR] Checking block {block_id}")
+    if level == -1:
+        _log.warning(f"Failed to lookup current level for block {block_id}.")
+        return None
+    try:
+        return await matchmaking.get_or_create_claim_check_async(block_id, _requirements)
+    except exceptions.InsufficientFunds:
+        run.out_of_funds.set()
+    except exceptions.UnableToUpdate:
+        _log.warning("Matchmaking does not have enough matches to create a claim check")
+        # Schedule this block for 5 minutes later, so we don't spam matchmaking every second if there aren't matches available
+        reschedule_block(run, block_id, level, score, int(time.time()) + 300)
+    except exceptions.NotFound:
+        _log.warning(
+            f"Matchmaking does not have record of claim for block {block_id}."
+            "Presumably closed. Saving to unfinished claim and removing from broadcast system."
+        )
+        await broadcast_functions.save_unfinished_claim(block_id)
+    return None
+
+
+async def process_block_for_broadcast_bounded(
+    run: BroadcastRun, block_id: str, score: float, level: int, state: Tuple[int, List[Set[str]]], claim: dict
+) -> None:
+    """Process a block for broadcast once there's room under the concurrency limit, isolating any errors to this block
+    Args:
+        run: state of the current broadcast processor run
+        block_id: block id to process
+        score: current broadcast score of the block (0 if it hasn't been broadcast at its current level yet)
+        level: current level of the block, as read at the start of the run
+        state: (level, verifications) of the block, read after its claim was retrieved
+        claim: matchmaking claim of the block
+    """
+    async with run.semaphore:
+        try:
+            await process_block_for_broadcast(run, block_id, score, level, state, claim)
+        except Exception:
+            # The block keeps its score in the in-flight set, so it is retried on the next run
+            _log.exception(f"[BROADCAST PROCESSOR] Error processing block {block_id} for broadcast")
+
+
+def reschedule_block(run: BroadcastRun, block_id: str, level: int, score: float, check_at: int, new_level: Optional[int] = None) -> None:
+    """Queue the re-schedule (and optionally the promotion) of a block, which is written at the end of the run
+    unless its state was changed since it was read (i.e. by a received verification)
+    Args:
+        run: state of the current broadcast processor run
+        block_id: block id to schedule
+        level: level of the block when it was read
+        score: broadcast score of the block when it was read
+        check_at: unix timestamp to re-schedule for checking (0 means ASAP)
+        new_level: level to promote the block to, if any
+    """
+    run.schedule_updates.append((block_id, level, score, check_at, new_level))
+
+
+async def process_block_for_broadcast(  # noqa: C901
+    run: BroadcastRun, block_id: str, score: float, level: int, state: Tuple[int, List[Set[str]]], claim: Any
+) -> None:
+    """Send broadcasts for a block to the chains of its claim, update the claim to get new chains if existing ones aren't responding,
+    or promote the block once it has enough verifications
+
+    Args:
+        run: state of the current broadcast processor run
+        block_id: block id to process
+        score: current broadcast score of the block (0 if it hasn't been broadcast at its current level yet)
+        level: current level of the block, as read at the start of the run
+        state: (level, verifications) of the block, read after its claim was retrieved
+        claim: matchmaking claim of the block
+    """
+    current_level, verifications = state
+    if current_level != level:
+        _log.info(f"[BROADCAST PROCESSOR] Block {block_id} changed while it was being processed. Leaving its new state as it is")
+        return
+    # The broadcast dto is built from (and cached against) the verifications at the level below this one (index 0 is L2)
+    lower_verifications = verifications[current_level - 3] if current_level > 2 else set()
+    claim_chains = chain_id_set_from_matchmaking_claim(claim, current_level)
+    if current_level == 5:
+        chain_id = claim_chains.pop()  # 'peek' l5 chain id from set by popping and re-adding
+        claim_chains.add(chain_id)
+    if score == 0:
+        # If this block hasn't been broadcast at this level before (score is 0)
+        _log.info(f"[BROADCAST PROCESSOR] Block {block_id} Level {current_level} not broadcasted yet. Broadcasting to all chains in claim")
+        # Make requests for all chains in the claim
+        futures = make_broadcast_futures(run.session, block_id, current_level, claim_chains, lower_verifications)
+        if futures is None:
+            # This occurs when make_broadcast_futures failed to create the broadcast dto (need to process this block later)
+            return
+        run.request_futures.update(futures)
+        # Schedule this block to be re-checked after BROADCAST_RECEIPT_WAIT_TIME more seconds have passed
+        reschedule_block(
+            run,
+            block_id,
+            current_level,
+            score,
+            int(time.time()) + (BROADCAST_RECEIPT_WAIT_TIME if current_level != 5 else get_l5_wait_time(chain_id)),
+        )
+    else:
+        # Block has been broadcast at this level before. Figure out which chains didn't respond in time
+        current_verifications = verifications[current_level - 2]
+        if len(current_verifications) < needed_verifications(current_level):
+            # For each chain that didn't respond
+            for chain in claim_chains.difference(current_verifications):
+                _log.info(f"[BROADCAST PROCESSOR] Chain {chain} didn't respond to broadcast in time. Fetching new chain")
+                try:
+                    claim = await matchmaking.overwrite_no_response_node_async(block_id, current_level, chain)
+                except exceptions.UnableToUpdate:
+                    _log.warning(f"Matchmaking does not have enough matches to update this claim check with new chains for level {current_level}")
+                    # Schedule for 5 minutes later, so we don't spam matchmaking every second if there aren't matches
+                    reschedule_block(run, block_id, current_level, score, int(time.time()) + 300)
+                    claim = None
+                    break
+                except exceptions.NotFound:
+                    _log.warning(
+                        f"Matchmaking does not have record of claim for block {block_id}."
+                        "Presumably closed. Saving to unfinished claim and removing from broadcast system."
+                    )
+                    await broadcast_functions.save_unfinished_claim(block_id)
+                    claim = None
+                    break
+            # Can't continue processing this block if the claim wasn't updated
+            if claim is None:
+                return
+            new_claim_chains = chain_id_set_from_matchmaking_claim(claim, current_level)
+            # Make requests for all the new chains
+            futures = make_broadcast_futures(
+                run.session, block_id, current_level, new_claim_chains.difference(current_verifications), lower_verifications
             )
-            await broadcast_functions.save_unfinished_claim(block_id)
-            continue
-        claim_chains = chain_id_set_from_matchmaking_claim(claim, current_level)
-        if current_level == 5:
-            chain_id = claim_chains.pop()  # 'peek' l5 chain id from set by popping and re-adding
-            claim_chains.add(chain_id)
-        if score == 0:
-            # If this block hasn't been broadcast at this level before (score is 0)
-            _log.info(f"[BROADCAST PROCESSOR] Block {block_id} Level {current_level} not broadcasted yet. Broadcasting to all chains in claim")
-            # Make requests for all chains in the claim
-            futures = make_broadcast_futures(session, block_id, current_level, claim_chains)
             if futures is None:
-                # This occurs when make_broadcast_futures failed to create the broadcast dto (need to process this block later)
-                continue
-            request_futures.update(futures)
+                # This occurs when make_broadcast_futures failed to create the broadcast dto (we need to process this block later)
+                return
+            run.request_futures.update(futures)
             # Schedule this block to be re-checked after BROADCAST_RECEIPT_WAIT_TIME more seconds have passed
-            await broadcast_functions.schedule_block_for_broadcast_async(
-                block_id, int(time.time()) + (BROADCAST_RECEIPT_WAIT_TIME if current_level != 5 else get_l5_wait_time(chain_id))
+            reschedule_block(
+                run,
+                block_id,
+                current_level,
+                score,
+                int(time.time()) + (BROADCAST_RECEIPT_WAIT_TIME if current_level != 5 else get_l5_wait_time(chain_id)),
             )
         else:
-            # Block has been broadcast at this level before. Figure out which chains didn't respond in time
-            current_verifications = await broadcast_functions.get_receieved_verifications_for_block_and_level_async(block_id, current_level)
-            if len(current_verifications) < needed_verifications(current_level):
-                # For each chain that didn't respond
-                for chain in claim_chains.difference(current_verifications):
-                    _log.info(f"[BROADCAST PROCESSOR] Chain {chain} didn't respond to broadcast in time. Fetching new chain")
-                    try:
-                        claim = matchmaking.overwrite_no_response_node(block_id, current_level, chain)
-                    except exceptions.UnableToUpdate:
-                        _log.warning(f"Matchmaking does not have enough matches to update this claim check with new chains for level {current_level}")
-                        # Schedule for 5 minutes later, so we don't spam matchmaking every second if there aren't matches
-                        await broadcast_functions.schedule_block_for_broadcast_async(block_id, int(time.time()) + 300)
-                        claim = None
-                        break
-                    except exceptions.NotFound:
-                        _log.warning(
-                            f"Matchmaking does not have record of claim for block {block_id}."
-                            "Presumably closed. Saving to unfinished claim and removing from broadcast system."
-                        )
-                        await broadcast_functions.save_unfinished_claim(block_id)
-                        claim = None
-                        break
-                # Can't continue processing this block if the claim wasn't updated
-                if claim is None:
-                    continue
-                new_claim_chains = chain_id_set_from_matchmaking_claim(claim, current_level)
-                # Make requests for all the new chains
-                futures = make_broadcast_futures(session, block_id, current_level, new_claim_chains.difference(current_verifications))
-                if futures is None:
-                    # This occurs when make_broadcast_futures failed to create the broadcast dto (we need to process this block later)
-                    continue
-                request_futures.update(futures)
-                # Schedule this block to be re-checked after BROADCAST_RECEIPT_WAIT_TIME more seconds have passed
-                await broadcast_functions.schedule_block_for_broadcast_async(
-                    block_id, int(time.time()) + (BROADCAST_RECEIPT_WAIT_TIME if current_level != 5 else get_l5_wait_time(chain_id))
+            if current_level >= 5:
+                # If level 5, block needs no more verifications; remove it from the broadcast system
+                _log.warning(
+                    f"[BROADCAST PROCESSOR] Block {block_id} has enough verifications at level {current_level}. Removing from broadcast system"
                 )
+                await broadcast_functions.remove_block_from_broadcast_system_async(block_id)
+                _broadcast_dto_cache.invalidate((block_id, current_level))
             else:
-                if current_level >= 5:
-                    # If level 5, block needs no more verifications; remove it from the broadcast system
-                    _log.warning(
-                        f"[BROADCAST PROCESSOR] Block {block_id} has enough verifications at level {current_level}. Removing from broadcast system"
-                    )
-                    await broadcast_functions.remove_block_from_broadcast_system_async(block_id)
-                else:
-                    # Promote the block with enough verifications at this level
-                    _log.warning(f"[BROADCAST PROCESSOR] Block {block_id} has enough verifications at level {current_level}. Promoting to next level")
-                    await broadcast_functions.set_current_block_level_async(block_id, current_level + 1)
-                    await broadcast_functions.schedule_block_for_broadcast_async(block_id)
-    # Wait for all the broadcasts in this run to finish before returning/looping
-    await asyncio.gather(*request_futures, return_exceptions=True)
+                # Promote the block with enough verifications at this level
+                _log.warning(f"[BROADCAST PROCESSOR] Block {block_id} has enough verifications at level {current_level}. Promoting to next level")
+                reschedule_block(run, block_id, current_level, score, 0, new_level=current_level + 1)
+                _broadcast_dto_cache.invalidate((block_id, current_level))
 
 
 async def loop() -> None:
@@ -345,9 +623,11 @@ async def loop() -> None:
         while True:
             await asyncio.sleep(1)
             await process_blocks_for_broadcast(session)
-            await process_verification_notifications(session)
+            await process_verification_notifications()
     except Exception:
         await session.close()
+        await close_notification_sessions()
+        await matchmaking.close_async_session()
         raise
 
 
@@ -363,6 +643,7 @@ def error_handler(loop: "asyncio.AbstractEventLoop", context: dict) -> None:
 if __name__ == "__main__":
     try:
         setup()
+        metrics.start("broadcast_processor")
         event_loop = asyncio.get_event_loop()
         event_loop.set_exception_handler(error_handler)
         event_loop.run_until_complete(loop())
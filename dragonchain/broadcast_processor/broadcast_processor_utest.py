@@ -18,7 +18,7 @@
 import importlib
 import asyncio
 import unittest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, MagicMock, call
 
 from dragonchain import test_env  # noqa: F401
 from dragonchain.broadcast_processor import broadcast_processor
@@ -107,16 +107,43 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(broadcast_processor.get_l5_wait_time("chainid"), 15228)
         mock_get_rego.assert_called_once_with("chainid")
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto")
-    def test_broadcast_futures_gets_broadcast_dto_for_block_id(self, patch_get_broadcast):
-        broadcast_processor.make_broadcast_futures(None, "id", 3, set())
-        patch_get_broadcast.assert_called_once_with(3, "id")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_broadcast_content")
+    def test_broadcast_futures_gets_broadcast_content_for_block_id(self, patch_get_broadcast):
+        broadcast_processor.make_broadcast_futures(None, "id", 3, set(), {"chain1"})
+        patch_get_broadcast.assert_called_once_with("id", 3, {"chain1"})
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", return_value={"dto": "thing"})
+    def test_get_broadcast_content_serializes_dto(self, patch_get_broadcast):
+        self.assertEqual(broadcast_processor.get_broadcast_content("id", 2, set()), b'{"dto":"thing"}')
+        patch_get_broadcast.assert_called_once_with(2, "id")
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", return_value="dto")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", return_value={"dto": "thing"})
+    def test_get_broadcast_content_is_cached_per_block_and_level(self, patch_get_broadcast):
+        content = broadcast_processor.get_broadcast_content("id", 3, {"chain1", "chain2"})
+        self.assertEqual(broadcast_processor.get_broadcast_content("id", 3, {"chain1", "chain2"}), content)
+        patch_get_broadcast.assert_called_once_with(3, "id")
+        broadcast_processor.get_broadcast_content("id", 4, {"chain1", "chain2"})
+        broadcast_processor.get_broadcast_content("other", 3, {"chain1", "chain2"})
+        self.assertEqual(patch_get_broadcast.call_count, 3)
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", return_value={"dto": "thing"})
+    def test_get_broadcast_content_rebuilds_when_verifications_change(self, patch_get_broadcast):
+        broadcast_processor.get_broadcast_content("id", 3, {"chain1", "chain2"})
+        broadcast_processor.get_broadcast_content("id", 3, {"chain1", "chain2", "chain3"})
+        broadcast_processor.get_broadcast_content("id", 3, {"chain1", "chain2", "chain3"})
+        self.assertEqual(patch_get_broadcast.call_count, 2)
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", return_value={"dto": "thing"})
+    def test_get_broadcast_content_doesnt_cache_without_verifications_in_redis(self, patch_get_broadcast):
+        broadcast_processor.get_broadcast_content("id", 3, set())
+        broadcast_processor.get_broadcast_content("id", 3, set())
+        self.assertEqual(patch_get_broadcast.call_count, 2)
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_broadcast_content", return_value=b"dto")
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.create_task", return_value="task")
     @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_dragonchain_address", return_value="addr")
     @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.authorization.generate_authenticated_request",
+        "dragonchain.broadcast_processor.broadcast_processor.authorization.generate_authenticated_request_for_content",
         return_value=({"header": "thing"}, b"some data"),
     )
     def test_broadcast_futures_returns_set_of_futures_from_session_posts(
@@ -124,10 +151,10 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
     ):
         fake_session = MagicMock()
         fake_session.post = MagicMock(return_value="session_request")
-        self.assertEqual(broadcast_processor.make_broadcast_futures(fake_session, "block_id", 2, {"chain_id"}), {"task"})
+        self.assertEqual(broadcast_processor.make_broadcast_futures(fake_session, "block_id", 2, {"chain_id"}, set()), {"task"})
         mock_get_address.assert_called_once_with("chain_id")
         mock_create_task.assert_called_once_with("session_request")
-        mock_gen_request.assert_called_once_with("POST", "chain_id", "/v1/enqueue", "dto")
+        mock_gen_request.assert_called_once_with("POST", "chain_id", "/v1/enqueue", b"dto", "application/json")
         fake_session.post.assert_called_once_with(
             url="addr/v1/enqueue",
             data=b"some data",
@@ -137,9 +164,9 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
 
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.create_task", return_value="task")
     @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_dragonchain_address", return_value="addr")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", return_value="dto")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_broadcast_content", return_value=b"dto")
     @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.authorization.generate_authenticated_request",
+        "dragonchain.broadcast_processor.broadcast_processor.authorization.generate_authenticated_request_for_content",
         return_value=({"header": "thing"}, b"some data"),
     )
     @patch(
@@ -149,7 +176,7 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
     def test_broadcast_futures_sets_deadline_header_for_l5(self, mock_get_rego, mock_gen_request, mock_get_address, mock_create_task, mock_dto):
         fake_session = MagicMock()
         fake_session.post = MagicMock(return_value="session_request")
-        broadcast_processor.make_broadcast_futures(fake_session, "block_id", 5, {"chain_id"})
+        broadcast_processor.make_broadcast_futures(fake_session, "block_id", 5, {"chain_id"}, {"l4chain"})
         fake_session.post.assert_called_once_with(
             url="addr/v1/enqueue",
             data=b"some data",
@@ -157,18 +184,18 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
             timeout=broadcast_processor.HTTP_REQUEST_TIMEOUT,
         )
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", return_value="dto")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_broadcast_content", return_value=b"dto")
     @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_dragonchain_address", return_value="addr")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.authorization.generate_authenticated_request", side_effect=Exception)
+    @patch("dragonchain.broadcast_processor.broadcast_processor.authorization.generate_authenticated_request_for_content", side_effect=Exception)
     def test_broadcast_futures_doesnt_return_future_for_exception_with_a_chain(self, mock_gen_req, mock_get_address, patch_get_broadcast):
         fake_session = MagicMock()
         fake_session.post = MagicMock(return_value="session_request")
-        self.assertEqual(broadcast_processor.make_broadcast_futures(fake_session, "block_id", 2, {"chain_id"}), set())
+        self.assertEqual(broadcast_processor.make_broadcast_futures(fake_session, "block_id", 2, {"chain_id"}, set()), set())
 
     @patch("dragonchain.broadcast_processor.broadcast_processor.block_dao.get_broadcast_dto", side_effect=exceptions.NotEnoughVerifications)
     @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.increment_storage_error_sync")
     def test_broadcast_futures_returns_none_on_get_broadcast_dto_failure(self, mock_increment_error, patch_get_broadcast):
-        self.assertIsNone(broadcast_processor.make_broadcast_futures(None, "block_id", 2, {"chain_id"}))
+        self.assertIsNone(broadcast_processor.make_broadcast_futures(None, "block_id", 2, {"chain_id"}, set()))
         mock_increment_error.assert_called_once_with("block_id", 2)
 
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
@@ -179,49 +206,56 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         mock_get_blocks.assert_awaited_once()
 
     @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check",
+        "dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async",
         return_value={"metadata": {"dcId": "banana-dc-id"}},
     )
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_block_for_broadcast_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=2)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
         return_value=[("block_id", 0)],
     )
     async def test_process_blocks_calls_matchmaking_for_claims(
-        self, mock_get_blocks, mock_gather, mock_get_block_level, mock_chain_id_set, mock_get_futures, mock_schedule_broadcast, mock_claim
+        self, mock_get_blocks, mock_gather, mock_get_states, mock_chain_id_set, mock_get_futures, mock_update, mock_claim
     ):
         mock_gather.return_value.set_result(None)
         await broadcast_processor.process_blocks_for_broadcast(None)
         mock_claim.assert_called_once_with("block_id", broadcast_processor._requirements)
         mock_chain_id_set.assert_called_once_with({"metadata": {"dcId": "banana-dc-id"}}, 2)
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check", side_effect=exceptions.InsufficientFunds)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async", side_effect=exceptions.InsufficientFunds
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.sleep")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=None)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
         return_value=[("block_id", 0)],
     )
-    async def test_process_blocks_sleeps_with_insufficient_funds(self, mock_get_blocks, mock_gather, mock_get_block_level, mock_sleep, mock_claim):
+    async def test_process_blocks_sleeps_with_insufficient_funds(self, mock_get_blocks, mock_gather, mock_get_states, mock_sleep, mock_claim):
         mock_gather.return_value.set_result(None)
         await broadcast_processor.process_blocks_for_broadcast(None)
         mock_sleep.assert_awaited_once_with(1800)
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
     @patch("dragonchain.broadcast_processor.broadcast_processor.time.time", return_value=123)
-    @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_receieved_verifications_for_block_and_level_async",
-        return_value=None,
-    )
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_block_for_broadcast_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=2)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
@@ -231,50 +265,49 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         self,
         mock_get_blocks,
         mock_gather,
-        mock_get_block_level,
+        mock_get_states,
         mock_chain_id_set,
         mock_get_futures,
-        mock_schedule_broadcast,
-        mock_get_verifications,
+        mock_update,
         mock_time,
         mock_claim,
     ):
         mock_gather.return_value.set_result(None)
         await broadcast_processor.process_blocks_for_broadcast(None)
-        mock_get_futures.assert_called_once_with(None, "block_id", 2, {"chain_id"})
-        mock_schedule_broadcast.assert_awaited_once_with("block_id", 123 + broadcast_processor.BROADCAST_RECEIPT_WAIT_TIME)
+        mock_get_futures.assert_called_once_with(None, "block_id", 2, {"chain_id"}, set())
+        mock_update.assert_awaited_once_with([("block_id", 2, 0, 123 + broadcast_processor.BROADCAST_RECEIPT_WAIT_TIME, None)])
         mock_gather.assert_called_once_with(return_exceptions=True)
-        mock_get_verifications.assert_not_called()
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_block_for_broadcast_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures", return_value=None)
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=2)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
         return_value=[("block_id", 0)],
     )
     async def test_process_blocks_doesnt_reschedule_new_block_which_failed_had_no_futures(
-        self, mock_get_blocks, mock_gather, mock_get_block_level, mock_chain_id_set, mock_get_futures, mock_schedule_broadcast, mock_claim
+        self, mock_get_blocks, mock_gather, mock_get_states, mock_chain_id_set, mock_get_futures, mock_update, mock_claim
     ):
         mock_gather.return_value.set_result(None)
         await broadcast_processor.process_blocks_for_broadcast(None)
         mock_get_futures.assert_called_once()
-        mock_schedule_broadcast.assert_not_called()
+        mock_update.assert_awaited_once_with([])
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.set_current_block_level_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
     @patch("dragonchain.broadcast_processor.broadcast_processor.needed_verifications", return_value=0)
-    @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_receieved_verifications_for_block_and_level_async",
-        return_value={"verification"},
-    )
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_block_for_broadcast_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=2)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
@@ -284,33 +317,29 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         self,
         mock_get_blocks,
         mock_gather,
-        mock_get_block_level,
+        mock_get_states,
         mock_chain_id_set,
         mock_get_futures,
-        mock_schedule_broadcast,
-        mock_get_verifications,
+        mock_update,
         mock_needed_verifications,
-        mock_set_block_level,
         mock_claim_check,
     ):
         mock_gather.return_value.set_result(None)
         await broadcast_processor.process_blocks_for_broadcast(None)
-        mock_set_block_level.assert_awaited_once_with("block_id", 3)
-        mock_schedule_broadcast.assert_awaited_once_with("block_id")
+        mock_update.assert_awaited_once_with([("block_id", 2, 1, 0, 3)])
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.remove_block_from_broadcast_system_async",
         return_value=asyncio.Future(),
     )
     @patch("dragonchain.broadcast_processor.broadcast_processor.needed_verifications", return_value=0)
-    @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_receieved_verifications_for_block_and_level_async",
-        return_value={"verification"},
-    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=5)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (5, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
@@ -320,10 +349,9 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         self,
         mock_get_blocks,
         mock_gather,
-        mock_get_block_level,
+        mock_get_states,
         mock_chain_id_set,
         mock_get_futures,
-        mock_get_verifications,
         mock_needed_verifications,
         mock_remove_block,
         mock_claim_check,
@@ -333,17 +361,16 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         await broadcast_processor.process_blocks_for_broadcast(None)
         mock_remove_block.assert_called_once_with("block_id")
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.overwrite_no_response_node")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.overwrite_no_response_node_async")
     @patch("dragonchain.broadcast_processor.broadcast_processor.needed_verifications", return_value=3)
-    @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_receieved_verifications_for_block_and_level_async",
-        return_value={"verification"},
-    )
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_block_for_broadcast_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=2)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
@@ -353,11 +380,10 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         self,
         mock_get_blocks,
         mock_gather,
-        mock_get_block_level,
+        mock_get_states,
         mock_chain_id_set,
         mock_get_futures,
-        mock_schedule_broadcast,
-        mock_get_verifications,
+        mock_update,
         mock_needed_verifications,
         mock_no_response_node,
         mock_claim_check,
@@ -367,20 +393,19 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         mock_no_response_node.assert_called_once_with("block_id", 2, "chain_id")
 
     @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check",
+        "dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async",
         return_value={"metadata": {"dcId": "banana-dc-id"}},
     )
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.overwrite_no_response_node", return_value={"verification"})
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.overwrite_no_response_node_async", return_value={"verification"})
     @patch("dragonchain.broadcast_processor.broadcast_processor.time.time", return_value=123)
     @patch("dragonchain.broadcast_processor.broadcast_processor.needed_verifications", return_value=3)
-    @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_receieved_verifications_for_block_and_level_async",
-        return_value={"verification"},
-    )
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_block_for_broadcast_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=2)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
@@ -390,11 +415,10 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         self,
         mock_get_blocks,
         mock_gather,
-        mock_get_block_level,
+        mock_get_states,
         mock_chain_id_set,
         mock_get_futures,
-        mock_schedule_broadcast,
-        mock_get_verifications,
+        mock_update,
         mock_needed_verifications,
         mock_time,
         mock_no_response_node,
@@ -402,21 +426,20 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
     ):
         mock_gather.return_value.set_result(None)
         await broadcast_processor.process_blocks_for_broadcast(None)
-        mock_get_futures.assert_called_once_with(None, "block_id", 2, {"chain_id"})
-        mock_schedule_broadcast.assert_awaited_once_with("block_id", 123 + broadcast_processor.BROADCAST_RECEIPT_WAIT_TIME)
+        mock_get_futures.assert_called_once_with(None, "block_id", 2, {"chain_id"}, set())
+        mock_update.assert_awaited_once_with([("block_id", 2, 1, 123 + broadcast_processor.BROADCAST_RECEIPT_WAIT_TIME, None)])
         mock_gather.assert_called_once_with(return_exceptions=True)
 
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check")
-    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.overwrite_no_response_node", return_value={"verification"})
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.overwrite_no_response_node_async", return_value={"verification"})
     @patch("dragonchain.broadcast_processor.broadcast_processor.needed_verifications", return_value=3)
-    @patch(
-        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_receieved_verifications_for_block_and_level_async",
-        return_value={"verification"},
-    )
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_block_for_broadcast_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
     @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures", return_value=None)
     @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
-    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_current_block_level_async", return_value=2)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block_id": (2, [set(), set(), set(), set()])},
+    )
     @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.gather", return_value=asyncio.Future())
     @patch(
         "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
@@ -426,11 +449,10 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         self,
         mock_get_blocks,
         mock_gather,
-        mock_get_block_level,
+        mock_get_states,
         mock_chain_id_set,
         mock_get_futures,
-        mock_schedule_broadcast,
-        mock_get_verifications,
+        mock_update,
         mock_needed_verifications,
         mock_no_response_node,
         mock_claim_check,
@@ -438,8 +460,150 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         mock_gather.return_value.set_result(None)
         await broadcast_processor.process_blocks_for_broadcast(None)
         mock_get_futures.assert_called_once()
-        mock_schedule_broadcast.assert_not_called()
+        mock_update.assert_awaited_once_with([])
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.BROADCAST_CONCURRENCY", 2)
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
+    @patch("dragonchain.broadcast_processor.broadcast_processor.process_block_for_broadcast")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.claim_block_for_broadcast", return_value={})
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={f"block{i}": (2, [set(), set(), set(), set()]) for i in range(1, 6)},
+    )
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
+        return_value=[("block1", 0), ("block2", 0), ("block3", 0), ("block4", 0), ("block5", 0)],
+    )
+    async def test_process_blocks_limits_concurrent_blocks(self, mock_get_blocks, mock_get_states, mock_claim, mock_process_block, mock_update):
+        running = 0
+        max_running = 0
+
+        async def fake_process(*args):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        mock_process_block.side_effect = fake_process
+        await broadcast_processor.process_blocks_for_broadcast(None)
+        self.assertEqual(mock_process_block.await_count, 5)
+        self.assertEqual(max_running, 2)
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
+    @patch("dragonchain.broadcast_processor.broadcast_processor.process_block_for_broadcast")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.claim_block_for_broadcast", return_value={})
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={f"block{i}": (2, [set(), set(), set(), set()]) for i in range(1, 4)},
+    )
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
+        return_value=[("block1", 0), ("block2", 0), ("block3", 0)],
+    )
+    async def test_process_blocks_isolates_errors_to_one_block(self, mock_get_blocks, mock_get_states, mock_claim, mock_process_block, mock_update):
+        processed = []
+
+        async def fake_process(run, block_id, score, level, state, claim):
+            if block_id == "block2":
+                raise RuntimeError("boom")
+            processed.append(block_id)
+
+        mock_process_block.side_effect = fake_process
+        await broadcast_processor.process_blocks_for_broadcast(None)
+        self.assertEqual(sorted(processed), ["block1", "block3"])
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.asyncio.sleep")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.BROADCAST_CONCURRENCY", 1)
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async", side_effect=exceptions.InsufficientFunds
+    )
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block1": (2, set()), "block2": (2, [set(), set(), set(), set()])},
+    )
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
+        return_value=[("block1", 0), ("block2", 0)],
+    )
+    async def test_process_blocks_stops_processing_blocks_when_out_of_funds(self, mock_get_blocks, mock_get_states, mock_claim, mock_sleep):
+        await broadcast_processor.process_blocks_for_broadcast(None)
+        mock_claim.assert_awaited_once()
+        mock_sleep.assert_awaited_once_with(1800)
 
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.overwrite_no_response_node_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.needed_verifications", return_value=3)
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
+    @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        side_effect=[{"block_id": (2, [set(), set(), set(), set()])}, {"block_id": (2, [{"chain_id"}, set(), set(), set()])}],
+    )
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
+        return_value=[("block_id", 1)],
+    )
+    async def test_process_blocks_doesnt_replace_chains_which_responded(
+        self, mock_get_blocks, mock_get_states, mock_chain_id_set, mock_get_futures, mock_update, mock_needed, mock_no_response_node, mock_claim
+    ):
+        await broadcast_processor.process_blocks_for_broadcast(None)
+        self.assertEqual(mock_get_states.await_args_list, [call(["block_id"]), call(["block_id"])])
+        mock_no_response_node.assert_not_called()
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor._log")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=[])
+    @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures")
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        side_effect=[{"block_id": (2, [set(), set(), set(), set()])}, {"block_id": (3, [{"chain_id"}, set(), set(), set()])}],
+    )
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
+        return_value=[("block_id", 1)],
+    )
+    async def test_process_blocks_leaves_block_promoted_while_waiting_on_claim(
+        self, mock_get_blocks, mock_get_states, mock_get_futures, mock_update, mock_claim, mock_log
+    ):
+        await broadcast_processor.process_blocks_for_broadcast(None)
+        mock_get_futures.assert_not_called()
+        mock_update.assert_awaited_once_with([])
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor._log")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.time.time", return_value=123)
+    @patch("dragonchain.broadcast_processor.broadcast_processor.matchmaking.get_or_create_claim_check_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.update_block_schedules_async", return_value=["block2"])
+    @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures", return_value=set())
+    @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_broadcast_states_async",
+        return_value={"block1": (2, [set(), set(), set(), set()]), "block2": (3, [set(), set(), set(), set()])},
+    )
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_blocks_to_process_for_broadcast_async",
+        return_value=[("block1", 0), ("block2", 0)],
+    )
+    async def test_process_blocks_commits_all_schedules_in_one_call(
+        self, mock_get_blocks, mock_get_states, mock_chain_id_set, mock_get_futures, mock_update, mock_claim, mock_time, mock_log
+    ):
+        await broadcast_processor.process_blocks_for_broadcast(None)
+        self.assertEqual(mock_get_states.await_args_list, [call(["block1", "block2"]), call([])])
+        wait = 123 + broadcast_processor.BROADCAST_RECEIPT_WAIT_TIME
+        mock_update.assert_awaited_once()
+        self.assertCountEqual(mock_update.await_args[0][0], [("block1", 2, 0, wait, None), ("block2", 3, 0, wait, None)])
+        mock_log.info.assert_any_call("[BROADCAST PROCESSOR] Block block2 changed while it was being processed. Leaving its new state as it is")
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.make_broadcast_futures", return_value=set())
+    @patch("dragonchain.broadcast_processor.broadcast_processor.chain_id_set_from_matchmaking_claim", return_value={"chain_id"})
+    async def test_process_block_broadcasts_with_lower_level_verifications_from_state(self, mock_chain_id_set, mock_get_futures):
+        run = broadcast_processor.BroadcastRun(None)
+        await broadcast_processor.process_block_for_broadcast(run, "block_id", 0, 3, (3, [{"l2chain"}, set(), set(), set()]), {})
+        mock_get_futures.assert_called_once_with(None, "block_id", 3, {"chain_id"}, {"l2chain"})
+        self.assertEqual(len(run.schedule_updates), 1)
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_notification_retries_due_async", return_value=[])
     @patch(
         "dragonchain.broadcast_processor.broadcast_functions.get_notification_verifications_for_broadcast_async",
         return_value={"BLOCK/banana-l2-whatever"},
@@ -448,13 +612,15 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
     @patch("dragonchain.broadcast_processor.broadcast_processor.storage.get", return_value=b"location-object-bytes")
     @patch("dragonchain.broadcast_processor.broadcast_processor.keys.get_public_id", return_value="my-public-id")
     @patch("dragonchain.broadcast_processor.broadcast_functions.redis.srem_async", return_value="OK")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_notification_session")
     async def test_process_verification_notification_calls_configured_url(
-        self, srem_mock, public_id_mock, storage_get_mock, sign_mock, get_location_mock
+        self, mock_get_session, srem_mock, public_id_mock, storage_get_mock, sign_mock, get_location_mock, mock_get_retries
     ):
         broadcast_processor.VERIFICATION_NOTIFICATION = {"all": ["url1"]}
-        fake_session = AsyncMock(post=AsyncMock())
-        await broadcast_processor.process_verification_notifications(fake_session)
-        fake_session.post.assert_awaited_once_with(
+        mock_get_session.return_value.post.return_value.__aenter__.return_value.status = 200
+        await broadcast_processor.process_verification_notifications()
+        mock_get_session.assert_called_once_with("url1")
+        mock_get_session.return_value.post.assert_called_once_with(
             data=b"location-object-bytes",
             headers={"Content-Type": "application/json", "dragonchainId": "my-public-id", "signature": "my-signature"},
             timeout=30,
@@ -462,6 +628,9 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
         )
         srem_mock.assert_awaited_once_with("broadcast:notifications", "BLOCK/banana-l2-whatever")
 
+    @patch("dragonchain.broadcast_processor.broadcast_processor.time.time", return_value=100)
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_notification_retry_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_notification_retries_due_async", return_value=[])
     @patch(
         "dragonchain.broadcast_processor.broadcast_functions.get_notification_verifications_for_broadcast_async",
         return_value={"BLOCK/banana-l2-whatever"},
@@ -470,16 +639,74 @@ class BroadcastProcessorTests(unittest.IsolatedAsyncioTestCase):
     @patch("dragonchain.broadcast_processor.broadcast_processor.storage.get", return_value=b"location-object-bytes")
     @patch("dragonchain.broadcast_processor.broadcast_processor.keys.get_public_id", return_value="my-public-id")
     @patch("dragonchain.broadcast_processor.broadcast_functions.redis.srem_async", return_value="OK")
-    async def test_process_verification_notification_removes_from_set_when_fail(
-        self, srem_mock, public_id_mock, storage_get_mock, sign_mock, get_location_mock
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_notification_session")
+    async def test_process_verification_notification_schedules_retry_and_removes_from_set_when_fail(
+        self, mock_get_session, srem_mock, public_id_mock, storage_get_mock, sign_mock, get_location_mock, mock_get_retries, mock_retry, mock_time
     ):
         broadcast_processor.VERIFICATION_NOTIFICATION = {"all": ["url1"]}
-        fake_session = AsyncMock(post=AsyncMock(side_effect=Exception("boom")))
-        await broadcast_processor.process_verification_notifications(fake_session)
-        fake_session.post.assert_called_once_with(
-            data=b"location-object-bytes",
-            headers={"Content-Type": "application/json", "dragonchainId": "my-public-id", "signature": "my-signature"},
-            timeout=30,
-            url="url1",
+        mock_get_session.return_value.post.side_effect = Exception("boom")
+        await broadcast_processor.process_verification_notifications()
+        mock_get_session.return_value.post.assert_called_once()
+        mock_retry.assert_awaited_once_with("BLOCK/banana-l2-whatever", "url1", 1, 100 + broadcast_processor.NOTIFICATION_RETRY_DELAY)
+        srem_mock.assert_awaited_once_with("broadcast:notifications", "BLOCK/banana-l2-whatever")
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.clear_notification_retry_async")
+    @patch(
+        "dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.get_notification_retries_due_async",
+        return_value=[("BLOCK/banana-l2-whatever", "url2", 3)],
+    )
+    @patch("dragonchain.broadcast_processor.broadcast_functions.get_notification_verifications_for_broadcast_async", return_value=set())
+    @patch("dragonchain.broadcast_processor.broadcast_processor.sign", return_value="my-signature")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.storage.get", return_value=b"location-object-bytes")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.keys.get_public_id", return_value="my-public-id")
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.srem_async", return_value="OK")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_notification_session")
+    async def test_process_verification_notification_retries_due_deliveries_only_to_their_url(
+        self, mock_get_session, srem_mock, public_id_mock, storage_get_mock, sign_mock, get_location_mock, mock_get_retries, mock_clear
+    ):
+        broadcast_processor.VERIFICATION_NOTIFICATION = {"all": ["url1", "url2"]}
+        mock_get_session.return_value.post.return_value.__aenter__.return_value.status = 200
+        await broadcast_processor.process_verification_notifications()
+        mock_get_session.assert_called_once_with("url2")
+        mock_clear.assert_awaited_once_with("BLOCK/banana-l2-whatever", "url2")
+        srem_mock.assert_not_called()
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_notification_retry_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.dead_letter_notification_async")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_notification_session")
+    async def test_send_notification_dead_letters_after_max_attempts(self, mock_get_session, mock_dead_letter, mock_retry):
+        mock_get_session.return_value.post.return_value.__aenter__.return_value.status = 500
+        delivered = await broadcast_processor.send_notification_verification(
+            "url1", b"bytes", "sig", "BLOCK/banana-l2-whatever", broadcast_processor.NOTIFICATION_MAX_ATTEMPTS - 1
         )
+        self.assertFalse(delivered)
+        mock_dead_letter.assert_awaited_once_with("BLOCK/banana-l2-whatever", "url1")
+        mock_retry.assert_not_called()
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.time.time", return_value=100)
+    @patch("dragonchain.broadcast_processor.broadcast_processor.broadcast_functions.schedule_notification_retry_async")
+    async def test_schedule_notification_retry_backs_off_exponentially(self, mock_retry, mock_time):
+        await broadcast_processor.schedule_notification_retry("loc", "url1", 3)
+        mock_retry.assert_awaited_once_with("loc", "url1", 3, 100 + broadcast_processor.NOTIFICATION_RETRY_DELAY * 4)
+
+    @patch("dragonchain.broadcast_processor.broadcast_processor.schedule_notification_retry")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.storage.get", side_effect=exceptions.NotFound)
+    @patch("dragonchain.broadcast_processor.broadcast_functions.redis.srem_async", return_value="OK")
+    @patch("dragonchain.broadcast_processor.broadcast_processor.get_notification_session")
+    async def test_process_verification_notification_schedules_retries_when_storage_read_fails(
+        self, mock_get_session, srem_mock, storage_get_mock, mock_retry
+    ):
+        broadcast_processor.VERIFICATION_NOTIFICATION = {"all": ["url1"]}
+        delivered = await broadcast_processor.process_verification_notification(asyncio.Semaphore(1), "BLOCK/banana-l2-whatever", [("url2", 2)], True)
+        self.assertEqual(delivered, 0)
+        mock_get_session.assert_not_called()
+        mock_retry.assert_has_awaits([call("BLOCK/banana-l2-whatever", "url2", 3), call("BLOCK/banana-l2-whatever", "url1", 1)], any_order=True)
         srem_mock.assert_awaited_once_with("broadcast:notifications", "BLOCK/banana-l2-whatever")
+
+    async def test_get_notification_session_pools_by_endpoint(self):
+        session = broadcast_processor.get_notification_session("https://example.com/a")
+        self.assertIs(broadcast_processor.get_notification_session("https://example.com/b?c=d"), session)
+        self.assertIsNot(broadcast_processor.get_notification_session("https://example.org/a"), session)
+        self.assertEqual(session.connector.limit, broadcast_processor.NOTIFICATION_ENDPOINT_CONNECTIONS)
+        await broadcast_processor.close_notification_sessions()
+        self.assertTrue(session.closed)
@@ -62,10 +62,12 @@ def main() -> "ContractJob":
             job.update()
             change_to_read_user()
             job.model.save()
+            smart_contract_dao.invalidate_cached_contract(job.model.id)
         elif job.model and job.model.task_type == "create":
             job.create()
             change_to_read_user()
             job.model.save()
+            smart_contract_dao.invalidate_cached_contract(job.model.id)
         elif job.model and job.model.task_type == "delete":
             job.delete()
     except Exception:
@@ -78,6 +80,7 @@ def main() -> "ContractJob":
             job.model.set_state(job.end_error_state, "Unexpected error updating contract")
         change_to_read_user()
         job.model.save()
+        smart_contract_dao.invalidate_cached_contract(job.model.id)
         raise
     return job
 
@@ -376,6 +379,7 @@ class ContractJob(object):
             storage.delete_directory(f"SMARTCONTRACT/{self.model.id}")
             _log.info("Removing index")
             smart_contract_dao.remove_smart_contract_index(self.model.id)
+            smart_contract_dao.invalidate_cached_contract(self.model.id)
             _log.info(f"Deleting txn type {self.model.txn_type}")
             transaction_type_dao.remove_existing_transaction_type(self.model.txn_type)
             key = f"KEYS/{self.model.auth_key_id}"
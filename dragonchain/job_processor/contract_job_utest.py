@@ -382,11 +382,12 @@ class ContractJobTest(unittest.TestCase):
         mock_requests.assert_called()
         mock_faas_auth.assert_called()
 
+    @patch("dragonchain.job_processor.contract_job.smart_contract_dao.invalidate_cached_contract")
     @patch("dragonchain.job_processor.contract_job.transaction_type_dao.remove_existing_transaction_type")
     @patch("dragonchain.job_processor.contract_job.smart_contract_dao.remove_smart_contract_index")
     @patch("dragonchain.job_processor.contract_job.storage.delete_directory")
     @patch("dragonchain.job_processor.contract_job.storage.delete")
-    def test_delete_contract_data(self, mock_delete, mock_delete_directory, mock_delete_txn_type, mock_remove_tx_type):
+    def test_delete_contract_data(self, mock_delete, mock_delete_directory, mock_delete_txn_type, mock_remove_tx_type, mock_invalidate):
         self.test_job.contract_service = MagicMock()
         self.test_job.delete_contract_data()
 
@@ -394,6 +395,7 @@ class ContractJobTest(unittest.TestCase):
         mock_delete.assert_called_once_with(f"KEYS/{self.test_job.model.auth_key_id}")
         mock_delete_txn_type.assert_called_once()
         mock_remove_tx_type.assert_called_once()
+        mock_invalidate.assert_called_once_with(self.test_job.model.id)
 
     @patch("dragonchain.job_processor.contract_job.scheduler.schedule_contract_invocation")
     def test_schedule_contract(self, mock_schedule):
@@ -430,7 +432,8 @@ class ContractJobTest(unittest.TestCase):
         self.test_job.migrate_env()
         self.test_job.model.env.update.assert_called_once_with(self.test_job.update_model.env)
 
-    def test_main_create(self):
+    @patch("dragonchain.job_processor.contract_job.smart_contract_dao.invalidate_cached_contract")
+    def test_main_create(self, mock_invalidate):
         self.test_job.model = self.BuildTaskResult("banana", "create", "active", "ban", "ana", {}, image="image", auth="YmFuYTpuYQ==")
         self.test_job.model.save = MagicMock()
         smart_contract_model.new_from_build_task = MagicMock(return_value=self.test_job.model)
@@ -438,6 +441,7 @@ class ContractJobTest(unittest.TestCase):
         contract_job.ContractJob.create = MagicMock()
         contract_job.main()
         contract_job.ContractJob.create.assert_called()
+        mock_invalidate.assert_called_once()
 
     @patch("dragonchain.job_processor.contract_job.ContractJob.delete")
     def test_run_delete(self, delete_mock):
@@ -469,11 +473,12 @@ class ContractJobTest(unittest.TestCase):
         self.test_job.create_openfaas_secrets = MagicMock()
         self.test_job.update()
 
+    @patch("dragonchain.job_processor.contract_job.smart_contract_dao.invalidate_cached_contract")
     @patch("dragonchain.lib.keys.get_public_id", return_value="z7S3WADvnjCyFkUmL48cPGqrSHDrQghNxLFMwBEwwtMa")
     @patch("dragonchain.job_processor.contract_job.registry_interface.get_login")
     @patch("dragonchain.job_processor.contract_job.ContractJob.docker_login_if_necessary")
     @patch("dragonchain.job_processor.contract_job.docker")
-    def test_main_pass_does_update_model(self, mock_docker, mock_login, mock_ecr, mock_secrets):
+    def test_main_pass_does_update_model(self, mock_docker, mock_login, mock_ecr, mock_secrets, mock_invalidate):
         contract_job.EVENT = '{"txn_type": "test", "task_type": "update", "id": "123", "start_state": "inactive", "auth": "auth", "image": "image", "cmd": "cmd", "args": "[one]", "secrets": "{}", "existing_secrets": "[]", "env": "{}", "cron": "None", "seconds": "30",  "execution_order": "serial", "desired_state": "active"}'  # noqa: B950
         self.test_job.model = self.BuildTaskResultWithHelpers("banana", "create", "inactive", "ban", "ana", {}, image="image", auth="YmFuYTpuYQ==")
         self.test_job.update_model = self.BuildTaskResultWithHelpers(
@@ -500,6 +505,7 @@ class ContractJobTest(unittest.TestCase):
             self.assertEqual(job.model.cmd, "banana")
             self.assertEqual(job.model.status["state"], "active")
             job.model.save.assert_called()
+            mock_invalidate.assert_called_once_with(job.model.id)
         except Exception:
             self.fail("should not have thrown a generic exception!")
 
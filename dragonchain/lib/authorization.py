@@ -193,8 +193,28 @@ def generate_authenticated_request(
     Returns:
         Tuple where index 0 is the headers dictionary to use, and index 1 is the byte data (body) to use for an http request
     """
-    if json_content is None:
-        json_content = {}
+    content_type = ""
+    content = b""
+    if json_content:
+        content_type = "application/json"
+        content = json.dumps(json_content, separators=(",", ":")).encode("utf-8")
+    return generate_authenticated_request_for_content(http_verb, dcid, full_path, content, content_type, hmac_hash_type)
+
+
+def generate_authenticated_request_for_content(
+    http_verb: str, dcid: str, full_path: str, content: bytes = b"", content_type: str = "", hmac_hash_type: str = "SHA256"
+) -> Tuple[dict, bytes]:
+    """Generate request data (headers and body) for making authenticated http requests with an already serialized body
+    Args:
+        http_verb: string of the http verb that will be used for this request (i.e. GET, POST, etc)
+        dcid: the dragonchain id to make this request for. If this is for matchmaking, specify the string 'matchmaking' instead
+        full_path: full path of the request after the FQDN (including any query parameters) (i.e. /matchmaking/2?qty=3)
+        content: byte data to use as the body of the request (empty if request has no body)
+        content_type: content type of the body (empty if request has no body)
+        hmac_hash_type: the hmac hash type to use for this request
+    Returns:
+        Tuple where index 0 is the headers dictionary to use, and index 1 is the byte data (body) to use for an http request
+    """
     auth_key = None
     matchmaking = dcid == "matchmaking"
     http_verb = http_verb.upper()
@@ -211,11 +231,6 @@ def generate_authenticated_request(
             # We need to estabilish a shared HMAC key for this chain before we can make a request
             auth_key = register_new_interchain_key_with_remote(dcid).key
     timestamp = get_now_datetime().isoformat() + "Z"
-    content_type = ""
-    content = b""
-    if json_content:
-        content_type = "application/json"
-        content = json.dumps(json_content, separators=(",", ":")).encode("utf-8")
     headers = {
         "timestamp": timestamp,
         "Authorization": get_authorization(
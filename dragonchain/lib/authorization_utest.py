@@ -167,6 +167,16 @@ class TestAuthorization(unittest.TestCase):
         self.assertEqual(content, json_str)
         self.assertDictEqual(headers, expected_headers)
 
+    @patch("dragonchain.lib.authorization.keys.get_public_id", return_value="test_dcid")
+    @patch("dragonchain.lib.authorization.register_new_interchain_key_with_remote", return_value=MagicMock(key="key"))
+    @patch("dragonchain.lib.authorization.get_now_datetime", return_value=MagicMock(isoformat=MagicMock(return_value="timestamp")))
+    @patch("dragonchain.lib.authorization.api_key_dao.get_api_key", side_effect=exceptions.NotFound)
+    def test_gen_interchain_request_for_content_matches_json_request(self, mock_get_auth_key, date_mock, mock_register, mock_dcid):
+        json_content = {"thing": "test"}
+        json_str = json.dumps(json_content, separators=(",", ":")).encode("utf-8")
+        expected = authorization.generate_authenticated_request("POST", "adcid", "/path", json_content)
+        self.assertEqual(authorization.generate_authenticated_request_for_content("POST", "adcid", "/path", json_str, "application/json"), expected)
+
     @patch("dragonchain.lib.authorization.keys.get_public_id", return_value="test_dcid")
     @patch("dragonchain.lib.authorization.get_matchmaking_key", return_value=None)
     @patch("dragonchain.lib.authorization.register_new_key_with_matchmaking", return_value="key")
@@ -15,15 +15,31 @@
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
 
-import requests
+import os
+import atexit
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import aiohttp
 
 from dragonchain.lib.database import redis
 from dragonchain.lib.dto import transaction_model
 from dragonchain import logger
 
 CALLBACK_REDIS_KEY = "dc:tx:callback"
+CALLBACK_CONCURRENCY = int(os.environ.get("CALLBACK_CONCURRENCY") or "20")  # Maximum number of callbacks in flight at once
+CALLBACK_RETRIES = int(os.environ.get("CALLBACK_RETRIES") or "2")  # Number of retries after a failed callback attempt
+CALLBACK_TIMEOUT = 10
+CALLBACK_DRAIN_TIMEOUT = 30  # Seconds to wait at exit for callbacks which are still being delivered
 
 _log = logger.get_logger()
+_dispatcher_loop: Optional[asyncio.AbstractEventLoop] = None
+_dispatcher_lock = threading.Lock()
+_session: Optional[aiohttp.ClientSession] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+_pending: Set[concurrent.futures.Future] = set()
 
 
 def register_callback(txn_id: str, callback_url: str) -> None:
@@ -31,17 +47,93 @@ def register_callback(txn_id: str, callback_url: str) -> None:
     redis.hset_sync(CALLBACK_REDIS_KEY, txn_id, callback_url)
 
 
-def fire_if_exists(txn_id: str, transaction_model: transaction_model.TransactionModel) -> None:
-    """Fires a callback with a given payload, then removes from redis"""
-    url = redis.hget_sync(CALLBACK_REDIS_KEY, txn_id)
-    if url is not None:
-        try:
-            _log.debug(f"POST -> {url}")
-            with requests.Session() as s:
-                s.mount(url, requests.adapters.HTTPAdapter(max_retries=0))
-                r = s.post(url, json=transaction_model.export_as_full(), timeout=10)
-                _log.debug(f"POST <- {r.status_code}:{url}")
-        except Exception:
-            _log.exception("POST <- ERROR. No-op")
-
-        redis.hdel_sync(CALLBACK_REDIS_KEY, txn_id)
+def fire_many(callbacks: List[Tuple[str, transaction_model.TransactionModel]]) -> None:
+    """Queue callbacks for a batch of transactions to be delivered in the background
+    Each callback is removed from redis once its delivery is over (delivered or given up on)
+    Args:
+        callbacks: list of (callback key, transaction model) tuples. The key is the invoker for contract invocations, or the txn_id otherwise
+    """
+    if not callbacks:
+        return
+    urls = redis.hmget_sync(CALLBACK_REDIS_KEY, *[key for key, _ in callbacks])
+    for (key, model), url in zip(callbacks, urls):
+        if url is not None:
+            dispatch(url, model.export_as_full(), key)
+
+
+def dispatch(url: str, payload: Dict[str, Any], key: Optional[str] = None) -> concurrent.futures.Future:
+    """Schedule a callback POST on the background dispatcher without waiting for it
+    Args:
+        url: url to POST the payload to
+        payload: JSON payload of the callback
+        key: callback key to remove from redis once the delivery is over (if any)
+    Returns:
+        Future of the delivery
+    """
+    future = asyncio.run_coroutine_threadsafe(_deliver(url, payload, key), _get_dispatcher_loop())
+    with _dispatcher_lock:
+        _pending.add(future)
+    future.add_done_callback(_discard_pending)
+    return future
+
+
+def drain(timeout: float = CALLBACK_DRAIN_TIMEOUT) -> None:
+    """Wait for the callbacks which are still being delivered
+    The dispatcher runs on a daemon thread, so without this, callbacks in flight are dropped when the process exits
+    Args:
+        timeout: maximum number of seconds to wait
+    """
+    with _dispatcher_lock:
+        pending = list(_pending)
+    if pending:
+        _log.info(f"Waiting for {len(pending)} callback(s) to be delivered")
+        concurrent.futures.wait(pending, timeout=timeout)
+
+
+atexit.register(drain)
+
+
+def _discard_pending(future: concurrent.futures.Future) -> None:
+    with _dispatcher_lock:
+        _pending.discard(future)
+
+
+def _get_dispatcher_loop() -> asyncio.AbstractEventLoop:
+    global _dispatcher_loop
+    with _dispatcher_lock:
+        if _dispatcher_loop is None:
+            _dispatcher_loop = asyncio.new_event_loop()
+            threading.Thread(target=_dispatcher_loop.run_forever, name="callback-dispatcher", daemon=True).start()
+    return _dispatcher_loop
+
+
+async def _deliver(url: str, payload: Dict[str, Any], key: Optional[str]) -> None:
+    try:
+        await _post_with_retries(url, payload)
+    finally:
+        # Only removed after the delivery, so the callback stays registered if the process dies while it is in flight
+        if key is not None:
+            await asyncio.get_running_loop().run_in_executor(None, redis.hdel_sync, CALLBACK_REDIS_KEY, key)
+
+
+async def _post_with_retries(url: str, payload: Dict[str, Any]) -> None:
+    global _session
+    global _semaphore
+    # These are lazily created here so they are bound to the dispatcher's event loop
+    if _session is None:
+        _session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=CALLBACK_CONCURRENCY))
+        _semaphore = asyncio.Semaphore(CALLBACK_CONCURRENCY)
+    async with _semaphore:  # type: ignore
+        for attempt in range(CALLBACK_RETRIES + 1):
+            try:
+                _log.debug(f"POST -> {url}")
+                async with _session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=CALLBACK_TIMEOUT)) as r:
+                    _log.debug(f"POST <- {r.status}:{url}")
+                    # Only server errors are worth retrying
+                    if r.status < 500:
+                        return
+            except Exception:
+                _log.exception("POST <- ERROR")
+            if attempt < CALLBACK_RETRIES:
+                await asyncio.sleep(2**attempt)
+        _log.warning(f"Callback to {url} failed after {CALLBACK_RETRIES + 1} attempts. No-op")
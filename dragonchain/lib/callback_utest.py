@@ -15,11 +15,13 @@
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
 
+import asyncio
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from dragonchain import test_env  # noqa: F401
-from dragonchain.lib.callback import register_callback, fire_if_exists
+from dragonchain.lib import callback
+from dragonchain.lib.callback import register_callback
 
 fake_redis = MagicMock()
 fake_session = MagicMock()
@@ -31,33 +33,98 @@ class TestCallback(unittest.TestCase):
         register_callback("banana", "NotNone")
         mock_hset.assert_called_once_with("dc:tx:callback", "banana", "NotNone")
 
-    @patch("dragonchain.lib.callback.redis.hget_sync", return_value=None)
+    @patch("dragonchain.lib.callback.redis.hmget_sync", return_value=["url1", None])
     @patch("dragonchain.lib.callback.redis.hdel_sync")
-    def test_fire_if_exists_no_op_when_no_trigger_exists(self, mock_hdel, mock_hget):
-        fake_txn_model = MagicMock()
-        fire_if_exists("fakeTxnId", fake_txn_model)
+    @patch("dragonchain.lib.callback.dispatch")
+    def test_fire_many_uses_one_lookup_and_dispatches_existing(self, mock_dispatch, mock_hdel, mock_hmget):
+        txn_1 = MagicMock()
+        txn_2 = MagicMock()
+        callback.fire_many([("txn1", txn_1), ("txn2", txn_2)])
+        mock_hmget.assert_called_once_with("dc:tx:callback", "txn1", "txn2")
+        mock_dispatch.assert_called_once_with("url1", txn_1.export_as_full(), "txn1")
+        # Removed by the dispatcher once delivered, not before
         mock_hdel.assert_not_called()
 
-    @patch("dragonchain.lib.callback.redis.hget_sync", return_value="ExistingTriggerUrl")
+    @patch("dragonchain.lib.callback.redis.hmget_sync", return_value=[None])
     @patch("dragonchain.lib.callback.redis.hdel_sync")
-    @patch("requests.Session", return_value=fake_session)
-    def test_fire_if_exists_when_trigger_exists(self, whatev, mock_hget, mock_hdel):
-        fake_txn_model = MagicMock()
-        fire_if_exists("fakeTxnId", fake_txn_model)
-        fake_session.__enter__().post.assert_called_with("ExistingTriggerUrl", json=fake_txn_model.export_as_full(), timeout=10)
+    @patch("dragonchain.lib.callback.dispatch")
+    def test_fire_many_no_op_when_no_trigger_exists(self, mock_dispatch, mock_hdel, mock_hmget):
+        callback.fire_many([("txn1", MagicMock())])
+        mock_dispatch.assert_not_called()
+        mock_hdel.assert_not_called()
+
+    @patch("dragonchain.lib.callback.redis.hmget_sync")
+    def test_fire_many_no_op_when_empty(self, mock_hmget):
+        callback.fire_many([])
+        mock_hmget.assert_not_called()
+
+
+class TestCallbackDispatcher(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        callback._session = None
+        callback._semaphore = None
+
+    def set_responses(self, *responses):
+        contexts = []
+        for response in responses:
+            context = MagicMock()
+            if isinstance(response, Exception):
+                context.__aenter__ = AsyncMock(side_effect=response)
+            else:
+                context.__aenter__ = AsyncMock(return_value=MagicMock(status=response))
+            contexts.append(context)
+        callback._session = MagicMock(post=MagicMock(side_effect=contexts))
+        callback._semaphore = asyncio.Semaphore(1)
+
+    @patch("dragonchain.lib.callback.asyncio.sleep")
+    async def test_post_with_retries_succeeds_first_time(self, mock_sleep):
+        self.set_responses(200)
+        await callback._post_with_retries("url", {"da": "ta"})
+        callback._session.post.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("dragonchain.lib.callback.CALLBACK_RETRIES", 2)
+    @patch("dragonchain.lib.callback.asyncio.sleep")
+    async def test_post_with_retries_retries_server_errors_and_exceptions(self, mock_sleep):
+        self.set_responses(500, Exception("boom"), 201)
+        await callback._post_with_retries("url", {"da": "ta"})
+        self.assertEqual(callback._session.post.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("dragonchain.lib.callback.CALLBACK_RETRIES", 1)
+    @patch("dragonchain.lib.callback.asyncio.sleep")
+    async def test_post_with_retries_gives_up(self, mock_sleep):
+        self.set_responses(503, 503)
+        await callback._post_with_retries("url", {"da": "ta"})
+        self.assertEqual(callback._session.post.call_count, 2)
+        mock_sleep.assert_called_once_with(1)
+
+    @patch("dragonchain.lib.callback.redis.hdel_sync")
+    @patch("dragonchain.lib.callback._post_with_retries")
+    async def test_deliver_removes_callback_after_posting(self, mock_post, mock_hdel):
+        mock_post.side_effect = lambda *args: mock_hdel.assert_not_called()
+        await callback._deliver("url", {"da": "ta"}, "txn1")
+        mock_post.assert_awaited_once_with("url", {"da": "ta"})
+        mock_hdel.assert_called_once_with("dc:tx:callback", "txn1")
 
-    @patch("dragonchain.lib.callback.redis.hget_sync", return_value="ExistingTriggerUrl")
     @patch("dragonchain.lib.callback.redis.hdel_sync")
-    @patch("requests.Session", side_effect=Exception)
-    def test_fire_if_exists_when_exception_is_thrown(self, whatev, mock_hget, mock_hdel):
-        fake_txn_model = MagicMock()
-        fire_if_exists("fakeTxnId", fake_txn_model)
-        fake_session.post.assert_not_called()
+    @patch("dragonchain.lib.callback._post_with_retries", side_effect=RuntimeError)
+    async def test_deliver_removes_callback_when_post_raises(self, mock_post, mock_hdel):
+        with self.assertRaises(RuntimeError):
+            await callback._deliver("url", {"da": "ta"}, "txn1")
+        mock_hdel.assert_called_once_with("dc:tx:callback", "txn1")
 
     @patch("dragonchain.lib.callback.redis.hdel_sync")
-    @patch("dragonchain.lib.callback.redis.hget_sync", return_value="ExistingTriggerUrl")
-    @patch("requests.Session", side_effect=Exception)
-    def test_fire_if_exists_calls_hdel_no_matter_what(self, whatev, mock_get, mock_hdel):
-        fake_txn_model = MagicMock()
-        fire_if_exists("fakeTxnId", fake_txn_model)
-        mock_hdel.assert_called_with("dc:tx:callback", "fakeTxnId")
+    @patch("dragonchain.lib.callback._post_with_retries")
+    async def test_drain_waits_for_dispatched_callbacks(self, mock_post, mock_hdel):
+        delivered = []
+
+        async def slow_post(url, payload):
+            await asyncio.sleep(0.05)
+            delivered.append(url)
+
+        mock_post.side_effect = slow_post
+        callback.dispatch("url", {"da": "ta"}, "txn1")
+        callback.drain(timeout=5)
+        self.assertEqual(delivered, ["url"])
+        mock_hdel.assert_called_once_with("dc:tx:callback", "txn1")
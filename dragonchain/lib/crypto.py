@@ -19,7 +19,8 @@ import hmac
 import hashlib
 import base64
 import enum
-from typing import Tuple, Callable, Any, TYPE_CHECKING, Union
+import itertools
+from typing import Tuple, Callable, Any, TYPE_CHECKING, Union, Optional, cast
 
 import base58
 
@@ -200,6 +201,75 @@ def hash_stripped_transaction(hash_type: SupportedHashes, full_hash_bytes: bytes
     return stripped_hash.digest()
 
 
+def get_l1_block_pow_parts(block: "l1_block_model.L1BlockModel") -> Tuple[bytes, bytes]:
+    """Get the bytes which are hashed before and after the nonce of an l1 block
+    Args:
+        block: L1BlockModel with appropriate data to hash
+    Returns:
+        Tuple where index 0 is the bytes hashed before the nonce, and index 1 is the bytes hashed after the nonce
+    """
+    prefix = [block.__dict__[curr].encode("utf-8") for curr in l1_block_hash_order]
+    prefix.extend(tx.encode("utf-8") for tx in block.stripped_transactions)
+    return (b"".join(prefix), b"")
+
+
+def get_l2_block_pow_parts(block: "l2_block_model.L2BlockModel") -> Tuple[bytes, bytes]:
+    """Get the bytes which are hashed before and after the nonce of an l2 block
+    Args:
+        block: L2BlockModel with appropriate data to hash
+    Returns:
+        Tuple where index 0 is the bytes hashed before the nonce, and index 1 is the bytes hashed after the nonce
+    """
+    prefix = [block.__dict__[curr].encode("utf-8") for curr in l2_block_hash_order]
+    prefix.append(block.validations_str.encode("utf-8"))
+    return (b"".join(prefix), b"")
+
+
+def get_l3_block_pow_parts(block: "l3_block_model.L3BlockModel") -> Tuple[bytes, bytes]:
+    """Get the bytes which are hashed before and after the nonce of an l3 block
+    Args:
+        block: L3BlockModel with appropriate data to hash
+    Returns:
+        Tuple where index 0 is the bytes hashed before the nonce, and index 1 is the bytes hashed after the nonce
+    """
+    prefix = [block.__dict__[curr].encode("utf-8") for curr in l3_block_hash_order]
+    prefix.extend(region.encode("utf-8") for region in block.regions)
+    prefix.extend(cloud.encode("utf-8") for cloud in block.clouds)
+    # Unlike other levels, l2 proofs are hashed after the nonce
+    suffix = []
+    if block.l2_proofs is not None:
+        for proof in block.l2_proofs:
+            suffix.append(proof["dc_id"].encode("utf-8"))
+            suffix.append(proof["block_id"].encode("utf-8"))
+            suffix.append(proof["proof"].encode("utf-8"))
+    return (b"".join(prefix), b"".join(suffix))
+
+
+def get_l4_block_pow_parts(block: "l4_block_model.L4BlockModel") -> Tuple[bytes, bytes]:
+    """Get the bytes which are hashed before and after the nonce of an l4 block
+    Args:
+        block: L4BlockModel with appropriate data to hash
+    Returns:
+        Tuple where index 0 is the bytes hashed before the nonce, and index 1 is the bytes hashed after the nonce
+    """
+    prefix = [block.__dict__[curr].encode("utf-8") for curr in l4_block_hash_order]
+    for validation in block.validations:
+        for curr in l4_block_validation_hash_order:
+            prefix.append(validation[curr].encode("utf-8"))
+        # For hashing purposes, treat True as a 1 byte, and treat False as a 0 byte
+        prefix.append(b"\x01" if validation["valid"] else b"\x00")
+    return (b"".join(prefix), b"")
+
+
+def _hash_pow_parts(hash_type: SupportedHashes, parts: Tuple[bytes, bytes], nonce: int) -> bytes:
+    proof_hash = get_hash_obj(hash_type)
+    proof_hash.update(parts[0])
+    if nonce:
+        proof_hash.update(int_to_unsigned_bytes(nonce))
+    proof_hash.update(parts[1])
+    return proof_hash.digest()
+
+
 def hash_l1_block(hash_type: SupportedHashes, block: "l1_block_model.L1BlockModel", nonce: int = 0) -> bytes:
     """Hash an l1 block
     Args:
@@ -209,16 +279,7 @@ def hash_l1_block(hash_type: SupportedHashes, block: "l1_block_model.L1BlockMode
     Returns:
         Bytes for the hash of the block
     """
-    # Get hash object
-    proof_hash = get_hash_obj(hash_type)
-    # Create hash for message signing
-    for curr in l1_block_hash_order:
-        proof_hash.update(block.__dict__[curr].encode("utf-8"))
-    for tx in block.stripped_transactions:
-        proof_hash.update(tx.encode("utf-8"))
-    if nonce:
-        proof_hash.update(int_to_unsigned_bytes(nonce))
-    return proof_hash.digest()
+    return _hash_pow_parts(hash_type, get_l1_block_pow_parts(block), nonce)
 
 
 def hash_l2_block(hash_type: SupportedHashes, block: "l2_block_model.L2BlockModel", nonce: int = 0) -> bytes:
@@ -230,15 +291,7 @@ def hash_l2_block(hash_type: SupportedHashes, block: "l2_block_model.L2BlockMode
     Returns:
         Bytes for the hash of the block
     """
-    # Get hash object
-    proof_hash = get_hash_obj(hash_type)
-    # Create hash for message signing
-    for curr in l2_block_hash_order:
-        proof_hash.update(block.__dict__[curr].encode("utf-8"))
-    proof_hash.update(block.validations_str.encode("utf-8"))
-    if nonce:
-        proof_hash.update(int_to_unsigned_bytes(nonce))
-    return proof_hash.digest()
+    return _hash_pow_parts(hash_type, get_l2_block_pow_parts(block), nonce)
 
 
 def hash_l3_block(hash_type: SupportedHashes, block: "l3_block_model.L3BlockModel", nonce: int = 0) -> bytes:
@@ -250,23 +303,7 @@ def hash_l3_block(hash_type: SupportedHashes, block: "l3_block_model.L3BlockMode
     Returns:
         Bytes for the hash of the block
     """
-    # Get hash object
-    proof_hash = get_hash_obj(hash_type)
-    # Create hash for message signing
-    for curr in l3_block_hash_order:
-        proof_hash.update(block.__dict__[curr].encode("utf-8"))
-    for region in block.regions:
-        proof_hash.update(region.encode("utf-8"))
-    for cloud in block.clouds:
-        proof_hash.update(cloud.encode("utf-8"))
-    if nonce:
-        proof_hash.update(int_to_unsigned_bytes(nonce))
-    if block.l2_proofs is not None:
-        for proof in block.l2_proofs:
-            proof_hash.update(proof["dc_id"].encode("utf-8"))
-            proof_hash.update(proof["block_id"].encode("utf-8"))
-            proof_hash.update(proof["proof"].encode("utf-8"))
-    return proof_hash.digest()
+    return _hash_pow_parts(hash_type, get_l3_block_pow_parts(block), nonce)
 
 
 def hash_l4_block(hash_type: SupportedHashes, block: "l4_block_model.L4BlockModel", nonce: int = 0) -> bytes:
@@ -278,22 +315,7 @@ def hash_l4_block(hash_type: SupportedHashes, block: "l4_block_model.L4BlockMode
     Returns:
         Bytes for the hash of the block
     """
-    # Get hash object
-    proof_hash = get_hash_obj(hash_type)
-    # Create hash for message signing
-    for curr in l4_block_hash_order:
-        proof_hash.update(block.__dict__[curr].encode("utf-8"))
-    for validation in block.validations:
-        for curr in l4_block_validation_hash_order:
-            proof_hash.update(validation[curr].encode("utf-8"))
-        # For hashing purposes, treat True as a 1 byte, and treat False as a 0 byte
-        if validation["valid"]:
-            proof_hash.update(b"\x01")
-        else:
-            proof_hash.update(b"\x00")
-    if nonce:
-        proof_hash.update(int_to_unsigned_bytes(nonce))
-    return proof_hash.digest()
+    return _hash_pow_parts(hash_type, get_l4_block_pow_parts(block), nonce)
 
 
 def hash_l5_block(hash_type: SupportedHashes, block: "l5_block_model.L5BlockModel", nonce: int = 0) -> bytes:
@@ -407,24 +429,44 @@ def verify_signature(encryption_type: SupportedEncryption, pub_key: Union["Publi
         raise NotImplementedError("Unsupported encryption type")
 
 
-def pow_item(hash_type: SupportedHashes, item: Any, hash_method: Callable, complexity: int) -> Tuple[str, int]:
-    """Perform a PoW operation on an item, given a hash_method to match complexity
+def search_nonce(
+    hash_type: SupportedHashes, prefix: bytes, suffix: bytes, complexity: int, start: int = 1, stop: Optional[int] = None
+) -> Optional[Tuple[bytes, int]]:
+    """Search a range of nonces for a hash which matches complexity
+    The prefix is only hashed once, and its hash state is copied for each attempt
     Args:
-        hash_type: SupportedHashes enum type (passed as the first parameter into hash_method)
-        item: item to do PoW with (passed as the second parameter into hash_method)
-        hash_method: python function which takes hash_type, item, nonce
+        hash_type: SupportedHashes enum type
+        prefix: bytes hashed before the nonce (from get_l*_block_pow_parts)
+        suffix: bytes hashed after the nonce (from get_l*_block_pow_parts)
         complexity: number of bits of complexity required
+        start: first nonce to try (must be positive)
+        stop: nonce to stop before. If None, search until a match is found
     Returns:
-        Tuple where index 0 is a Base64 encoded string of the generated hash and index 1 is the nonce
+        Tuple of the matching hash bytes and its nonce, or None if no nonce in the range matched
     """
-    nonce = 1
-    # Because python doesn't have do-while, we have to break out of a while True loop
-    block_hash = None
-    while True:
-        block_hash = hash_method(hash_type, item, nonce)
+    prefix_hash = get_hash_obj(hash_type)
+    prefix_hash.update(prefix)
+    for nonce in itertools.count(start) if stop is None else range(start, stop):
+        proof_hash = prefix_hash.copy()
+        proof_hash.update(int_to_unsigned_bytes(nonce))
+        if suffix:
+            proof_hash.update(suffix)
+        block_hash = proof_hash.digest()
         if check_complexity(block_hash, complexity):
-            break
-        nonce += 1
+            return (block_hash, nonce)
+    return None
+
+
+def pow_parts(hash_type: SupportedHashes, parts: Tuple[bytes, bytes], complexity: int) -> Tuple[str, int]:
+    """Perform a PoW operation in this process, given the bytes hashed before and after the nonce
+    Args:
+        hash_type: SupportedHashes enum type
+        parts: Tuple of bytes hashed before and after the nonce (from get_l*_block_pow_parts)
+        complexity: number of bits of complexity required
+    Returns:
+        Tuple where index 0 is a Base64 encoded string of the generated hash and index 1 is the nonce
+    """
+    block_hash, nonce = cast(Tuple[bytes, int], search_nonce(hash_type, parts[0], parts[1], complexity))
     return (base64.b64encode(block_hash).decode("ascii"), nonce)
 
 
@@ -531,7 +573,7 @@ def pow_l1_block(hash_type: SupportedHashes, block: "l1_block_model.L1BlockModel
     Returns:
         Tuple where index 0 is a Base64 encoded string of the generated hash and index 1 is the nonce
     """
-    return pow_item(hash_type, block, hash_l1_block, complexity)
+    return pow_parts(hash_type, get_l1_block_pow_parts(block), complexity)
 
 
 def sign_l1_block(
@@ -561,7 +603,7 @@ def pow_l2_block(hash_type: SupportedHashes, block: "l2_block_model.L2BlockModel
     Returns:
         Tuple where index 0 is a Base64 encoded string of the generated hash and index 1 is the nonce
     """
-    return pow_item(hash_type, block, hash_l2_block, complexity)
+    return pow_parts(hash_type, get_l2_block_pow_parts(block), complexity)
 
 
 def sign_l2_block(
@@ -591,7 +633,7 @@ def pow_l3_block(hash_type: SupportedHashes, block: "l3_block_model.L3BlockModel
     Returns:
         Tuple where index 0 is a Base64 encoded string of the generated hash and index 1 is the nonce
     """
-    return pow_item(hash_type, block, hash_l3_block, complexity)
+    return pow_parts(hash_type, get_l3_block_pow_parts(block), complexity)
 
 
 def sign_l3_block(
@@ -621,7 +663,7 @@ def pow_l4_block(hash_type: SupportedHashes, block: "l4_block_model.L4BlockModel
     Returns:
         Tuple where index 0 is a Base64 encoded string of the generated hash and index 1 is the nonce
     """
-    return pow_item(hash_type, block, hash_l4_block, complexity)
+    return pow_parts(hash_type, get_l4_block_pow_parts(block), complexity)
 
 
 def sign_l4_block(
@@ -0,0 +1,171 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+
+import os
+import base64
+import threading
+import multiprocessing
+import multiprocessing.pool
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dragonchain.lib import crypto
+from dragonchain.lib import keys
+from dragonchain.lib import ttl_cache
+from dragonchain.lib.dto import transaction_model
+from dragonchain import logger
+
+# Number of worker processes to use for transaction signing. 0 (default) disables the pool and signs serially in-process
+CRYPTO_POOL_PROCESSES = int(os.environ.get("CRYPTO_POOL_PROCESSES") or "0")
+# Number of transactions handed to a worker process at a time
+CRYPTO_POOL_CHUNK_SIZE = int(os.environ.get("CRYPTO_POOL_CHUNK_SIZE") or "250")
+
+_log = logger.get_logger()
+
+_pool: Optional[multiprocessing.pool.Pool] = None
+# Work can be handed to the pool from several threads at once, so only one of them may create it
+_pool_lock = threading.Lock()
+# (public key string, hash type, encryption type) -> DCKeys, for each worker process. Bounded, as workers live as long as the pool does
+_worker_verifying_keys = ttl_cache.TTLCache(ttl=keys.VERIFYING_KEYS_CACHE_TTL, maxsize=1024)
+
+
+def enabled() -> bool:
+    """Whether or not the crypto process pool is configured for use
+    Returns:
+        True if crypto work should be distributed to the process pool
+    """
+    return CRYPTO_POOL_PROCESSES > 0
+
+
+def _initialize_worker() -> None:
+    """Warm the memoized chain keys once per worker process so they aren't re-derived per chunk"""
+    keys.get_my_keys()
+
+
+def _get_pool() -> multiprocessing.pool.Pool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _log.info(f"Starting crypto pool with {CRYPTO_POOL_PROCESSES} processes")
+                _pool = multiprocessing.Pool(processes=CRYPTO_POOL_PROCESSES, initializer=_initialize_worker)
+    return _pool
+
+
+def start() -> None:
+    """Start the process pool (if enabled) before the processor starts any threads,
+    so the worker processes aren't forked from a multithreaded process
+    """
+    if enabled():
+        _get_pool()
+
+
+def _chunk(items: list, chunk_size: int) -> List[list]:
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def imap(func: Callable[[Any], Any], items: Iterable[Any], chunk_size: int = CRYPTO_POOL_CHUNK_SIZE) -> Iterator[Any]:
+    """Lazily map a (module level, picklable) function over items across the process pool
+    Args:
+        func: function to call in a worker process for each item
+        items: items to call the function with
+        chunk_size: number of items to send to a worker process at a time
+    Returns:
+        Iterator of results in the same order as items
+    """
+    return _get_pool().imap(func, items, chunksize=max(chunk_size, 1))
+
+
+def _sign_messages(messages: List[bytes]) -> List[str]:
+    """Sign a chunk of 32 byte messages with this chain's private key (runs in a worker process)
+    Args:
+        messages: list of stripped transaction hashes to sign
+    Returns:
+        list of base64 encoded signatures in the same order as messages
+    """
+    my_keys = keys.get_my_keys()
+    return [crypto.encrypt_message(my_keys.encryption, my_keys.priv, message) for message in messages]
+
+
+def sign_transactions(transactions: List["transaction_model.TransactionModel"], block_id: str, chunk_size: int = CRYPTO_POOL_CHUNK_SIZE) -> None:
+    """Sign transaction models for a given block, distributing the signatures across the process pool
+    Hashing happens in this process so that only the 32 byte signature messages (not payloads) are sent to workers.
+    Results are identical to signing each transaction serially with keys.DCKeys.sign_transaction
+    Args:
+        transactions: list of TransactionModels to sign (modified in place)
+        block_id: block id to give to these transactions before signing
+        chunk_size: number of transactions to send to a worker process at a time
+    """
+    my_keys = keys.get_my_keys()
+    full_hashes = []
+    messages = []
+    for transaction in transactions:
+        transaction.block_id = block_id
+        full_hash_bytes = crypto.hash_full_transaction(my_keys.hash, transaction)
+        full_hashes.append(base64.b64encode(full_hash_bytes).decode("ascii"))
+        messages.append(crypto.hash_stripped_transaction(my_keys.hash, full_hash_bytes, transaction))
+
+    # Pool.map preserves the order of the chunks, so signatures line up with their transactions
+    signatures: List[str] = []
+    for signed_chunk in _get_pool().map(_sign_messages, _chunk(messages, max(chunk_size, 1))):
+        signatures.extend(signed_chunk)
+
+    for transaction, full_hash, signature in zip(transactions, full_hashes, signatures):
+        transaction.full_hash = full_hash
+        transaction.signature = signature
+
+
+def _verify_stripped_chunk(key_info: Tuple[str, str, str], stripped_transactions: List[str]) -> List[Tuple[str, bool]]:
+    """Verify a chunk of stripped transaction strings (runs in a worker process)
+    Args:
+        key_info: tuple of (public key string, hash type, encryption type) of the chain that signed the transactions
+        stripped_transactions: list of stripped transaction json strings from an L1 block
+    Returns:
+        list of (txn_id, valid) for every transaction that could be parsed
+    """
+    verify_keys = _worker_verifying_keys.get(key_info)
+    if verify_keys is None:
+        verify_keys = keys.DCKeys(pull_keys=False).initialize(level=1, public_key_string=key_info[0], hash_type=key_info[1], encryption=key_info[2])
+        _worker_verifying_keys.set(key_info, verify_keys)
+    results = []
+    for txn in stripped_transactions:
+        try:
+            txn_model = transaction_model.new_from_stripped_block_input(txn)
+            results.append((txn_model.txn_id, verify_keys.verify_stripped_transaction(txn_model)))
+        except Exception:
+            _log.exception(f"Couldn't parse/verify txn: {txn}")
+    return results
+
+
+def verify_stripped_transactions(
+    dc_id: str, verify_keys: keys.DCKeys, stripped_transactions: List[str], chunk_size: int = CRYPTO_POOL_CHUNK_SIZE
+) -> Dict[str, bool]:
+    """Verify the stripped transactions of an L1 block, distributing contiguous chunks across the process pool
+    Results are identical to verifying each transaction serially with keys.DCKeys.verify_stripped_transaction
+    Args:
+        dc_id: public id of the chain which signed these transactions
+        verify_keys: DCKeys of the chain which signed these transactions
+        stripped_transactions: list of stripped transaction json strings from the L1 block
+        chunk_size: number of transactions to send to a worker process at a time
+    Returns:
+        Dictionary of txn_id to whether or not its signature is valid (transactions which couldn't be parsed are omitted)
+    """
+    key_info = (dc_id, verify_keys.hash.name, verify_keys.encryption.name)
+    txn_map: Dict[str, bool] = {}
+    chunks = [(key_info, chunk) for chunk in _chunk(stripped_transactions, max(chunk_size, 1))]
+    for verified_chunk in _get_pool().starmap(_verify_stripped_chunk, chunks):
+        txn_map.update(verified_chunk)
+    return txn_map
@@ -0,0 +1,151 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+
+import json
+import time
+import itertools
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+import base58
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain.lib import crypto_pool
+from dragonchain.lib import keys
+from dragonchain.lib.dto import transaction_model
+
+# Don't change this private key or tests will break
+test_keys = keys.DCKeys(pull_keys=False).initialize(private_key_string="9oerV8bGxL+PyujfNEu2UJB1CjkjZ+XNcR7G0RMfSIc=")
+
+
+def make_txns(count):
+    return [
+        transaction_model.TransactionModel(
+            dc_id="something", txn_id=f"txn{i}", txn_type="a type", tag="tags", timestamp="123", payload=f"payload {i}"
+        )
+        for i in range(count)
+    ]
+
+
+class TestCryptoPool(unittest.TestCase):
+    def test_chunk_splits_in_order(self):
+        self.assertEqual(crypto_pool._chunk([1, 2, 3, 4, 5], 2), [[1, 2], [3, 4], [5]])
+
+    @patch("dragonchain.lib.crypto_pool.CRYPTO_POOL_PROCESSES", 0)
+    def test_enabled_false_without_processes(self):
+        self.assertFalse(crypto_pool.enabled())
+
+    @patch("dragonchain.lib.crypto_pool.CRYPTO_POOL_PROCESSES", 4)
+    def test_enabled_true_with_processes(self):
+        self.assertTrue(crypto_pool.enabled())
+
+    @patch("dragonchain.lib.crypto_pool._pool", None)
+    @patch("dragonchain.lib.crypto_pool.CRYPTO_POOL_PROCESSES", 2)
+    @patch("dragonchain.lib.crypto_pool.multiprocessing.Pool")
+    def test_start_creates_pool_when_enabled(self, mock_pool):
+        crypto_pool.start()
+        mock_pool.assert_called_once_with(processes=2, initializer=crypto_pool._initialize_worker)
+
+    @patch("dragonchain.lib.crypto_pool._pool", None)
+    @patch("dragonchain.lib.crypto_pool.CRYPTO_POOL_PROCESSES", 0)
+    @patch("dragonchain.lib.crypto_pool.multiprocessing.Pool")
+    def test_start_doesnt_create_pool_when_disabled(self, mock_pool):
+        crypto_pool.start()
+        mock_pool.assert_not_called()
+
+    @patch("dragonchain.lib.crypto_pool._pool", None)
+    @patch("dragonchain.lib.crypto_pool.multiprocessing.Pool")
+    def test_get_pool_creates_one_pool_for_concurrent_callers(self, mock_pool):
+        def slow_pool(**kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+
+        mock_pool.side_effect = slow_pool
+        threads = [threading.Thread(target=crypto_pool._get_pool) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        mock_pool.assert_called_once()
+
+    @patch("dragonchain.lib.crypto_pool.keys.get_my_keys", return_value=test_keys)
+    @patch("dragonchain.lib.crypto_pool._get_pool", return_value=MagicMock(map=lambda func, chunks: map(func, chunks)))
+    def test_sign_transactions_matches_serial_signing(self, mock_get_pool, mock_get_keys):
+        pooled_txns = make_txns(7)
+        serial_txns = make_txns(7)
+        crypto_pool.sign_transactions(pooled_txns, "1234", chunk_size=3)
+        for txn in serial_txns:
+            txn.block_id = "1234"
+            txn.full_hash, txn.signature = test_keys.sign_transaction(txn)
+        for pooled, serial in zip(pooled_txns, serial_txns):
+            self.assertEqual(pooled.block_id, "1234")
+            self.assertEqual(pooled.full_hash, serial.full_hash)
+            self.assertEqual(pooled.signature, serial.signature)
+
+    @patch("dragonchain.lib.crypto_pool.keys.get_my_keys", return_value=test_keys)
+    @patch("dragonchain.lib.crypto_pool._get_pool")
+    def test_sign_transactions_sends_chunks_of_messages(self, mock_get_pool, mock_get_keys):
+        mock_get_pool.return_value.map.return_value = [["a", "b"], ["c"]]
+        crypto_pool.sign_transactions(make_txns(3), "1234", chunk_size=2)
+        func, chunks = mock_get_pool.return_value.map.call_args[0]
+        self.assertEqual(func, crypto_pool._sign_messages)
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+
+    @patch("dragonchain.lib.crypto_pool._get_pool", return_value=MagicMock(starmap=itertools.starmap))
+    def test_verify_stripped_transactions_matches_serial_verification(self, mock_get_pool):
+        txns = make_txns(5)
+        for txn in txns:
+            txn.block_id = "1234"
+            txn.full_hash, txn.signature = test_keys.sign_transaction(txn)
+        txns[3].signature = txns[2].signature
+        stripped = [json.dumps(txn.export_as_stripped(), separators=(",", ":")) for txn in txns] + ["not a transaction"]
+        dc_id = base58.b58encode(test_keys.pub.serialize()).decode("ascii")
+        verify_keys = keys.DCKeys(pull_keys=False).initialize(public_key_string=dc_id)
+        serial_map = {}
+        for txn in stripped[:-1]:
+            txn_model = transaction_model.new_from_stripped_block_input(txn)
+            serial_map[txn_model.txn_id] = verify_keys.verify_stripped_transaction(txn_model)
+        self.assertEqual(crypto_pool.verify_stripped_transactions(dc_id, verify_keys, stripped, chunk_size=2), serial_map)
+        self.assertFalse(serial_map["txn3"])
+        self.assertTrue(serial_map["txn4"])
+
+    @patch("dragonchain.lib.crypto_pool._get_pool")
+    def test_verify_stripped_transactions_sends_key_info_with_each_chunk(self, mock_get_pool):
+        mock_get_pool.return_value.starmap.return_value = [[("a", True), ("b", False)], [("c", True)]]
+        self.assertEqual(
+            crypto_pool.verify_stripped_transactions("dcid", test_keys, ["1", "2", "3"], chunk_size=2), {"a": True, "b": False, "c": True}
+        )
+        func, args = mock_get_pool.return_value.starmap.call_args[0]
+        self.assertEqual(func, crypto_pool._verify_stripped_chunk)
+        self.assertEqual(args, [(("dcid", "blake2b", "secp256k1"), ["1", "2"]), (("dcid", "blake2b", "secp256k1"), ["3"])])
+
+    @patch("dragonchain.lib.crypto_pool._worker_verifying_keys", crypto_pool.ttl_cache.TTLCache(ttl=60, maxsize=1))
+    @patch("dragonchain.lib.crypto_pool.keys.DCKeys")
+    def test_verify_stripped_chunk_caches_keys_within_bounds(self, mock_dckeys):
+        crypto_pool._verify_stripped_chunk(("dcid1", "blake2b", "secp256k1"), [])
+        crypto_pool._verify_stripped_chunk(("dcid1", "blake2b", "secp256k1"), [])
+        self.assertEqual(mock_dckeys.call_count, 1)
+        crypto_pool._verify_stripped_chunk(("dcid2", "blake2b", "secp256k1"), [])
+        self.assertIsNone(crypto_pool._worker_verifying_keys.get(("dcid1", "blake2b", "secp256k1")))
+        self.assertEqual(mock_dckeys.call_count, 2)
+
+    @patch("dragonchain.lib.crypto_pool._get_pool")
+    def test_imap_maps_in_order_over_pool(self, mock_get_pool):
+        mock_get_pool.return_value.imap.return_value = iter([2, 4])
+        self.assertEqual(list(crypto_pool.imap(abs, [-2, -4], chunk_size=0)), [2, 4])
+        mock_get_pool.return_value.imap.assert_called_once_with(abs, [-2, -4], chunksize=1)
@@ -15,7 +15,10 @@
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
 
-from typing import List, Dict, Any, TYPE_CHECKING
+import os
+import threading
+import concurrent.futures
+from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
 from dragonchain.lib.dto import l1_block_model
 from dragonchain.lib.dto import l2_block_model
@@ -24,6 +27,7 @@ from dragonchain.lib.dto import l4_block_model
 from dragonchain.lib import dragonnet_config
 from dragonchain.lib.interfaces import storage
 from dragonchain.broadcast_processor import broadcast_functions
+from dragonchain.lib.database import redis
 from dragonchain.lib.database import redisearch
 from dragonchain import exceptions
 from dragonchain import logger
@@ -33,9 +37,18 @@ if TYPE_CHECKING:
 
 FOLDER = "BLOCK"
 LAST_CLOSED_KEY = "LAST_BLOCK_PROOF"
+CHAIN_TIP_KEY = "dc:chain:tip"
+# Where the chain tip (last block id and proof) is read from when creating blocks. With "redis", the tip is kept in a redis hash
+# and only written behind to storage, which saves two storage round trips per block
+CHAIN_TIP_STORE = (os.environ.get("CHAIN_TIP_STORE") or "storage").lower()
 
 _log = logger.get_logger()
 
+_tip_reconciled = False
+_tip_lock = threading.Lock()
+_unpersisted_tip: Optional[Dict[str, str]] = None
+_tip_writer: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
 
 def get_verifications_for_l1_block(block_id: str, level: int) -> List[Dict[str, Any]]:
     try:
@@ -81,15 +94,96 @@ def get_broadcast_dto(higher_level: int, block_id: str) -> Dict[str, Any]:
             raise exceptions.InvalidNodeLevel(f"Level {higher_level} is not valid for getting a broadcast DTO (Only allowed 2-5)")
 
 
+def _get_stored_last_block_proof() -> Dict[str, str]:
+    try:
+        return storage.get_json_from_object(f"{FOLDER}/{LAST_CLOSED_KEY}")
+    except exceptions.NotFound:
+        return {}
+
+
 def get_last_block_proof() -> Dict[str, str]:
     """Return the last closed block's ID and hash
     Returns:
         Result of last closed block lookup (empty dictionary if not found)
     """
+    if CHAIN_TIP_STORE != "redis":
+        return _get_stored_last_block_proof()
+    if not _tip_reconciled:
+        return reconcile_chain_tip()
+    return redis.hgetall_sync(CHAIN_TIP_KEY)
+
+
+def _get_latest_stored_block_ref() -> Optional[Dict[str, str]]:
+    """Find the newest block in the block search index which also exists in storage
+    Returns:
+        Dictionary with block_id and proof of the newest stored block, or None if the index has none (or can't be searched)
+    """
+    if not redisearch.ENABLED:
+        return None
     try:
-        return storage.get_json_from_object(f"{FOLDER}/{LAST_CLOSED_KEY}")
-    except exceptions.NotFound:
-        return {}
+        # The index is written just before a block is uploaded, so its newest entry may not have made it to storage
+        docs = redisearch.search(index=redisearch.Indexes.block.value, query_str="*", limit=10, sort_by="block_id", sort_asc=False).docs
+    except Exception:
+        _log.exception("Failed to search the block index for the newest block")
+        return None
+    for doc in docs:
+        if storage.does_object_exist(f"{FOLDER}/{doc.id}"):
+            block = storage.get_json_from_object(f"{FOLDER}/{doc.id}")
+            return {"block_id": doc.id, "proof": block["proof"]["proof"]}
+    return None
+
+
+def reconcile_chain_tip() -> Dict[str, str]:
+    """Reconcile the redis chain tip with storage (done once per process before the redis tip is used)
+    The newest of the redis tip, the storage tip and the newest block in the block search index is taken (L1 block ids are sparse,
+    so later blocks can only be found through the index), then advanced past any later consecutive blocks which already exist
+    in storage (uploaded before a crash, or whose tip was lost with redis) so that block ids are never reused
+    Returns:
+        The reconciled chain tip (empty dictionary if the chain has no blocks)
+    """
+    global _tip_reconciled
+    stored_tips = (redis.hgetall_sync(CHAIN_TIP_KEY), _get_stored_last_block_proof(), _get_latest_stored_block_ref())
+    candidates = [tip for tip in stored_tips if tip and tip.get("block_id")]
+    tip = max(candidates, key=lambda candidate: int(candidate["block_id"]), default={})
+    next_block_id = int(tip.get("block_id") or 0) + 1
+    while storage.does_object_exist(f"{FOLDER}/{next_block_id}"):
+        block = storage.get_json_from_object(f"{FOLDER}/{next_block_id}")
+        _log.warning(f"Block {next_block_id} exists past the recorded chain tip. Advancing chain tip")
+        tip = {"block_id": str(next_block_id), "proof": block["proof"]["proof"]}
+        next_block_id += 1
+    if tip:
+        redis.hset_mapping_sync(CHAIN_TIP_KEY, tip)
+    _tip_reconciled = True
+    return tip
+
+
+def set_chain_tip(last_block_ref: Dict[str, str]) -> None:
+    """Record a new chain tip in redis, and queue writing it behind to storage
+    Args:
+        last_block_ref: dictionary with block_id and proof of the newest block
+    """
+    global _unpersisted_tip, _tip_writer
+    redis.hset_mapping_sync(CHAIN_TIP_KEY, last_block_ref)
+    with _tip_lock:
+        _unpersisted_tip = last_block_ref
+        if _tip_writer is None:
+            _tip_writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="chain-tip")
+    _tip_writer.submit(_persist_chain_tip)
+
+
+def _persist_chain_tip() -> None:
+    """Write the newest unpersisted chain tip to storage (skipped if a previous call already wrote it)"""
+    global _unpersisted_tip
+    with _tip_lock:
+        tip = _unpersisted_tip
+        _unpersisted_tip = None
+    if tip is None:
+        return
+    try:
+        storage.put_object_as_json(f"{FOLDER}/{LAST_CLOSED_KEY}", tip)
+    except Exception:
+        # The redis tip is authoritative, and reconciliation scans storage for blocks past a stale stored tip
+        _log.exception("Failed to write chain tip to storage")
 
 
 def insert_block(block: "model.BlockModel") -> None:
@@ -104,7 +198,10 @@ def insert_block(block: "model.BlockModel") -> None:
     storage.put_object_as_json(f"{FOLDER}/{block.block_id}", block.export_as_at_rest())
 
     #  Upload ref
-    storage.put_object_as_json(f"{FOLDER}/{LAST_CLOSED_KEY}", last_block_ref)
+    if CHAIN_TIP_STORE == "redis":
+        set_chain_tip(last_block_ref)
+    else:
+        storage.put_object_as_json(f"{FOLDER}/{LAST_CLOSED_KEY}", last_block_ref)
 
 
 def insert_l5_verification(storage_location: str, block: "model.BlockModel") -> None:
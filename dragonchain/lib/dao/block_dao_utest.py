@@ -0,0 +1,117 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+
+import unittest
+from unittest.mock import patch, MagicMock
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain import exceptions
+from dragonchain.lib.dao import block_dao
+
+
+class TestBlockDAO(unittest.TestCase):
+    def setUp(self):
+        block_dao._tip_reconciled = False
+        block_dao._unpersisted_tip = None
+
+    @patch("dragonchain.lib.dao.block_dao.CHAIN_TIP_STORE", "storage")
+    @patch("dragonchain.lib.dao.block_dao.storage.get_json_from_object", return_value={"block_id": "5", "proof": "abc"})
+    def test_get_last_block_proof_reads_storage_by_default(self, mock_get_json):
+        self.assertEqual(block_dao.get_last_block_proof(), {"block_id": "5", "proof": "abc"})
+        mock_get_json.assert_called_once_with("BLOCK/LAST_BLOCK_PROOF")
+
+    @patch("dragonchain.lib.dao.block_dao.CHAIN_TIP_STORE", "storage")
+    @patch("dragonchain.lib.dao.block_dao.storage.get_json_from_object", side_effect=exceptions.NotFound)
+    def test_get_last_block_proof_returns_empty_when_not_found(self, mock_get_json):
+        self.assertEqual(block_dao.get_last_block_proof(), {})
+
+    @patch("dragonchain.lib.dao.block_dao.CHAIN_TIP_STORE", "redis")
+    @patch("dragonchain.lib.dao.block_dao.storage")
+    @patch("dragonchain.lib.dao.block_dao.redis")
+    def test_get_last_block_proof_reads_redis_after_reconciling(self, mock_redis, mock_storage):
+        block_dao._tip_reconciled = True
+        mock_redis.hgetall_sync.return_value = {"block_id": "5", "proof": "abc"}
+        self.assertEqual(block_dao.get_last_block_proof(), {"block_id": "5", "proof": "abc"})
+        mock_redis.hgetall_sync.assert_called_once_with(block_dao.CHAIN_TIP_KEY)
+        mock_storage.get_json_from_object.assert_not_called()
+
+    @patch("dragonchain.lib.dao.block_dao.redisearch.ENABLED", False)
+    @patch("dragonchain.lib.dao.block_dao.CHAIN_TIP_STORE", "redis")
+    @patch("dragonchain.lib.dao.block_dao.storage")
+    @patch("dragonchain.lib.dao.block_dao.redis")
+    def test_reconcile_chain_tip_takes_newest_tip_and_advances_past_existing_blocks(self, mock_redis, mock_storage):
+        mock_redis.hgetall_sync.return_value = {"block_id": "4", "proof": "old"}
+        mock_storage.get_json_from_object.side_effect = [{"block_id": "5", "proof": "stored"}, {"proof": {"scheme": "trust", "proof": "newest"}}]
+        mock_storage.does_object_exist.side_effect = [True, False]
+        self.assertEqual(block_dao.get_last_block_proof(), {"block_id": "6", "proof": "newest"})
+        mock_storage.does_object_exist.assert_any_call("BLOCK/6")
+        mock_storage.does_object_exist.assert_any_call("BLOCK/7")
+        mock_redis.hset_mapping_sync.assert_called_once_with(block_dao.CHAIN_TIP_KEY, {"block_id": "6", "proof": "newest"})
+        self.assertTrue(block_dao._tip_reconciled)
+
+    @patch("dragonchain.lib.dao.block_dao.redisearch.ENABLED", True)
+    @patch("dragonchain.lib.dao.block_dao.redisearch.search")
+    @patch("dragonchain.lib.dao.block_dao.storage")
+    @patch("dragonchain.lib.dao.block_dao.redis")
+    def test_reconcile_chain_tip_finds_sparse_block_ids_through_search_index(self, mock_redis, mock_storage, mock_search):
+        mock_redis.hgetall_sync.return_value = {"block_id": "1000", "proof": "old"}
+        mock_search.return_value = MagicMock(docs=[MagicMock(id="1060"), MagicMock(id="1030")])
+        mock_storage.get_json_from_object.side_effect = [{"block_id": "1000", "proof": "old"}, {"proof": {"scheme": "trust", "proof": "newest"}}]
+        mock_storage.does_object_exist.side_effect = [False, True, False]
+        self.assertEqual(block_dao.reconcile_chain_tip(), {"block_id": "1030", "proof": "newest"})
+        mock_search.assert_called_once_with(index="bk", query_str="*", limit=10, sort_by="block_id", sort_asc=False)
+        mock_storage.does_object_exist.assert_any_call("BLOCK/1060")
+        mock_storage.does_object_exist.assert_any_call("BLOCK/1031")
+        mock_redis.hset_mapping_sync.assert_called_once_with(block_dao.CHAIN_TIP_KEY, {"block_id": "1030", "proof": "newest"})
+
+    @patch("dragonchain.lib.dao.block_dao.redisearch.ENABLED", False)
+    @patch("dragonchain.lib.dao.block_dao.storage")
+    @patch("dragonchain.lib.dao.block_dao.redis")
+    def test_reconcile_chain_tip_returns_empty_for_empty_chain(self, mock_redis, mock_storage):
+        mock_redis.hgetall_sync.return_value = {}
+        mock_storage.get_json_from_object.side_effect = exceptions.NotFound
+        mock_storage.does_object_exist.return_value = False
+        self.assertEqual(block_dao.reconcile_chain_tip(), {})
+        mock_storage.does_object_exist.assert_called_once_with("BLOCK/1")
+        mock_redis.hset_mapping_sync.assert_not_called()
+
+    @patch("dragonchain.lib.dao.block_dao.redisearch.ENABLED", False)
+    @patch("dragonchain.lib.dao.block_dao.CHAIN_TIP_STORE", "redis")
+    @patch("dragonchain.lib.dao.block_dao._tip_writer")
+    @patch("dragonchain.lib.dao.block_dao.storage")
+    @patch("dragonchain.lib.dao.block_dao.redis")
+    def test_insert_block_sets_redis_tip_and_writes_behind(self, mock_redis, mock_storage, mock_tip_writer):
+        block_dao.insert_block(MagicMock(block_id="7", proof="proof"))
+        mock_storage.put_object_as_json.assert_called_once()
+        mock_redis.hset_mapping_sync.assert_called_once_with(block_dao.CHAIN_TIP_KEY, {"block_id": "7", "proof": "proof"})
+        mock_tip_writer.submit.assert_called_once_with(block_dao._persist_chain_tip)
+
+    @patch("dragonchain.lib.dao.block_dao.redisearch.ENABLED", False)
+    @patch("dragonchain.lib.dao.block_dao.CHAIN_TIP_STORE", "storage")
+    @patch("dragonchain.lib.dao.block_dao.storage")
+    @patch("dragonchain.lib.dao.block_dao.redis")
+    def test_insert_block_writes_tip_to_storage_by_default(self, mock_redis, mock_storage):
+        block_dao.insert_block(MagicMock(block_id="7", proof="proof"))
+        mock_storage.put_object_as_json.assert_called_with("BLOCK/LAST_BLOCK_PROOF", {"block_id": "7", "proof": "proof"})
+        mock_redis.hset_mapping_sync.assert_not_called()
+
+    @patch("dragonchain.lib.dao.block_dao.storage")
+    def test_persist_chain_tip_writes_newest_tip_once(self, mock_storage):
+        block_dao._unpersisted_tip = {"block_id": "8", "proof": "proof"}
+        block_dao._persist_chain_tip()
+        block_dao._persist_chain_tip()
+        mock_storage.put_object_as_json.assert_called_once_with("BLOCK/LAST_BLOCK_PROOF", {"block_id": "8", "proof": "proof"})
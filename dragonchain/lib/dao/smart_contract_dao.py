@@ -15,19 +15,27 @@
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
 
+import os
 from typing import List, Optional, Dict
 
 from dragonchain import logger
 from dragonchain import exceptions
+from dragonchain.lib import ttl_cache
 from dragonchain.lib.dto import smart_contract_model
 from dragonchain.lib.interfaces import storage
+from dragonchain.lib.database import redis
 from dragonchain.lib.database import redisearch
 from dragonchain.lib import faas
 
 #  Constants
 FOLDER = "SMARTCONTRACT"
+# Prefix of the redis counters bumped whenever a contract's metadata changes, so every process drops its cached copy
+CACHE_GENERATION_KEY = "metadata-cache:contract"
+# Seconds to cache contract metadata in-process for the enqueue path (bounds memory; staleness is bounded by the generation counter)
+METADATA_CACHE_TTL = float(os.environ.get("METADATA_CACHE_TTL") or "10")
 
 _log = logger.get_logger()
+_cache = ttl_cache.TTLCache(ttl=METADATA_CACHE_TTL)
 
 
 def get_contract_id_by_txn_type(txn_type: str) -> str:
@@ -91,6 +99,31 @@ def get_contract_by_id(contract_id: str) -> smart_contract_model.SmartContractMo
     return smart_contract_model.new_from_at_rest(storage.get_json_from_object(f"{FOLDER}/{contract_id}/metadata.json"))
 
 
+def _cache_generation_key(contract_id: str) -> str:
+    return f"{CACHE_GENERATION_KEY}:{contract_id}"
+
+
+def get_contract_by_id_cached(contract_id: str) -> smart_contract_model.SmartContractModel:
+    """Same as get_contract_by_id, but served from an in-process cache when possible
+    The cached copy is only used while the contract's generation counter in redis is unchanged,
+    so a change saved by any process is seen on the next call
+    Note: The returned model is shared, and should not be modified
+    """
+    generation = redis.get_sync(_cache_generation_key(contract_id))
+    cached = _cache.get(contract_id)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    contract = get_contract_by_id(contract_id)
+    _cache.set(contract_id, (generation, contract))
+    return contract
+
+
+def invalidate_cached_contract(contract_id: str) -> None:
+    """Drop a contract from the metadata cache of every process (call after the change is saved)"""
+    redis.incr_sync(_cache_generation_key(contract_id))
+    _cache.invalidate(contract_id)
+
+
 def contract_does_exist(contract_id: str) -> bool:
     """Checks if a contract exists or not"""
     return storage.does_object_exist(f"{FOLDER}/{contract_id}/metadata.json")
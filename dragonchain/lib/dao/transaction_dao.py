@@ -17,7 +17,7 @@
 
 import uuid
 import time
-from typing import TYPE_CHECKING, Dict, Any
+from typing import TYPE_CHECKING, Dict, Tuple, Any
 
 import redis
 
@@ -33,6 +33,7 @@ if TYPE_CHECKING:
     from dragonchain.lib.dto import l1_block_model
 
 FOLDER = "TRANSACTION"
+INDEX_FOLDER = "TRANSACTION_INDEX"
 S3_OBJECT_ID = "s3_object_id"
 
 _log = logger.get_logger()
@@ -58,12 +59,16 @@ def ledger_contract_action(action: str, txn_type: str, entrypoint: str, image_di
 
 def store_full_txns(block_model: "l1_block_model.L1BlockModel") -> None:
     """
-    Store the transactions object as a single file per block in storage.
+    Store the transactions object as a single file per block in storage, alongside an index of where each transaction is in that file.
     Also updates the indexes for each indexed transaction in ES with block information.
     """
     _log.info("[TRANSACTION DAO] Putting transaction to storage")
-    storage.put(f"{FOLDER}/{block_model.block_id}", block_model.export_as_full_transactions().encode("utf-8"))
-    block_model.store_transaction_payloads()
+    # Payloads are stored first so that every stored transaction record points at an existing payload pack
+    payload_index = block_model.store_transaction_payloads()
+    record_index: Dict[str, Tuple[int, int]] = {}
+    storage.put_stream(f"{FOLDER}/{block_model.block_id}", block_model.stream_full_transactions(payload_index, record_index))
+    # Sidecar of txn_id -> (offset, length) so single transactions can be read without scanning the whole block
+    storage.put_object_as_json(f"{INDEX_FOLDER}/{block_model.block_id}", record_index, should_cache=False)
     txn_dict: Dict[str, Dict[str, Dict[str, Any]]] = {}
     txn_dict[redisearch.Indexes.transaction.value] = {}
     # O(N) loop where N = # of txn
@@ -16,16 +16,17 @@
 # language governing permissions and limitations under the Apache License.
 
 import unittest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, ANY, call
 
 from dragonchain import test_env  # noqa: F401
 from dragonchain.lib.dao import transaction_dao
 
 
 class TestStoreFullTxns(unittest.TestCase):
+    @patch("dragonchain.lib.interfaces.storage.put_stream")
     @patch("dragonchain.lib.interfaces.storage.put")
     @patch("dragonchain.lib.database.redisearch.put_many_documents")
-    def test_store_full_txns_calls_redis_a_lot(self, mock_index_many, mock_put):
+    def test_store_full_txns_calls_redis_a_lot(self, mock_index_many, mock_put, mock_put_stream):
         mock_block = MagicMock(block_id="banana", transactions=[MagicMock(txn_id="apple", block_id="banana", txn_type="fruity")])
         transaction_dao.store_full_txns(mock_block)
         mock_index_many.assert_has_calls(
@@ -34,3 +35,25 @@ class TestStoreFullTxns(unittest.TestCase):
                 call("fruity", {"apple": mock_block.transactions[0].export_as_search_index.return_value}, upsert=True),
             ]
         )
+
+    @patch("dragonchain.lib.interfaces.storage.put_stream")
+    @patch("dragonchain.lib.interfaces.storage.put")
+    @patch("dragonchain.lib.database.redisearch.put_many_documents")
+    def test_store_full_txns_streams_transactions_and_index(self, mock_index_many, mock_put, mock_put_stream):
+        mock_block = MagicMock(block_id="banana", transactions=[])
+        payload_index = {"apple": (0, 1)}
+
+        def store_payloads():
+            mock_put_stream.assert_not_called()
+            return payload_index
+
+        def stream_full_transactions(payload_index, record_index):
+            record_index["apple"] = (0, 10)
+            yield b"txns"
+
+        mock_block.store_transaction_payloads.side_effect = store_payloads
+        mock_block.stream_full_transactions.side_effect = stream_full_transactions
+        mock_put_stream.side_effect = lambda key, chunks: self.assertEqual(list(chunks), [b"txns"])
+        transaction_dao.store_full_txns(mock_block)
+        mock_put_stream.assert_called_once_with("TRANSACTION/banana", ANY)
+        mock_put.assert_called_once_with("TRANSACTION_INDEX/banana", b'{"apple":[0,10]}', None, False)
@@ -15,8 +15,10 @@
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
 
+import os
 from typing import Dict, Any, List, Iterable, Optional, TYPE_CHECKING
 
+from dragonchain.lib import ttl_cache
 from dragonchain.lib.interfaces import storage
 from dragonchain.lib.dto import transaction_type_model
 from dragonchain.lib.database import redis
@@ -30,8 +32,13 @@ if TYPE_CHECKING:
 
 FOLDER = "TRANSACTION_TYPES/TYPES"
 QUEUED_TXN_TYPES = "mq:txn_type_creation_queue"
+# Prefix of the redis counters bumped whenever a transaction type changes, so every process drops its cached copy
+CACHE_GENERATION_KEY = "metadata-cache:transaction-type"
+# Seconds to cache transaction type metadata in-process for the enqueue path (bounds memory; staleness is bounded by the generation counter)
+METADATA_CACHE_TTL = float(os.environ.get("METADATA_CACHE_TTL") or "10")
 
 _log = logger.get_logger()
+_cache = ttl_cache.TTLCache(ttl=METADATA_CACHE_TTL)
 
 
 def get_registered_transaction_type(transaction_type: str) -> transaction_type_model.TransactionTypeModel:
@@ -44,6 +51,31 @@ def get_registered_transaction_type(transaction_type: str) -> transaction_type_m
     return transaction_type_model.new_from_at_rest(result)
 
 
+def _cache_generation_key(transaction_type: str) -> str:
+    return f"{CACHE_GENERATION_KEY}:{transaction_type}"
+
+
+def get_registered_transaction_type_cached(transaction_type: str) -> transaction_type_model.TransactionTypeModel:
+    """Same as get_registered_transaction_type, but served from an in-process cache when possible
+    The cached copy is only used while the transaction type's generation counter in redis is unchanged,
+    so a change saved by any process is seen on the next call
+    Note: The returned model is shared, and should not be modified
+    """
+    generation = redis.get_sync(_cache_generation_key(transaction_type))
+    cached = _cache.get(transaction_type)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    txn_type_model = get_registered_transaction_type(transaction_type)
+    _cache.set(transaction_type, (generation, txn_type_model))
+    return txn_type_model
+
+
+def invalidate_cached_transaction_type(transaction_type: str) -> None:
+    """Drop a transaction type from the metadata cache of every process (call after the change is saved)"""
+    redis.incr_sync(_cache_generation_key(transaction_type))
+    _cache.invalidate(transaction_type)
+
+
 def get_registered_transaction_types_or_default(transaction_types: Iterable[str]) -> Dict[str, transaction_type_model.TransactionTypeModel]:
     """Bulk get of registered transaction types
        Note: If a transaction type is not found, it is sent back as a TransactionTypeModel with default values
@@ -74,6 +106,7 @@ def remove_existing_transaction_type(transaction_type: str) -> None:
     _log.info(f"Deleting existing transaction type {transaction_type}")
     redisearch.delete_index(transaction_type)
     storage.delete(f"{FOLDER}/{transaction_type}")
+    invalidate_cached_transaction_type(transaction_type)
 
 
 def register_smart_contract_transaction_type(
@@ -105,6 +138,7 @@ def activate_transaction_types_if_necessary(block_id: str) -> None:
             txn_type_model.active_since_block = block_id
             # Save the transaction type state
             storage.put_object_as_json(f"{FOLDER}/{txn_type_model.txn_type}", txn_type_model.export_as_at_rest())
+            invalidate_cached_transaction_type(txn_type_model.txn_type)
         except exceptions.NotFound:
             pass  # txn_type was probably deleted before activating. Simply ignore it
 
@@ -118,3 +152,4 @@ def create_new_transaction_type(txn_type_model: transaction_type_model.Transacti
     redis.lpush_sync(QUEUED_TXN_TYPES, txn_type_model.txn_type)
     _log.debug("Adding the transaction type to storage")
     storage.put_object_as_json(f"{FOLDER}/{txn_type_model.txn_type}", txn_type_dto)
+    invalidate_cached_transaction_type(txn_type_model.txn_type)
@@ -41,31 +41,84 @@ class TestTransactionTypeDAO(unittest.TestCase):
     def test_get_registered_transactions_raises_not_found(self, storage_get_mock):
         self.assertRaises(exceptions.NotFound, transaction_type_dao.get_registered_transaction_type, "test_type")
 
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.incr_sync")
     @patch("dragonchain.lib.database.redis.lpush_sync")
     @patch("dragonchain.lib.database.redisearch.create_transaction_index")
     @patch("dragonchain.lib.dao.transaction_type_dao.storage.put_object_as_json")
-    def test_create_registered_txn_type_succeeds(self, storage_put_mock, rsearch_create_mock, mock_lpush):
+    def test_create_registered_txn_type_succeeds(self, storage_put_mock, rsearch_create_mock, mock_lpush, mock_incr):
         instance = transaction_type_model.new_from_user_input({"version": "2", "txn_type": "test_type", "custom_indexes": []})
         transaction_type_dao.create_new_transaction_type(instance)
         storage_put_mock.assert_called_once_with("TRANSACTION_TYPES/TYPES/test_type", instance.export_as_at_rest())
         rsearch_create_mock.assert_called_once_with("test_type", [])
         mock_lpush.assert_called_once_with("mq:txn_type_creation_queue", "test_type")
+        mock_incr.assert_called_once_with("metadata-cache:transaction-type:test_type")
 
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.incr_sync")
     @patch("dragonchain.lib.database.redisearch.delete_index")
     @patch("dragonchain.lib.dao.transaction_type_dao.storage.delete", return_value=True)
-    def test_delete_registered_txn_type_succeeds(self, storage_delete_mock, rsearch_delete_mock):
+    def test_delete_registered_txn_type_succeeds(self, storage_delete_mock, rsearch_delete_mock, mock_incr):
         transaction_type_dao.remove_existing_transaction_type("randomTxn")
         storage_delete_mock.assert_called_with("TRANSACTION_TYPES/TYPES/randomTxn")
         rsearch_delete_mock.assert_called_once_with("randomTxn")
 
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.incr_sync")
     @patch(
         "dragonchain.lib.dao.transaction_type_dao.get_registered_transaction_type",
         return_value=MagicMock(txn_type="blah", export_as_at_rest=MagicMock(return_value={})),
     )
     @patch("dragonchain.lib.database.redis.pipeline_sync", return_value=MagicMock(execute=MagicMock(return_value=[[b"txn_id"], 4])))
     @patch("dragonchain.lib.dao.transaction_type_dao.storage.put_object_as_json")
-    def test_activate_transaction_types_if_necessary(self, store_mock, redis_mock, mock_get_txn_type):
+    def test_activate_transaction_types_if_necessary(self, store_mock, redis_mock, mock_get_txn_type, mock_incr):
         transaction_type_dao.activate_transaction_types_if_necessary("1000")
         redis_mock.assert_called_once()
         store_mock.assert_called_once_with("TRANSACTION_TYPES/TYPES/blah", {})
         mock_get_txn_type.assert_called_once_with("txn_id")
+
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.incr_sync")
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.get_sync", return_value="1")
+    @patch("dragonchain.lib.dao.transaction_type_dao.get_registered_transaction_type", return_value=MagicMock())
+    def test_get_registered_transaction_type_cached_only_fetches_once(self, mock_get_txn_type, mock_get_generation, mock_incr):
+        try:
+            first = transaction_type_dao.get_registered_transaction_type_cached("cached_type")
+            self.assertIs(transaction_type_dao.get_registered_transaction_type_cached("cached_type"), first)
+            mock_get_txn_type.assert_called_once_with("cached_type")
+        finally:
+            transaction_type_dao.invalidate_cached_transaction_type("cached_type")
+
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.incr_sync")
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.get_sync", return_value="1")
+    @patch("dragonchain.lib.dao.transaction_type_dao.get_registered_transaction_type", return_value=MagicMock())
+    @patch("dragonchain.lib.database.redisearch.delete_index")
+    @patch("dragonchain.lib.dao.transaction_type_dao.storage.delete", return_value=True)
+    def test_delete_registered_txn_type_invalidates_cache(
+        self, storage_delete_mock, rsearch_delete_mock, mock_get_txn_type, mock_get_generation, mock_incr
+    ):
+        transaction_type_dao.get_registered_transaction_type_cached("cached_type")
+        transaction_type_dao.remove_existing_transaction_type("cached_type")
+        transaction_type_dao.get_registered_transaction_type_cached("cached_type")
+        self.assertEqual(mock_get_txn_type.call_count, 2)
+        transaction_type_dao.invalidate_cached_transaction_type("cached_type")
+
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.incr_sync")
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.get_sync", return_value="1")
+    @patch("dragonchain.lib.dao.transaction_type_dao.get_registered_transaction_type", side_effect=exceptions.NotFound)
+    def test_get_registered_transaction_type_cached_does_not_cache_not_found(self, mock_get_txn_type, mock_get_generation, mock_incr):
+        self.assertRaises(exceptions.NotFound, transaction_type_dao.get_registered_transaction_type_cached, "missing_type")
+        self.assertRaises(exceptions.NotFound, transaction_type_dao.get_registered_transaction_type_cached, "missing_type")
+        self.assertEqual(mock_get_txn_type.call_count, 2)
+
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.incr_sync")
+    @patch("dragonchain.lib.dao.transaction_type_dao.redis.get_sync", return_value="1")
+    @patch("dragonchain.lib.dao.transaction_type_dao.get_registered_transaction_type", return_value=MagicMock())
+    def test_get_registered_transaction_type_cached_refetches_when_changed_by_another_process(
+        self, mock_get_txn_type, mock_get_generation, mock_incr
+    ):
+        try:
+            transaction_type_dao.get_registered_transaction_type_cached("cached_type")
+            mock_get_generation.return_value = "2"
+            transaction_type_dao.get_registered_transaction_type_cached("cached_type")
+            transaction_type_dao.get_registered_transaction_type_cached("cached_type")
+            self.assertEqual(mock_get_txn_type.call_count, 2)
+            mock_get_generation.assert_called_with("metadata-cache:transaction-type:cached_type")
+        finally:
+            transaction_type_dao.invalidate_cached_transaction_type("cached_type")
@@ -18,7 +18,7 @@
 import os
 import time
 import asyncio
-from typing import Dict, Mapping, Iterable, Optional, Any, Union, cast
+from typing import Dict, List, Mapping, Iterable, Optional, Any, Union, cast
 
 import aioredis
 import aioredis.util
@@ -191,6 +191,16 @@ async def multi_exec_async() -> aioredis.commands.transaction.MultiExec:
     return async_redis_client.multi_exec()
 
 
+async def pipeline_async() -> aioredis.commands.transaction.Pipeline:
+    await _set_redis_client_async_if_necessary()
+    return async_redis_client.pipeline()
+
+
+async def eval_async(script: str, keys: List[str], args: List[str]) -> Any:
+    await _set_redis_client_async_if_necessary()
+    return await async_redis_client.eval(script, keys=keys, args=args)
+
+
 async def hgetall_async(key: str, *, decode: bool = True) -> dict:
     await _set_redis_client_async_if_necessary()
     return await async_redis_client.hgetall(key, encoding="utf8" if decode else aioredis.util._NOTSET)
@@ -211,6 +221,11 @@ async def brpop_async(key: str, *keys: str, timeout: int = 0, decode: bool = Tru
     return await async_redis_client.brpop(key, *keys, timeout=timeout, encoding="utf8" if decode else aioredis.util._NOTSET)
 
 
+async def hget_async(key: str, field: str, *, decode: bool = True) -> Optional[str]:
+    await _set_redis_client_async_if_necessary()
+    return await async_redis_client.hget(key, field, encoding="utf8" if decode else aioredis.util._NOTSET)
+
+
 async def hset_async(key: str, field: str, value: str) -> Optional[int]:
     await _set_redis_client_async_if_necessary()
     return await async_redis_client.hset(key, field, value)
@@ -237,6 +252,11 @@ def cache_get(key: str, service_name: str = "storage") -> Optional[bytes]:
     return redis_client_lru.get(_cache_key(key, service_name))
 
 
+def cache_get_many(keys: List[str], service_name: str = "storage") -> List[Optional[bytes]]:
+    _set_redis_client_lru_if_necessary()
+    return redis_client_lru.mget([_cache_key(key, service_name) for key in keys])
+
+
 def cache_delete(key: str, service_name: str = "storage") -> int:
     _set_redis_client_lru_if_necessary()
     return redis_client_lru.delete(_cache_key(key, service_name))
@@ -278,11 +298,21 @@ def delete_sync(*names: str) -> int:
     return redis_client.delete(*names)
 
 
+def rename_sync(src: str, dst: str) -> bool:
+    _set_redis_client_if_necessary()
+    return redis_client.rename(src, dst)
+
+
 def hset_sync(name: str, key: str, value: str) -> int:
     _set_redis_client_if_necessary()
     return redis_client.hset(name, key, value)
 
 
+def hset_mapping_sync(name: str, mapping: Mapping[str, str]) -> int:
+    _set_redis_client_if_necessary()
+    return redis_client.hset(name, mapping=mapping)
+
+
 def brpop_sync(keys: str, timeout: int = 0, decode: bool = True) -> Optional[tuple]:
     """Perform a blocking pop against redis list(s)
     Args:
@@ -322,6 +352,11 @@ def get_sync(name: str, decode: bool = True) -> Optional[str]:
     return _decode_response(response, decode)
 
 
+def incr_sync(name: str) -> int:
+    _set_redis_client_if_necessary()
+    return redis_client.incr(name)
+
+
 def lindex_sync(name: str, index: int, decode: bool = True) -> Optional[str]:
     _set_redis_client_if_necessary()
     response = redis_client.lindex(name, index)
@@ -344,6 +379,12 @@ def hget_sync(name: str, key: str, decode: bool = True) -> Optional[str]:
     return _decode_response(response, decode)
 
 
+def hmget_sync(name: str, *keys: str, decode: bool = True) -> List[Optional[str]]:
+    _set_redis_client_if_necessary()
+    response = redis_client.hmget(name, *keys)
+    return _decode_list_response(response, decode)
+
+
 def smembers_sync(name: str, decode: bool = True) -> set:
     _set_redis_client_if_necessary()
     response = redis_client.smembers(name)
@@ -366,6 +407,22 @@ def pipeline_sync(transaction: bool = True) -> redis.client.Pipeline:
     return redis_client.pipeline(transaction=transaction)
 
 
+def register_script_sync(script: str) -> redis.client.Script:
+    """Register a lua script which can be called (with keys and args) to run atomically on the redis server
+    Args:
+        script: lua source of the script
+    Returns:
+        Callable script object which uses EVALSHA (loading the script if necessary)
+    """
+    _set_redis_client_if_necessary()
+    return redis_client.register_script(script)
+
+
+def lrem_sync(name: str, count: int, value: Union[str, bytes]) -> int:
+    _set_redis_client_if_necessary()
+    return redis_client.lrem(name, count, value)
+
+
 def llen_sync(name: str) -> int:
     _set_redis_client_if_necessary()
     return redis_client.llen(name)
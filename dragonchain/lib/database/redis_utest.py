@@ -69,6 +69,14 @@ class TestRedisAccess(unittest.IsolatedAsyncioTestCase):
         await redis.multi_exec_async()
         redis.async_redis_client.multi_exec.assert_called_once()
 
+    async def test_pipeline_async(self):
+        await redis.pipeline_async()
+        redis.async_redis_client.pipeline.assert_called_once()
+
+    async def test_eval_async(self):
+        await redis.eval_async("script", ["key"], ["arg"])
+        redis.async_redis_client.eval.assert_awaited_once_with("script", keys=["key"], args=["arg"])
+
     async def test_hgetall_async(self):
         await redis.hgetall_async("banana")
         redis.async_redis_client.hgetall.assert_awaited_once_with("banana", encoding="utf8")
@@ -85,6 +93,10 @@ class TestRedisAccess(unittest.IsolatedAsyncioTestCase):
         await redis.brpop_async("banana", "banana", "banana")
         redis.async_redis_client.brpop.assert_awaited_once_with("banana", "banana", "banana", encoding="utf8", timeout=0)
 
+    async def test_hget_async(self):
+        await redis.hget_async("banana", "banana")
+        redis.async_redis_client.hget.assert_awaited_once_with("banana", "banana", encoding="utf8")
+
     async def test_hset_async(self):
         await redis.hset_async("banana", "banana", "banana")
         redis.async_redis_client.hset.assert_awaited_once_with("banana", "banana", "banana")
@@ -109,6 +121,10 @@ class TestRedisAccess(unittest.IsolatedAsyncioTestCase):
         redis.cache_get("banana")
         redis.redis_client_lru.get.assert_called_once_with("storage:banana")
 
+    def test_cache_get_many(self):
+        redis.cache_get_many(["banana", "apple"], service_name="fruit")
+        redis.redis_client_lru.mget.assert_called_once_with(["fruit:banana", "fruit:apple"])
+
     def test_cache_delete(self):
         redis.cache_delete("banana")
         redis.redis_client_lru.delete.assert_called_once_with("storage:banana")
@@ -153,6 +169,10 @@ class TestRedisAccess(unittest.IsolatedAsyncioTestCase):
         redis.get_sync("banana")
         redis.redis_client.get.assert_called_once_with("banana")
 
+    def test_incr_sync(self):
+        redis.incr_sync("banana")
+        redis.redis_client.incr.assert_called_once_with("banana")
+
     def test_lindex(self):
         redis.lindex_sync("banana", 2)
         redis.redis_client.lindex.assert_called_once_with("banana", 2)
@@ -18,7 +18,7 @@
 import time
 import json
 import math
-from typing import Dict, Any, List, Set, TYPE_CHECKING
+from typing import Dict, Any, List, Set, Tuple, Iterator, Optional, TYPE_CHECKING
 
 import fastjsonschema
 
@@ -33,6 +33,7 @@ if TYPE_CHECKING:
 
 EPOCH_OFFSET = 1432238220
 BLOCK_INTERVAL = 5
+PAYLOAD_PACK_FOLDER = "PAYLOAD_PACK"
 
 _validate_l1_block_at_rest = fastjsonschema.compile(schema.l1_block_at_rest_schema)
 
@@ -95,6 +96,11 @@ def get_current_block_id() -> str:
     return str(int((time.time() - EPOCH_OFFSET) / BLOCK_INTERVAL))
 
 
+def get_block_id_start_time(block_id: str) -> float:
+    """Get the unix time at which a block id becomes the current block id"""
+    return EPOCH_OFFSET + int(block_id) * BLOCK_INTERVAL
+
+
 def export_broadcast_dto(block: Dict[str, Any]) -> Dict[str, Any]:
     return {"version": "1", "payload": block}
 
@@ -179,15 +185,48 @@ class L1BlockModel(model.BlockModel):
             "proof": proof,
         }
 
-    def export_as_full_transactions(self) -> str:
-        """Export full transactions in block as NDJSON (for storage select when querying)"""
-        txn_string = ""
+    def stream_full_transactions(
+        self, payload_index: Optional[Dict[str, Tuple[int, int]]] = None, record_index: Optional[Dict[str, Tuple[int, int]]] = None
+    ) -> Iterator[bytes]:
+        """Export full transactions in block as NDJSON, one encoded record at a time
+        Args:
+            payload_index: (OPTIONAL) txn_id -> (offset, length) of each payload in the block's payload pack
+            record_index: (OPTIONAL) dictionary which is filled with txn_id -> (offset, length) of each record (without newline) as they are generated
+        Returns:
+            Iterator of NDJSON record bytes
+        """
+        offset = 0
         for transaction in self.transactions:
-            txn_string += '{"txn_id": "' + transaction.txn_id + '", "stripped_payload": true, '
-            txn_string += '"txn": ' + json.dumps(transaction.export_as_full(), separators=(",", ":")) + "}\n"
-        return txn_string
-
-    def store_transaction_payloads(self) -> None:
-        """Stores full transaction payloads for block"""
+            txn_string = '{"txn_id": "' + transaction.txn_id + '", "stripped_payload": true, '
+            if payload_index is not None:
+                payload_offset, payload_length = payload_index[transaction.txn_id]
+                txn_string += '"payload_offset": ' + str(payload_offset) + ', "payload_length": ' + str(payload_length) + ", "
+            record = (txn_string + '"txn": ' + json.dumps(transaction.export_as_full(), separators=(",", ":")) + "}\n").encode("utf-8")
+            if record_index is not None:
+                record_index[transaction.txn_id] = (offset, len(record) - 1)
+            offset += len(record)
+            yield record
+
+    def stream_payload_pack(self, payload_index: Optional[Dict[str, Tuple[int, int]]] = None) -> Iterator[bytes]:
+        """Export all transaction payloads in block as one contiguous object, one encoded payload at a time
+        Args:
+            payload_index: (OPTIONAL) dictionary which is filled with txn_id -> (offset, length) of each payload as they are generated
+        Returns:
+            Iterator of payload bytes
+        """
+        offset = 0
         for transaction in self.transactions:
-            storage.put(f"PAYLOADS/{transaction.txn_id}", json.dumps(transaction.payload, separators=(",", ":")).encode("utf-8"))
+            payload = json.dumps(transaction.payload, separators=(",", ":")).encode("utf-8")
+            if payload_index is not None:
+                payload_index[transaction.txn_id] = (offset, len(payload))
+            offset += len(payload)
+            yield payload
+
+    def store_transaction_payloads(self) -> Dict[str, Tuple[int, int]]:
+        """Stores full transaction payloads for block as a single payload pack object
+        Returns:
+            Dictionary of txn_id -> (offset, length) of each payload within the stored pack
+        """
+        payload_index: Dict[str, Tuple[int, int]] = {}
+        storage.put_stream(f"{PAYLOAD_PACK_FOLDER}/{self.block_id}", self.stream_payload_pack(payload_index))
+        return payload_index
@@ -17,7 +17,7 @@
 
 import json
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, ANY
 
 import fastjsonschema
 
@@ -326,12 +326,62 @@ class TestL1Block(unittest.TestCase):
         tx2.txn_id = tx_id_2
         l1block = create_l1_block()
         l1block.transactions = [tx1, tx2]
-        to_validate = l1block.export_as_full_transactions().splitlines()
+        to_validate = list(l1block.stream_full_transactions())
+        self.assertEqual(len(to_validate), 2)
+        self.assertTrue(all(record.endswith(b"\n") for record in to_validate))
         self.assertEqual(json.loads(to_validate[0])["txn_id"], tx_id_1)
         self.assertDictEqual(json.loads(to_validate[0])["txn"], tx1.export_as_full())
         self.assertEqual(json.loads(to_validate[1])["txn_id"], tx_id_2)
         self.assertDictEqual(json.loads(to_validate[1])["txn"], tx2.export_as_full())
 
+    def test_nd_json_export_with_payload_index(self):
+        tx1 = create_tx()
+        tx1.txn_id = "a cool id"
+        l1block = create_l1_block()
+        l1block.transactions = [tx1]
+        record = json.loads(next(l1block.stream_full_transactions({"a cool id": (12, 34)})))
+        self.assertEqual(record["payload_offset"], 12)
+        self.assertEqual(record["payload_length"], 34)
+        self.assertDictEqual(record["txn"], tx1.export_as_full())
+
+    def test_nd_json_stream_fills_record_index(self):
+        tx1 = create_tx()
+        tx2 = create_tx()
+        tx1.txn_id = "a cool id"
+        tx2.txn_id = "another cool id"
+        l1block = create_l1_block()
+        l1block.transactions = [tx1, tx2]
+        record_index = {}
+        full_transactions = b"".join(l1block.stream_full_transactions(record_index=record_index))
+        self.assertEqual(len(full_transactions.splitlines()), 2)
+        for txn in [tx1, tx2]:
+            offset, length = record_index[txn.txn_id]
+            self.assertDictEqual(json.loads(full_transactions[offset : offset + length])["txn"], txn.export_as_full())
+
+    def test_payload_pack_stream_fills_payload_index(self):
+        tx1 = create_tx()
+        tx2 = create_tx()
+        tx1.txn_id = "a cool id"
+        tx2.txn_id = "another cool id"
+        tx2.payload = {"some": "thing"}
+        l1block = create_l1_block()
+        l1block.transactions = [tx1, tx2]
+        payload_index = {}
+        pack = b"".join(l1block.stream_payload_pack(payload_index))
+        for txn in [tx1, tx2]:
+            offset, length = payload_index[txn.txn_id]
+            self.assertEqual(json.loads(pack[offset : offset + length]), txn.payload)
+
+    @patch("dragonchain.lib.dto.l1_block_model.storage.put_stream")
+    def test_store_transaction_payloads_streams_payload_pack(self, mock_put_stream):
+        tx1 = create_tx()
+        l1block = create_l1_block()
+        l1block.transactions = [tx1]
+        mock_put_stream.side_effect = lambda key, chunks: list(chunks)
+        payload_index = l1block.store_transaction_payloads()
+        mock_put_stream.assert_called_once_with("PAYLOAD_PACK/123", ANY)
+        self.assertEqual(list(payload_index.keys()), [tx1.txn_id])
+
 
 class TestL2Block(unittest.TestCase):
     def test_setting_validations(self):
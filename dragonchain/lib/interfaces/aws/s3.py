@@ -16,7 +16,7 @@
 # language governing permissions and limitations under the Apache License.
 
 import json
-from typing import List
+from typing import Dict, Iterable, List, Any
 
 import boto3
 import botocore
@@ -24,6 +24,7 @@ import botocore
 from dragonchain import exceptions
 
 s3 = boto3.client("s3")
+MULTIPART_PART_SIZE = 8388608  # Size (in bytes) of each part when streaming an object with a multipart upload (must be at least 5MB)
 
 
 def get(location: str, key: str) -> bytes:
@@ -42,6 +43,24 @@ def get(location: str, key: str) -> bytes:
         raise exceptions.NotFound
 
 
+def get_range(location: str, key: str, offset: int, length: int) -> bytes:
+    """Returns a byte range of an object from S3
+    Args:
+        location: The S3 bucket to use
+        key: The S3 key to get
+        offset: The byte offset in the object to start reading from
+        length: The number of bytes to read
+    Returns:
+        data as bytes
+    Raises:
+        exceptions.NotFound exception if key is not found in S3
+    """
+    try:
+        return s3.get_object(Bucket=location, Key=key, Range=f"bytes={offset}-{offset + length - 1}")["Body"].read()
+    except s3.exceptions.NoSuchKey:
+        raise exceptions.NotFound
+
+
 def put(location: str, key: str, value: bytes) -> None:
     """Puts an object in S3
     Args:
@@ -55,6 +74,44 @@ def put(location: str, key: str, value: bytes) -> None:
         raise RuntimeError("S3 put failed to give 200 response")
 
 
+def put_stream(location: str, key: str, chunks: Iterable[bytes]) -> None:
+    """Puts an object in S3 from an iterable of byte chunks, only holding one part in memory at a time
+    Objects smaller than a single part are uploaded with a normal put, otherwise a multipart upload is used
+    Args:
+        location: The S3 bucket to use
+        key: The key of the object being written in S3
+        chunks: Iterable of bytes which make up the object when concatenated
+    Raises:
+        RuntimeError exception if write fails
+    """
+    buffer = bytearray()
+    upload_id = None
+    parts: List[Dict[str, Any]] = []
+    try:
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= MULTIPART_PART_SIZE:
+                if upload_id is None:
+                    upload_id = s3.create_multipart_upload(Bucket=location, Key=key)["UploadId"]
+                parts.append(_upload_part(location, key, upload_id, len(parts) + 1, bytes(buffer)))
+                buffer = bytearray()
+        if upload_id is None:
+            put(location, key, bytes(buffer))
+            return
+        if buffer:
+            parts.append(_upload_part(location, key, upload_id, len(parts) + 1, bytes(buffer)))
+        s3.complete_multipart_upload(Bucket=location, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts})
+    except Exception:
+        if upload_id is not None:
+            s3.abort_multipart_upload(Bucket=location, Key=key, UploadId=upload_id)
+        raise
+
+
+def _upload_part(location: str, key: str, upload_id: str, part_number: int, value: bytes) -> Dict[str, Any]:
+    response = s3.upload_part(Bucket=location, Key=key, UploadId=upload_id, PartNumber=part_number, Body=value)
+    return {"ETag": response["ETag"], "PartNumber": part_number}
+
+
 def delete(location: str, key: str) -> None:
     """Deletes an object in S3 with cache write-thru
     Args:
@@ -91,7 +148,7 @@ def select_transaction(location: str, block_id: str, txn_id: str) -> dict:
         obj = s3.select_object_content(
             Bucket=location,
             Key=f"TRANSACTION/{block_id}",
-            Expression=f"select s.txn, s.stripped_payload from s3object s where s.txn_id = '{txn_id}' limit 1",  # nosec (this s3 select query is safe)
+            Expression=f"select s.txn, s.stripped_payload, s.payload_offset, s.payload_length from s3object s where s.txn_id = '{txn_id}' limit 1",  # nosec (this s3 select query is safe)
             ExpressionType="SQL",
             InputSerialization={"JSON": {"Type": "DOCUMENT"}},
             OutputSerialization={"JSON": {"RecordDelimiter": "\n"}},
@@ -106,11 +163,16 @@ def select_transaction(location: str, block_id: str, txn_id: str) -> dict:
     if txn_data:
         loaded_txn = json.loads(txn_data)
         if loaded_txn.get("stripped_payload"):
-            payload_key = f"PAYLOADS/{txn_id}"
-            if does_object_exist(location, payload_key):
-                loaded_txn["txn"]["payload"] = json.loads(get(location, payload_key).decode("utf-8"))
+            if loaded_txn.get("payload_length") is not None:
+                payload = get_range(location, f"PAYLOAD_PACK/{block_id}", loaded_txn["payload_offset"], loaded_txn["payload_length"])
+                loaded_txn["txn"]["payload"] = json.loads(payload.decode("utf-8"))
             else:
-                loaded_txn["txn"]["payload"] = json.dumps({})
+                # Blocks stored before payload packs existed have one payload object per transaction
+                payload_key = f"PAYLOADS/{txn_id}"
+                if does_object_exist(location, payload_key):
+                    loaded_txn["txn"]["payload"] = json.loads(get(location, payload_key).decode("utf-8"))
+                else:
+                    loaded_txn["txn"]["payload"] = json.dumps({})
         return loaded_txn["txn"]
     raise exceptions.NotFound
 
@@ -16,7 +16,7 @@
 # language governing permissions and limitations under the Apache License.
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, call
 
 import botocore
 
@@ -35,6 +35,15 @@ class TestS3Interface(unittest.TestCase):
     def test_get_throws_notfound_on_nosuckkey(self, mock_get_object):
         self.assertRaises(exceptions.NotFound, s3.get, "a", "b")
 
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.get_object")
+    def test_get_range_calls_with_correct_params(self, mock_get_object):
+        s3.get_range("test", "thing", 10, 5)
+        mock_get_object.assert_called_once_with(Bucket="test", Key="thing", Range="bytes=10-14")
+
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.get_object", side_effect=s3.s3.exceptions.NoSuchKey({}, {}))
+    def test_get_range_throws_notfound_on_nosuckkey(self, mock_get_object):
+        self.assertRaises(exceptions.NotFound, s3.get_range, "a", "b", 0, 1)
+
     @patch("dragonchain.lib.interfaces.aws.s3.s3.put_object", return_value={"ResponseMetadata": {"HTTPStatusCode": 200}})
     def test_put_calls_with_correct_params(self, mock_put_object):
         s3.put("test", "thing", b"hi")
@@ -44,6 +53,38 @@ class TestS3Interface(unittest.TestCase):
     def test_put_raises_when_not_200(self, mock_put_object):
         self.assertRaises(RuntimeError, s3.put, "test", "thing", b"hi")
 
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.create_multipart_upload")
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.put_object", return_value={"ResponseMetadata": {"HTTPStatusCode": 200}})
+    def test_put_stream_uses_single_put_when_small(self, mock_put_object, mock_create_multipart):
+        s3.put_stream("test", "thing", [b"h", b"i"])
+        mock_put_object.assert_called_once_with(Bucket="test", Key="thing", Body=b"hi")
+        mock_create_multipart.assert_not_called()
+
+    @patch("dragonchain.lib.interfaces.aws.s3.MULTIPART_PART_SIZE", 4)
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.complete_multipart_upload")
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.upload_part", side_effect=[{"ETag": "a"}, {"ETag": "b"}])
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.create_multipart_upload", return_value={"UploadId": "id"})
+    def test_put_stream_uses_multipart_upload_when_large(self, mock_create_multipart, mock_upload_part, mock_complete):
+        s3.put_stream("test", "thing", [b"abc", b"de", b"f"])
+        mock_create_multipart.assert_called_once_with(Bucket="test", Key="thing")
+        mock_upload_part.assert_has_calls(
+            [
+                call(Bucket="test", Key="thing", UploadId="id", PartNumber=1, Body=b"abcde"),
+                call(Bucket="test", Key="thing", UploadId="id", PartNumber=2, Body=b"f"),
+            ]
+        )
+        mock_complete.assert_called_once_with(
+            Bucket="test", Key="thing", UploadId="id", MultipartUpload={"Parts": [{"ETag": "a", "PartNumber": 1}, {"ETag": "b", "PartNumber": 2}]}
+        )
+
+    @patch("dragonchain.lib.interfaces.aws.s3.MULTIPART_PART_SIZE", 1)
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.abort_multipart_upload")
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.upload_part", side_effect=RuntimeError)
+    @patch("dragonchain.lib.interfaces.aws.s3.s3.create_multipart_upload", return_value={"UploadId": "id"})
+    def test_put_stream_aborts_multipart_upload_on_error(self, mock_create_multipart, mock_upload_part, mock_abort):
+        self.assertRaises(RuntimeError, s3.put_stream, "test", "thing", [b"abc"])
+        mock_abort.assert_called_once_with(Bucket="test", Key="thing", UploadId="id")
+
     @patch("dragonchain.lib.interfaces.aws.s3.s3.delete_object", return_value={"ResponseMetadata": {"HTTPStatusCode": 204}})
     def test_delete_calls_with_correct_params(self, mock_delete_object):
         s3.delete("test", "thing")
@@ -62,7 +103,7 @@ class TestS3Interface(unittest.TestCase):
         mock_select_object_content.assert_called_once_with(
             Bucket="loc",
             Key="TRANSACTION/block",
-            Expression="select s.txn, s.stripped_payload from s3object s where s.txn_id = 'txn' limit 1",
+            Expression="select s.txn, s.stripped_payload, s.payload_offset, s.payload_length from s3object s where s.txn_id = 'txn' limit 1",
             ExpressionType="SQL",
             InputSerialization={"JSON": {"Type": "DOCUMENT"}},
             OutputSerialization={"JSON": {"RecordDelimiter": "\n"}},
@@ -72,6 +113,25 @@ class TestS3Interface(unittest.TestCase):
     def test_select_gets_nested_data_properly(self, mock_select_object_content):
         self.assertEqual(s3.select_transaction("loc", "block", "txn"), "thing")
 
+    @patch("dragonchain.lib.interfaces.aws.s3.get_range", return_value=b'{"pay":"load"}')
+    @patch(
+        "dragonchain.lib.interfaces.aws.s3.s3.select_object_content",
+        return_value={"Payload": [{"Records": {"Payload": b'{"txn":{},"stripped_payload":true,"payload_offset":4,"payload_length":14}'}}]},
+    )
+    def test_select_reads_payload_from_payload_pack(self, mock_select_object_content, mock_get_range):
+        self.assertEqual(s3.select_transaction("loc", "block", "txn"), {"payload": {"pay": "load"}})
+        mock_get_range.assert_called_once_with("loc", "PAYLOAD_PACK/block", 4, 14)
+
+    @patch("dragonchain.lib.interfaces.aws.s3.get", return_value=b'{"pay":"load"}')
+    @patch("dragonchain.lib.interfaces.aws.s3.does_object_exist", return_value=True)
+    @patch(
+        "dragonchain.lib.interfaces.aws.s3.s3.select_object_content",
+        return_value={"Payload": [{"Records": {"Payload": b'{"txn":{},"stripped_payload":true}'}}]},
+    )
+    def test_select_reads_legacy_payload_object(self, mock_select_object_content, mock_exists, mock_get):
+        self.assertEqual(s3.select_transaction("loc", "block", "txn"), {"payload": {"pay": "load"}})
+        mock_get.assert_called_once_with("loc", "PAYLOADS/txn")
+
     @patch("dragonchain.lib.interfaces.aws.s3.s3.select_object_content", return_value={"Payload": [{}]})
     def test_select_raises_not_found_with_empty_records(self, mock_select_object_content):
         self.assertRaises(exceptions.NotFound, s3.select_transaction, "loc", "block", "txn")
@@ -17,11 +17,16 @@
 
 import os
 import json
-from typing import List
+import uuid
+import functools
+from typing import IO, Dict, Iterable, List, Any
 
 from dragonchain import exceptions
 from dragonchain import logger
 
+# Suffix of the temporary files objects are written to before being moved to their key (these are never listed as objects)
+TEMP_FILE_SUFFIX = ".put-tmp"
+
 _log = logger.get_logger()
 
 
@@ -45,17 +50,48 @@ def get(location: str, key: str) -> bytes:
     return contents
 
 
-def put(location: str, key: str, value: bytes) -> None:
+def get_range(location: str, key: str, offset: int, length: int) -> bytes:
     key = process_key(key)
-    path = os.path.join(location, key)
     try:
-        file = open(path, "wb")
+        file = open(os.path.join(location, key), "rb")
+    except FileNotFoundError:
+        raise exceptions.NotFound
+    file.seek(offset)
+    contents = file.read(length)
+    file.close()
+    return contents
+
+
+def put(location: str, key: str, value: bytes) -> None:
+    put_stream(location, key, [value])
+
+
+def _open_for_write(path: str) -> IO[bytes]:
+    try:
+        return open(path, "wb")
     except (NotADirectoryError, FileNotFoundError):
         # If directory doesn't exist, we need to create it
         os.makedirs(os.path.dirname(path))
-        file = open(path, "wb")
-    file.write(value)
-    file.close()
+        return open(path, "wb")
+
+
+def put_stream(location: str, key: str, chunks: Iterable[bytes]) -> None:
+    key = process_key(key)
+    path = os.path.join(location, key)
+    # Chunks are written to a temporary file which only replaces the object once all of them are written,
+    # so a stream which fails part way leaves neither a partial object nor an open file behind
+    temp_path = f"{path}.{uuid.uuid4().hex}{TEMP_FILE_SUFFIX}"
+    try:
+        with _open_for_write(temp_path) as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
 
 
 def delete(location: str, key: str) -> None:
@@ -90,23 +126,54 @@ def delete_directory(location: str, directory_key: str) -> None:
         raise
 
 
+@functools.lru_cache(maxsize=256)
+def _get_transaction_index(location: str, block_id: str) -> Dict[str, List[int]]:
+    """Get the txn_id -> [offset, length] index of a block's transaction file
+    Blocks are immutable once stored, so found indexes are safe to keep in memory (missing ones raise, and are not cached)
+    """
+    return json.loads(get(location, os.path.join("TRANSACTION_INDEX", block_id)).decode("utf-8"))
+
+
+def _load_payload(location: str, block_id: str, txn_id: str, loaded_txn: Dict[str, Any]) -> Dict[str, Any]:
+    if loaded_txn.get("stripped_payload"):
+        if loaded_txn.get("payload_length") is not None:
+            pack_key = os.path.join("PAYLOAD_PACK", block_id)
+            payload = get_range(location, pack_key, loaded_txn["payload_offset"], loaded_txn["payload_length"])
+            loaded_txn["txn"]["payload"] = json.loads(payload.decode("utf-8"))
+        else:
+            # Blocks stored before payload packs existed have one payload object per transaction
+            payload_key = os.path.join("PAYLOADS", txn_id)
+            if does_object_exist(location, payload_key):
+                loaded_txn["txn"]["payload"] = json.loads(get(location, payload_key).decode("utf-8"))
+            else:
+                loaded_txn["txn"]["payload"] = json.dumps({})
+    return loaded_txn["txn"]
+
+
 def select_transaction(location: str, block_id: str, txn_id: str) -> dict:
     block_id = process_key(block_id)
+    transaction_key = os.path.join("TRANSACTION", block_id)
+    try:
+        transaction_index = _get_transaction_index(location, block_id)
+    except exceptions.NotFound:
+        transaction_index = None
+    if transaction_index is not None:
+        if txn_id not in transaction_index:
+            raise exceptions.NotFound
+        offset, length = transaction_index[txn_id]
+        loaded_txn = json.loads(get_range(location, transaction_key, offset, length).decode("utf-8"))
+        return _load_payload(location, block_id, txn_id, loaded_txn)
+
+    # Blocks stored before transaction indexes existed must be scanned
     # Unfortunately, we can't cache this get due to recursive imports
     # If it is possible, this should be revisited
-    obj = get(location, os.path.join("TRANSACTION", block_id)).decode("utf8")
+    obj = get(location, transaction_key).decode("utf8")
     transactions = obj.split("\n")
     for transaction in transactions:
         try:
             loaded_txn = json.loads(transaction)
             if loaded_txn["txn_id"] == txn_id:
-                if loaded_txn.get("stripped_payload"):
-                    payload_key = os.path.join("PAYLOADS", txn_id)
-                    if does_object_exist(location, payload_key):
-                        loaded_txn["txn"]["payload"] = json.loads(get(location, payload_key).decode("utf-8"))
-                    else:
-                        loaded_txn["txn"]["payload"] = json.dumps({})
-                return loaded_txn["txn"]
+                return _load_payload(location, block_id, txn_id, loaded_txn)
         except Exception:
             _log.exception("Error loading retrieved transaction from disk select_transaction")
     raise exceptions.NotFound
@@ -120,7 +187,7 @@ def list_objects(location: str, prefix: str) -> List[str]:
     for root, _, files in os.walk(base):
         for name in files:
             key = os.path.relpath(os.path.join(root, name), location)
-            if key.startswith(prefix):
+            if key.startswith(prefix) and not key.endswith(TEMP_FILE_SUFFIX):
                 prefixed_keys.append(key)
     return prefixed_keys
 
@@ -17,7 +17,7 @@
 
 import os
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch, mock_open, call, MagicMock
 
 from dragonchain import test_env  # noqa: F401
 from dragonchain import exceptions
@@ -42,11 +42,47 @@ class TestDiskInterface(unittest.TestCase):
     def test_get_throws_notfound_on_filenotfound(self, mock_file):
         self.assertRaises(exceptions.NotFound, disk.get, "loc", "key")
 
+    @patch("builtins.open", new_callable=mock_open, read_data=b"data")
+    def test_get_range_seeks_and_reads_length(self, mock_file):
+        disk.get_range("loc", "key", 10, 4)
+        mock_file.assert_called_once_with(os.path.join("loc", "key"), "rb")
+        mock_file.return_value.seek.assert_called_once_with(10)
+        mock_file.return_value.read.assert_called_once_with(4)
+
+    @patch("builtins.open", side_effect=FileNotFoundError)
+    def test_get_range_throws_notfound_on_filenotfound(self, mock_file):
+        self.assertRaises(exceptions.NotFound, disk.get_range, "loc", "key", 0, 1)
+
+    @patch("dragonchain.lib.interfaces.local.disk.uuid.uuid4", return_value=MagicMock(hex="abc"))
+    @patch("dragonchain.lib.interfaces.local.disk.os.replace")
     @patch("builtins.open", new_callable=mock_open)
-    def test_put_opens_correct_file(self, mock_file):
+    def test_put_writes_temp_file_then_moves_it_to_key(self, mock_file, mock_replace, mock_uuid):
         path = os.path.join("loc", "key")
         disk.put("loc", "key", b"data")
-        mock_file.assert_called_once_with(path, "wb")
+        mock_file.assert_called_once_with(f"{path}.abc.put-tmp", "wb")
+        mock_file.return_value.__exit__.assert_called_once()
+        mock_replace.assert_called_once_with(f"{path}.abc.put-tmp", path)
+
+    @patch("dragonchain.lib.interfaces.local.disk.os.replace")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_put_stream_writes_each_chunk(self, mock_file, mock_replace):
+        disk.put_stream("loc", "key", [b"da", b"ta"])
+        mock_file.return_value.write.assert_has_calls([call(b"da"), call(b"ta")])
+        mock_replace.assert_called_once()
+
+    @patch("dragonchain.lib.interfaces.local.disk.uuid.uuid4", return_value=MagicMock(hex="abc"))
+    @patch("dragonchain.lib.interfaces.local.disk.os.remove")
+    @patch("dragonchain.lib.interfaces.local.disk.os.replace")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_put_stream_closes_and_removes_temp_file_when_chunks_fail(self, mock_file, mock_replace, mock_remove, mock_uuid):
+        def chunks():
+            yield b"da"
+            raise RuntimeError("stream failed")
+
+        self.assertRaises(RuntimeError, disk.put_stream, "loc", "key", chunks())
+        mock_file.return_value.__exit__.assert_called_once()
+        mock_replace.assert_not_called()
+        mock_remove.assert_called_once_with(f"{os.path.join('loc', 'key')}.abc.put-tmp")
 
     @patch("builtins.open", side_effect=NotADirectoryError)
     @patch("dragonchain.lib.interfaces.local.disk.os.makedirs")
@@ -66,18 +102,48 @@ class TestDiskInterface(unittest.TestCase):
         mock_walk.assert_called_once()
         self.assertEqual(mock_rm_dir.call_count, 2)
 
+    @patch("dragonchain.lib.interfaces.local.disk._get_transaction_index", side_effect=exceptions.NotFound)
     @patch("dragonchain.lib.interfaces.local.disk.get", return_value=b'{"txn_id":"mock","txn":{"da":"ta"}}\n')
-    def test_select_transaction_parses_txn_id(self, mock_get):
+    def test_select_transaction_parses_txn_id(self, mock_get, mock_get_index):
         self.assertEqual(disk.select_transaction("loc", "block", "mock"), {"da": "ta"})
 
+    @patch("dragonchain.lib.interfaces.local.disk._get_transaction_index", side_effect=exceptions.NotFound)
+    @patch("dragonchain.lib.interfaces.local.disk.get_range", return_value=b'"payload"')
+    @patch(
+        "dragonchain.lib.interfaces.local.disk.get",
+        return_value=b'{"txn_id":"mock","stripped_payload":true,"payload_offset":3,"payload_length":9,"txn":{"da":"ta"}}\n',
+    )
+    def test_select_transaction_reads_payload_from_payload_pack(self, mock_get, mock_get_range, mock_get_index):
+        self.assertEqual(disk.select_transaction("loc", "block", "mock"), {"da": "ta", "payload": "payload"})
+        mock_get_range.assert_called_once_with("loc", os.path.join("PAYLOAD_PACK", "block"), 3, 9)
+
+    @patch("dragonchain.lib.interfaces.local.disk._get_transaction_index", side_effect=exceptions.NotFound)
     @patch("dragonchain.lib.interfaces.local.disk.get", return_value=b'{"txn_id":"mock","txn":{"da":"ta"}}\n')
-    def test_select_transaction_returns_not_found(self, mock_get):
+    def test_select_transaction_returns_not_found(self, mock_get, mock_get_index):
         self.assertRaises(exceptions.NotFound, disk.select_transaction, "loc", "block", "bogus")
 
+    @patch("dragonchain.lib.interfaces.local.disk._get_transaction_index", return_value={"mock": [20, 35]})
+    @patch("dragonchain.lib.interfaces.local.disk.get_range", return_value=b'{"txn_id":"mock","txn":{"da":"ta"}}')
+    @patch("dragonchain.lib.interfaces.local.disk.get")
+    def test_select_transaction_uses_transaction_index(self, mock_get, mock_get_range, mock_get_index):
+        self.assertEqual(disk.select_transaction("loc", "block", "mock"), {"da": "ta"})
+        mock_get_range.assert_called_once_with("loc", os.path.join("TRANSACTION", "block"), 20, 35)
+        mock_get.assert_not_called()
+
+    @patch("dragonchain.lib.interfaces.local.disk._get_transaction_index", return_value={"mock": [20, 35]})
+    @patch("dragonchain.lib.interfaces.local.disk.get")
+    def test_select_transaction_returns_not_found_when_not_in_index(self, mock_get, mock_get_index):
+        self.assertRaises(exceptions.NotFound, disk.select_transaction, "loc", "block", "bogus")
+        mock_get.assert_not_called()
+
     @patch("dragonchain.lib.interfaces.local.disk.os.walk", return_value=[("path", ("obj",), ("obj1",)), ("path/obj", (), ("obj2",))])
     def test_list_objects_returns_correct_objects(self, mock_walk):
         self.assertEqual(disk.list_objects("path", "obj"), ["obj1", os.path.join("obj", "obj2")])
 
+    @patch("dragonchain.lib.interfaces.local.disk.os.walk", return_value=[("path", (), ("obj1", "obj2.abc.put-tmp"))])
+    def test_list_objects_skips_temp_files_being_written(self, mock_walk):
+        self.assertEqual(disk.list_objects("path", "obj"), ["obj1"])
+
     @patch("dragonchain.lib.interfaces.local.disk.os.path.isdir")
     def test_does_superkey_exit_calls_isdir_with_correct_params(self, mock_isdir):
         disk.does_superkey_exist("loc", "thing")
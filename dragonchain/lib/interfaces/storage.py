@@ -18,7 +18,7 @@
 import os
 import json
 import time
-from typing import Optional, List, Any, TYPE_CHECKING
+from typing import Optional, Iterable, List, Any, TYPE_CHECKING
 
 from dragonchain import logger
 from dragonchain import exceptions
@@ -90,6 +90,22 @@ def put(key: str, value: bytes, cache_expire: Optional[int] = None, should_cache
         raise exceptions.StorageError("Uncaught exception while performing storage put")
 
 
+def put_stream(key: str, chunks: Iterable[bytes]) -> None:
+    """Puts an object into storage from an iterable of byte chunks without building the whole object in memory
+    Note: Streamed objects do not write-thru to the cache
+    Args:
+        key: The key of the object being written in storage
+        chunks: Iterable of bytes which make up the object when concatenated
+    Raises:
+        exceptions.StorageError on any unexpected error interacting with storage
+    """
+    try:
+        storage.put_stream(STORAGE_LOCATION, key, chunks)
+    except Exception:
+        _log.exception("Uncaught exception while performing storage put_stream")
+        raise exceptions.StorageError("Uncaught exception while performing storage put_stream")
+
+
 def delete(key: str) -> None:
     """Deletes an object in storage with cache write-thru
     Args:
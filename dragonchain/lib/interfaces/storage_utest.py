@@ -82,6 +82,18 @@ class TestStorageInterface(unittest.TestCase):
         storage.put("thing", b"val")
         storage.redis.cache_put.assert_called_once_with("thing", b"val", None)
 
+    def test_put_stream_calls_storage_put_stream_with_params(self):
+        storage.put_stream("thing", [b"v", b"al"])
+        storage.storage.put_stream.assert_called_once_with("test", "thing", [b"v", b"al"])
+
+    def test_put_stream_raises_storage_error(self):
+        storage.storage.put_stream = MagicMock(side_effect=RuntimeError)
+        self.assertRaises(exceptions.StorageError, storage.put_stream, "thing", [b"val"])
+
+    def test_put_stream_does_not_cache(self):
+        storage.put_stream("thing", [b"val"])
+        storage.redis.cache_put.assert_not_called()
+
     def test_delete_calls_storage_delete_with_params(self):
         storage.delete("thing")
         storage.storage.delete.assert_called_once_with("test", "thing")
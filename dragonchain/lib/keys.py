@@ -17,16 +17,22 @@
 
 import os
 import enum
+import time
 import base64
-from typing import cast, Tuple, Optional, TYPE_CHECKING
+import threading
+import concurrent.futures
+from typing import cast, Iterable, Set, Tuple, Optional, TYPE_CHECKING
 
 import base58
 import secp256k1
 
 from dragonchain.lib import crypto
+from dragonchain.lib import pow_engine
 from dragonchain.lib import matchmaking
+from dragonchain.lib import ttl_cache
 from dragonchain.lib.interfaces import secrets
 from dragonchain import exceptions
+from dragonchain import logger
 
 if TYPE_CHECKING:
     from dragonchain.lib.dto import model
@@ -41,10 +47,20 @@ LEVEL = os.environ["LEVEL"]
 PROOF_SCHEME = os.environ["PROOF_SCHEME"]
 HASH = os.environ["HASH"]
 ENCRYPTION = os.environ["ENCRYPTION"]
+# Seconds to keep other chains' verifying keys in memory, and how old they can get before being refreshed in the background
+VERIFYING_KEYS_CACHE_TTL = int(os.environ.get("VERIFYING_KEYS_CACHE_TTL") or "3600")
+VERIFYING_KEYS_REFRESH_AFTER = int(os.environ.get("VERIFYING_KEYS_REFRESH_AFTER") or str(VERIFYING_KEYS_CACHE_TTL * 4 // 5))
+# Maximum number of chains whose keys/registrations are fetched at the same time when prefetching
+VERIFYING_KEYS_PREFETCH_CONCURRENCY = int(os.environ.get("VERIFYING_KEYS_PREFETCH_CONCURRENCY") or "10")
 
 
+_log = logger.get_logger()
+
 _my_keys = None
 _public_id = ""
+_verifying_keys = ttl_cache.TTLCache(ttl=VERIFYING_KEYS_CACHE_TTL, maxsize=1024)
+_refreshing: Set[str] = set()
+_refreshing_lock = threading.Lock()
 
 
 def get_public_id() -> str:
@@ -73,6 +89,91 @@ def get_my_keys() -> "DCKeys":
     return _my_keys
 
 
+def get_verifying_keys(dc_id: str) -> "DCKeys":
+    """Cached retrieval of another chain's keys for verifying its blocks/transactions
+    Keys are cached in memory (backed by the redis registration cache), and refreshed in the background once they get old
+    Args:
+        dc_id: chain id to get keys for
+    Returns:
+        DCKeys for the chain (shared, should not be modified)
+    Raises:
+        exceptions.NotFound if the chain is not registered with matchmaking (this is also cached)
+    """
+    entry = _verifying_keys.get(dc_id)
+    if entry is None:
+        return _load_verifying_keys(dc_id, refresh=False)
+    chain_keys, loaded_at = entry
+    if time.monotonic() - loaded_at >= VERIFYING_KEYS_REFRESH_AFTER:
+        _refresh_verifying_keys_in_background(dc_id)
+    if chain_keys is None:
+        raise exceptions.NotFound(f"Registration not found for {dc_id}")
+    return chain_keys
+
+
+def prefetch_verifying_keys(dc_ids: Iterable[str]) -> None:
+    """Concurrently load the verifying keys (and cached registrations) of any of these chains which aren't cached yet
+    Failures are only logged here; they are raised again when the keys are actually used
+    Args:
+        dc_ids: chain ids which are about to be verified (duplicates are fine)
+    """
+    missing = {dc_id for dc_id in dc_ids if _verifying_keys.get(dc_id) is None}
+    if not missing:
+        return
+    _log.info(f"Prefetching verifying keys for {len(missing)} chains")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(missing), VERIFYING_KEYS_PREFETCH_CONCURRENCY)) as executor:
+        futures = {dc_id: executor.submit(_load_verifying_keys, dc_id, False) for dc_id in missing}
+        for dc_id, future in futures.items():
+            try:
+                future.result()
+            except exceptions.NotFound:
+                pass
+            except Exception:
+                _log.exception(f"Failed to prefetch verifying keys for {dc_id}")
+
+
+def invalidate_verifying_keys(dc_id: str) -> None:
+    """Remove a chain's keys from the cache (i.e. after a failed signature check) so they are fetched fresh next time"""
+    _log.info(f"Invalidating cached verifying keys for {dc_id}")
+    _verifying_keys.invalidate(dc_id)
+    matchmaking.invalidate_cached_registration(dc_id)
+
+
+def _load_verifying_keys(dc_id: str, refresh: bool) -> "DCKeys":
+    loaded_at = time.monotonic()
+    try:
+        identity = matchmaking.get_registration_cached(dc_id, refresh=refresh)
+    except exceptions.NotFound:
+        _verifying_keys.set(dc_id, (None, loaded_at), ttl=matchmaking.REGISTRATION_NEGATIVE_CACHE_TTL)
+        raise
+    chain_keys = DCKeys(pull_keys=False).initialize(
+        level=int(identity["level"]),
+        scheme=identity["proofScheme"],
+        public_key_string=dc_id,
+        hash_type=identity["hashAlgo"],
+        encryption=identity["encryptionAlgo"],
+    )
+    _verifying_keys.set(dc_id, (chain_keys, loaded_at))
+    return chain_keys
+
+
+def _refresh_verifying_keys_in_background(dc_id: str) -> None:
+    with _refreshing_lock:
+        if dc_id in _refreshing:
+            return
+        _refreshing.add(dc_id)
+    threading.Thread(target=_refresh_verifying_keys, args=(dc_id,), daemon=True).start()
+
+
+def _refresh_verifying_keys(dc_id: str) -> None:
+    try:
+        _load_verifying_keys(dc_id, refresh=True)
+    except Exception:
+        _log.exception(f"Failed to refresh verifying keys for {dc_id}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(dc_id)
+
+
 class SupportedSchemes(enum.Enum):
     trust = 1
     work = 2
@@ -305,15 +406,16 @@ class DCKeys(object):
             exceptions.InvalidNodeLevel when invalid level on self
         """
         if self.level == 1:
-            return crypto.pow_l1_block(self.hash, cast("l1_block_model.L1BlockModel", signable_block))
+            parts = crypto.get_l1_block_pow_parts(cast("l1_block_model.L1BlockModel", signable_block))
         elif self.level == 2:
-            return crypto.pow_l2_block(self.hash, cast("l2_block_model.L2BlockModel", signable_block))
+            parts = crypto.get_l2_block_pow_parts(cast("l2_block_model.L2BlockModel", signable_block))
         elif self.level == 3:
-            return crypto.pow_l3_block(self.hash, cast("l3_block_model.L3BlockModel", signable_block))
+            parts = crypto.get_l3_block_pow_parts(cast("l3_block_model.L3BlockModel", signable_block))
         elif self.level == 4:
-            return crypto.pow_l4_block(self.hash, cast("l4_block_model.L4BlockModel", signable_block))
+            parts = crypto.get_l4_block_pow_parts(cast("l4_block_model.L4BlockModel", signable_block))
         else:
             raise exceptions.InvalidNodeLevel(f"Node level {self.level} not implemented yet")
+        return pow_engine.proof_of_work(self.hash, parts)
 
     def verify_block(self, block: "model.BlockModel") -> bool:  # noqa: C901
         """Verify a block with this class' keys
@@ -0,0 +1,92 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import unittest
+from unittest.mock import patch
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain import exceptions
+from dragonchain.lib import keys
+
+registration = {"level": "1", "proofScheme": "trust", "hashAlgo": "blake2b", "encryptionAlgo": "secp256k1"}
+chain_id = "28VhSgtPhwkhKBgmQSW6vrsir7quEYHdCjqsW6aAYbfrw"
+
+
+class TestVerifyingKeys(unittest.TestCase):
+    def tearDown(self):
+        keys._verifying_keys.clear()
+
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", return_value=registration)
+    def test_get_verifying_keys_only_loads_once(self, mock_registration):
+        chain_keys = keys.get_verifying_keys(chain_id)
+        self.assertIs(keys.get_verifying_keys(chain_id), chain_keys)
+        mock_registration.assert_called_once_with(chain_id, refresh=False)
+        self.assertEqual(chain_keys.level, 1)
+        self.assertIsNotNone(chain_keys.pub)
+
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", side_effect=exceptions.NotFound)
+    def test_get_verifying_keys_caches_unregistered_chains(self, mock_registration):
+        self.assertRaises(exceptions.NotFound, keys.get_verifying_keys, chain_id)
+        self.assertRaises(exceptions.NotFound, keys.get_verifying_keys, chain_id)
+        mock_registration.assert_called_once()
+
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", side_effect=RuntimeError)
+    def test_get_verifying_keys_does_not_cache_errors(self, mock_registration):
+        self.assertRaises(RuntimeError, keys.get_verifying_keys, chain_id)
+        self.assertRaises(RuntimeError, keys.get_verifying_keys, chain_id)
+        self.assertEqual(mock_registration.call_count, 2)
+
+    @patch("dragonchain.lib.keys.matchmaking.invalidate_cached_registration")
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", return_value=registration)
+    def test_invalidate_verifying_keys_removes_from_caches(self, mock_registration, mock_invalidate_registration):
+        keys.get_verifying_keys(chain_id)
+        keys.invalidate_verifying_keys(chain_id)
+        keys.get_verifying_keys(chain_id)
+        mock_invalidate_registration.assert_called_once_with(chain_id)
+        self.assertEqual(mock_registration.call_count, 2)
+
+    @patch("dragonchain.lib.keys.VERIFYING_KEYS_REFRESH_AFTER", 0)
+    @patch("dragonchain.lib.keys._refresh_verifying_keys_in_background")
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", return_value=registration)
+    def test_get_verifying_keys_refreshes_old_keys_in_background(self, mock_registration, mock_refresh):
+        chain_keys = keys.get_verifying_keys(chain_id)
+        self.assertIs(keys.get_verifying_keys(chain_id), chain_keys)
+        mock_refresh.assert_called_once_with(chain_id)
+
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", return_value=registration)
+    def test_refresh_verifying_keys_bypasses_redis_cache(self, mock_registration):
+        keys._refreshing.add(chain_id)
+        keys._refresh_verifying_keys(chain_id)
+        mock_registration.assert_called_once_with(chain_id, refresh=True)
+        self.assertNotIn(chain_id, keys._refreshing)
+
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", return_value=registration)
+    def test_prefetch_verifying_keys_loads_each_missing_chain_once(self, mock_registration):
+        keys.prefetch_verifying_keys([chain_id, chain_id])
+        mock_registration.assert_called_once_with(chain_id, refresh=False)
+        self.assertIsNotNone(keys.get_verifying_keys(chain_id))
+        mock_registration.assert_called_once()
+
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", return_value=registration)
+    def test_prefetch_verifying_keys_skips_cached_chains(self, mock_registration):
+        keys.get_verifying_keys(chain_id)
+        keys.prefetch_verifying_keys([chain_id])
+        mock_registration.assert_called_once()
+
+    @patch("dragonchain.lib.keys.matchmaking.get_registration_cached", side_effect=RuntimeError)
+    def test_prefetch_verifying_keys_does_not_raise(self, mock_registration):
+        keys.prefetch_verifying_keys([chain_id])
+        mock_registration.assert_called_once()
@@ -17,7 +17,10 @@
 
 import os
 import json
+import asyncio
+from typing import Any, NoReturn, Optional
 
+import aiohttp
 import requests
 
 from dragonchain.lib import authorization
@@ -34,6 +37,11 @@ STAGE = os.environ["STAGE"]
 REREGISTER_TIMING_KEY = "matchmaking:registration-still-current"
 REREGISTER_TIME_AMOUNT = 1500  # 25 Min (Matchmaking forgets every 30)
 REQUEST_TIMEOUT = 30
+REGISTRATION_CACHE_KEY = "matchmaking:registration"
+REGISTRATION_CACHE_TTL = int(os.environ.get("REGISTRATION_CACHE_TTL") or "3600")  # Seconds to cache other chains' registrations in redis
+REGISTRATION_NEGATIVE_CACHE_TTL = int(os.environ.get("REGISTRATION_NEGATIVE_CACHE_TTL") or "60")  # Seconds to remember unregistered chains
+# Maximum number of concurrent connections the async client makes to matchmaking
+MATCHMAKING_CONNECTION_LIMIT = int(os.environ.get("MATCHMAKING_CONNECTION_LIMIT") or "20")
 if STAGE == "prod":
     MATCHMAKING_ADDRESS = "https://matchmaking.api.dragonchain.com"
 else:
@@ -42,6 +50,8 @@ else:
 
 _log = logger.get_logger()
 
+_async_session: Optional[aiohttp.ClientSession] = None
+
 
 def get_dragonchain_address(dragonchain_id: str) -> str:
     """Return the endpoint for a particular dragonchain
@@ -157,6 +167,38 @@ def get_registration(dc_id: str) -> dict:
     return registration
 
 
+def get_registration_cached(dc_id: str, refresh: bool = False) -> dict:
+    """Retrieve matchmaking config for any registered chain, using a redis cache shared by all processes
+    Unregistered chains are also cached (for a shorter time) so they aren't requested from matchmaking every time
+    Args:
+        dc_id: chain id to get registration data for
+        refresh: if True, ignore any cached value and update the cache from matchmaking
+    Returns:
+        Dictionary of the identity json returned by matchmaking
+    Raises:
+        exceptions.NotFound if the chain is not registered
+    """
+    key = f"{REGISTRATION_CACHE_KEY}:{dc_id}"
+    cached = None if refresh else redis.get_sync(key)
+    if cached is not None:
+        registration = json.loads(cached)
+        if not registration:
+            raise exceptions.NotFound(f"Registration not found for {dc_id}")
+        return registration
+    try:
+        registration = get_registration(dc_id)
+    except exceptions.NotFound:
+        redis.set_sync(key, "{}", ex=REGISTRATION_NEGATIVE_CACHE_TTL)
+        raise
+    redis.set_sync(key, json.dumps(registration, separators=(",", ":")), ex=REGISTRATION_CACHE_TTL)
+    return registration
+
+
+def invalidate_cached_registration(dc_id: str) -> None:
+    """Remove a chain's registration from the redis cache"""
+    redis.delete_sync(f"{REGISTRATION_CACHE_KEY}:{dc_id}")
+
+
 def update_registration(new_data: dict) -> None:
     try:
         _log.info(f"[MATCHMAKING] Putting matchmaking config in storage: {new_data}")
@@ -262,6 +304,81 @@ def update_claim_check(block_id: str, data: dict) -> dict:
     return claim_check
 
 
+async def create_claim_check_async(block_id: str, requirements: dict) -> dict:
+    """Call matchmaking to create a claimcheck for a block without blocking the event loop
+    Args:
+        block_id: block id to create a claim check for
+        requirements: requirements dict for this chain
+    Returns:
+        Parsed claim check (as dict) from matchmaking
+    """
+    broadcast_dto = await asyncio.get_event_loop().run_in_executor(None, block_dao.get_broadcast_dto, 2, block_id)
+    transaction_count = len(broadcast_dto["payload"]["transactions"])
+    claim_request_dto = get_claim_request_dto(requirements, block_id, transaction_count)
+    claim_check = await make_matchmaking_request_async("POST", "/claim-check", claim_request_dto)
+    await cache_claim_check_async(block_id, claim_check)
+    return claim_check
+
+
+async def get_claim_check_async(block_id: str) -> dict:
+    """Get a claim check that already exists (memoized) without blocking the event loop
+    Args:
+        block_id: the block id of the claim check to fetch
+    Returns:
+        Parsed claim check (as dict)
+    """
+    claim_check = await redis.hget_async("broadcast:claimcheck", block_id)
+    if claim_check is not None:
+        return json.loads(claim_check)
+    path = f"/claim-check?blockId={block_id}&dcId={keys.get_public_id()}"
+    new_claim_check = await make_matchmaking_request_async("GET", path)
+    await cache_claim_check_async(block_id, new_claim_check)
+    return new_claim_check
+
+
+async def get_or_create_claim_check_async(block_id: str, requirements: dict) -> dict:
+    """Get a claim check for a block if it already exists, else create a new one, without blocking the event loop
+    Args:
+        block_id: block_id for the claim check
+        requirements: requirements for the claim check (if it needs to create one)
+    Returns:
+        Dict of claim check
+    """
+    try:
+        return await get_claim_check_async(block_id)
+    except Exception:  # nosec (We don't care why getting a claim check failed, we will simply request a new one from matchmaking)
+        pass
+    return await create_claim_check_async(block_id, requirements)
+
+
+async def overwrite_no_response_node_async(block_id: str, higher_level: int, higher_level_node: str) -> dict:
+    """Update a claim check which has had a node that didn't respond in time, without blocking the event loop
+    Args:
+        block_id: The block id for the claim that needs to be updated
+        higher_level: the level of the node to replace
+        higher_level_node: the id of the node to replace
+    Returns:
+        Updated claim check
+    """
+    claim = await get_claim_check_async(block_id)
+    body = get_overwrite_no_response_dto(claim, higher_level_node, higher_level)
+    return await update_claim_check_async(block_id, body)
+
+
+async def update_claim_check_async(block_id: str, data: dict) -> dict:
+    """Update a claim check that already exists without blocking the event loop
+    Args:
+        block_id: block id of the claim check to update
+        data: to update the claim check with
+    Returns:
+        Updated claim check from matchmaking
+    """
+    path = f"/claim-check/{keys.get_public_id()}-{block_id}"
+    claim_check = await make_matchmaking_request_async("PUT", path, data)
+    await cache_claim_check_async(block_id, claim_check)
+    return claim_check
+
+
 def add_receipt(l1_block_id: str, level: int, dc_id: str, block_id: str, proof: str) -> None:
     """Add a receipt to a claim check and cache the new claim check
     Args:
@@ -333,21 +450,98 @@ def make_matchmaking_request(
             )
             register(retry=False)
             return make_matchmaking_request(http_verb=http_verb, path=path, json_content=json_content, retry=False, authenticated=authenticated)
-        elif response.status_code == 402:
-            raise exceptions.InsufficientFunds("received insufficient funds (402) from matchmaking")
-        elif response.status_code == 404:
-            raise exceptions.NotFound("Not found (404) from matchmaking")
-        elif response.status_code == 409:
-            raise exceptions.UnableToUpdate("Matchmaking could not find enough nodes to verify this block")
-        elif response.status_code >= 500:
-            raise exceptions.MatchmakingRetryableError(f"[MATCHMAKING] Server error {response.status_code} from matchmaking")
-        raise exceptions.MatchmakingError(
-            f"Received unexpected response code {response.status_code} from matchmaking with response:\n{response.text}"
-        )
+        _raise_matchmaking_error(response.status_code, response.text)
 
     return response
 
 
+async def make_matchmaking_request_async(http_verb: str, path: str, json_content: dict = None, retry: bool = True, authenticated: bool = True) -> Any:
+    """Make an authenticated request to matchmaking with the shared aiohttp session and return the parsed response
+    Args:
+        http_verb: GET, POST, etc
+        path: path of the request
+        json_content: OPTIONAL if the request needs a post body, include it as a dictionary
+        retry: boolean whether or not to recursively retry on recoverable errors (i.e. no auth, missing registration)
+            Note: This should not be provided manually, and is only for recursive calls within the function it
+        authenticated: boolean whether or not this matchmaking endpoint is authenticated
+    Returns:
+        Parsed json body of the response (None if the response had no body)
+    Raises:
+        exceptions.MatchmakingError when unexpected matchmaking error occurs
+        exceptions.InsufficientFunds when matchmaking responds with payment required
+        exceptions.NotFound when matchmaking responds with a 404
+    """
+    if json_content is None:
+        json_content = {}
+    http_verb = http_verb.upper()
+    _log.info(f"[MATCHMAKING] Performing async {http_verb} request to {path} with data: {json_content}")
+    headers, data = None, None
+    if authenticated:
+        headers, data = authorization.generate_authenticated_request(http_verb, "matchmaking", path, json_content)
+    else:
+        data = json.dumps(json_content, separators=(",", ":")).encode("utf-8") if json_content else b""
+        headers = {"Content-Type": "application/json"} if json_content else {}
+
+    async with _get_async_session().request(http_verb, f"{MATCHMAKING_ADDRESS}{path}", headers=headers, data=data) as response:
+        status_code = response.status
+        text = await response.text()
+
+    if status_code < 200 or status_code >= 300:
+        # Re-registering is rare, so it's done with the synchronous client off of the event loop
+        if retry and status_code == 401 and authenticated:
+            _log.warning("[MATCHMAKING] received 401 from matchmaking. Registering new key with matchmaking and trying again")
+            await asyncio.get_event_loop().run_in_executor(None, authorization.register_new_key_with_matchmaking)
+            return await make_matchmaking_request_async(
+                http_verb=http_verb, path=path, json_content=json_content, retry=False, authenticated=authenticated
+            )
+        elif retry and status_code == 403 and authenticated:
+            _log.warning(
+                "[MATCHMAKING] received 403 from matchmaking. Registration is expired or Dragon Net config is invalid. Re-registering and trying again"
+            )
+            await asyncio.get_event_loop().run_in_executor(None, register, False)
+            return await make_matchmaking_request_async(
+                http_verb=http_verb, path=path, json_content=json_content, retry=False, authenticated=authenticated
+            )
+        _raise_matchmaking_error(status_code, text)
+
+    return json.loads(text) if text else None
+
+
+def _raise_matchmaking_error(status_code: int, text: str) -> NoReturn:
+    """Raise the appropriate exception for an unsuccessful (non-retried) matchmaking response
+    Args:
+        status_code: http status code of the response
+        text: body of the response
+    """
+    if status_code == 402:
+        raise exceptions.InsufficientFunds("received insufficient funds (402) from matchmaking")
+    elif status_code == 404:
+        raise exceptions.NotFound("Not found (404) from matchmaking")
+    elif status_code == 409:
+        raise exceptions.UnableToUpdate("Matchmaking could not find enough nodes to verify this block")
+    elif status_code >= 500:
+        raise exceptions.MatchmakingRetryableError(f"[MATCHMAKING] Server error {status_code} from matchmaking")
+    raise exceptions.MatchmakingError(f"Received unexpected response code {status_code} from matchmaking with response:\n{text}")
+
+
+def _get_async_session() -> aiohttp.ClientSession:
+    """Get the aiohttp session (with a pool of up to MATCHMAKING_CONNECTION_LIMIT connections) shared by async matchmaking requests"""
+    global _async_session
+    if _async_session is None or _async_session.closed:
+        _async_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MATCHMAKING_CONNECTION_LIMIT), timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        )
+    return _async_session
+
+
+async def close_async_session() -> None:
+    """Close the aiohttp session shared by async matchmaking requests, if one is open"""
+    global _async_session
+    if _async_session is not None:
+        await _async_session.close()
+        _async_session = None
+
+
 def cache_claim_check(block_id: str, claim_check: dict) -> None:
     """Cache a claim check in redis
     Args:
@@ -358,3 +552,15 @@ def cache_claim_check(block_id: str, claim_check: dict) -> None:
         redis.hset_sync("broadcast:claimcheck", str(block_id), json.dumps(claim_check, separators=(",", ":")))
     except Exception:
         _log.exception("Failure uploading claim to storage")
+
+
+async def cache_claim_check_async(block_id: str, claim_check: dict) -> None:
+    """Cache a claim check in redis without blocking the event loop
+    Args:
+        block_id: the block id of the claim check that's being cached
+        claim_check: the actual claim check to cache
+    """
+    try:
+        await redis.hset_async("broadcast:claimcheck", str(block_id), json.dumps(claim_check, separators=(",", ":")))
+    except Exception:
+        _log.exception("Failure uploading claim to storage")
@@ -0,0 +1,122 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain import exceptions
+from dragonchain.lib import matchmaking
+
+
+class TestRegistrationCache(unittest.TestCase):
+    @patch("dragonchain.lib.matchmaking.get_registration")
+    @patch("dragonchain.lib.matchmaking.redis.get_sync", return_value='{"level":"2"}')
+    def test_get_registration_cached_uses_redis(self, mock_get, mock_registration):
+        self.assertEqual(matchmaking.get_registration_cached("chain"), {"level": "2"})
+        mock_get.assert_called_once_with("matchmaking:registration:chain")
+        mock_registration.assert_not_called()
+
+    @patch("dragonchain.lib.matchmaking.redis.set_sync")
+    @patch("dragonchain.lib.matchmaking.get_registration", return_value={"level": "2"})
+    @patch("dragonchain.lib.matchmaking.redis.get_sync", return_value=None)
+    def test_get_registration_cached_sets_redis_on_miss(self, mock_get, mock_registration, mock_set):
+        self.assertEqual(matchmaking.get_registration_cached("chain"), {"level": "2"})
+        mock_set.assert_called_once_with("matchmaking:registration:chain", '{"level":"2"}', ex=matchmaking.REGISTRATION_CACHE_TTL)
+
+    @patch("dragonchain.lib.matchmaking.redis.set_sync")
+    @patch("dragonchain.lib.matchmaking.get_registration", side_effect=exceptions.NotFound)
+    @patch("dragonchain.lib.matchmaking.redis.get_sync", return_value=None)
+    def test_get_registration_cached_caches_not_found(self, mock_get, mock_registration, mock_set):
+        self.assertRaises(exceptions.NotFound, matchmaking.get_registration_cached, "chain")
+        mock_set.assert_called_once_with("matchmaking:registration:chain", "{}", ex=matchmaking.REGISTRATION_NEGATIVE_CACHE_TTL)
+
+    @patch("dragonchain.lib.matchmaking.get_registration")
+    @patch("dragonchain.lib.matchmaking.redis.get_sync", return_value="{}")
+    def test_get_registration_cached_raises_cached_not_found(self, mock_get, mock_registration):
+        self.assertRaises(exceptions.NotFound, matchmaking.get_registration_cached, "chain")
+        mock_registration.assert_not_called()
+
+    @patch("dragonchain.lib.matchmaking.redis.set_sync")
+    @patch("dragonchain.lib.matchmaking.get_registration", return_value={"level": "2"})
+    @patch("dragonchain.lib.matchmaking.redis.get_sync")
+    def test_get_registration_cached_refresh_skips_redis_read(self, mock_get, mock_registration, mock_set):
+        matchmaking.get_registration_cached("chain", refresh=True)
+        mock_get.assert_not_called()
+        mock_registration.assert_called_once_with("chain")
+
+
+def fake_response(status: int, text: str) -> MagicMock:
+    response = MagicMock(status=status, text=AsyncMock(return_value=text))
+    context = MagicMock(__aenter__=AsyncMock(return_value=response), __aexit__=AsyncMock(return_value=False))
+    return context
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    @patch("dragonchain.lib.matchmaking.authorization.generate_authenticated_request", return_value=({"auth": "header"}, b"body"))
+    @patch("dragonchain.lib.matchmaking._get_async_session")
+    async def test_make_matchmaking_request_async_returns_parsed_body(self, mock_session, mock_auth):
+        mock_session.return_value.request.return_value = fake_response(200, '{"claim":"check"}')
+        self.assertEqual(await matchmaking.make_matchmaking_request_async("get", "/claim-check"), {"claim": "check"})
+        mock_session.return_value.request.assert_called_once_with(
+            "GET", f"{matchmaking.MATCHMAKING_ADDRESS}/claim-check", headers={"auth": "header"}, data=b"body"
+        )
+
+    @patch("dragonchain.lib.matchmaking.authorization.generate_authenticated_request", return_value=({}, b""))
+    @patch("dragonchain.lib.matchmaking._get_async_session")
+    async def test_make_matchmaking_request_async_raises_matchmaking_errors(self, mock_session, mock_auth):
+        mock_session.return_value.request.return_value = fake_response(404, "")
+        with self.assertRaises(exceptions.NotFound):
+            await matchmaking.make_matchmaking_request_async("GET", "/claim-check")
+        mock_session.return_value.request.return_value = fake_response(409, "")
+        with self.assertRaises(exceptions.UnableToUpdate):
+            await matchmaking.make_matchmaking_request_async("GET", "/claim-check")
+
+    @patch("dragonchain.lib.matchmaking.authorization.register_new_key_with_matchmaking")
+    @patch("dragonchain.lib.matchmaking.authorization.generate_authenticated_request", return_value=({}, b""))
+    @patch("dragonchain.lib.matchmaking._get_async_session")
+    async def test_make_matchmaking_request_async_registers_new_key_on_401(self, mock_session, mock_auth, mock_register_key):
+        mock_session.return_value.request.side_effect = [fake_response(401, ""), fake_response(200, "")]
+        self.assertIsNone(await matchmaking.make_matchmaking_request_async("DELETE", "/claim-check/id"))
+        mock_register_key.assert_called_once()
+        self.assertEqual(mock_session.return_value.request.call_count, 2)
+
+    @patch("dragonchain.lib.matchmaking.make_matchmaking_request_async")
+    @patch("dragonchain.lib.matchmaking.redis.hget_async", return_value='{"cached":"claim"}')
+    async def test_get_or_create_claim_check_async_uses_cached_claim(self, mock_hget, mock_request):
+        self.assertEqual(await matchmaking.get_or_create_claim_check_async("block", {}), {"cached": "claim"})
+        mock_hget.assert_awaited_once_with("broadcast:claimcheck", "block")
+        mock_request.assert_not_called()
+
+    @patch("dragonchain.lib.matchmaking.cache_claim_check_async")
+    @patch("dragonchain.lib.matchmaking.make_matchmaking_request_async", return_value={"new": "claim"})
+    @patch("dragonchain.lib.matchmaking.get_claim_check_async", side_effect=exceptions.NotFound)
+    @patch("dragonchain.lib.matchmaking.block_dao.get_broadcast_dto", return_value={"payload": {"transactions": [1, 2]}})
+    async def test_get_or_create_claim_check_async_creates_missing_claim(self, mock_get_dto, mock_get_claim, mock_request, mock_cache):
+        self.assertEqual(await matchmaking.get_or_create_claim_check_async("block", {"l2": {}, "l3": {}, "l4": {}, "l5": {}}), {"new": "claim"})
+        mock_get_dto.assert_called_once_with(2, "block")
+        self.assertEqual(mock_request.call_args[0][:2], ("POST", "/claim-check"))
+        mock_cache.assert_awaited_once_with("block", {"new": "claim"})
+
+    @patch("dragonchain.lib.matchmaking.keys.get_public_id", return_value="my-id")
+    @patch("dragonchain.lib.matchmaking.cache_claim_check_async")
+    @patch("dragonchain.lib.matchmaking.make_matchmaking_request_async", return_value={"updated": "claim"})
+    @patch("dragonchain.lib.matchmaking.get_overwrite_no_response_dto", return_value={"dto": "body"})
+    @patch("dragonchain.lib.matchmaking.get_claim_check_async", return_value={"claim": "check"})
+    async def test_overwrite_no_response_node_async_updates_claim(self, mock_get_claim, mock_dto, mock_request, mock_cache, mock_id):
+        self.assertEqual(await matchmaking.overwrite_no_response_node_async("block", 3, "chain"), {"updated": "claim"})
+        mock_dto.assert_called_once_with({"claim": "check"}, "chain", 3)
+        mock_request.assert_awaited_once_with("PUT", "/claim-check/my-id-block", {"dto": "body"})
@@ -0,0 +1,205 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+
+import os
+import time
+import bisect
+import atexit
+import threading
+import contextlib
+from typing import Dict, Iterator, List, Tuple
+
+from dragonchain import logger
+
+# Directory to periodically write this process's metrics to (in prometheus text format) as <process>-<pid>.prom. Empty (default) disables writing
+METRICS_DIR = os.environ.get("METRICS_DIR") or ""
+# Seconds between writes of the metrics file
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL") or "15")
+LEVEL = os.environ.get("LEVEL") or ""
+# Upper bounds (in seconds) of the stage duration histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_log = logger.get_logger()
+
+_lock = threading.Lock()
+_process_name = "dragonchain"
+_flusher = None
+# {stage: [count per bucket (last is +Inf), sum of seconds, count]}
+_durations: Dict[str, list] = {}
+_items: Dict[str, float] = {}
+_items_per_second: Dict[str, float] = {}
+_queue_depths: Dict[str, float] = {}
+
+
+def observe(stage: str, seconds: float, items: int = 0) -> None:
+    """Record how long a processing stage took
+    Args:
+        stage: name of the stage (i.e. dequeue, verify, sign, build, upload, broadcast)
+        seconds: duration of the stage
+        items: number of items (transactions, blocks, etc) handled by the stage, if relevant
+    """
+    with _lock:
+        histogram = _durations.get(stage)
+        if histogram is None:
+            histogram = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+            _durations[stage] = histogram
+        histogram[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+        histogram[1] += seconds
+        histogram[2] += 1
+        if items:
+            _items[stage] = _items.get(stage, 0) + items
+            if seconds > 0:
+                _items_per_second[stage] = items / seconds
+
+
+@contextlib.contextmanager
+def timer(stage: str, items: int = 0) -> Iterator[None]:
+    """Context manager which records the duration of its body as a processing stage
+    Args:
+        stage: name of the stage
+        items: number of items handled by the stage, if relevant
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start, items)
+
+
+def set_queue_depth(queue_name: str, depth: int) -> None:
+    """Record the current number of items waiting in a queue
+    Args:
+        queue_name: name of the queue
+        depth: number of items in the queue
+    """
+    with _lock:
+        _queue_depths[queue_name] = depth
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+
+def render() -> str:
+    """Render the metrics of this process
+    Returns:
+        Metrics in the prometheus text exposition format
+    """
+    base = [("process", _process_name), ("pid", str(os.getpid())), ("level", LEVEL)]
+    with _lock:
+        durations = {stage: (list(histogram[0]), histogram[1], histogram[2]) for stage, histogram in _durations.items()}
+        items, items_per_second, queue_depths = dict(_items), dict(_items_per_second), dict(_queue_depths)
+    lines = [
+        "# HELP dragonchain_stage_duration_seconds Time spent in each processing stage",
+        "# TYPE dragonchain_stage_duration_seconds histogram",
+    ]
+    for stage, (buckets, total, count) in sorted(durations.items()):
+        labels = base + [("stage", stage)]
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + (float("inf"),), buckets):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"dragonchain_stage_duration_seconds_bucket{{{_format_labels(labels + [('le', le)])}}} {cumulative}")
+        lines.append(f"dragonchain_stage_duration_seconds_sum{{{_format_labels(labels)}}} {total}")
+        lines.append(f"dragonchain_stage_duration_seconds_count{{{_format_labels(labels)}}} {count}")
+    lines += ["# HELP dragonchain_stage_items_total Items handled by each processing stage", "# TYPE dragonchain_stage_items_total counter"]
+    lines += [f"dragonchain_stage_items_total{{{_format_labels(base + [('stage', stage)])}}} {value}" for stage, value in sorted(items.items())]
+    lines += [
+        "# HELP dragonchain_stage_items_per_second Items per second handled by the last run of each processing stage",
+        "# TYPE dragonchain_stage_items_per_second gauge",
+    ]
+    lines += [
+        f"dragonchain_stage_items_per_second{{{_format_labels(base + [('stage', stage)])}}} {value}"
+        for stage, value in sorted(items_per_second.items())
+    ]
+    lines += ["# HELP dragonchain_queue_depth Items waiting in a queue", "# TYPE dragonchain_queue_depth gauge"]
+    lines += [f"dragonchain_queue_depth{{{_format_labels(base + [('queue', name)])}}} {value}" for name, value in sorted(queue_depths.items())]
+    return "\n".join(lines) + "\n"
+
+
+def render_all() -> str:
+    """Render the metrics of this process merged with every other process writing to METRICS_DIR
+    Returns:
+        Metrics in the prometheus text exposition format
+    """
+    texts = [render()]
+    own_file = _metrics_file_path()
+    if METRICS_DIR:
+        stale_before = time.time() - METRICS_FLUSH_INTERVAL * 4
+        try:
+            for name in sorted(os.listdir(METRICS_DIR)):
+                path = os.path.join(METRICS_DIR, name)
+                if not name.endswith(".prom") or path == own_file or os.path.getmtime(path) < stale_before:
+                    continue
+                with open(path, "r") as f:
+                    texts.append(f.read())
+        except OSError:
+            _log.exception("Could not read metrics directory")
+    # Samples of the same metric have to be grouped under a single HELP/TYPE header
+    headers: Dict[str, List[str]] = {}
+    samples: Dict[str, List[str]] = {}
+    for text in texts:
+        family = ""
+        for line in text.splitlines():
+            if line.startswith("# "):
+                family = line.split(" ")[2]
+                if len(headers.setdefault(family, [])) < 2:
+                    headers[family].append(line)
+                samples.setdefault(family, [])
+            elif line:
+                samples.setdefault(family, []).append(line)
+    return "".join("\n".join(headers.get(family, []) + family_samples) + "\n" for family, family_samples in samples.items())
+
+
+def _metrics_file_path() -> str:
+    return os.path.join(METRICS_DIR, f"{_process_name}-{os.getpid()}.prom") if METRICS_DIR else ""
+
+
+def write_file() -> None:
+    """Atomically write this process's metrics to its file in METRICS_DIR"""
+    path = _metrics_file_path()
+    if not path:
+        return
+    try:
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as f:
+            f.write(render())
+        os.replace(temporary_path, path)
+    except OSError:
+        _log.exception("Could not write metrics file")
+
+
+def _flush_forever() -> None:
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        write_file()
+
+
+def start(process_name: str) -> None:
+    """Name this process's metrics, and start writing them to METRICS_DIR in the background (if configured)
+    Args:
+        process_name: name of the process (i.e. transaction_processor, webserver, broadcast_processor)
+    """
+    global _process_name
+    global _flusher
+    _process_name = process_name
+    if not METRICS_DIR or _flusher is not None:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    _flusher = threading.Thread(target=_flush_forever, name="metrics-flusher", daemon=True)
+    _flusher.start()
+    atexit.register(write_file)
@@ -0,0 +1,90 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain.lib import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics._durations.clear()
+        metrics._items.clear()
+        metrics._items_per_second.clear()
+        metrics._queue_depths.clear()
+
+    def test_observe_records_cumulative_histogram(self):
+        metrics.observe("verify", 0.003, 10)
+        metrics.observe("verify", 0.2, 30)
+        metrics.observe("verify", 120)
+        text = metrics.render()
+        self.assertIn('stage="verify",le="0.005"} 1\n', text)
+        self.assertIn('stage="verify",le="0.25"} 2\n', text)
+        self.assertIn('stage="verify",le="60.0"} 2\n', text)
+        self.assertIn('stage="verify",le="+Inf"} 3\n', text)
+        self.assertIn('stage="verify"} 120.203\n', text)
+        self.assertIn('dragonchain_stage_items_total{process="dragonchain",pid="', text)
+        self.assertIn('stage="verify"} 40\n', text)
+        self.assertIn('stage="verify"} 150.0\n', text)
+
+    def test_timer_observes_duration(self):
+        with metrics.timer("sign", 5):
+            pass
+        self.assertEqual(metrics._durations["sign"][2], 1)
+        self.assertEqual(metrics._items["sign"], 5)
+
+    def test_timer_observes_duration_on_error(self):
+        try:
+            with metrics.timer("sign"):
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(metrics._durations["sign"][2], 1)
+
+    def test_render_includes_queue_depths(self):
+        metrics.set_queue_depth("incoming", 12)
+        self.assertIn('queue="incoming"} 12\n', metrics.render())
+
+    def test_render_all_merges_metric_families_from_other_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        metrics.observe("upload", 0.1)
+        with open(os.path.join(directory, "broadcast_processor-1.prom"), "w") as f:
+            f.write(metrics.render().replace('process="dragonchain"', 'process="broadcast_processor"'))
+        with patch("dragonchain.lib.metrics.METRICS_DIR", directory):
+            text = metrics.render_all()
+        self.assertEqual(text.count("# TYPE dragonchain_stage_duration_seconds histogram"), 1)
+        self.assertEqual(text.count("dragonchain_stage_duration_seconds_count"), 2)
+        self.assertIn('process="broadcast_processor"', text)
+
+    def test_write_file_writes_metrics_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        metrics.set_queue_depth("incoming", 3)
+        with patch("dragonchain.lib.metrics.METRICS_DIR", directory):
+            metrics.write_file()
+        with open(os.path.join(directory, f"dragonchain-{os.getpid()}.prom")) as f:
+            self.assertEqual(f.read(), metrics.render())
+
+    def test_write_file_does_nothing_without_directory(self):
+        with patch("dragonchain.lib.metrics.open") as mock_open:
+            metrics.write_file()
+        mock_open.assert_not_called()
@@ -17,21 +17,97 @@
 
 import os
 import json
+import time
+import threading
+from typing import Dict, Set, Tuple
 
 import requests
 
+from dragonchain.lib.database import redis
 from dragonchain import logger
 
 STAGE = os.environ["STAGE"]
 REQUEST_TIMEOUT = 30
 PARTY_URL = "https://party.api.dragonchain.com" if STAGE == "prod" else "https://party-staging.api.dragonchain.com"
+# Seconds before a cached DDSS is refreshed (in the background, while the cached value continues to be used)
+DDSS_CACHE_TTL = int(os.environ.get("DDSS_CACHE_TTL") or "3600")
 
 
 _log = logger.get_logger()
 
+_ddss_cache: Dict[str, Tuple[str, float]] = {}
+_refreshing: Set[str] = set()
+_lock = threading.Lock()
+
 
 def get_address_ddss(address: str) -> str:
-    """Return the DDSS for a particular address from party api
+    """Return the DDSS for a particular address, cached in memory
+    Once older than DDSS_CACHE_TTL, the cached value is still returned while it is refreshed in the background.
+    When it isn't cached in memory yet, the last known value (kept in the LRU redis) is returned and refreshed in the background,
+    so this only blocks on the party service for addresses without any known value.
+    Args:
+        address: address to fetch ddss for
+    Returns:
+        Floating point number representing address DDSS
+    Raises:
+        RuntimeError when the party service can't provide a DDSS and there is no last known value
+    """
+    with _lock:
+        entry = _ddss_cache.get(address)
+    if entry is None:
+        last_known = redis.cache_get(address, service_name="ddss")
+        if last_known is None:
+            return _load_address_ddss(address)
+        ddss = last_known.decode("utf-8")
+        with _lock:
+            # Its age is unknown, so treat it as expired until the background refresh replaces it
+            _ddss_cache.setdefault(address, (ddss, time.monotonic() - DDSS_CACHE_TTL))
+        _refresh_address_ddss_in_background(address)
+        return ddss
+    ddss, fetched_at = entry
+    if time.monotonic() - fetched_at >= DDSS_CACHE_TTL:
+        _refresh_address_ddss_in_background(address)
+    return ddss
+
+
+def _load_address_ddss(address: str) -> str:
+    try:
+        ddss = fetch_address_ddss(address)
+    except Exception:
+        last_known = redis.cache_get(address, service_name="ddss")
+        if last_known is None:
+            raise
+        _log.exception("[PARTY] Could not get DDSS from party service. Using last known value")
+        ddss = last_known.decode("utf-8")
+        fetched_at = time.monotonic() - DDSS_CACHE_TTL  # Refresh again on next use
+    else:
+        fetched_at = time.monotonic()
+        redis.cache_put(address, ddss, service_name="ddss")
+    with _lock:
+        _ddss_cache[address] = (ddss, fetched_at)
+    return ddss
+
+
+def _refresh_address_ddss_in_background(address: str) -> None:
+    with _lock:
+        if address in _refreshing:
+            return
+        _refreshing.add(address)
+    threading.Thread(target=_refresh_address_ddss, args=(address,), daemon=True).start()
+
+
+def _refresh_address_ddss(address: str) -> None:
+    try:
+        _load_address_ddss(address)
+    except Exception:
+        _log.exception(f"[PARTY] Failed to refresh DDSS for {address}")
+    finally:
+        with _lock:
+            _refreshing.discard(address)
+
+
+def fetch_address_ddss(address: str) -> str:
+    """Return the DDSS for a particular address from party api (uncached)
     Args:
         address: address to fetch ddss for
     Returns:
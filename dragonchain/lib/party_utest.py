@@ -0,0 +1,84 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+
+import unittest
+from unittest.mock import patch, MagicMock
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain.lib import party
+
+
+class TestParty(unittest.TestCase):
+    def setUp(self):
+        party._ddss_cache.clear()
+        party._refreshing.clear()
+
+    @patch("dragonchain.lib.party.make_party_request", return_value=MagicMock(status_code=200, json=MagicMock(return_value={"adjustedScore": 12.5})))
+    def test_fetch_address_ddss_returns_adjusted_score(self, mock_request):
+        self.assertEqual(party.fetch_address_ddss("addr"), "12.5")
+        mock_request.assert_called_once_with("GET", "/v1/wallet/addr")
+
+    @patch("dragonchain.lib.party.make_party_request", return_value=MagicMock(status_code=500))
+    def test_fetch_address_ddss_raises_on_bad_response(self, mock_request):
+        self.assertRaises(RuntimeError, party.fetch_address_ddss, "addr")
+
+    @patch("dragonchain.lib.party.redis")
+    @patch("dragonchain.lib.party.fetch_address_ddss", return_value="12.5")
+    def test_get_address_ddss_caches_value(self, mock_fetch, mock_redis):
+        mock_redis.cache_get.return_value = None
+        self.assertEqual(party.get_address_ddss("addr"), "12.5")
+        self.assertEqual(party.get_address_ddss("addr"), "12.5")
+        mock_fetch.assert_called_once_with("addr")
+        mock_redis.cache_put.assert_called_once_with("addr", "12.5", service_name="ddss")
+
+    @patch("dragonchain.lib.party._refresh_address_ddss_in_background")
+    @patch("dragonchain.lib.party.fetch_address_ddss")
+    def test_get_address_ddss_serves_stale_value_while_refreshing(self, mock_fetch, mock_refresh):
+        party._ddss_cache["addr"] = ("10", party.time.monotonic() - party.DDSS_CACHE_TTL - 1)
+        self.assertEqual(party.get_address_ddss("addr"), "10")
+        mock_fetch.assert_not_called()
+        mock_refresh.assert_called_once_with("addr")
+
+    @patch("dragonchain.lib.party._refresh_address_ddss_in_background")
+    @patch("dragonchain.lib.party.redis.cache_get", return_value=b"9.5")
+    @patch("dragonchain.lib.party.fetch_address_ddss")
+    def test_get_address_ddss_serves_last_known_value_on_cold_cache(self, mock_fetch, mock_cache_get, mock_refresh):
+        self.assertEqual(party.get_address_ddss("addr"), "9.5")
+        mock_cache_get.assert_called_once_with("addr", service_name="ddss")
+        mock_fetch.assert_not_called()
+        mock_refresh.assert_called_once_with("addr")
+        self.assertEqual(party._ddss_cache["addr"][0], "9.5")
+
+    @patch("dragonchain.lib.party.redis.cache_get", return_value=b"9.5")
+    @patch("dragonchain.lib.party.fetch_address_ddss", side_effect=RuntimeError)
+    def test_load_address_ddss_falls_back_to_last_known_value(self, mock_fetch, mock_cache_get):
+        self.assertEqual(party._load_address_ddss("addr"), "9.5")
+        mock_cache_get.assert_called_once_with("addr", service_name="ddss")
+
+    @patch("dragonchain.lib.party.redis.cache_get", return_value=None)
+    @patch("dragonchain.lib.party.fetch_address_ddss", side_effect=RuntimeError)
+    def test_get_address_ddss_raises_without_last_known_value(self, mock_fetch, mock_cache_get):
+        self.assertRaises(RuntimeError, party.get_address_ddss, "addr")
+
+    @patch("dragonchain.lib.party.redis.cache_get", return_value=None)
+    @patch("dragonchain.lib.party.fetch_address_ddss", side_effect=RuntimeError)
+    def test_failed_refresh_keeps_cached_value(self, mock_fetch, mock_cache_get):
+        party._ddss_cache["addr"] = ("10", 0.0)
+        party._refreshing.add("addr")
+        party._refresh_address_ddss("addr")
+        self.assertEqual(party._ddss_cache["addr"], ("10", 0.0))
+        self.assertNotIn("addr", party._refreshing)
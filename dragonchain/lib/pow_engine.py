@@ -0,0 +1,66 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import os
+import base64
+import multiprocessing
+import multiprocessing.pool
+from typing import Tuple, Optional
+
+from dragonchain.lib import crypto
+from dragonchain import logger
+
+# Number of worker processes to split the nonce space across. 0 (default) does proof of work serially in-process
+POW_PROCESSES = int(os.environ.get("POW_PROCESSES") or "0")
+# Number of nonces given to a worker process at a time
+POW_CHUNK_SIZE = int(os.environ.get("POW_CHUNK_SIZE") or "65536")
+# Below this complexity, a match is found faster than work can be handed to another process
+POW_PARALLEL_MIN_COMPLEXITY = int(os.environ.get("POW_PARALLEL_MIN_COMPLEXITY") or "16")
+
+_log = logger.get_logger()
+
+_pool: Optional[multiprocessing.pool.Pool] = None
+
+
+def _get_pool() -> multiprocessing.pool.Pool:
+    global _pool
+    if _pool is None:
+        _log.info(f"Starting proof of work pool with {POW_PROCESSES} processes")
+        _pool = multiprocessing.Pool(processes=POW_PROCESSES)
+    return _pool
+
+
+def proof_of_work(hash_type: crypto.SupportedHashes, parts: Tuple[bytes, bytes], complexity: int = 8) -> Tuple[str, int]:
+    """Do proof of work, splitting the nonce space across worker processes when configured
+    The result is always the lowest matching nonce, identical to crypto.pow_parts
+    Args:
+        hash_type: SupportedHashes enum type
+        parts: Tuple of bytes hashed before and after the nonce (from crypto.get_l*_block_pow_parts)
+        complexity: number of bits of complexity required
+    Returns:
+        Tuple where index 0 is a Base64 encoded string of the generated hash and index 1 is the nonce
+    """
+    if POW_PROCESSES <= 0 or complexity < POW_PARALLEL_MIN_COMPLEXITY:
+        return crypto.pow_parts(hash_type, parts, complexity)
+    chunk_size = max(POW_CHUNK_SIZE, 1)
+    start = 1
+    while True:
+        ranges = [(hash_type, parts[0], parts[1], complexity, start + i * chunk_size, start + (i + 1) * chunk_size) for i in range(POW_PROCESSES)]
+        # starmap preserves the order of the ranges, so the first match is the lowest matching nonce
+        for result in _get_pool().starmap(crypto.search_nonce, ranges):
+            if result is not None:
+                return (base64.b64encode(result[0]).decode("ascii"), result[1])
+        start += POW_PROCESSES * chunk_size
@@ -0,0 +1,69 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import itertools
+import unittest
+from unittest.mock import patch, MagicMock
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain.lib import crypto
+from dragonchain.lib import pow_engine
+from dragonchain.lib.dto import l3_block_model
+
+blake2b = crypto.SupportedHashes.blake2b
+
+
+def make_l3_block():
+    return l3_block_model.L3BlockModel(
+        dc_id="an id",
+        current_ddss="a ddss",
+        block_id="8474745",
+        timestamp="129874",
+        prev_proof="the previous block proof",
+        l1_dc_id="an l1 id",
+        l1_block_id="some l1 block id",
+        l1_proof="the l1 proof",
+        l2_proofs=[{"dc_id": "l2 id", "block_id": "l2 block", "proof": "l2 proof"}],
+        l2_count="3",
+        ddss="a ddss",
+        regions=["us-west-2"],
+        clouds=["aws"],
+    )
+
+
+class TestPowEngine(unittest.TestCase):
+    @patch("dragonchain.lib.pow_engine._get_pool")
+    def test_proof_of_work_runs_serially_by_default(self, mock_get_pool):
+        parts = crypto.get_l3_block_pow_parts(make_l3_block())
+        self.assertEqual(pow_engine.proof_of_work(blake2b, parts), crypto.pow_parts(blake2b, parts, 8))
+        mock_get_pool.assert_not_called()
+
+    @patch("dragonchain.lib.pow_engine.POW_PARALLEL_MIN_COMPLEXITY", 0)
+    @patch("dragonchain.lib.pow_engine.POW_CHUNK_SIZE", 16)
+    @patch("dragonchain.lib.pow_engine.POW_PROCESSES", 3)
+    @patch("dragonchain.lib.pow_engine._get_pool", return_value=MagicMock(starmap=lambda func, args: list(itertools.starmap(func, args))))
+    def test_proof_of_work_split_across_processes_matches_serial(self, mock_get_pool):
+        block = make_l3_block()
+        parts = crypto.get_l3_block_pow_parts(block)
+        block_hash, nonce = pow_engine.proof_of_work(blake2b, parts)
+        self.assertEqual((block_hash, nonce), crypto.pow_parts(blake2b, parts, 8))
+        self.assertEqual(crypto.pow_l3_block(blake2b, block), (block_hash, nonce))
+
+    def test_search_nonce_returns_none_when_range_has_no_match(self):
+        parts = crypto.get_l3_block_pow_parts(make_l3_block())
+        _, nonce = crypto.pow_parts(blake2b, parts, 8)
+        self.assertIsNone(crypto.search_nonce(blake2b, parts[0], parts[1], 8, 1, nonce))
+        self.assertEqual(crypto.search_nonce(blake2b, parts[0], parts[1], 8, nonce, nonce + 1)[1], nonce)
@@ -17,8 +17,9 @@
 
 import os
 import json
+import math
 import base64
-from typing import List, Tuple, Union, Optional, Dict, Any, cast, TYPE_CHECKING
+from typing import List, Tuple, Dict, Any, TYPE_CHECKING
 
 from dragonchain.lib import crypto
 from dragonchain.lib.database import redis
@@ -41,9 +42,32 @@ REDIS_ENDPOINT = os.environ["REDIS_ENDPOINT"]
 REDIS_PORT = os.environ["REDIS_PORT"]
 INCOMING_TX_KEY = "dc:tx:incoming"
 PROCESSING_TX_KEY = "dc:tx:processing"
+STORING_TX_KEY = "dc:tx:storing"
 TEMPORARY_TX_KEY = "dc:tx:temporary"
+NEW_TX_SIGNAL_KEY = "dc:tx:signal"
 CONTRACT_INVOKE_MQ_KEY = "mq:contract-invoke"
 MAX_L4_BLOCKS = 10000  # sanity check on the number of L4 blocks that can go into a single L5 block
+MAX_L1_TRANSACTIONS = 10000  # maximum number of transactions that can go into a single L1 block
+# Maximum number of queued blocks which L2-L4 take off the queue and verify concurrently at a time
+PROCESSING_BATCH_SIZE = max(int(os.environ.get("PROCESSING_BATCH_SIZE") or "1"), 1)
+# When L1 blocks are cut adaptively, the processor blocks on a signal list which is pushed to whenever transactions are enqueued
+SIGNAL_NEW_TRANSACTIONS = (os.environ.get("L1_BLOCK_CUTTING") or "interval").lower() == "adaptive"
+
+# Atomically moves up to ARGV[1] items from the tail of KEYS[1] onto the head of KEYS[2]
+# Equivalent to calling RPOPLPUSH ARGV[1] times (same resulting lists and same order of returned items), but in a single round trip
+_BULK_RPOPLPUSH_LUA = """
+local items = redis.call("LRANGE", KEYS[1], -tonumber(ARGV[1]), -1)
+local popped = {}
+for i = #items, 1, -1 do
+    redis.call("LPUSH", KEYS[2], items[i])
+    popped[#popped + 1] = items[i]
+end
+if #items > 0 then
+    redis.call("LTRIM", KEYS[1], 0, -#items - 1)
+end
+return popped
+"""
+_bulk_rpoplpush_script = None
 
 _log = logger.get_logger()
 
@@ -65,6 +89,20 @@ def check_and_recover_processing_if_necessary() -> None:
         p.execute()
 
 
+def check_and_recover_storing_if_necessary() -> None:
+    """
+    Checks the storing tx queue (transactions of a block which was being uploaded) and returns them to the incoming queue
+    (Should be called after check_and_recover_processing_if_necessary, so that these older transactions are processed first)
+    """
+    if redis.llen_sync(STORING_TX_KEY) != 0:
+        _log.warning("WARNING! Storing queue was not empty. Last block upload probably crashed. Recovering and re-queuing these dropped items.")
+        to_recover = redis.lrange_sync(STORING_TX_KEY, 0, -1, decode=False)
+        p = redis.pipeline_sync()
+        p.rpush(INCOMING_TX_KEY, *to_recover)
+        p.delete(STORING_TX_KEY)
+        p.execute()
+
+
 def enqueue_item(item: dict, deadline: int = 0) -> None:
     """Enqueues to the chain's block / transaction queue"""
     if LEVEL == "1":
@@ -96,18 +134,20 @@ def enqueue_l1_pipeline(pipeline: "Pipeline", transaction: Dict[str, Any]) -> "P
     invocation_attempt = not transaction["header"].get("invoker")  # This transaction is an invocation attempt if there is no invoker
 
     try:
-        transaction_type = transaction_type_dao.get_registered_transaction_type(txn_type_string)
+        transaction_type = transaction_type_dao.get_registered_transaction_type_cached(txn_type_string)
     except exceptions.NotFound:
         _log.error("Invalid transaction type")
         raise exceptions.InvalidTransactionType(f"Transaction of type {txn_type_string} does not exist")
 
     pipeline.lpush(INCOMING_TX_KEY, json.dumps(transaction, separators=(",", ":")))
     pipeline.sadd(TEMPORARY_TX_KEY, transaction["header"]["txn_id"])
+    if SIGNAL_NEW_TRANSACTIONS:
+        add_new_transactions_signal(pipeline)
 
     # Attempt contract invocation if necessary
     if transaction_type.contract_id and invocation_attempt:
         _log.info("Checking if smart contract is associated with this txn_type")
-        contract = smart_contract_dao.get_contract_by_id(transaction_type.contract_id)  # Explicitly checked for existence above
+        contract = smart_contract_dao.get_contract_by_id_cached(transaction_type.contract_id)  # Explicitly checked for existence above
         contract_active = contract.status["state"] in ["active", "updating"]
         _log.info(f"Contract found: {contract}")
 
@@ -119,11 +159,22 @@ def enqueue_l1_pipeline(pipeline: "Pipeline", transaction: Dict[str, Any]) -> "P
     return pipeline
 
 
+def add_new_transactions_signal(pipeline: "Pipeline") -> "Pipeline":
+    """Add the commands which wake a processor waiting in wait_for_new_transactions to a redis pipeline"""
+    # Only a single pending signal is needed to wake the processor, so keep the list trimmed to one element
+    pipeline.rpush(NEW_TX_SIGNAL_KEY, "1")
+    pipeline.ltrim(NEW_TX_SIGNAL_KEY, 0, 0)
+    return pipeline
+
+
 def enqueue_generic(content: dict, queue: str, deadline: int) -> None:
     _log.info(f"Enqueueing content to {queue} queue")
     string_content = json.dumps(content, separators=(",", ":"))
     if not redis.lpush_sync(queue, string_content):
         raise RuntimeError("Failed to enqueue")
+    if queue == INCOMING_TX_KEY and SIGNAL_NEW_TRANSACTIONS:
+        # Transactions enqueued directly (e.g. ledgered contract actions) must wake the processor like user transactions do
+        add_new_transactions_signal(redis.pipeline_sync()).execute()
     if deadline:  # Set a deadline, beyond-which this L2-5 will disgard this item completely
         key = get_deadline_key(string_content.encode("utf8"))
         redis.set_sync(key, "a", deadline)  # Value is irrelevant
@@ -134,11 +185,36 @@ def is_not_empty() -> bool:
     return redis.llen_sync(INCOMING_TX_KEY) != 0
 
 
+def incoming_length() -> int:
+    """Get the number of items waiting in the incoming queue"""
+    return redis.llen_sync(INCOMING_TX_KEY)
+
+
+def wait_for_new_transactions(timeout: float) -> bool:
+    """Block until a new transaction is signaled as enqueued, or the timeout expires
+    Args:
+        timeout: maximum number of seconds to wait (rounded up to a whole second)
+    Returns:
+        True if woken by a new transaction signal, False if the timeout expired
+    """
+    return redis.brpop_sync(NEW_TX_SIGNAL_KEY, timeout=max(1, math.ceil(timeout))) is not None
+
+
 def clear_processing_queue() -> None:
     """Clear the processing queue after finishing processing a block successfully"""
     redis.delete_sync(PROCESSING_TX_KEY)
 
 
+def move_processing_to_storing() -> None:
+    """Move the transactions of a fully created block out of the processing queue while the block is uploaded"""
+    redis.rename_sync(PROCESSING_TX_KEY, STORING_TX_KEY)
+
+
+def clear_storing_queue() -> None:
+    """Clear the storing queue after finishing uploading a block successfully"""
+    redis.delete_sync(STORING_TX_KEY)
+
+
 def get_deadline_key(item_as_bytes: bytes) -> str:
     unique_id = crypto.hash_bytes(crypto.SupportedHashes.sha256, item_as_bytes)
     return f"dc:tx:deadline:{base64.b64encode(unique_id).decode('ascii')}"
@@ -149,20 +225,21 @@ def item_is_expired(item_as_bytes: bytes) -> bool:
     return not redis.get_sync(get_deadline_key(item_as_bytes), decode=False)
 
 
-def get_next_item() -> Optional[Any]:
-    """Get and json.loads the next item from the queue"""
-    item = cast(bytes, redis.rpoplpush_sync(INCOMING_TX_KEY, PROCESSING_TX_KEY, decode=False))
-    if item is not None:
-        if LEVEL != "1":
-            if item_is_expired(item):
-                redis.lpop_sync(PROCESSING_TX_KEY, decode=False)
-                return get_next_item()
-
-        next_item = json.loads(item)
-        _log.info(f"Next item: {next_item}")
-        return next_item
-
-    return None
+def bulk_rpoplpush(src: str, dst: str, count: int) -> List[bytes]:
+    """Atomically move up to count items from one queue to another in a single round trip
+    Args:
+        src: key of the list to pop items from
+        dst: key of the list to push items onto
+        count: maximum number of items to move
+    Returns:
+        List of moved items (as bytes) in the order they would have been popped
+    """
+    global _bulk_rpoplpush_script
+    if count <= 0:
+        return []
+    if _bulk_rpoplpush_script is None:
+        _bulk_rpoplpush_script = redis.register_script_sync(_BULK_RPOPLPUSH_LUA)
+    return _bulk_rpoplpush_script(keys=[src, dst], args=[count])
 
 
 def get_new_transactions() -> List[transaction_model.TransactionModel]:
@@ -171,85 +248,130 @@ def get_new_transactions() -> List[transaction_model.TransactionModel]:
         raise RuntimeError("Getting transactions is a level 1 action")
 
     transactions = []
-    # Only allow up to 1000 transactions to process at a time
-    length = min(redis.llen_sync(INCOMING_TX_KEY), 10000)
-    p = redis.pipeline_sync()
-    for _ in range(0, length):
-        p.rpoplpush(INCOMING_TX_KEY, PROCESSING_TX_KEY)
-    for value in p.execute():
+    # Only allow up to MAX_L1_TRANSACTIONS transactions to process at a time
+    for value in bulk_rpoplpush(INCOMING_TX_KEY, PROCESSING_TX_KEY, MAX_L1_TRANSACTIONS):
         dictionary = json.loads(value)
         txn_model = transaction_model.new_from_queue_input(dictionary)
         transactions.append(txn_model)
     return transactions
 
 
-def get_next_l1_block() -> Optional[l1_block_model.L1BlockModel]:
-    """Get (and pop) the next l1 block to process off the queue"""
-    if LEVEL != "2":
-        raise RuntimeError("Getting next l1 block from queue is a level 2 action")
+def get_next_items(count: int) -> List[Tuple[bytes, Any]]:
+    """Get (moving to the processing queue) and json.loads up to count items from the queue, skipping expired items
+    Each item must be removed from the processing queue with finish_processing_item once it has been handled
+    Args:
+        count: maximum number of items to get
+    Returns:
+        List of (raw item as stored in the processing queue, parsed item) in queue order
+    """
+    items = []
+    for item in bulk_rpoplpush(INCOMING_TX_KEY, PROCESSING_TX_KEY, count):
+        if LEVEL != "1" and item_is_expired(item):
+            redis.lrem_sync(PROCESSING_TX_KEY, -1, item)
+            continue
+        next_item = json.loads(item)
+        _log.info(f"Next item: {next_item}")
+        items.append((item, next_item))
+    return items
+
 
-    next_item = get_next_item()
+def finish_processing_item(item: bytes) -> None:
+    """Remove a single handled item from the processing queue, so only unfinished items are recovered after a crash
+    Args:
+        item: raw item as returned by get_next_items
+    """
+    # Handed out items are at the tail end of the processing queue, so search from the tail (count -1) rather than the head
+    redis.lrem_sync(PROCESSING_TX_KEY, -1, item)
 
-    if not next_item:
-        return None
 
-    return l1_block_model.new_from_stripped_block(next_item)
+def finish_processing_items(items: List[bytes]) -> None:
+    """Remove multiple handled items from the processing queue in a single round trip
+    Args:
+        items: raw items as moved into the processing queue
+    """
+    if not items:
+        return
+    p = redis.pipeline_sync(transaction=False)
+    finish_processing_items_pipeline(p, items)
+    p.execute()
+
+
+def finish_processing_items_pipeline(pipeline: "Pipeline", items: List[bytes]) -> "Pipeline":
+    """Add the removal of handled items from the processing queue to a redis pipeline (without executing it)
+    Args:
+        pipeline: redis pipeline to add the commands to
+        items: raw items as moved into the processing queue
+    Returns:
+        The pipeline with the commands added
+    """
+    # Items are moved to the head of the processing queue in the order they are handed out, so the oldest is at the tail.
+    # Removing from the tail (count -1) finds each handled item right away instead of scanning every newer item first
+    for item in items:
+        pipeline.lrem(PROCESSING_TX_KEY, -1, item)
+    return pipeline
 
 
-def get_next_l2_blocks() -> Union[Tuple[None, None], Tuple["L1Headers", List[l2_block_model.L2BlockModel]]]:
-    """Get (and pop) the next l2 queue array to process"""
-    if LEVEL != "3":
-        raise RuntimeError("Getting next l2 array from queue is a level 3 action")
-    next_item = get_next_item()
+def _parse_l1_headers(next_item: Dict[str, Any]) -> "L1Headers":
+    return {
+        "dc_id": next_item["header"]["dc_id"],
+        "block_id": next_item["header"]["block_id"],
+        "proof": next_item["header"]["stripped_proof"],
+    }
 
-    if not next_item:
-        return (None, None)
 
+def _parse_l2_block_array(next_item: Dict[str, Any]) -> Tuple["L1Headers", List[l2_block_model.L2BlockModel]]:
     l2_blocks = []
     for block in next_item["l2-blocks"]:
         try:
             l2_blocks.append(l2_block_model.new_from_at_rest(block))
         except Exception:
             _log.exception("Error parsing an l2 block from input")
-    l1_headers: "L1Headers" = {
-        "dc_id": next_item["header"]["dc_id"],
-        "block_id": next_item["header"]["block_id"],
-        "proof": next_item["header"]["stripped_proof"],
-    }
-    return (l1_headers, l2_blocks)
+    return (_parse_l1_headers(next_item), l2_blocks)
 
 
-def get_next_l3_block() -> Union[Tuple[None, None], Tuple["L1Headers", List[l3_block_model.L3BlockModel]]]:
-    """Get (and pop) the next l3 block to process off the queue"""
-    if LEVEL != "4":
-        raise RuntimeError("Getting next l3 item from queue is a level 4 action")
-    next_item = get_next_item()
-
-    if not next_item:
-        return (None, None)
-
+def _parse_l3_block_array(next_item: Dict[str, Any]) -> Tuple["L1Headers", List[l3_block_model.L3BlockModel]]:
     l3_blocks = []
     for block in next_item["l3-blocks"]:
         try:
             l3_blocks.append(l3_block_model.new_from_at_rest(block))
         except Exception:
             _log.exception("Error parsing an l3 block from input")
-    l1_headers: "L1Headers" = {
-        "dc_id": next_item["header"]["dc_id"],
-        "block_id": next_item["header"]["block_id"],
-        "proof": next_item["header"]["stripped_proof"],
-    }
-    return (l1_headers, l3_blocks)
+    return (_parse_l1_headers(next_item), l3_blocks)
+
+
+def get_next_l1_blocks(count: int = PROCESSING_BATCH_SIZE) -> List[Tuple[bytes, l1_block_model.L1BlockModel]]:
+    """Get up to count l1 blocks to process off the queue
+    Returns:
+        List of (raw queue item, l1 block) in queue order
+    """
+    if LEVEL != "2":
+        raise RuntimeError("Getting next l1 blocks from queue is a level 2 action")
+    return [(item, l1_block_model.new_from_stripped_block(next_item)) for item, next_item in get_next_items(count)]
+
+
+def get_next_l2_block_arrays(count: int = PROCESSING_BATCH_SIZE) -> List[Tuple[bytes, "L1Headers", List[l2_block_model.L2BlockModel]]]:
+    """Get up to count l2 queue arrays to process
+    Returns:
+        List of (raw queue item, l1 headers, l2 blocks) in queue order
+    """
+    if LEVEL != "3":
+        raise RuntimeError("Getting next l2 arrays from queue is a level 3 action")
+    return [(item, *_parse_l2_block_array(next_item)) for item, next_item in get_next_items(count)]
+
+
+def get_next_l3_block_arrays(count: int = PROCESSING_BATCH_SIZE) -> List[Tuple[bytes, "L1Headers", List[l3_block_model.L3BlockModel]]]:
+    """Get up to count l3 queue arrays to process
+    Returns:
+        List of (raw queue item, l1 headers, l3 blocks) in queue order
+    """
+    if LEVEL != "4":
+        raise RuntimeError("Getting next l3 arrays from queue is a level 4 action")
+    return [(item, *_parse_l3_block_array(next_item)) for item, next_item in get_next_items(count)]
 
 
 def get_new_l4_blocks() -> List[bytes]:
     """Get all new l4 records from the incoming queue"""
     if LEVEL != "5":
         raise RuntimeError("Getting l4_blocks is a level 5 action")
-    l4_blocks = []
-    l4_blocks_count = min(redis.llen_sync(INCOMING_TX_KEY), MAX_L4_BLOCKS)  # whichever is less
-    for _ in range(0, l4_blocks_count):
-        # These are in lists because enterprise will be able to specify more than one l4.
-        l4_blocks_list = cast(bytes, redis.rpoplpush_sync(INCOMING_TX_KEY, PROCESSING_TX_KEY, decode=False))
-        l4_blocks.append(l4_blocks_list)
-    return l4_blocks
+    # These are in lists because enterprise will be able to specify more than one l4.
+    return bulk_rpoplpush(INCOMING_TX_KEY, PROCESSING_TX_KEY, MAX_L4_BLOCKS)
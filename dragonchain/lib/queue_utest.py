@@ -36,38 +36,109 @@ class TestQueue(unittest.TestCase):
         self.assertRaises(RuntimeError, queue.get_new_transactions)
         queue.LEVEL = "1"
 
-    def test_get_next_l1_block_raises_on_bad_level(self):
-        self.assertRaises(RuntimeError, queue.get_next_l1_block)
+    def test_get_next_l1_blocks_raises_on_bad_level(self):
+        self.assertRaises(RuntimeError, queue.get_next_l1_blocks)
 
-    def test_get_next_l2_blocks_raises_on_bad_level(self):
-        self.assertRaises(RuntimeError, queue.get_next_l2_blocks)
+    def test_get_next_l2_block_arrays_raises_on_bad_level(self):
+        self.assertRaises(RuntimeError, queue.get_next_l2_block_arrays)
 
-    def test_get_next_l3_block_raises_on_bad_level(self):
-        self.assertRaises(RuntimeError, queue.get_next_l3_block)
+    def test_get_next_l3_block_arrays_raises_on_bad_level(self):
+        self.assertRaises(RuntimeError, queue.get_next_l3_block_arrays)
 
-    def test_get_new_l4_blocks_raises_on_bad_level(self):
-        self.assertRaises(RuntimeError, queue.get_new_l4_blocks)
+    @patch("dragonchain.lib.queue.LEVEL", "3")
+    @patch("dragonchain.lib.queue.item_is_expired", side_effect=[False, True, False])
+    @patch("dragonchain.lib.queue.bulk_rpoplpush", return_value=[b'{"a":1}', b'{"b":2}', b'{"c":3}'])
+    @patch("dragonchain.lib.queue.redis")
+    def test_get_next_items_skips_and_removes_expired_items(self, mock_redis, mock_bulk_rpoplpush, mock_expired):
+        self.assertEqual(queue.get_next_items(3), [(b'{"a":1}', {"a": 1}), (b'{"c":3}', {"c": 3})])
+        mock_bulk_rpoplpush.assert_called_once_with(queue.INCOMING_TX_KEY, queue.PROCESSING_TX_KEY, 3)
+        mock_redis.lrem_sync.assert_called_once_with(queue.PROCESSING_TX_KEY, -1, b'{"b":2}')
+
+    @patch("dragonchain.lib.queue.LEVEL", "5")
+    @patch("dragonchain.lib.queue.bulk_rpoplpush", return_value=[b"a", b"b"])
+    def test_get_new_l4_blocks_moves_blocks_in_bulk(self, mock_bulk_rpoplpush):
+        self.assertEqual(queue.get_new_l4_blocks(), [b"a", b"b"])
+        mock_bulk_rpoplpush.assert_called_once_with(queue.INCOMING_TX_KEY, queue.PROCESSING_TX_KEY, queue.MAX_L4_BLOCKS)
 
-    @patch("dragonchain.lib.queue.transaction_model.new_from_queue_input", return_value="fake model")
     @patch("dragonchain.lib.queue.redis")
-    def test_get_new_transactions(self, mock_redis, mock_new_from_queue):
+    def test_finish_processing_items_removes_items_in_one_pipeline(self, mock_redis):
+        queue.finish_processing_items([b"a", b"b"])
+        mock_pipeline = mock_redis.pipeline_sync.return_value
+        mock_pipeline.lrem.assert_has_calls([call(queue.PROCESSING_TX_KEY, -1, b"a"), call(queue.PROCESSING_TX_KEY, -1, b"b")])
+        mock_pipeline.execute.assert_called_once()
+
+    def test_finish_processing_items_pipeline_does_not_execute(self):
         mock_pipeline = MagicMock()
-        mock_pipeline.execute.return_value = [json.dumps({"some": "data"}).encode("utf8")]
-        mock_redis.llen_sync.return_value = 1
-        mock_redis.pipeline_sync.return_value = mock_pipeline
+        self.assertIs(queue.finish_processing_items_pipeline(mock_pipeline, [b"a"]), mock_pipeline)
+        mock_pipeline.lrem.assert_called_once_with(queue.PROCESSING_TX_KEY, -1, b"a")
+        mock_pipeline.execute.assert_not_called()
+
+    @patch("dragonchain.lib.queue.redis")
+    def test_finish_processing_item_removes_only_that_item(self, mock_redis):
+        queue.finish_processing_item(b"item")
+        mock_redis.lrem_sync.assert_called_once_with(queue.PROCESSING_TX_KEY, -1, b"item")
+
+    @patch("dragonchain.lib.queue.LEVEL", "3")
+    @patch("dragonchain.lib.queue.l2_block_model.new_from_at_rest", side_effect=["block1", Exception, "block3"])
+    @patch("dragonchain.lib.queue.get_next_items")
+    def test_get_next_l2_block_arrays_parses_headers_and_blocks(self, mock_get_next_items, mock_new_l2):
+        mock_get_next_items.return_value = [
+            (b"raw", {"header": {"dc_id": "dc", "block_id": "1", "stripped_proof": "proof"}, "l2-blocks": [{}, {}, {}]})
+        ]
+        self.assertEqual(queue.get_next_l2_block_arrays(5), [(b"raw", {"dc_id": "dc", "block_id": "1", "proof": "proof"}, ["block1", "block3"])])
+        mock_get_next_items.assert_called_once_with(5)
 
+    def test_get_new_l4_blocks_raises_on_bad_level(self):
+        self.assertRaises(RuntimeError, queue.get_new_l4_blocks)
+
+    @patch("dragonchain.lib.queue.transaction_model.new_from_queue_input", return_value="fake model")
+    @patch("dragonchain.lib.queue.bulk_rpoplpush", return_value=[json.dumps({"some": "data"}).encode("utf8")])
+    def test_get_new_transactions(self, mock_bulk_rpoplpush, mock_new_from_queue):
         self.assertEqual(queue.get_new_transactions(), ["fake model"])
 
-        mock_pipeline.rpoplpush.assert_called_once_with(queue.INCOMING_TX_KEY, queue.PROCESSING_TX_KEY)
+        mock_bulk_rpoplpush.assert_called_once_with(queue.INCOMING_TX_KEY, queue.PROCESSING_TX_KEY, queue.MAX_L1_TRANSACTIONS)
         mock_new_from_queue.assert_called_once_with({"some": "data"})
 
-    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type", side_effect=exceptions.NotFound)
+    @patch("dragonchain.lib.queue._bulk_rpoplpush_script", None)
+    @patch("dragonchain.lib.queue.redis")
+    def test_bulk_rpoplpush_runs_script_once(self, mock_redis):
+        mock_redis.register_script_sync.return_value.return_value = [b"a", b"b"]
+        self.assertEqual(queue.bulk_rpoplpush("src", "dst", 5), [b"a", b"b"])
+        mock_redis.register_script_sync.assert_called_once_with(queue._BULK_RPOPLPUSH_LUA)
+        mock_redis.register_script_sync.return_value.assert_called_once_with(keys=["src", "dst"], args=[5])
+
+    @patch("dragonchain.lib.queue.redis")
+    def test_bulk_rpoplpush_no_ops_without_count(self, mock_redis):
+        self.assertEqual(queue.bulk_rpoplpush("src", "dst", 0), [])
+        mock_redis.register_script_sync.assert_not_called()
+
+    @patch("dragonchain.lib.queue.redis")
+    def test_check_and_recover_storing_requeues_items(self, mock_redis):
+        mock_redis.llen_sync.return_value = 2
+        mock_redis.lrange_sync.return_value = [b"newer", b"older"]
+        queue.check_and_recover_storing_if_necessary()
+        mock_pipeline = mock_redis.pipeline_sync.return_value
+        mock_pipeline.rpush.assert_called_once_with(queue.INCOMING_TX_KEY, b"newer", b"older")
+        mock_pipeline.delete.assert_called_once_with(queue.STORING_TX_KEY)
+
+    @patch("dragonchain.lib.queue.redis")
+    def test_check_and_recover_storing_no_ops_when_empty(self, mock_redis):
+        mock_redis.llen_sync.return_value = 0
+        queue.check_and_recover_storing_if_necessary()
+        mock_redis.pipeline_sync.assert_not_called()
+
+    @patch("dragonchain.lib.queue.redis")
+    def test_move_processing_to_storing_renames_queue(self, mock_redis):
+        queue.move_processing_to_storing()
+        mock_redis.rename_sync.assert_called_once_with(queue.PROCESSING_TX_KEY, queue.STORING_TX_KEY)
+
+    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type_cached", side_effect=exceptions.NotFound)
     @patch("dragonchain.lib.queue.redis")
     def test_enqueue_l1_raises_invalid_transaction_type_when_not_found(self, mock_redis, mock_get_transaction_type):
         self.assertRaises(exceptions.InvalidTransactionType, queue.enqueue_l1, {"header": {"txn_type": "banana"}})
         mock_get_transaction_type.assert_called_once_with("banana")
 
-    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type")
+    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type_cached")
     @patch("dragonchain.lib.queue.redis")
     def test_enqueue_l1_not_invocation_is_successful(self, mock_redis, mock_get_transaction_type):
         mock_pipeline = MagicMock()
@@ -81,7 +152,41 @@ class TestQueue(unittest.TestCase):
         mock_pipeline.sadd.assert_called_once_with(queue.TEMPORARY_TX_KEY, "some id")
         mock_pipeline.execute.assert_called_once()
 
-    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type")
+    @patch("dragonchain.lib.queue.SIGNAL_NEW_TRANSACTIONS", True)
+    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type_cached", return_value=MagicMock(contract_id=None))
+    def test_enqueue_l1_pipeline_signals_new_transaction_when_adaptive(self, mock_get_transaction_type):
+        mock_pipeline = MagicMock()
+        queue.enqueue_l1_pipeline(mock_pipeline, {"header": {"txn_type": "thing", "txn_id": "some id", "invoker": "banana"}})
+        mock_pipeline.rpush.assert_called_once_with(queue.NEW_TX_SIGNAL_KEY, "1")
+        mock_pipeline.ltrim.assert_called_once_with(queue.NEW_TX_SIGNAL_KEY, 0, 0)
+
+    @patch("dragonchain.lib.queue.SIGNAL_NEW_TRANSACTIONS", True)
+    @patch("dragonchain.lib.queue.redis")
+    def test_enqueue_generic_signals_new_transaction_for_incoming_queue_when_adaptive(self, mock_redis):
+        queue.enqueue_generic({"thing": "stuff"}, queue=queue.INCOMING_TX_KEY, deadline=0)
+        mock_redis.lpush_sync.assert_called_once_with(queue.INCOMING_TX_KEY, '{"thing":"stuff"}')
+        mock_redis.pipeline_sync.return_value.rpush.assert_called_once_with(queue.NEW_TX_SIGNAL_KEY, "1")
+        mock_redis.pipeline_sync.return_value.ltrim.assert_called_once_with(queue.NEW_TX_SIGNAL_KEY, 0, 0)
+        mock_redis.pipeline_sync.return_value.execute.assert_called_once()
+
+    @patch("dragonchain.lib.queue.SIGNAL_NEW_TRANSACTIONS", True)
+    @patch("dragonchain.lib.queue.redis")
+    def test_enqueue_generic_doesnt_signal_for_other_queues(self, mock_redis):
+        queue.enqueue_generic({"thing": "stuff"}, queue=queue.CONTRACT_INVOKE_MQ_KEY, deadline=0)
+        mock_redis.lpush_sync.assert_called_once_with(queue.CONTRACT_INVOKE_MQ_KEY, '{"thing":"stuff"}')
+        mock_redis.pipeline_sync.assert_not_called()
+
+    @patch("dragonchain.lib.queue.redis.brpop_sync", return_value=None)
+    def test_wait_for_new_transactions_returns_false_on_timeout(self, mock_brpop):
+        self.assertFalse(queue.wait_for_new_transactions(0.2))
+        mock_brpop.assert_called_once_with(queue.NEW_TX_SIGNAL_KEY, timeout=1)
+
+    @patch("dragonchain.lib.queue.redis.brpop_sync", return_value=(queue.NEW_TX_SIGNAL_KEY, "1"))
+    def test_wait_for_new_transactions_returns_true_when_signaled(self, mock_brpop):
+        self.assertTrue(queue.wait_for_new_transactions(2.5))
+        mock_brpop.assert_called_once_with(queue.NEW_TX_SIGNAL_KEY, timeout=3)
+
+    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type_cached")
     @patch("dragonchain.lib.queue.redis")
     def test_enqueue_l1_raises_runtime_with_bad_redis_call(self, mock_redis, mock_get_transaction_type):
         mock_pipeline = MagicMock()
@@ -92,10 +197,10 @@ class TestQueue(unittest.TestCase):
         self.assertRaises(RuntimeError, queue.enqueue_l1, param_value)
 
     @patch(
-        "dragonchain.lib.queue.smart_contract_dao.get_contract_by_id",
+        "dragonchain.lib.queue.smart_contract_dao.get_contract_by_id_cached",
         return_value=MagicMock(status={"state": "active"}, export_as_invoke_request=MagicMock(return_value={"some": "data"})),
     )
-    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type", return_value=MagicMock(contract_id="banana"))
+    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type_cached", return_value=MagicMock(contract_id="banana"))
     @patch("dragonchain.lib.queue.redis")
     def test_enqueue_l1_with_active_contract_invocation_attempt_is_successful(self, mock_redis, mock_get_transaction_type, mock_get_contract):
         mock_pipeline = MagicMock()
@@ -113,8 +218,8 @@ class TestQueue(unittest.TestCase):
             ]
         )
 
-    @patch("dragonchain.lib.queue.smart_contract_dao.get_contract_by_id", return_value=MagicMock(status={"state": "inactive"}))
-    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type", return_value=MagicMock(contract_id="banana"))
+    @patch("dragonchain.lib.queue.smart_contract_dao.get_contract_by_id_cached", return_value=MagicMock(status={"state": "inactive"}))
+    @patch("dragonchain.lib.queue.transaction_type_dao.get_registered_transaction_type_cached", return_value=MagicMock(contract_id="banana"))
     @patch("dragonchain.lib.queue.redis")
     def test_enqueue_l1_with_inactive_contract_invocation_attempt_is_successful(self, mock_redis, mock_get_transaction_type, mock_get_contract):
         mock_pipeline = MagicMock()
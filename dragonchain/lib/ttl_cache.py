@@ -0,0 +1,76 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import time
+import threading
+import collections
+from typing import Any, Hashable, Optional
+
+
+class TTLCache(object):
+    """Thread-safe in-process LRU cache whose entries expire a fixed number of seconds after being set"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        """Create a new cache
+        Args:
+            ttl: number of seconds an entry is valid for. If 0 or less, the cache is disabled and never stores anything
+            maxsize: maximum number of entries to keep before evicting the least recently used
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "collections.OrderedDict[Hashable, tuple]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value from the cache
+        Returns:
+            The cached value, or None if it does not exist or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Set a value in the cache
+        Args:
+            key: key to cache the value under
+            value: value to cache (None cannot be distinguished from a cache miss)
+            ttl: override of the default ttl for this entry
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a key from the cache if it exists"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove everything from the cache"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,64 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import unittest
+from unittest.mock import patch
+
+from dragonchain.lib import ttl_cache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_get_returns_set_value(self):
+        cache = ttl_cache.TTLCache(ttl=10)
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), "value")
+
+    def test_get_returns_none_when_missing(self):
+        self.assertIsNone(ttl_cache.TTLCache(ttl=10).get("key"))
+
+    @patch("dragonchain.lib.ttl_cache.time.monotonic", side_effect=[100, 111])
+    def test_get_expires_entries(self, mock_time):
+        cache = ttl_cache.TTLCache(ttl=10)
+        cache.set("key", "value")
+        self.assertIsNone(cache.get("key"))
+
+    def test_set_is_no_op_when_disabled(self):
+        cache = ttl_cache.TTLCache(ttl=0)
+        cache.set("key", "value")
+        self.assertIsNone(cache.get("key"))
+
+    def test_set_evicts_least_recently_used(self):
+        cache = ttl_cache.TTLCache(ttl=10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_invalidate_removes_key(self):
+        cache = ttl_cache.TTLCache(ttl=10)
+        cache.set("key", "value")
+        cache.invalidate("key")
+        cache.invalidate("missing")
+        self.assertIsNone(cache.get("key"))
+
+    def test_clear_removes_everything(self):
+        cache = ttl_cache.TTLCache(ttl=10)
+        cache.set("key", "value")
+        cache.clear()
+        self.assertIsNone(cache.get("key"))
@@ -0,0 +1,69 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+
+import os
+import json
+import hashlib
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+from dragonchain.lib.database import redis
+from dragonchain import logger
+
+if TYPE_CHECKING:
+    from dragonchain.lib.dto import model
+
+# Seconds to remember that a lower level block has been verified. Entries live in the LRU redis, so the index is also bounded by its memory limit
+VERIFIED_INDEX_TTL = int(os.environ.get("VERIFIED_INDEX_TTL") or "86400")
+SERVICE_NAME = "verified"
+
+_log = logger.get_logger()
+
+
+def _index_key(block: "model.BlockModel") -> str:
+    # The hash covers every signed field of the block (i.e. ddss and l1 headers) as well as its proof,
+    # so a hit means this exact block was verified, and a valid proof resent with altered fields is a miss
+    content = json.dumps(block.export_as_at_rest(), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return f"{block.dc_id}:{block.block_id}:{hashlib.sha256(content).hexdigest()}"
+
+
+def get_verified(blocks: Sequence["model.BlockModel"]) -> List[Optional[str]]:
+    """Look up which blocks have already been verified, in a single round trip
+    Args:
+        blocks: lower level blocks to look up
+    Returns:
+        The value stored when each block was marked verified, or None if it wasn't (or the index couldn't be reached), in order
+    """
+    if not blocks:
+        return []
+    try:
+        values = redis.cache_get_many([_index_key(block) for block in blocks], service_name=SERVICE_NAME)
+        return [value.decode("utf-8") if value is not None else None for value in values]
+    except Exception:
+        _log.exception("Could not read the verified block index. Verifying all blocks.")
+        return [None] * len(blocks)
+
+
+def mark_verified(block: "model.BlockModel", value: str = "1") -> None:
+    """Remember that a block's proof was valid
+    Args:
+        block: lower level block whose proof was verified
+        value: anything to remember about the verified block
+    """
+    try:
+        redis.cache_put(_index_key(block), value, cache_expire=VERIFIED_INDEX_TTL, service_name=SERVICE_NAME)
+    except Exception:
+        _log.exception("Could not write to the verified block index")
@@ -0,0 +1,75 @@
+# Copyright 2020 Dragonchain, Inc.
+# Licensed under the Apache License, Version 2.0 (the "Apache License")
+# with the following modification; you may not use this file except in
+# compliance with the Apache License and the following modification to it:
+# Section 6. Trademarks. is deleted and replaced with:
+#      6. Trademarks. This License does not grant permission to use the trade
+#         names, trademarks, service marks, or product names of the Licensor
+#         and its affiliates, except as required to comply with Section 4(c) of
+#         the License and to reproduce the content of the NOTICE file.
+# You may obtain a copy of the Apache License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Apache License with the above modification is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the Apache License for the specific
+# language governing permissions and limitations under the Apache License.
+import unittest
+from unittest.mock import patch
+
+from dragonchain import test_env  # noqa: F401
+from dragonchain.lib import verified_index
+from dragonchain.lib.dto import l2_block_model
+
+
+def make_block(block_id="1", current_ddss="10", l1_block_id="100"):
+    return l2_block_model.L2BlockModel(
+        dc_id="chain",
+        current_ddss=current_ddss,
+        block_id=block_id,
+        timestamp="12345",
+        scheme="trust",
+        proof="proof",
+        l1_dc_id="l1chain",
+        l1_block_id=l1_block_id,
+        l1_proof="l1proof",
+        validations_str="{}",
+    )
+
+
+class TestVerifiedIndex(unittest.TestCase):
+    @patch("dragonchain.lib.verified_index.redis.cache_get_many", return_value=[b"1", None])
+    def test_get_verified_looks_up_all_blocks_at_once(self, mock_get_many):
+        blocks = [make_block("1"), make_block("2")]
+        self.assertEqual(verified_index.get_verified(blocks), ["1", None])
+        mock_get_many.assert_called_once_with([verified_index._index_key(block) for block in blocks], service_name="verified")
+
+    def test_index_key_is_stable_for_the_same_block(self):
+        self.assertEqual(verified_index._index_key(make_block()), verified_index._index_key(make_block()))
+        self.assertTrue(verified_index._index_key(make_block()).startswith("chain:1:"))
+
+    def test_index_key_changes_when_signed_fields_change_with_the_same_proof(self):
+        key = verified_index._index_key(make_block())
+        self.assertNotEqual(verified_index._index_key(make_block(current_ddss="99999")), key)
+        self.assertNotEqual(verified_index._index_key(make_block(l1_block_id="101")), key)
+
+    @patch("dragonchain.lib.verified_index.redis.cache_get_many")
+    def test_get_verified_does_nothing_without_blocks(self, mock_get_many):
+        self.assertEqual(verified_index.get_verified([]), [])
+        mock_get_many.assert_not_called()
+
+    @patch("dragonchain.lib.verified_index.redis.cache_get_many", side_effect=RuntimeError)
+    def test_get_verified_treats_errors_as_not_verified(self, mock_get_many):
+        self.assertEqual(verified_index.get_verified([make_block()]), [None])
+
+    @patch("dragonchain.lib.verified_index.redis.cache_put")
+    def test_mark_verified_expires_entries(self, mock_put):
+        block = make_block()
+        verified_index.mark_verified(block, "value")
+        mock_put.assert_called_once_with(
+            verified_index._index_key(block), "value", cache_expire=verified_index.VERIFIED_INDEX_TTL, service_name="verified"
+        )
+
+    @patch("dragonchain.lib.verified_index.redis.cache_put", side_effect=RuntimeError)
+    def test_mark_verified_does_not_raise(self, mock_put):
+        verified_index.mark_verified(make_block())
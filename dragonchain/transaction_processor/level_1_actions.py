@@ -17,7 +17,8 @@
 
 import os
 import time
-from typing import List, TYPE_CHECKING
+import concurrent.futures
+from typing import Dict, List, Optional, TYPE_CHECKING
 
 from dragonchain.broadcast_processor import broadcast_functions
 from dragonchain.lib.dao import transaction_dao
@@ -25,8 +26,10 @@ from dragonchain.lib.dao import transaction_type_dao
 from dragonchain.lib.dao import block_dao
 from dragonchain.lib.dto import l1_block_model
 from dragonchain.lib import keys
+from dragonchain.lib import crypto_pool
 from dragonchain.lib import matchmaking
 from dragonchain.lib import queue
+from dragonchain.lib import metrics
 from dragonchain.lib import callback
 from dragonchain import logger
 from dragonchain import exceptions
@@ -37,8 +40,18 @@ if TYPE_CHECKING:
 
 PROOF_SCHEME = os.environ["PROOF_SCHEME"].lower()
 BROADCAST = os.environ["BROADCAST"].lower() != "false"
+# "interval" (default) creates a block every block interval. "adaptive" cuts blocks as soon as enough transactions are queued, or the max latency passes
+BLOCK_CUTTING = (os.environ.get("L1_BLOCK_CUTTING") or "interval").lower()
+BLOCK_MAX_TRANSACTIONS = int(os.environ.get("L1_BLOCK_MAX_TRANSACTIONS") or queue.MAX_L1_TRANSACTIONS)
+BLOCK_MAX_LATENCY = float(os.environ.get("L1_BLOCK_MAX_LATENCY") or "2")
+# When enabled, a block is uploaded/indexed in the background while the next block is being signed
+PIPELINE = (os.environ.get("L1_PIPELINE") or "false").lower() == "true"
+BLOCK_IDLE_TIMEOUT = 30  # Number of seconds to wait for transactions before running execute anyway (for housekeeping like registration renewal)
 
 _log = logger.get_logger()
+_store_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_pending_store: Optional[concurrent.futures.Future] = None
+_last_block_proof: Dict[str, str] = {}  # Proof of the last created block when pipelining (it may not be in storage yet)
 
 
 def execute() -> None:
@@ -70,12 +83,19 @@ def execute() -> None:
         t4 = time.time()
 
         # Store the block
-        store_data(block)
+        if PIPELINE:
+            store_data_pipelined(block)
+        else:
+            store_data(block)
+            # Clear our processing queue (finished successfully)
+            clear_processing_transactions()
         t5 = time.time()
 
-        # Clear our processing queue (finished successfully)
-        clear_processing_transactions()
-
+        metrics.observe("dequeue", t1 - t0, len(new_signable_txns))
+        metrics.set_queue_depth("incoming", queue.incoming_length())
+        metrics.observe("sign", t3 - t2, len(signed_transactions))
+        metrics.observe("build", t4 - t3, len(signed_transactions))
+        metrics.observe("upload", t5 - t4, len(signed_transactions))
         total = t5 - t0
         _log.info(f"[L1] Processed {len(signed_transactions)} transactions in {total:.4f} seconds")
         _log.info(f"[L1] Retrieving Txns From queue: {t1 - t0:.4f} sec ({((t1 - t0) / total) * 100:.1f}% of processing)")
@@ -85,6 +105,42 @@ def execute() -> None:
         _log.info(f"[L1] Uploading data: {t5 - t4:.4f} sec ({((t5 - t4) / total) * 100:.1f}% of processing)")
 
 
+def run_adaptive() -> None:
+    """Continuously create blocks as transactions arrive (instead of on a fixed schedule)"""
+    # Safety check to recover after unexpected crash while creating last block if necessary
+    queue.check_and_recover_processing_if_necessary()
+    next_block_time = 0.0
+    while True:
+        next_block_time = cut_next_block(next_block_time)
+
+
+def cut_next_block(next_block_time: float) -> float:
+    """Wait until a block should be cut, then create it
+    Args:
+        next_block_time: unix time before which a new block cannot be created
+    Returns:
+        unix time before which the following block cannot be created
+    """
+    wait_for_block_cut()
+    # Block ids are derived from time, so only a single block can be created per block interval
+    now = time.time()
+    if now < next_block_time:
+        time.sleep(next_block_time - now)
+    execute()
+    return l1_block_model.get_block_id_start_time(str(int(l1_block_model.get_current_block_id()) + 1))
+
+
+def wait_for_block_cut() -> None:
+    """Block until there are BLOCK_MAX_TRANSACTIONS queued, or BLOCK_MAX_LATENCY has passed since transactions were first seen"""
+    if not queue.is_not_empty():
+        queue.wait_for_new_transactions(BLOCK_IDLE_TIMEOUT)
+        if not queue.is_not_empty():
+            return
+    deadline = time.time() + BLOCK_MAX_LATENCY
+    while queue.incoming_length() < BLOCK_MAX_TRANSACTIONS and time.time() < deadline:
+        queue.wait_for_new_transactions(deadline - time.time())
+
+
 def activate_pending_indexes_if_necessary(block_id: str) -> None:
     """This function is used to activate a new custom index at a precise time so that indexes can be regenerated in the future if necessary
     Args:
@@ -100,6 +156,9 @@ def clear_processing_transactions() -> None:
 def get_new_transactions() -> List["transaction_model.TransactionModel"]:
     # Safety check to recover after unexpected crash while creating last block if necessary
     queue.check_and_recover_processing_if_necessary()
+    # The storing queue is only in use while a pipelined upload is in progress
+    if _pending_store is None:
+        queue.check_and_recover_storing_if_necessary()
     return queue.get_new_transactions()
 
 
@@ -108,15 +167,23 @@ def process_transactions(raw_transactions: List["transaction_model.TransactionMo
     block_id = l1_block_model.get_current_block_id()
     _log.info(f"[L1] Starting processing for block {block_id}.")
 
+    if crypto_pool.enabled():
+        crypto_pool.sign_transactions(raw_transactions, block_id)
+    else:
+        for transaction in raw_transactions:
+            sign_transaction(transaction, block_id)
+
+    callbacks = []
     for transaction in raw_transactions:
-        sign_transaction(transaction, block_id)
         signed_transactions.append(transaction)
         if transaction.invoker is not None:
             #  Contract invocation callbacks
-            callback.fire_if_exists(transaction.invoker, transaction)
+            callbacks.append((transaction.invoker, transaction))
         else:
             #  Pure ledgering transaction callbacks
-            callback.fire_if_exists(transaction.txn_id, transaction)
+            callbacks.append((transaction.txn_id, transaction))
+    # Callbacks are looked up in one round trip and delivered in the background so slow endpoints can't stall block creation
+    callback.fire_many(callbacks)
 
     _log.info("[L1] Signing complete")
 
@@ -137,7 +204,7 @@ def sign_transaction(transaction: "transaction_model.TransactionModel", block_id
 
 def create_block(signed_transactions: List["transaction_model.TransactionModel"], block_id: str) -> l1_block_model.L1BlockModel:
     # Get prior block hash and ID, and create new block with the fixated transactions
-    previous_proof = block_dao.get_last_block_proof()
+    previous_proof = _last_block_proof or block_dao.get_last_block_proof()
     block = l1_block_model.new_from_full_transactions(
         signed_transactions, block_id, previous_proof.get("block_id") or "", previous_proof.get("proof") or ""
     )
@@ -180,3 +247,31 @@ def store_data(block: l1_block_model.L1BlockModel) -> None:
         return
     broadcast_functions.set_current_block_level_sync(block.block_id, 2)
     broadcast_functions.schedule_block_for_broadcast_sync(block.block_id)
+
+
+def store_data_pipelined(block: l1_block_model.L1BlockModel) -> None:
+    """Upload a block in the background, after waiting for the upload of the previous block to finish
+    Transactions of the uploading block are kept in the storing queue (rather than processing) so they can be recovered after a crash
+    """
+    global _store_executor
+    global _pending_store
+    global _last_block_proof
+    if _store_executor is None:
+        _store_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    if _pending_store is not None:
+        try:
+            # Raises if the previous upload failed; its transactions are left in the storing queue for recovery
+            _pending_store.result()
+        except Exception:
+            _last_block_proof = {}
+            raise
+        finally:
+            _pending_store = None
+    _last_block_proof = {"block_id": block.block_id, "proof": block.proof}
+    queue.move_processing_to_storing()
+    _pending_store = _store_executor.submit(_store_and_clear, block)
+
+
+def _store_and_clear(block: l1_block_model.L1BlockModel) -> None:
+    store_data(block)
+    queue.clear_storing_queue()
@@ -23,6 +23,45 @@ from dragonchain.transaction_processor import level_1_actions
 
 
 class TestLevelOneActions(unittest.TestCase):
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.incoming_length")
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.wait_for_new_transactions")
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.is_not_empty", return_value=False)
+    def test_wait_for_block_cut_returns_after_idle_timeout(self, mock_not_empty, mock_wait, mock_length):
+        level_1_actions.wait_for_block_cut()
+        mock_wait.assert_called_once_with(level_1_actions.BLOCK_IDLE_TIMEOUT)
+        mock_length.assert_not_called()
+
+    @patch("dragonchain.transaction_processor.level_1_actions.BLOCK_MAX_TRANSACTIONS", 10)
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.incoming_length", return_value=10)
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.wait_for_new_transactions")
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.is_not_empty", return_value=True)
+    def test_wait_for_block_cut_returns_when_threshold_reached(self, mock_not_empty, mock_wait, mock_length):
+        level_1_actions.wait_for_block_cut()
+        mock_wait.assert_not_called()
+
+    @patch("dragonchain.transaction_processor.level_1_actions.BLOCK_MAX_LATENCY", 5)
+    @patch("dragonchain.transaction_processor.level_1_actions.time.time", side_effect=[100, 101, 101, 106])
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.incoming_length", return_value=1)
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.wait_for_new_transactions")
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.is_not_empty", return_value=True)
+    def test_wait_for_block_cut_returns_at_max_latency(self, mock_not_empty, mock_wait, mock_length, mock_time):
+        level_1_actions.wait_for_block_cut()
+        mock_wait.assert_called_once_with(4)
+
+    @patch("dragonchain.transaction_processor.level_1_actions.l1_block_model.get_current_block_id", return_value="10")
+    @patch("dragonchain.transaction_processor.level_1_actions.l1_block_model.get_block_id_start_time", return_value=555.0)
+    @patch("dragonchain.transaction_processor.level_1_actions.execute")
+    @patch("dragonchain.transaction_processor.level_1_actions.time")
+    @patch("dragonchain.transaction_processor.level_1_actions.wait_for_block_cut")
+    def test_cut_next_block_waits_for_next_block_id(self, mock_wait, mock_time, mock_execute, mock_start_time, mock_block_id):
+        mock_time.time.return_value = 100.0
+        self.assertEqual(level_1_actions.cut_next_block(103.0), 555.0)
+        mock_wait.assert_called_once()
+        mock_time.sleep.assert_called_once_with(3.0)
+        mock_execute.assert_called_once()
+        mock_start_time.assert_called_once_with("11")
+
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.incoming_length", return_value=0)
     @patch("dragonchain.lib.dto.l1_block_model.get_current_block_id", return_value="12345")
     @patch("dragonchain.transaction_processor.level_1_actions.activate_pending_indexes_if_necessary")
     @patch("dragonchain.transaction_processor.level_1_actions.matchmaking")
@@ -41,9 +80,11 @@ class TestLevelOneActions(unittest.TestCase):
         mock_matchmaking,
         mock_activate_indexes,
         mock_get_block_id,
+        mock_incoming_length,
     ):
         level_1_actions.execute()
 
+        mock_incoming_length.assert_called_once()
         mock_activate_indexes.assert_called_once()
         mock_get_transactions.assert_called_once()
         mock_process_transactions.assert_called_once_with([{"new": "txn"}])
@@ -77,18 +118,60 @@ class TestLevelOneActions(unittest.TestCase):
         mock_store_data.assert_not_called()
         mock_clear_processing.assert_not_called()
 
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.check_and_recover_storing_if_necessary")
     @patch("dragonchain.transaction_processor.level_1_actions.queue.check_and_recover_processing_if_necessary")
     @patch("dragonchain.transaction_processor.level_1_actions.queue.get_new_transactions")
-    def test_get_new_transactions_calls_incoming_queue(self, mock_get_txns, mock_recover):
+    def test_get_new_transactions_calls_incoming_queue(self, mock_get_txns, mock_recover, mock_recover_storing):
         level_1_actions.get_new_transactions()
         mock_get_txns.assert_called_once()
 
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.check_and_recover_storing_if_necessary")
     @patch("dragonchain.transaction_processor.level_1_actions.queue.check_and_recover_processing_if_necessary")
     @patch("dragonchain.transaction_processor.level_1_actions.queue.get_new_transactions")
-    def test_get_new_transactions_checks_for_recovery(self, mock_get_txns, mock_recover):
+    def test_get_new_transactions_checks_for_recovery(self, mock_get_txns, mock_recover, mock_recover_storing):
         level_1_actions.get_new_transactions()
         mock_recover.assert_called_once()
 
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.check_and_recover_storing_if_necessary")
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.check_and_recover_processing_if_necessary")
+    @patch("dragonchain.transaction_processor.level_1_actions.queue.get_new_transactions")
+    def test_get_new_transactions_skips_storing_recovery_during_pipelined_upload(self, mock_get_txns, mock_recover, mock_recover_storing):
+        with patch("dragonchain.transaction_processor.level_1_actions._pending_store", MagicMock()):
+            level_1_actions.get_new_transactions()
+        mock_recover.assert_called_once()
+        mock_recover_storing.assert_not_called()
+
+    @patch("dragonchain.transaction_processor.level_1_actions.queue")
+    @patch("dragonchain.transaction_processor.level_1_actions.store_data")
+    def test_store_data_pipelined_stores_in_background_and_chains_proof(self, mock_store_data, mock_queue):
+        block_1 = MagicMock(block_id="1", proof="proof1")
+        block_2 = MagicMock(block_id="2", proof="proof2")
+        try:
+            level_1_actions.store_data_pipelined(block_1)
+            self.assertEqual(level_1_actions._last_block_proof, {"block_id": "1", "proof": "proof1"})
+            level_1_actions.store_data_pipelined(block_2)
+            level_1_actions._pending_store.result()
+            mock_store_data.assert_has_calls([call(block_1), call(block_2)])
+            self.assertEqual(mock_queue.move_processing_to_storing.call_count, 2)
+            self.assertEqual(mock_queue.clear_storing_queue.call_count, 2)
+        finally:
+            level_1_actions._pending_store = None
+            level_1_actions._last_block_proof = {}
+
+    @patch("dragonchain.transaction_processor.level_1_actions.queue")
+    @patch("dragonchain.transaction_processor.level_1_actions.store_data", side_effect=RuntimeError)
+    def test_store_data_pipelined_raises_previous_upload_failure(self, mock_store_data, mock_queue):
+        try:
+            level_1_actions.store_data_pipelined(MagicMock(block_id="1", proof="proof1"))
+            self.assertRaises(RuntimeError, level_1_actions.store_data_pipelined, MagicMock(block_id="2", proof="proof2"))
+            self.assertEqual(level_1_actions._last_block_proof, {})
+            self.assertIsNone(level_1_actions._pending_store)
+            mock_queue.move_processing_to_storing.assert_called_once()
+            mock_queue.clear_storing_queue.assert_not_called()
+        finally:
+            level_1_actions._pending_store = None
+            level_1_actions._last_block_proof = {}
+
     @patch("dragonchain.transaction_processor.level_1_actions.callback")
     @patch("dragonchain.transaction_processor.level_1_actions.sign_transaction")
     def test_process_transactions_signs_all_transactions(self, mock_sign, mock_callback):
@@ -98,22 +181,34 @@ class TestLevelOneActions(unittest.TestCase):
         self.assertEqual(response, [txn_model_1, txn_model_2])  # should be the same because sign is mocked
         mock_sign.assert_has_calls([call(txn_model_1, ANY), call(txn_model_2, ANY)])
 
-    @patch("dragonchain.transaction_processor.level_1_actions.callback.fire_if_exists")
+    @patch("dragonchain.transaction_processor.level_1_actions.callback")
+    @patch("dragonchain.transaction_processor.level_1_actions.crypto_pool.sign_transactions")
+    @patch("dragonchain.transaction_processor.level_1_actions.crypto_pool.enabled", return_value=True)
+    @patch("dragonchain.transaction_processor.level_1_actions.sign_transaction")
+    def test_process_transactions_uses_crypto_pool_when_enabled(self, mock_sign, mock_enabled, mock_pool_sign, mock_callback):
+        txn_model_1 = MagicMock()
+        txn_model_2 = MagicMock()
+        response = level_1_actions.process_transactions([txn_model_1, txn_model_2])
+        self.assertEqual(response, [txn_model_1, txn_model_2])
+        mock_pool_sign.assert_called_once_with([txn_model_1, txn_model_2], ANY)
+        mock_sign.assert_not_called()
+
+    @patch("dragonchain.transaction_processor.level_1_actions.callback.fire_many")
     @patch("dragonchain.transaction_processor.level_1_actions.sign_transaction")
     def test_process_transactions_finds_contract_id(self, mock_sign, mock_fire_callback):
         fake_txn_model = MagicMock()
         fake_txn_model.invoker = "apple"
         level_1_actions.process_transactions([fake_txn_model])
-        mock_fire_callback.assert_called_once_with(fake_txn_model.invoker, fake_txn_model)
+        mock_fire_callback.assert_called_once_with([(fake_txn_model.invoker, fake_txn_model)])
 
-    @patch("dragonchain.transaction_processor.level_1_actions.callback.fire_if_exists")
+    @patch("dragonchain.transaction_processor.level_1_actions.callback.fire_many")
     @patch("dragonchain.transaction_processor.level_1_actions.sign_transaction")
     def test_process_transactions_no_invoker(self, mock_sign, mock_fire_callback):
         fake_txn_model = MagicMock()
         fake_txn_model.txn_id = "test"
         fake_txn_model.invoker = None
         level_1_actions.process_transactions([fake_txn_model])
-        mock_fire_callback.assert_called_once_with(fake_txn_model.txn_id, fake_txn_model)
+        mock_fire_callback.assert_called_once_with([(fake_txn_model.txn_id, fake_txn_model)])
 
     @patch("dragonchain.transaction_processor.level_1_actions.keys.get_my_keys")
     def test_sign_calls_keys_sign(self, mock_keys):
@@ -19,9 +19,10 @@ import os
 import time
 import math
 import json
-from typing import Dict, Tuple, Optional, Any, TYPE_CHECKING
+from typing import Dict, List, Tuple, Optional, Any, TYPE_CHECKING
 
 from dragonchain.lib import broadcast
+from dragonchain.lib import crypto_pool
 from dragonchain.lib import keys
 from dragonchain.lib import matchmaking
 from dragonchain.lib import party
@@ -30,6 +31,7 @@ from dragonchain.lib.dto import l2_block_model
 from dragonchain.lib.dto import transaction_model
 from dragonchain.transaction_processor import shared_functions
 from dragonchain.lib import queue
+from dragonchain.lib import metrics
 from dragonchain import logger
 
 if TYPE_CHECKING:
@@ -42,50 +44,89 @@ _log = logger.get_logger()
 
 
 def execute() -> None:
-    """Gets the next L1 block from the queue and processes it"""
-    matchmaking.renew_registration_if_necessary()
+    """Drains the L1 block queue, verifying batches of queued blocks (from different L1 chains) concurrently"""
+    while True:
+        matchmaking.renew_registration_if_necessary()
+        if not process_next_batch():
+            return
+        if not queue.is_not_empty():
+            _log.info("[L2] Block processing complete and no new block to process. Waiting")
+            return
+        _log.info("[L2] More blocks are queued, immediately starting processing")
+
+
+def process_next_batch() -> bool:
+    """Gets the next batch of L1 blocks from the queue, verifies them concurrently, then creates and sends an L2 block for each in queue order
+    Returns:
+        False if there were no blocks to process, True otherwise
+    """
     t0 = time.time()
-    l1_block = get_new_block()
-
-    if l1_block:
-        _log.info(f"[L2] Got next L1 block from dcid: {l1_block.dc_id} blockid: {l1_block.block_id}")
-        t1 = time.time()
-
-        if verify_transaction_count(l1_block.dc_id, l1_block.block_id, len(l1_block.stripped_transactions)):
-            transaction_validation_map = process_transactions(l1_block)
+    batch = get_new_blocks()
+    if not batch:
+        return False
+    t1 = time.time()
+    _log.info(f"[L2] Got {len(batch)} L1 block(s) from queue in {t1 - t0:.4f} sec")
+    metrics.observe("dequeue", t1 - t0, len(batch))
+    metrics.set_queue_depth("incoming", queue.incoming_length())
+
+    futures = shared_functions.run_concurrently(verify_l1_block, [l1_block for _, l1_block in batch])
+    for (item, l1_block), future in zip(batch, futures):
+        transaction_validation_map = future.result()
+        if transaction_validation_map is not None:
             t2 = time.time()
-
             l2_block = create_block(l1_block, transaction_validation_map)
             t3 = time.time()
+            metrics.observe("build", t3 - t2)
 
             send_data(l2_block)
             t4 = time.time()
 
-            total = t4 - t0
-            _log.info(f"[L2] Processed block {l2_block.l1_block_id} from {l2_block.l1_dc_id} in {total:.4f} seconds")
-            _log.info(f"[L2] Retrieving L1 block from queue: {t1 - t0:.4f} sec ({((t1 - t0) / total) * 100:.1f}% of processing)")
-            _log.info(f"[L2] Processing transactions: {t2 - t1:.4f} sec ({((t2 - t1) / total) * 100:.1f}% of processing)")
-            _log.info(f"[L2] Creating L2 block: {t3 - t2:.4f} sec ({((t3 - t2) / total) * 100:.1f}% of processing)")
-            _log.info(f"[L2] Uploading block and broadcasting down: {t4 - t3:.4f} sec ({((t4 - t3) / total) * 100:.1f}% of processing)")
+            txn_count = len(l1_block.stripped_transactions)
+            _log.info(f"[L2] Creating L2 block: {t3 - t2:.4f} sec ({_throughput(txn_count, t3 - t2)})")
+            _log.info(f"[L2] Uploading block and broadcasting down: {t4 - t3:.4f} sec ({_throughput(txn_count, t4 - t3)})")
+            _log.info(f"[L2] Processed block {l2_block.l1_block_id} from {l2_block.l1_dc_id} {t4 - t0:.4f} seconds after dequeueing")
+
+        # Remove this block from our processing queue (finished successfully)
+        queue.finish_processing_item(item)
+    return True
+
 
-        # Clear our processing queue (finished successfully)
-        clear_processing_block()
-        recurse_if_necessary()
+def verify_l1_block(l1_block: "l1_block_model.L1BlockModel") -> Optional[Dict[str, bool]]:
+    """Verify an L1 block and its transactions (safe to run concurrently for different blocks)
+    Args:
+        l1_block: L1 block to verify
+    Returns:
+        Map of txn_id to validity, or None if this block should not be processed
+    """
+    _log.info(f"[L2] Verifying L1 block from dcid: {l1_block.dc_id} blockid: {l1_block.block_id}")
+    t0 = time.time()
+    txn_count = len(l1_block.stripped_transactions)
+    if not verify_transaction_count(l1_block.dc_id, l1_block.block_id, txn_count):
+        return None
+    transaction_validation_map = process_transactions(l1_block)
+    t1 = time.time()
+    metrics.observe("verify", t1 - t0, txn_count)
+    _log.info(
+        f"[L2] Processing transactions for block {l1_block.block_id} from {l1_block.dc_id}: {t1 - t0:.4f} sec ({_throughput(txn_count, t1 - t0)})"
+    )
+    return transaction_validation_map
 
 
-def clear_processing_block() -> None:
-    queue.clear_processing_queue()
+def _throughput(txn_count: int, seconds: float) -> str:
+    if seconds <= 0:
+        return f"{txn_count} txns"
+    return f"{txn_count / seconds:.1f} txns/sec"
 
 
-def get_new_block() -> Optional["l1_block_model.L1BlockModel"]:
+def get_new_blocks() -> List[Tuple[bytes, "l1_block_model.L1BlockModel"]]:
     # Safety check to recover after unexpected crash while creating last block if necessary
     queue.check_and_recover_processing_if_necessary()
-    return queue.get_next_l1_block()
+    return queue.get_next_l1_blocks()
 
 
 def get_verifying_keys(chain_id: str) -> keys.DCKeys:
     _log.info("[L2] Getting L1's verifying keys")
-    return keys.DCKeys(chain_id)
+    return keys.get_verifying_keys(chain_id)
 
 
 def verify_block(block: "l1_block_model.L1BlockModel", keys: keys.DCKeys) -> bool:
@@ -95,10 +136,12 @@ def verify_block(block: "l1_block_model.L1BlockModel", keys: keys.DCKeys) -> boo
 
 def send_data(block: l2_block_model.L2BlockModel) -> None:
     _log.info("[L2] Uploading block")
-    block_dao.insert_block(block)
+    with metrics.timer("upload"):
+        block_dao.insert_block(block)
 
     _log.info("[L2] Inserting complete. Broadcasting block")
-    broadcast.dispatch(block)
+    with metrics.timer("broadcast"):
+        broadcast.dispatch(block)
 
 
 def process_transactions(l1_block: "l1_block_model.L1BlockModel") -> Dict[str, bool]:
@@ -108,6 +151,8 @@ def process_transactions(l1_block: "l1_block_model.L1BlockModel") -> Dict[str, b
         if verify_block(l1_block, verify_keys):
             verify_transactions(l1_block, verify_keys, txn_map)
         else:
+            # The keys may be stale, so make sure they are fetched fresh for the next block
+            keys.invalidate_verifying_keys(l1_block.dc_id)
             mark_invalid(l1_block, txn_map)
     except Exception:
         mark_invalid(l1_block, txn_map)
@@ -117,6 +162,9 @@ def process_transactions(l1_block: "l1_block_model.L1BlockModel") -> Dict[str, b
 
 def verify_transactions(block: "l1_block_model.L1BlockModel", keys: keys.DCKeys, txn_map: Dict[str, Any]) -> None:
     _log.info("[L2] Whole block is valid, verifying individual transactions")
+    if crypto_pool.enabled():
+        txn_map.update(crypto_pool.verify_stripped_transactions(block.dc_id, keys, block.stripped_transactions))
+        return
     for txn in block.stripped_transactions:
         try:
             txn = transaction_model.new_from_stripped_block_input(txn)
@@ -185,17 +233,10 @@ def get_next_block_info() -> Tuple[int, str]:
 
 
 def sign_block(l2_block: l2_block_model.L2BlockModel) -> None:
-    if PROOF_SCHEME == "work":
-        _log.info("[L2] Performing PoW on block")
-        l2_block.proof, l2_block.nonce = keys.get_my_keys().pow_block(l2_block)
-    else:
-        _log.info("[L2] Signing block")
-        l2_block.proof = keys.get_my_keys().sign_block(l2_block)
-
-
-def recurse_if_necessary() -> None:
-    if queue.is_not_empty():
-        _log.info("[L2] Another block is queue, immediately starting processing")
-        execute()
-    else:
-        _log.info("[L2] Block processing complete and no new block to process. Waiting")
+    with metrics.timer("sign"):
+        if PROOF_SCHEME == "work":
+            _log.info("[L2] Performing PoW on block")
+            l2_block.proof, l2_block.nonce = keys.get_my_keys().pow_block(l2_block)
+        else:
+            _log.info("[L2] Signing block")
+            l2_block.proof = keys.get_my_keys().sign_block(l2_block)
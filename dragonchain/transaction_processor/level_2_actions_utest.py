@@ -16,79 +16,99 @@
 # language governing permissions and limitations under the Apache License.
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, call
 
 from dragonchain import test_env  # noqa: F401
 from dragonchain.transaction_processor import level_2_actions
 
 
 class TestLevelTwoActions(unittest.TestCase):
+    @patch("dragonchain.transaction_processor.level_2_actions.queue")
     @patch("dragonchain.transaction_processor.level_2_actions.matchmaking")
     @patch("dragonchain.transaction_processor.level_2_actions.send_data")
-    @patch("dragonchain.transaction_processor.level_2_actions.recurse_if_necessary")
     @patch("dragonchain.transaction_processor.level_2_actions.create_block")
-    @patch("dragonchain.transaction_processor.level_2_actions.process_transactions", return_value=True)
-    @patch("dragonchain.transaction_processor.level_2_actions.get_new_block")
-    @patch("dragonchain.transaction_processor.level_2_actions.verify_transaction_count")
-    @patch("dragonchain.transaction_processor.level_2_actions.clear_processing_block")
+    @patch("dragonchain.transaction_processor.level_2_actions.process_transactions", return_value={"txn": True})
+    @patch("dragonchain.transaction_processor.level_2_actions.get_new_blocks")
+    @patch("dragonchain.transaction_processor.level_2_actions.verify_transaction_count", return_value=True)
     def test_execute_calls_correct_functions(
-        self, mock_clear_processing, mock_get_block, mock_process, mock_create_block, mock_recurse, mock_send_data, mock_count, mock_matchmaking
+        self, mock_count, mock_get_blocks, mock_process, mock_create_block, mock_send_data, mock_matchmaking, mock_queue
     ):
+        mock_block = MagicMock(stripped_transactions=["txn"])
+        mock_get_blocks.return_value = [(b"item", mock_block)]
+        mock_queue.is_not_empty.return_value = False
         level_2_actions.execute()
 
-        mock_get_block.assert_called_once()
-        mock_process.assert_called_once()
-        mock_create_block.assert_called_once()
-        mock_send_data.assert_called_once()
-        mock_recurse.assert_called_once()
+        mock_get_blocks.assert_called_once()
         mock_count.assert_called_once()
-        mock_clear_processing.assert_called_once()
+        mock_process.assert_called_once_with(mock_block)
+        mock_create_block.assert_called_once_with(mock_block, {"txn": True})
+        mock_send_data.assert_called_once_with(mock_create_block.return_value)
+        mock_queue.finish_processing_item.assert_called_once_with(b"item")
 
+    @patch("dragonchain.transaction_processor.level_2_actions.queue")
     @patch("dragonchain.transaction_processor.level_2_actions.matchmaking")
     @patch("dragonchain.transaction_processor.level_2_actions.send_data")
-    @patch("dragonchain.transaction_processor.level_2_actions.recurse_if_necessary")
     @patch("dragonchain.transaction_processor.level_2_actions.create_block")
     @patch("dragonchain.transaction_processor.level_2_actions.verify_transactions")
     @patch("dragonchain.transaction_processor.level_2_actions.verify_block")
     @patch("dragonchain.transaction_processor.level_2_actions.get_verifying_keys")
-    @patch("dragonchain.transaction_processor.level_2_actions.get_new_block", return_value=[])
-    @patch("dragonchain.transaction_processor.level_2_actions.clear_processing_block")
+    @patch("dragonchain.transaction_processor.level_2_actions.get_new_blocks", return_value=[])
     def test_execute_no_ops_on_empty_queue(
-        self,
-        mock_clear_processing,
-        mock_get_block,
-        mock_get_keys,
-        mock_verify_block,
-        mock_verify_txn,
-        mock_create_block,
-        mock_recurse,
-        mock_send_data,
-        mock_matchmaking,
+        self, mock_get_blocks, mock_get_keys, mock_verify_block, mock_verify_txn, mock_create_block, mock_send_data, mock_matchmaking, mock_queue
     ):
         level_2_actions.execute()
 
-        mock_get_block.assert_called_once()
+        mock_get_blocks.assert_called_once()
         mock_get_keys.assert_not_called()
         mock_verify_block.assert_not_called()
         mock_verify_txn.assert_not_called()
         mock_create_block.assert_not_called()
-        mock_recurse.assert_not_called()
         mock_send_data.assert_not_called()
-        mock_clear_processing.assert_not_called()
+        mock_queue.finish_processing_item.assert_not_called()
+
+    @patch("dragonchain.transaction_processor.level_2_actions.queue")
+    @patch("dragonchain.transaction_processor.level_2_actions.matchmaking")
+    @patch("dragonchain.transaction_processor.level_2_actions.send_data")
+    @patch("dragonchain.transaction_processor.level_2_actions.create_block")
+    @patch("dragonchain.transaction_processor.level_2_actions.process_transactions")
+    @patch("dragonchain.transaction_processor.level_2_actions.verify_transaction_count", side_effect=[True, False, True])
+    def test_execute_creates_blocks_in_queue_order_and_finishes_each_item(
+        self, mock_count, mock_process, mock_create_block, mock_send_data, mock_matchmaking, mock_queue
+    ):
+        blocks = [MagicMock(block_id=str(i), stripped_transactions=[]) for i in range(3)]
+        mock_process.side_effect = lambda block: {"block": block.block_id}
+        with patch(
+            "dragonchain.transaction_processor.level_2_actions.get_new_blocks", return_value=[(b"0", blocks[0]), (b"1", blocks[1]), (b"2", blocks[2])]
+        ):
+            mock_queue.is_not_empty.return_value = False
+            level_2_actions.execute()
+
+        self.assertEqual(mock_create_block.call_args_list, [call(blocks[0], {"block": "0"}), call(blocks[2], {"block": "2"})])
+        self.assertEqual(mock_queue.finish_processing_item.call_args_list, [call(b"0"), call(b"1"), call(b"2")])
+
+    @patch("dragonchain.transaction_processor.level_2_actions.queue")
+    @patch("dragonchain.transaction_processor.level_2_actions.matchmaking")
+    @patch("dragonchain.transaction_processor.level_2_actions.process_next_batch", return_value=True)
+    def test_execute_drains_queue_iteratively(self, mock_process_batch, mock_matchmaking, mock_queue):
+        mock_queue.is_not_empty.side_effect = [True, True, False]
+        level_2_actions.execute()
+
+        self.assertEqual(mock_process_batch.call_count, 3)
+        self.assertEqual(mock_matchmaking.renew_registration_if_necessary.call_count, 3)
 
     @patch("dragonchain.transaction_processor.level_2_actions.queue.check_and_recover_processing_if_necessary")
-    @patch("dragonchain.transaction_processor.level_2_actions.queue.get_next_l1_block")
-    def test_get_new_block_calls_incoming_queue(self, mock_get_next_block, mock_recover):
-        level_2_actions.get_new_block()
-        mock_get_next_block.assert_called_once()
+    @patch("dragonchain.transaction_processor.level_2_actions.queue.get_next_l1_blocks")
+    def test_get_new_blocks_calls_incoming_queue(self, mock_get_next_blocks, mock_recover):
+        level_2_actions.get_new_blocks()
+        mock_get_next_blocks.assert_called_once()
 
     @patch("dragonchain.transaction_processor.level_2_actions.queue.check_and_recover_processing_if_necessary")
-    @patch("dragonchain.transaction_processor.level_2_actions.queue.get_next_l1_block")
-    def test_get_new_block_checks_for_recovery(self, mock_get_next_block, mock_recover):
-        level_2_actions.get_new_block()
+    @patch("dragonchain.transaction_processor.level_2_actions.queue.get_next_l1_blocks")
+    def test_get_new_blocks_checks_for_recovery(self, mock_get_next_blocks, mock_recover):
+        level_2_actions.get_new_blocks()
         mock_recover.assert_called_once()
 
-    @patch("dragonchain.transaction_processor.level_2_actions.keys.DCKeys", return_value="ChainKeys")
+    @patch("dragonchain.transaction_processor.level_2_actions.keys.get_verifying_keys", return_value="ChainKeys")
     def test_get_verifying_keys_returns_correct_keys(self, mock_keys):
         self.assertEqual(level_2_actions.get_verifying_keys("MyID"), "ChainKeys")
         mock_keys.assert_called_once_with("MyID")
@@ -126,6 +146,18 @@ class TestLevelTwoActions(unittest.TestCase):
         self.assertTrue(txn_map["1"])
         self.assertIsNone(txn_map.get("2"))
 
+    @patch("dragonchain.transaction_processor.level_2_actions.crypto_pool.verify_stripped_transactions", return_value={"1": True, "2": False})
+    @patch("dragonchain.transaction_processor.level_2_actions.crypto_pool.enabled", return_value=True)
+    def test_verify_transactions_uses_crypto_pool_when_enabled(self, mock_enabled, mock_verify_stripped):
+        txn_map = {}
+        mock_keys = MagicMock()
+        mock_block = MagicMock(dc_id="banana", stripped_transactions=["txn1", "txn2"])
+
+        level_2_actions.verify_transactions(mock_block, mock_keys, txn_map)
+        mock_verify_stripped.assert_called_once_with("banana", mock_keys, ["txn1", "txn2"])
+        mock_keys.verify_stripped_transaction.assert_not_called()
+        self.assertEqual(txn_map, {"1": True, "2": False})
+
     @patch("dragonchain.transaction_processor.level_2_actions.broadcast.dispatch")
     @patch("dragonchain.transaction_processor.level_2_actions.block_dao.insert_block")
     def test_send_data_inserts_and_dispatches(self, mock_insert_block, mock_dispatch):
@@ -148,13 +180,17 @@ class TestLevelTwoActions(unittest.TestCase):
         mock_invalidate.assert_not_called()
         mock_validate.assert_called_once_with(mock_block, "keys", {})
 
+    @patch("dragonchain.transaction_processor.level_2_actions.keys.invalidate_verifying_keys")
     @patch("dragonchain.transaction_processor.level_2_actions.get_verifying_keys", return_value="keys")
     @patch("dragonchain.transaction_processor.level_2_actions.verify_transactions")
     @patch("dragonchain.transaction_processor.level_2_actions.mark_invalid")
     @patch("dragonchain.transaction_processor.level_2_actions.verify_block", return_value=False)
-    def test_process_transactions_invalidates_if_invalid_block(self, mock_verify_block, mock_invalidate, mock_validate, mock_get_keys):
+    def test_process_transactions_invalidates_if_invalid_block(
+        self, mock_verify_block, mock_invalidate, mock_validate, mock_get_keys, mock_invalidate_keys
+    ):
         mock_block = MagicMock()
         self.assertEqual(level_2_actions.process_transactions(mock_block), {})
+        mock_invalidate_keys.assert_called_once_with(mock_block.dc_id)
 
         mock_get_keys.assert_called_once()
         mock_verify_block.assert_called_once_with(mock_block, "keys")
@@ -265,16 +301,10 @@ class TestLevelTwoActions(unittest.TestCase):
         mock_keys.return_value.sign_block.assert_called_once_with(mock_block)
         self.assertEqual(mock_block.proof, "proof")
 
-    @patch("dragonchain.transaction_processor.level_2_actions.queue.is_not_empty", return_value=True)
-    @patch("dragonchain.transaction_processor.level_2_actions.execute")
-    def test_recurse_necessary(self, mock_execute, mock_is_not_empty):
-        level_2_actions.recurse_if_necessary()
-
-        mock_execute.assert_called_once()
-
     @patch("dragonchain.transaction_processor.level_2_actions.queue.is_not_empty", return_value=False)
-    @patch("dragonchain.transaction_processor.level_2_actions.execute")
-    def test_recurse_not_necessary(self, mock_execute, mock_is_not_empty):
-        level_2_actions.recurse_if_necessary()
+    @patch("dragonchain.transaction_processor.level_2_actions.matchmaking")
+    @patch("dragonchain.transaction_processor.level_2_actions.process_next_batch", return_value=True)
+    def test_execute_stops_when_queue_is_drained(self, mock_process_batch, mock_matchmaking, mock_is_not_empty):
+        level_2_actions.execute()
 
-        mock_execute.assert_not_called()
+        mock_process_batch.assert_called_once()
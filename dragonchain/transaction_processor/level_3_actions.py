@@ -18,7 +18,8 @@
 import os
 import time
 import math
-from typing import Set, Union, Tuple, List, Iterable, TYPE_CHECKING
+import json
+from typing import Set, Dict, Union, Tuple, List, Iterable, TYPE_CHECKING
 
 from dragonchain.lib.dao import block_dao
 from dragonchain.lib.dto import l3_block_model
@@ -27,6 +28,8 @@ from dragonchain.lib import broadcast
 from dragonchain.lib import matchmaking
 from dragonchain.lib import party
 from dragonchain.lib import queue
+from dragonchain.lib import metrics
+from dragonchain.lib import verified_index
 from dragonchain import logger
 from dragonchain.transaction_processor import shared_functions
 
@@ -42,72 +45,85 @@ _log = logger.get_logger()
 
 
 def execute() -> None:
-    """Gets the next L2 block arrays from the queue and processes it"""
-    matchmaking.renew_registration_if_necessary()
-    t0 = time.time()
+    """Drains the L2 block array queue, verifying batches of queued arrays (for different L1 blocks) concurrently"""
+    while True:
+        matchmaking.renew_registration_if_necessary()
+        if not process_next_batch():
+            return
+        if not queue.is_not_empty():
+            _log.info("[L3] Block processing complete and no new block to process. Waiting")
+            return
+        _log.info("[L3] More blocks are queued, immediately starting processing")
 
-    l1_headers, l2_blocks = get_new_blocks()
-    if l1_headers and l2_blocks:
-        t1 = time.time()
-        _log.info(f"[L3] Got next L2 block array from dcid: {l1_headers['dc_id']} blockid: {l1_headers['block_id']}")
 
-        ddss, valid_block_count, regions, clouds = verify_blocks(l2_blocks, l1_headers)
+def process_next_batch() -> bool:
+    """Gets the next batch of L2 block arrays from the queue, verifies them concurrently, then creates and sends an L3 block for each in queue order
+    Returns:
+        False if there were no block arrays to process, True otherwise
+    """
+    t0 = time.time()
+    batch = get_new_blocks()
+    if not batch:
+        return False
+    t1 = time.time()
+    _log.info(f"[L3] Got {len(batch)} L2 block array(s) from queue in {t1 - t0:.4f} sec")
+    metrics.observe("dequeue", t1 - t0, len(batch))
+    metrics.set_queue_depth("incoming", queue.incoming_length())
+
+    futures = shared_functions.run_concurrently(_verify_block_array, [(l2_blocks, l1_headers) for _, l1_headers, l2_blocks in batch])
+    for (item, l1_headers, l2_blocks), future in zip(batch, futures):
+        ddss, valid_block_count, regions, clouds = future.result()
         if not valid_block_count:
             _log.info("[L3] None of the L2 blocks sent up were valid. Not creating any block/verifications")
-            clear_processing_blocks()
-            recurse_if_necessary()
-            return
-        t2 = time.time()
-
-        l3_block = create_block(l1_headers, ddss, valid_block_count, regions, clouds, l2_blocks)
-        t3 = time.time()
-
-        send_data(l3_block)
-        t4 = time.time()
+        else:
+            t2 = time.time()
+            l3_block = create_block(l1_headers, ddss, valid_block_count, regions, clouds, l2_blocks)
+            t3 = time.time()
+            metrics.observe("build", t3 - t2)
 
-        # Clear our processing queue (finished successfully)
-        clear_processing_blocks()
+            send_data(l3_block)
+            t4 = time.time()
 
-        total = t4 - t0
-        _log.info(
-            f"[L3] Processed {len(l2_blocks)} l2 blocks for l1 block id {l1_headers['dc_id']} with dcid {l1_headers['block_id']} in {total:.4f} seconds"
-        )
-        _log.info(f"[L3] Retrieving L2 block list from queue: {t1 - t0:.4f} sec ({((t1 - t0) / total) * 100:.1f}% of processing)")
-        _log.info(f"[L3] Verified all L2 blocks in list: {t2 - t1:.4f} sec ({((t2 - t1) / total) * 100:.1f}% of processing)")
-        _log.info(f"[L3] Creating block with proof: {t3 - t2:.4f} sec ({((t3 - t2) / total) * 100:.1f}% of processing)")
-        _log.info(f"[L3] Uploading block and broadcasting down: {t4 - t3:.4f} sec ({((t4 - t3) / total) * 100:.1f}% of processing)")
+            _log.info(f"[L3] Creating block with proof: {t3 - t2:.4f} sec")
+            _log.info(f"[L3] Uploading block and broadcasting down: {t4 - t3:.4f} sec")
+            _log.info(
+                f"[L3] Processed {len(l2_blocks)} l2 blocks for l1 block id {l1_headers['block_id']} with dcid {l1_headers['dc_id']} {t4 - t0:.4f} seconds after dequeueing"
+            )
 
-        recurse_if_necessary()
+        # Remove this array from our processing queue (finished successfully)
+        queue.finish_processing_item(item)
+    return True
 
 
-def clear_processing_blocks() -> None:
-    queue.clear_processing_queue()
+def _verify_block_array(args: Tuple[List["l2_block_model.L2BlockModel"], "L1Headers"]) -> Tuple[int, int, List[str], List[str]]:
+    l2_blocks, l1_headers = args
+    _log.info(f"[L3] Verifying L2 block array from dcid: {l1_headers['dc_id']} blockid: {l1_headers['block_id']}")
+    t0 = time.time()
+    result = verify_blocks(l2_blocks, l1_headers)
+    t1 = time.time()
+    metrics.observe("verify", t1 - t0, len(l2_blocks))
+    _log.info(f"[L3] Verified {len(l2_blocks)} L2 blocks for l1 block id {l1_headers['block_id']}: {t1 - t0:.4f} sec")
+    return result
 
 
 def send_data(block: l3_block_model.L3BlockModel) -> None:
     _log.info("[L3] Uploading block")
-    block_dao.insert_block(block)
+    with metrics.timer("upload"):
+        block_dao.insert_block(block)
 
     _log.info("[L3] Inserting complete. Broadcasting block")
-    broadcast.dispatch(block)
-
-
-def recurse_if_necessary() -> None:
-    if queue.is_not_empty():
-        _log.info("[L3] Another block is queue, immediately starting processing")
-        execute()
-    else:
-        _log.info("[L3] Block processing complete and no new block to process. Waiting")
+    with metrics.timer("broadcast"):
+        broadcast.dispatch(block)
 
 
-def get_new_blocks() -> Union[Tuple[None, None], Tuple["L1Headers", List["l2_block_model.L2BlockModel"]]]:
+def get_new_blocks() -> List[Tuple[bytes, "L1Headers", List["l2_block_model.L2BlockModel"]]]:
     # Safety check to recover after unexpected crash while creating last block if necessary
     queue.check_and_recover_processing_if_necessary()
-    return queue.get_next_l2_blocks()
+    return queue.get_next_l2_block_arrays()
 
 
 def get_verifying_keys(chain_id: str) -> keys.DCKeys:
-    return keys.DCKeys(chain_id)
+    return keys.get_verifying_keys(chain_id)
 
 
 def verify_blocks(l2_blocks: Iterable["l2_block_model.L2BlockModel"], l1_headers: "L1Headers") -> Tuple[int, int, List[str], List[str]]:
@@ -116,6 +132,7 @@ def verify_blocks(l2_blocks: Iterable["l2_block_model.L2BlockModel"], l1_headers
     regions: Set[str] = set()
     clouds: Set[str] = set()
     checked: Set[str] = set()
+    relevant_blocks = []
     for block in l2_blocks:
         # We use a checked array with proofs (which are unique) to make sure we don't process
         # a block twice, and ensures the block we're looking at is actually relevant
@@ -127,13 +144,24 @@ def verify_blocks(l2_blocks: Iterable["l2_block_model.L2BlockModel"], l1_headers
         )
 
         if check:
-            clouds, regions, ddss, l2_count = verify_block(block, clouds, regions, ddss, l2_count)
+            relevant_blocks.append(block)
         else:
             _log.info(f"[L3] L2 block was duplicated or not relevant to this verification.\n{block.__dict__}")
 
         # Finally, add this block into our checked blocks list
         checked.add(block.proof)
 
+    # Blocks verified before (i.e. redelivered or resent) are counted from the index without checking their proofs again
+    verified = verified_index.get_verified(relevant_blocks)
+    # Load the keys and registrations of every other chain in this array at once, rather than one at a time while verifying
+    keys.prefetch_verifying_keys(block.dc_id for block, location in zip(relevant_blocks, verified) if location is None)
+    for block, location in zip(relevant_blocks, verified):
+        if location is None:
+            clouds, regions, ddss, l2_count = verify_block(block, clouds, regions, ddss, l2_count)
+        else:
+            _log.info(f"[L3] L2 block id {block.block_id} from {block.dc_id} was already verified")
+            clouds, regions, ddss, l2_count = count_valid_block(block, json.loads(location), clouds, regions, ddss, l2_count)
+
     return ddss, l2_count, list(regions), list(clouds)
 
 
@@ -144,21 +172,29 @@ def verify_block(
         l2_verify_keys = get_verifying_keys(block.dc_id)
         _log.info(f"[L3] Verifying proof for L2 block id {block.block_id} from {block.dc_id}")
         if l2_verify_keys.verify_block(block):
-            l2_count += 1
-            l2_ddss = block.current_ddss or "0"
-            matchmaking_config = matchmaking.get_registration(block.dc_id)
-            clouds.add(matchmaking_config["cloud"])
-            regions.add(matchmaking_config["region"])
-            ddss += int(float(l2_ddss))
+            matchmaking_config = matchmaking.get_registration_cached(block.dc_id)
+            location = {"cloud": matchmaking_config["cloud"], "region": matchmaking_config["region"]}
+            clouds, regions, ddss, l2_count = count_valid_block(block, location, clouds, regions, ddss, l2_count)
+            verified_index.mark_verified(block, json.dumps(location, separators=(",", ":")))
             _log.info(f"[L3] Finished processing valid L2 block {block.block_id}")
         else:
             _log.info(f"[L3] Proof for L2 block id {block.block_id} from {block.dc_id} was invalid. Not including block in stats.")
+            keys.invalidate_verifying_keys(block.dc_id)
     except Exception:
         _log.exception("[L3] Could not get L2's verifying keys. Not incrementing stats for this block.")
 
     return clouds, regions, ddss, l2_count
 
 
+def count_valid_block(
+    block: "l2_block_model.L2BlockModel", location: Dict[str, str], clouds: Set[str], regions: Set[str], ddss: int, l2_count: int
+) -> Tuple[Set[str], Set[str], int, int]:
+    clouds.add(location["cloud"])
+    regions.add(location["region"])
+    ddss += int(float(block.current_ddss or "0"))
+    return clouds, regions, ddss, l2_count + 1
+
+
 def get_next_block_info() -> Tuple[int, str]:
     previous = block_dao.get_last_block_proof()
     _log.info(f"[L3] Got previous block information: {previous}")
@@ -214,10 +250,11 @@ def create_block(
 
 
 def sign_block(l3_block: l3_block_model.L3BlockModel) -> None:
-    if PROOF_SCHEME == "work":
-        _log.info("[L3] Performing PoW on block")
-        l3_block.proof, l3_block.nonce = keys.get_my_keys().pow_block(l3_block)
-    else:
-        _log.info("[L3] Signing block")
-        l3_block.proof = keys.get_my_keys().sign_block(l3_block)
-    _log.info(f"[L3] Finished Block:\n{l3_block.export_as_at_rest()}")
+    with metrics.timer("sign"):
+        if PROOF_SCHEME == "work":
+            _log.info("[L3] Performing PoW on block")
+            l3_block.proof, l3_block.nonce = keys.get_my_keys().pow_block(l3_block)
+        else:
+            _log.info("[L3] Signing block")
+            l3_block.proof = keys.get_my_keys().sign_block(l3_block)
+        _log.info(f"[L3] Finished Block:\n{l3_block.export_as_at_rest()}")
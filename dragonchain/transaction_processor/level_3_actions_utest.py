@@ -23,57 +23,67 @@ from dragonchain.transaction_processor import level_3_actions
 
 
 class TestLevelThreeActions(unittest.TestCase):
+    @patch("dragonchain.transaction_processor.level_3_actions.queue")
     @patch("dragonchain.transaction_processor.level_3_actions.matchmaking")
     @patch("dragonchain.transaction_processor.level_3_actions.send_data")
-    @patch("dragonchain.transaction_processor.level_3_actions.recurse_if_necessary")
     @patch("dragonchain.transaction_processor.level_3_actions.create_block")
-    @patch("dragonchain.transaction_processor.level_3_actions.verify_blocks", return_value=(MagicMock(), MagicMock(), MagicMock(), MagicMock()))
-    @patch("dragonchain.transaction_processor.level_3_actions.get_new_blocks", return_value=(MagicMock(), MagicMock()))
-    @patch("dragonchain.transaction_processor.level_3_actions.clear_processing_blocks")
+    @patch("dragonchain.transaction_processor.level_3_actions.verify_blocks", return_value=("ddss", 2, ["region"], ["cloud"]))
+    @patch("dragonchain.transaction_processor.level_3_actions.get_new_blocks")
     def test_execute_calls_correct_functions(
-        self, mock_clear_processing, mock_get_block, mock_verify_blocks, mock_create_block, mock_recurse, mock_send_data, mock_matchmaking
+        self, mock_get_blocks, mock_verify_blocks, mock_create_block, mock_send_data, mock_matchmaking, mock_queue
     ):
+        headers = {"dc_id": "123", "block_id": "123"}
+        mock_get_blocks.return_value = [(b"item", headers, ["l2 block"])]
+        mock_queue.is_not_empty.return_value = False
         level_3_actions.execute()
 
-        mock_get_block.assert_called_once()
-        mock_verify_blocks.assert_called_once()
-        mock_create_block.assert_called_once()
-        mock_send_data.assert_called_once()
-        mock_recurse.assert_called_once()
-        mock_clear_processing.assert_called_once()
+        mock_get_blocks.assert_called_once()
+        mock_verify_blocks.assert_called_once_with(["l2 block"], headers)
+        mock_create_block.assert_called_once_with(headers, "ddss", 2, ["region"], ["cloud"], ["l2 block"])
+        mock_send_data.assert_called_once_with(mock_create_block.return_value)
+        mock_queue.finish_processing_item.assert_called_once_with(b"item")
 
+    @patch("dragonchain.transaction_processor.level_3_actions.queue")
     @patch("dragonchain.transaction_processor.level_3_actions.matchmaking")
     @patch("dragonchain.transaction_processor.level_3_actions.send_data")
-    @patch("dragonchain.transaction_processor.level_3_actions.recurse_if_necessary")
     @patch("dragonchain.transaction_processor.level_3_actions.create_block")
-    @patch("dragonchain.transaction_processor.level_3_actions.verify_blocks", return_value=(MagicMock(), MagicMock(), MagicMock(), MagicMock()))
-    @patch("dragonchain.transaction_processor.level_3_actions.get_new_blocks", return_value=(None, None))
-    @patch("dragonchain.transaction_processor.level_3_actions.clear_processing_blocks")
+    @patch("dragonchain.transaction_processor.level_3_actions.verify_blocks")
+    @patch("dragonchain.transaction_processor.level_3_actions.get_new_blocks", return_value=[])
     def test_execute_no_ops_on_empty_queue(
-        self, mock_clear_processing, mock_get_block, mock_verify_blocks, mock_create_block, mock_recurse, mock_send_data, mock_matchmaking
+        self, mock_get_blocks, mock_verify_blocks, mock_create_block, mock_send_data, mock_matchmaking, mock_queue
     ):
         level_3_actions.execute()
 
-        mock_get_block.assert_called_once()
-
+        mock_get_blocks.assert_called_once()
         mock_verify_blocks.assert_not_called()
         mock_create_block.assert_not_called()
         mock_send_data.assert_not_called()
-        mock_recurse.assert_not_called()
-        mock_clear_processing.assert_not_called()
+        mock_queue.finish_processing_item.assert_not_called()
 
-    @patch("dragonchain.transaction_processor.level_3_actions.clear_processing_blocks")
+    @patch("dragonchain.transaction_processor.level_3_actions.queue")
     @patch("dragonchain.transaction_processor.level_3_actions.matchmaking")
-    @patch("dragonchain.transaction_processor.level_3_actions.recurse_if_necessary")
+    @patch("dragonchain.transaction_processor.level_3_actions.create_block")
     @patch("dragonchain.transaction_processor.level_3_actions.verify_blocks", return_value=(MagicMock(), 0, MagicMock(), MagicMock()))
-    @patch("dragonchain.transaction_processor.level_3_actions.get_new_blocks", return_value=({"dc_id": "123", "block_id": "123"}, True))
-    def test_execute_skips_on_invalid_block(self, mock_get_block, mock_verify_blocks, mock_recurse, mock_matchmaking, mock_clear_blocks):
+    @patch(
+        "dragonchain.transaction_processor.level_3_actions.get_new_blocks",
+        return_value=[(b"item", {"dc_id": "123", "block_id": "123"}, ["l2 block"])],
+    )
+    def test_execute_skips_on_invalid_block(self, mock_get_blocks, mock_verify_blocks, mock_create_block, mock_matchmaking, mock_queue):
+        mock_queue.is_not_empty.return_value = False
         level_3_actions.execute()
 
-        mock_get_block.assert_called_once()
         mock_verify_blocks.assert_called_once()
-        mock_recurse.assert_called_once()
-        mock_clear_blocks.assert_called_once()
+        mock_create_block.assert_not_called()
+        mock_queue.finish_processing_item.assert_called_once_with(b"item")
+
+    @patch("dragonchain.transaction_processor.level_3_actions.queue")
+    @patch("dragonchain.transaction_processor.level_3_actions.matchmaking")
+    @patch("dragonchain.transaction_processor.level_3_actions.process_next_batch", return_value=True)
+    def test_execute_drains_queue_iteratively(self, mock_process_batch, mock_matchmaking, mock_queue):
+        mock_queue.is_not_empty.side_effect = [True, False]
+        level_3_actions.execute()
+
+        self.assertEqual(mock_process_batch.call_count, 2)
 
     @patch("dragonchain.transaction_processor.level_3_actions.broadcast.dispatch")
     @patch("dragonchain.transaction_processor.level_3_actions.block_dao.insert_block")
@@ -84,22 +94,24 @@ class TestLevelThreeActions(unittest.TestCase):
 
         mock_dispatch.assert_called_once_with(mock_block)
 
+    @patch("dragonchain.transaction_processor.level_3_actions.verified_index.mark_verified")
     @patch("dragonchain.transaction_processor.level_3_actions.get_verifying_keys", return_value=MagicMock(verify_block=MagicMock(return_value=True)))
     @patch(
-        "dragonchain.transaction_processor.level_3_actions.matchmaking.get_registration",
+        "dragonchain.transaction_processor.level_3_actions.matchmaking.get_registration_cached",
         return_value={"cloud": "aws", "region": "us-west-2", "wallet": "walletAddress"},
     )
-    def test_verify_block_returns_data_on_valid_block(self, mock_registration, mock_get_keys):
-        mock_block = MagicMock(dc_id=123, block_id=124, current_ddss="123432")
+    def test_verify_block_returns_data_on_valid_block(self, mock_registration, mock_get_keys, mock_mark_verified):
+        mock_block = MagicMock(dc_id=123, block_id=124, proof="proof", current_ddss="123432")
         clouds, regions, ddss, l2_count = level_3_actions.verify_block(mock_block, set(), set(), 0, 0)
         mock_get_keys.assert_called_once_with(123)
         mock_registration.assert_called_once_with(123)
+        mock_mark_verified.assert_called_once_with(mock_block, '{"cloud":"aws","region":"us-west-2"}')
         self.assertEqual(clouds, {"aws"})
         self.assertEqual(regions, {"us-west-2"})
         self.assertEqual(ddss, 123432)
         self.assertEqual(l2_count, 1)
 
-    @patch("dragonchain.transaction_processor.level_3_actions.matchmaking.get_registration")
+    @patch("dragonchain.transaction_processor.level_3_actions.matchmaking.get_registration_cached")
     @patch("dragonchain.transaction_processor.level_3_actions.get_verifying_keys", side_effect=RuntimeError)
     def test_verify_block_returns_inputted_data_on_unverifiable_block(self, mock_get_keys, mock_registration):
         mock_block = MagicMock(dc_id=123, block_id=124)
@@ -111,12 +123,14 @@ class TestLevelThreeActions(unittest.TestCase):
         self.assertEqual(ddss, 0)
         self.assertEqual(l2_count, 0)
 
-    @patch("dragonchain.transaction_processor.level_3_actions.matchmaking.get_registration")
+    @patch("dragonchain.transaction_processor.level_3_actions.keys.invalidate_verifying_keys")
+    @patch("dragonchain.transaction_processor.level_3_actions.matchmaking.get_registration_cached")
     @patch("dragonchain.transaction_processor.level_3_actions.get_verifying_keys", return_value=MagicMock(verify_block=MagicMock(return_value=False)))
-    def test_verify_block_returns_what_was_passed_in_on_invalid_block(self, mock_get_keys, mock_registration):
+    def test_verify_block_returns_what_was_passed_in_on_invalid_block(self, mock_get_keys, mock_registration, mock_invalidate_keys):
         mock_block = MagicMock(dc_id=123, block_id=123)
         clouds, regions, ddss, l2_count = level_3_actions.verify_block(mock_block, set(), set(), 0, 0)
         mock_get_keys.assert_called_once_with(123)
+        mock_invalidate_keys.assert_called_once_with(123)
         mock_registration.assert_not_called()
         self.assertEqual(clouds, set())
         self.assertEqual(regions, set())
@@ -124,18 +138,18 @@ class TestLevelThreeActions(unittest.TestCase):
         self.assertEqual(l2_count, 0)
 
     @patch("dragonchain.transaction_processor.level_3_actions.queue.check_and_recover_processing_if_necessary")
-    @patch("dragonchain.transaction_processor.level_3_actions.queue.get_next_l2_blocks")
+    @patch("dragonchain.transaction_processor.level_3_actions.queue.get_next_l2_block_arrays")
     def test_get_new_blocks_calls_incoming_queue(self, mock_get_blocks, mock_recover):
         level_3_actions.get_new_blocks()
         mock_get_blocks.assert_called_once()
 
     @patch("dragonchain.transaction_processor.level_3_actions.queue.check_and_recover_processing_if_necessary")
-    @patch("dragonchain.transaction_processor.level_3_actions.queue.get_next_l2_blocks")
+    @patch("dragonchain.transaction_processor.level_3_actions.queue.get_next_l2_block_arrays")
     def test_get_new_blocks_checks_for_recovery(self, mock_get_blocks, mock_recover):
         level_3_actions.get_new_blocks()
         mock_recover.assert_called_once()
 
-    @patch("dragonchain.transaction_processor.level_3_actions.keys.DCKeys", return_value="ChainKeys")
+    @patch("dragonchain.transaction_processor.level_3_actions.keys.get_verifying_keys", return_value="ChainKeys")
     def test_get_verifying_keys_returns_correct_keys(self, mock_keys):
         self.assertEqual(level_3_actions.get_verifying_keys("MyID"), "ChainKeys")
         mock_keys.assert_called_once_with("MyID")
@@ -223,30 +237,43 @@ class TestLevelThreeActions(unittest.TestCase):
         mock_keys.return_value.sign_block.assert_called_once_with(mock_block)
         self.assertEqual(mock_block.proof, "proof")
 
-    @patch("dragonchain.transaction_processor.level_3_actions.queue.is_not_empty", return_value=True)
-    @patch("dragonchain.transaction_processor.level_3_actions.execute")
-    def test_recurse_necessary(self, mock_execute, mock_is_not_empty):
-        level_3_actions.recurse_if_necessary()
-
-        mock_execute.assert_called_once()
-
     @patch("dragonchain.transaction_processor.level_3_actions.queue.is_not_empty", return_value=False)
-    @patch("dragonchain.transaction_processor.level_3_actions.execute")
-    def test_recurse_not_necessary(self, mock_execute, mock_is_not_empty):
-        level_3_actions.recurse_if_necessary()
+    @patch("dragonchain.transaction_processor.level_3_actions.matchmaking")
+    @patch("dragonchain.transaction_processor.level_3_actions.process_next_batch", return_value=True)
+    def test_execute_stops_when_queue_is_drained(self, mock_process_batch, mock_matchmaking, mock_is_not_empty):
+        level_3_actions.execute()
 
-        mock_execute.assert_not_called()
+        mock_process_batch.assert_called_once()
 
+    @patch("dragonchain.transaction_processor.level_3_actions.verified_index.get_verified", return_value=[None])
+    @patch("dragonchain.transaction_processor.level_3_actions.keys.prefetch_verifying_keys")
     @patch("dragonchain.transaction_processor.level_3_actions.verify_block", return_value=({"aws"}, {"us-west-2"}, 200, 2))
-    def test_keys_verifys_blocks(self, mock_verify):
-        mock_block = MagicMock(l1_dc_id="1", l1_block_id="1", l1_proof="MyProof")
+    def test_keys_verifys_blocks(self, mock_verify, mock_prefetch, mock_get_verified):
+        mock_block = MagicMock(l1_dc_id="1", l1_block_id="1", l1_proof="MyProof", dc_id="l2 chain")
         headers = {"dc_id": "1", "block_id": "1", "proof": "MyProof"}
 
         mock_blocks = [mock_block, mock_block]
 
         ddss, l2_count, regions, clouds = level_3_actions.verify_blocks(mock_blocks, headers)
+        self.assertEqual(list(mock_prefetch.call_args[0][0]), ["l2 chain"])
         mock_verify.assert_called_once_with(mock_block, set(), set(), 0, 0)
         self.assertEqual(ddss, 200)
         self.assertEqual(l2_count, 2)
         self.assertEqual(regions, ["us-west-2"])
         self.assertEqual(clouds, ["aws"])
+
+    @patch("dragonchain.transaction_processor.level_3_actions.verified_index.get_verified", return_value=['{"cloud":"aws","region":"us-west-2"}'])
+    @patch("dragonchain.transaction_processor.level_3_actions.keys.prefetch_verifying_keys")
+    @patch("dragonchain.transaction_processor.level_3_actions.verify_block")
+    def test_verify_blocks_counts_already_verified_blocks_without_verifying(self, mock_verify, mock_prefetch, mock_get_verified):
+        mock_block = MagicMock(l1_dc_id="1", l1_block_id="1", l1_proof="MyProof", dc_id="l2 chain", block_id="5", proof="l2 proof", current_ddss="10")
+        headers = {"dc_id": "1", "block_id": "1", "proof": "MyProof"}
+
+        ddss, l2_count, regions, clouds = level_3_actions.verify_blocks([mock_block], headers)
+        mock_get_verified.assert_called_once_with([mock_block])
+        self.assertEqual(list(mock_prefetch.call_args[0][0]), [])
+        mock_verify.assert_not_called()
+        self.assertEqual(ddss, 10)
+        self.assertEqual(l2_count, 1)
+        self.assertEqual(regions, ["us-west-2"])
+        self.assertEqual(clouds, ["aws"])
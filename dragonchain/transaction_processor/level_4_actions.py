@@ -18,7 +18,7 @@
 import os
 import time
 import math
-from typing import Set, Dict, List, Union, Tuple, Any, TYPE_CHECKING
+from typing import Set, Dict, List, Optional, Tuple, Any, TYPE_CHECKING
 
 from dragonchain.lib.dao import block_dao
 from dragonchain.lib.dto import l4_block_model
@@ -27,6 +27,8 @@ from dragonchain.lib import broadcast
 from dragonchain.lib import keys
 from dragonchain.lib import party
 from dragonchain.lib import queue
+from dragonchain.lib import metrics
+from dragonchain.lib import verified_index
 from dragonchain import logger
 from dragonchain.transaction_processor import shared_functions
 
@@ -42,82 +44,91 @@ _log = logger.get_logger()
 
 
 def execute() -> None:
-    """Gets the next L3 block content from the queue and processes it"""
-    matchmaking.renew_registration_if_necessary()
+    """Drains the L3 block array queue, verifying batches of queued arrays (for different L1 blocks) concurrently"""
+    while True:
+        matchmaking.renew_registration_if_necessary()
+        if not process_next_batch():
+            return
+        if not queue.is_not_empty():
+            _log.info("[L4] Block processing complete and no new block to process. Waiting")
+            return
+        _log.info("[L4] More blocks are queued, immediately starting processing")
+
+
+def process_next_batch() -> bool:
+    """Gets the next batch of L3 block arrays from the queue, verifies them concurrently, then creates and sends an L4 block for each in queue order
+    Returns:
+        False if there were no block arrays to process, True otherwise
+    """
     t0 = time.time()
+    batch = get_new_blocks()
+    if not batch:
+        return False
+    t1 = time.time()
+    _log.info(f"[L4] Got {len(batch)} L3 block array(s) from queue in {t1 - t0:.4f} sec")
+    metrics.observe("dequeue", t1 - t0, len(batch))
+    metrics.set_queue_depth("incoming", queue.incoming_length())
+
+    futures = shared_functions.run_concurrently(_verify_block_array, [(l3_blocks, l1_headers) for _, l1_headers, l3_blocks in batch])
+    for (item, l1_headers, l3_blocks), future in zip(batch, futures):
+        validations = future.result()
+        if validations is None:
+            _log.warning(f"Bad Block received from lower level. L1 Headers: {l1_headers}")
+        else:
+            t2 = time.time()
+            l4_block = create_block(l1_headers, validations)
+            t3 = time.time()
+            metrics.observe("build", t3 - t2)
 
-    l1_headers, l3_blocks = get_new_blocks()
-    if l3_blocks and l1_headers:
-        _log.info(f"[L4] Got next L3 block array from dcid: {l1_headers['dc_id']} for blockid: {l1_headers['block_id']}")
-        t1 = time.time()
-
-        validations = verify_blocks(l3_blocks, l1_headers)
-        t2 = time.time()
-
-        l4_block = create_block(l1_headers, validations)
-        t3 = time.time()
-
-        send_data(l4_block)
-        t4 = time.time()
-
-        # Clear our processing queue (finished successfully)
-        clear_processing_blocks()
-
-        total = t4 - t0
-        _log.info(f"[L4] Processed block l3 blocks in {total:.4f} seconds")
-        _log.info(f"[L4] Retrieving L3 block from queue: {t1 - t0:.4f} sec ({((t1 - t0) / total) * 100:.1f}% of processing)")
-        _log.info(f"[L4] Validating all L3 block proofs: {t2 - t1:.4f} sec ({((t2 - t1) / total) * 100:.1f}% of processing)")
-        _log.info(f"[L4] Creating block with proof: {t3 - t2:.4f} sec ({((t3 - t2) / total) * 100:.1f}% of processing)")
-        _log.info(f"[L4] Uploading block and broadcasting down: {t4 - t3:.4f} sec ({((t4 - t3) / total) * 100:.1f}% of processing)")
-
-        recurse_if_necessary()
-    else:
-        # Clear our processing queue
-        clear_processing_blocks()
+            send_data(l4_block)
+            t4 = time.time()
 
-    if l1_headers is not None and l3_blocks is None:
-        try:
-            _log.warning(f"Bad Block received from lower level. L1 Headers: {l1_headers}")
-        except Exception:  # nosec (We don't care if l1_headers is an error/not defined and this log fails)
-            pass
+            _log.info(f"[L4] Creating block with proof: {t3 - t2:.4f} sec")
+            _log.info(f"[L4] Uploading block and broadcasting down: {t4 - t3:.4f} sec")
+            _log.info(f"[L4] Processed {len(l3_blocks)} l3 blocks for l1 block id {l1_headers['block_id']} {t4 - t0:.4f} seconds after dequeueing")
 
-        # Clear our processing queue
-        clear_processing_blocks()
+        # Remove this array from our processing queue (finished successfully)
+        queue.finish_processing_item(item)
+    return True
 
 
-def clear_processing_blocks() -> None:
-    queue.clear_processing_queue()
+def _verify_block_array(args: Tuple[List["l3_block_model.L3BlockModel"], "L1Headers"]) -> Optional[List[Dict[str, Any]]]:
+    l3_blocks, l1_headers = args
+    if not l3_blocks:
+        return None
+    _log.info(f"[L4] Verifying L3 block array from dcid: {l1_headers['dc_id']} for blockid: {l1_headers['block_id']}")
+    t0 = time.time()
+    validations = verify_blocks(l3_blocks, l1_headers)
+    t1 = time.time()
+    metrics.observe("verify", t1 - t0, len(l3_blocks))
+    _log.info(f"[L4] Validated {len(l3_blocks)} L3 block proofs for l1 block id {l1_headers['block_id']}: {t1 - t0:.4f} sec")
+    return validations
 
 
-def get_new_blocks() -> Union[Tuple[None, None], Tuple["L1Headers", List["l3_block_model.L3BlockModel"]]]:
+def get_new_blocks() -> List[Tuple[bytes, "L1Headers", List["l3_block_model.L3BlockModel"]]]:
     # Safety check to recover after unexpected crash while creating last block if necessary
     queue.check_and_recover_processing_if_necessary()
-    return queue.get_next_l3_block()
+    return queue.get_next_l3_block_arrays()
 
 
 def send_data(block: l4_block_model.L4BlockModel) -> None:
     _log.info("[L4] Block created. Uploading data to storage")
-    block_dao.insert_block(block)
+    with metrics.timer("upload"):
+        block_dao.insert_block(block)
 
     _log.info("[L4] Inserting complete. Broadcasting block")
-    broadcast.dispatch(block)
+    with metrics.timer("broadcast"):
+        broadcast.dispatch(block)
 
 
 def get_verifying_keys(chain_id: str) -> keys.DCKeys:
-    return keys.DCKeys(chain_id)
-
-
-def recurse_if_necessary() -> None:
-    if queue.is_not_empty():
-        _log.info("[L4] Another block is queue, immediately starting processing")
-        execute()
-    else:
-        _log.info("[L4] Block processing complete and no new block to process. Waiting")
+    return keys.get_verifying_keys(chain_id)
 
 
 def verify_blocks(l3_blocks: List["l3_block_model.L3BlockModel"], l1_headers: "L1Headers") -> List[Dict[str, Any]]:
     validations = []
     checked: Set[str] = set()
+    relevant_blocks = []
     for block in l3_blocks:
         # We use a checked array with proofs (which are unique) to make sure we don't process
         # a block twice, and ensure the block we're looking at is actually relevant
@@ -129,12 +140,23 @@ def verify_blocks(l3_blocks: List["l3_block_model.L3BlockModel"], l1_headers: "L
         )
 
         if check:
-            validations.append(verify_block(block))
+            relevant_blocks.append(block)
         else:
             _log.info(f"[L4] L3 block was duplicated or not relevant to this verification.\nBlock in question: {block.__dict__}")
         # Finally, add this block into our checked blocks list
         checked.add(block.proof)
 
+    # Blocks verified before (i.e. redelivered or resent) are marked valid from the index without checking their proofs again
+    verified = verified_index.get_verified(relevant_blocks)
+    # Load the keys of every other chain in this array at once, rather than one at a time while verifying
+    keys.prefetch_verifying_keys(block.dc_id for block, value in zip(relevant_blocks, verified) if value is None)
+    for block, value in zip(relevant_blocks, verified):
+        if value is None:
+            validations.append(verify_block(block))
+        else:
+            _log.info(f"[L4] L3 block id {block.block_id} from {block.dc_id} was already verified")
+            validations.append({"l3_dc_id": block.dc_id, "l3_block_id": block.block_id, "l3_proof": block.proof, "valid": True})
+
     return validations
 
 
@@ -144,10 +166,12 @@ def verify_block(block: "l3_block_model.L3BlockModel") -> Dict[str, Any]:
         _log.info(f"[L4] Verifying proof for L2 block id {block.block_id} from {block.dc_id}")
         if verify_keys.verify_block(block):
             verification = True
+            verified_index.mark_verified(block)
             _log.info(f"[L4] Finished processing valid L3 block {block.block_id}")
         else:
             verification = False
             _log.info(f"[L4] Proof for L3 block id {block.block_id} from {block.dc_id} was invalid")
+            keys.invalidate_verifying_keys(block.dc_id)
     except Exception:
         _log.exception("[L4] Could not get L3 chain's verifying keys. Marking block as invalid.")
         verification = False
@@ -193,10 +217,11 @@ def get_next_block_info() -> Tuple[int, str]:
 
 
 def sign_block(l4_block: l4_block_model.L4BlockModel) -> None:
-    if PROOF_SCHEME == "work":
-        _log.info("[L4] Performing PoW on block")
-        l4_block.proof, l4_block.nonce = keys.get_my_keys().pow_block(l4_block)
-    else:
-        _log.info("[L4] Signing block")
-        l4_block.proof = keys.get_my_keys().sign_block(l4_block)
-    _log.info(f"[L4] Finished Block:\n{l4_block.export_as_at_rest()}")
+    with metrics.timer("sign"):
+        if PROOF_SCHEME == "work":
+            _log.info("[L4] Performing PoW on block")
+            l4_block.proof, l4_block.nonce = keys.get_my_keys().pow_block(l4_block)
+        else:
+            _log.info("[L4] Signing block")
+            l4_block.proof = keys.get_my_keys().sign_block(l4_block)
+        _log.info(f"[L4] Finished Block:\n{l4_block.export_as_at_rest()}")
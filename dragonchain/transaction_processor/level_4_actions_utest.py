@@ -23,46 +23,62 @@ from dragonchain.transaction_processor import level_4_actions
 
 
 class TestLevelFourActions(unittest.TestCase):
+    @patch("dragonchain.transaction_processor.level_4_actions.queue")
     @patch("dragonchain.transaction_processor.level_4_actions.matchmaking")
     @patch("dragonchain.transaction_processor.level_4_actions.send_data")
-    @patch("dragonchain.transaction_processor.level_4_actions.recurse_if_necessary")
     @patch("dragonchain.transaction_processor.level_4_actions.create_block")
-    @patch("dragonchain.transaction_processor.level_4_actions.verify_blocks")
-    @patch("dragonchain.transaction_processor.level_4_actions.get_new_blocks", return_value=(MagicMock(), MagicMock()))
-    @patch("dragonchain.transaction_processor.level_4_actions.clear_processing_blocks")
+    @patch("dragonchain.transaction_processor.level_4_actions.verify_blocks", return_value=["validation"])
+    @patch("dragonchain.transaction_processor.level_4_actions.get_new_blocks")
     def test_execute_calls_correct_functions(
-        self, mock_clear_processing, mock_get_block, mock_verify_blocks, mock_create_block, mock_recurse, mock_send_data, mock_matchmaking
+        self, mock_get_blocks, mock_verify_blocks, mock_create_block, mock_send_data, mock_matchmaking, mock_queue
     ):
+        headers = {"dc_id": "123", "block_id": "123"}
+        mock_get_blocks.return_value = [(b"item", headers, ["l3 block"])]
+        mock_queue.is_not_empty.return_value = False
         level_4_actions.execute()
 
-        mock_get_block.assert_called_once()
-        mock_verify_blocks.assert_called_once()
-        mock_create_block.assert_called_once()
-        mock_send_data.assert_called_once()
-        mock_recurse.assert_called_once()
-        mock_clear_processing.assert_called_once()
+        mock_get_blocks.assert_called_once()
+        mock_verify_blocks.assert_called_once_with(["l3 block"], headers)
+        mock_create_block.assert_called_once_with(headers, ["validation"])
+        mock_send_data.assert_called_once_with(mock_create_block.return_value)
+        mock_queue.finish_processing_item.assert_called_once_with(b"item")
 
+    @patch("dragonchain.transaction_processor.level_4_actions.queue")
     @patch("dragonchain.transaction_processor.level_4_actions.matchmaking")
     @patch("dragonchain.transaction_processor.level_4_actions.send_data")
-    @patch("dragonchain.transaction_processor.level_4_actions.recurse_if_necessary")
     @patch("dragonchain.transaction_processor.level_4_actions.create_block")
     @patch("dragonchain.transaction_processor.level_4_actions.verify_blocks")
-    @patch("dragonchain.transaction_processor.level_4_actions.get_new_blocks", return_value=(None, None))
-    @patch("dragonchain.transaction_processor.level_4_actions.clear_processing_blocks")
+    @patch("dragonchain.transaction_processor.level_4_actions.get_new_blocks", return_value=[])
     def test_execute_no_ops_on_empty_queue(
-        self, mock_clear_processing, mock_get_block, mock_verify_blocks, mock_create_block, mock_recurse, mock_send_data, mock_matchmaking
+        self, mock_get_blocks, mock_verify_blocks, mock_create_block, mock_send_data, mock_matchmaking, mock_queue
     ):
         level_4_actions.execute()
 
-        mock_get_block.assert_called_once()
+        mock_get_blocks.assert_called_once()
         mock_verify_blocks.assert_not_called()
         mock_create_block.assert_not_called()
         mock_send_data.assert_not_called()
-        mock_recurse.assert_not_called()
-        mock_clear_processing.assert_called_once()
+        mock_queue.finish_processing_item.assert_not_called()
+
+    @patch("dragonchain.transaction_processor.level_4_actions.queue")
+    @patch("dragonchain.transaction_processor.level_4_actions.matchmaking")
+    @patch("dragonchain.transaction_processor.level_4_actions.create_block")
+    @patch("dragonchain.transaction_processor.level_4_actions.verify_blocks")
+    @patch("dragonchain.transaction_processor.level_4_actions.get_new_blocks", return_value=[(b"item", {"dc_id": "123", "block_id": "123"}, [])])
+    def test_execute_skips_block_array_without_valid_l3_blocks(
+        self, mock_get_blocks, mock_verify_blocks, mock_create_block, mock_matchmaking, mock_queue
+    ):
+        mock_queue.is_not_empty.return_value = False
+        level_4_actions.execute()
 
+        mock_verify_blocks.assert_not_called()
+        mock_create_block.assert_not_called()
+        mock_queue.finish_processing_item.assert_called_once_with(b"item")
+
+    @patch("dragonchain.transaction_processor.level_4_actions.verified_index.get_verified", return_value=[None, None])
+    @patch("dragonchain.transaction_processor.level_4_actions.keys.prefetch_verifying_keys")
     @patch("dragonchain.transaction_processor.level_4_actions.verify_block", return_value="validation")
-    def test_verify_blocks_skips_duplicates(self, mock_verify):
+    def test_verify_blocks_skips_duplicates(self, mock_verify, mock_prefetch, mock_get_verified):
         mock_blocks = [
             MagicMock(proof="myl3proof", l1_dc_id=123, l1_block_id=124, l1_proof="myproof"),
             MagicMock(proof="myl3proof2", l1_dc_id=123, l1_block_id=124, l1_proof="myproof"),
@@ -73,13 +89,28 @@ class TestLevelFourActions(unittest.TestCase):
         response = level_4_actions.verify_blocks(mock_blocks, {"dc_id": 123, "block_id": 124, "proof": "myproof"})
 
         mock_verify.assert_has_calls([call(mock_blocks[0]), call(mock_blocks[1])])
+        mock_prefetch.assert_called_once()
         self.assertEqual(len(response), 2)
 
+    @patch("dragonchain.transaction_processor.level_4_actions.verified_index.get_verified", return_value=["1"])
+    @patch("dragonchain.transaction_processor.level_4_actions.keys.prefetch_verifying_keys")
+    @patch("dragonchain.transaction_processor.level_4_actions.verify_block")
+    def test_verify_blocks_marks_already_verified_blocks_valid_without_verifying(self, mock_verify, mock_prefetch, mock_get_verified):
+        mock_block = MagicMock(dc_id="l3 chain", block_id="5", proof="myl3proof", l1_dc_id=123, l1_block_id=124, l1_proof="myproof")
+
+        response = level_4_actions.verify_blocks([mock_block], {"dc_id": 123, "block_id": 124, "proof": "myproof"})
+
+        mock_get_verified.assert_called_once_with([mock_block])
+        mock_verify.assert_not_called()
+        self.assertEqual(response, [{"l3_dc_id": "l3 chain", "l3_block_id": "5", "l3_proof": "myl3proof", "valid": True}])
+
+    @patch("dragonchain.transaction_processor.level_4_actions.verified_index.mark_verified")
     @patch("dragonchain.transaction_processor.level_4_actions.get_verifying_keys", return_value=MagicMock(verify_block=MagicMock(return_value=True)))
-    def test_verify_block_checks_valid_proof(self, get_keys_mock):
+    def test_verify_block_checks_valid_proof(self, get_keys_mock, mock_mark_verified):
         mock_block = MagicMock(dc_id="123", block_id="1234", proof="myproof")
         validation = level_4_actions.verify_block(mock_block)
         get_keys_mock.assert_called_once_with(mock_block.dc_id)
+        mock_mark_verified.assert_called_once_with(mock_block)
 
         self.assertEqual(validation["l3_dc_id"], "123")
         self.assertEqual(validation["l3_block_id"], "1234")
@@ -97,11 +128,13 @@ class TestLevelFourActions(unittest.TestCase):
         self.assertEqual(validation["l3_proof"], "myproof")
         self.assertFalse(validation["valid"])
 
+    @patch("dragonchain.transaction_processor.level_4_actions.keys.invalidate_verifying_keys")
     @patch("dragonchain.transaction_processor.level_4_actions.get_verifying_keys", return_value=MagicMock(verify_block=MagicMock(return_value=False)))
-    def test_verify_block_checks_invalid_proof(self, get_keys_mock):
+    def test_verify_block_checks_invalid_proof(self, get_keys_mock, mock_invalidate_keys):
         mock_block = MagicMock(dc_id="123", block_id="1234", proof="myproof")
         validation = level_4_actions.verify_block(mock_block)
         get_keys_mock.assert_called_once_with(mock_block.dc_id)
+        mock_invalidate_keys.assert_called_once_with("123")
 
         self.assertEqual(validation["l3_dc_id"], "123")
         self.assertEqual(validation["l3_block_id"], "1234")
@@ -109,13 +142,13 @@ class TestLevelFourActions(unittest.TestCase):
         self.assertFalse(validation["valid"])
 
     @patch("dragonchain.transaction_processor.level_4_actions.queue.check_and_recover_processing_if_necessary")
-    @patch("dragonchain.transaction_processor.level_4_actions.queue.get_next_l3_block")
+    @patch("dragonchain.transaction_processor.level_4_actions.queue.get_next_l3_block_arrays")
     def test_get_new_blocks_calls_incoming_queue(self, mock_get_block, mock_recover):
         level_4_actions.get_new_blocks()
         mock_get_block.assert_called_once()
 
     @patch("dragonchain.transaction_processor.level_4_actions.queue.check_and_recover_processing_if_necessary")
-    @patch("dragonchain.transaction_processor.level_4_actions.queue.get_next_l3_block")
+    @patch("dragonchain.transaction_processor.level_4_actions.queue.get_next_l3_block_arrays")
     def test_get_new_blocks_checks_for_recovery(self, mock_get_block, mock_recover):
         level_4_actions.get_new_blocks()
         mock_recover.assert_called_once()
@@ -128,7 +161,7 @@ class TestLevelFourActions(unittest.TestCase):
         mock_insert_block.assert_called_once_with(mock_block)
         mock_dispatch.assert_called_once_with(mock_block)
 
-    @patch("dragonchain.transaction_processor.level_4_actions.keys.DCKeys", return_value="ChainKeys")
+    @patch("dragonchain.transaction_processor.level_4_actions.keys.get_verifying_keys", return_value="ChainKeys")
     def test_get_verifying_keys_returns_correct_keys(self, mock_keys):
         self.assertEqual(level_4_actions.get_verifying_keys("MyID"), "ChainKeys")
         mock_keys.assert_called_once_with("MyID")
@@ -210,16 +243,10 @@ class TestLevelFourActions(unittest.TestCase):
         mock_keys.return_value.sign_block.assert_called_once_with(mock_block)
         self.assertEqual(mock_block.proof, "proof")
 
-    @patch("dragonchain.transaction_processor.level_4_actions.execute")
-    @patch("dragonchain.transaction_processor.level_4_actions.queue.is_not_empty", return_value=True)
-    def test_recurse_necessary(self, mock_is_not_empty, mock_execute):
-        level_4_actions.recurse_if_necessary()
-
-        mock_execute.assert_called_once()
-
-    @patch("dragonchain.transaction_processor.level_4_actions.execute")
     @patch("dragonchain.transaction_processor.level_4_actions.queue.is_not_empty", return_value=False)
-    def test_recurse_not_necessary(self, mock_is_not_empty, mock_execute):
-        level_4_actions.recurse_if_necessary()
+    @patch("dragonchain.transaction_processor.level_4_actions.matchmaking")
+    @patch("dragonchain.transaction_processor.level_4_actions.process_next_batch", return_value=True)
+    def test_execute_stops_when_queue_is_drained(self, mock_process_batch, mock_matchmaking, mock_is_not_empty):
+        level_4_actions.execute()
 
-        mock_execute.assert_not_called()
+        mock_process_batch.assert_called_once()
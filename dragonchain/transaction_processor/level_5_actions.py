@@ -19,8 +19,7 @@ import os
 import time
 import json
 import math
-import uuid
-from typing import cast, Iterable, List, Dict, Union, Any, TYPE_CHECKING
+from typing import cast, Iterable, Iterator, List, Dict, Union, Any, TYPE_CHECKING
 
 import fastjsonschema
 
@@ -29,17 +28,24 @@ from dragonchain.lib.dto import schema
 from dragonchain.lib.dto import l5_block_model
 from dragonchain.lib import keys
 from dragonchain.lib import broadcast
+from dragonchain.lib import crypto_pool
 from dragonchain.lib import party
 from dragonchain.lib import matchmaking
 from dragonchain import logger
 from dragonchain import exceptions
 from dragonchain.lib.dao import interchain_dao
 from dragonchain.lib import queue
+from dragonchain.lib import metrics
 from dragonchain.transaction_processor import shared_functions
 from dragonchain.lib.database import redisearch
 from dragonchain.lib.database import redis
 
 FAILED_CLAIMS_KEY = "mq:failed-claims"
+# Append-only log of compact L4 records per pending L5 block, and a manifest hash of {block_id: record count}
+TO_BROADCAST_LOG_KEY = "mq:to-broadcast"
+TO_BROADCAST_MANIFEST_KEY = "mq:to-broadcast-manifest"
+# Storage keys of legacy staged records (BROADCAST/TO_BROADCAST) which were moved into the log but not yet deleted from storage
+TO_BROADCAST_MIGRATED_KEY = "mq:to-broadcast-migrated"
 
 if TYPE_CHECKING:
     from dragonchain.lib.dto import model  # noqa: F401
@@ -48,6 +54,8 @@ PROOF_SCHEME = os.environ["PROOF_SCHEME"].lower()
 ADDRESS = os.environ["INTERNAL_ID"]
 WATCH_INTERVAL = 600  # Default: 10 minutes as seconds
 TRANSACTION_BUFFER = 5  # The minimum number of transactions you are estimated to be able to send before no longer accepting blocks from lower nodes
+# Number of verified L4 records to accumulate before staging them in the redis log (and releasing their queue items)
+TO_BROADCAST_FLUSH_RECORDS = int(os.environ.get("TO_BROADCAST_FLUSH_RECORDS") or "1000")
 # All of these will be defined by calling setup() before using the rest of the module, hence the casts
 BROADCAST_INTERVAL = cast(int, None)
 INTERCHAIN_NETWORK = cast(str, None)
@@ -73,6 +81,30 @@ def setup() -> None:
     FUNDED = my_config["funded"]
     _interchain_client = interchain_dao.get_default_interchain_client()
     _log.info(f"[L5] MY CONFIG -------> {my_config}")
+    migrate_legacy_pending_l4_blocks()
+
+
+def migrate_legacy_pending_l4_blocks() -> None:
+    """Move L4 records staged as individual storage objects (before the redis staging log existed) into the staging log
+    Each object's records are staged and the object marked as migrated in one transaction before it is deleted from storage,
+    so a migration interrupted by a crash resumes on the next start without staging any record twice
+    """
+    legacy_keys = storage.list_objects("BROADCAST/TO_BROADCAST/")
+    if not legacy_keys:
+        return
+    _log.info(f"[L5] Migrating {len(legacy_keys)} staged storage objects to the redis staging log")
+    for key in legacy_keys:
+        if not redis.sismember_sync(TO_BROADCAST_MIGRATED_KEY, key):
+            block_id = key.split("/")[2]  # BROADCAST/TO_BROADCAST/{block_id}/{uuid}
+            records = [compact_l4_record(record) for record in storage.get_json_from_object(key)]
+            p = redis.pipeline_sync()
+            if records:
+                p.rpush(f"{TO_BROADCAST_LOG_KEY}:{block_id}", *records)
+                p.hincrby(TO_BROADCAST_MANIFEST_KEY, block_id, len(records))
+            p.sadd(TO_BROADCAST_MIGRATED_KEY, key)
+            p.execute()
+        storage.delete(key)
+    redis.delete_sync(TO_BROADCAST_MIGRATED_KEY)
 
 
 def execute() -> None:
@@ -96,8 +128,10 @@ def execute() -> None:
         # Create and Send L5 block to public blockchain
         if should_broadcast(current_block_id):
             # TODO: if any of these steps fail, we need to roll back or retry
-            l5_block = create_l5_block(current_block_id)
-            broadcast_to_public_chain(l5_block)
+            with metrics.timer("build"):
+                l5_block = create_l5_block(current_block_id)
+            with metrics.timer("broadcast", len(l5_block.l4_blocks)):
+                broadcast_to_public_chain(l5_block)
             broadcast_clean_up(l5_block)
             # Check to see if any more funds have been added to wallet
             watch_for_funds()
@@ -134,7 +168,10 @@ def process_claims_backlog() -> None:
 def broadcast_clean_up(l5_block: l5_block_model.L5BlockModel) -> None:
     # remove block form awaiting broadcast
     _log.info(f"[L5] Deleting block from to broadcast blockid: {l5_block.block_id}")
-    storage.delete_directory(f"BROADCAST/TO_BROADCAST/{l5_block.block_id}")
+    p = redis.pipeline_sync()
+    p.delete(f"{TO_BROADCAST_LOG_KEY}:{l5_block.block_id}")
+    p.hdel(TO_BROADCAST_MANIFEST_KEY, l5_block.block_id)
+    p.execute()
 
     # Set last block number and last broadcast time
     set_last_block_number(l5_block.block_id)
@@ -147,23 +184,57 @@ def store_l4_blocks(next_block_id_to_broadcast: str) -> None:
     # Shape: ["{l4 block in transit}", "{l4 block in transit}"]
     _log.info("[L5] Storing L4 blocks")
     queue.check_and_recover_processing_if_necessary()
+    t0 = time.time()
     l4_blocks = queue.get_new_l4_blocks()
+    metrics.observe("dequeue", time.time() - t0, len(l4_blocks))
+    metrics.set_queue_depth("incoming", queue.incoming_length())
     _log.info(f"[L5] Popped {len(l4_blocks)} L4 blocks off of queue")
-    if l4_blocks:
-        verified_records = verify_blocks(l4_blocks)
-        storage.put_object_as_json(f"BROADCAST/TO_BROADCAST/{next_block_id_to_broadcast}/{str(uuid.uuid4())}", verified_records)
+    # Write verified records as they accumulate, so a crash only re-queues the L4 blocks which weren't stored yet
+    pending_records: List[Dict[str, Any]] = []
+    pending_items: List[bytes] = []
+    for l4_blocks_in_transit, verified_records in zip(l4_blocks, verify_blocks(l4_blocks)):
+        pending_records.extend(verified_records)
+        pending_items.append(l4_blocks_in_transit)
+        if len(pending_records) >= TO_BROADCAST_FLUSH_RECORDS:
+            write_verified_records(next_block_id_to_broadcast, pending_records, pending_items)
+            pending_records, pending_items = [], []
+    write_verified_records(next_block_id_to_broadcast, pending_records, pending_items)
     # Successfully handled block popped from redis
     queue.clear_processing_queue()
 
 
-def verify_blocks(l4_blocks: Iterable[bytes]) -> List[Dict[str, Any]]:
-    verified_records = []
-    for l4_blocks_in_transit in l4_blocks:
-        # For each record, validate or mark as invalid
-        for record in json.loads(l4_blocks_in_transit)["l4-blocks"]:
-            verified_records.append(verify_block(record))
+def write_verified_records(next_block_id_to_broadcast: str, verified_records: List[Dict[str, Any]], l4_blocks: List[bytes]) -> None:
+    """Append verified records to the staging log of the pending L5 block
+    The records are staged and their L4 blocks removed from the processing queue in one transaction, so a crash can't stage them twice
+    Args:
+        next_block_id_to_broadcast: block id of the pending L5 block
+        verified_records: the verified (or tagged invalid) L4 records
+        l4_blocks: raw processing queue items which the records came from
+    """
+    if not verified_records and not l4_blocks:
+        return
+    with metrics.timer("upload", len(verified_records)):
+        p = redis.pipeline_sync()
+        if verified_records:
+            p.rpush(f"{TO_BROADCAST_LOG_KEY}:{next_block_id_to_broadcast}", *[compact_l4_record(record) for record in verified_records])
+            p.hincrby(TO_BROADCAST_MANIFEST_KEY, next_block_id_to_broadcast, len(verified_records))
+        queue.finish_processing_items_pipeline(p, l4_blocks)
+        p.execute()
+
+
+def verify_blocks(l4_blocks: Iterable[bytes]) -> Iterator[List[Dict[str, Any]]]:
+    """Verify queued L4 blocks (in parallel across the crypto process pool if it is enabled)
+    Returns:
+        Iterator of the verified records for each item of l4_blocks, in order
+    """
+    if crypto_pool.enabled():
+        return crypto_pool.imap(verify_l4_blocks_in_transit, l4_blocks)
+    return map(verify_l4_blocks_in_transit, l4_blocks)
+
 
-    return verified_records
+def verify_l4_blocks_in_transit(l4_blocks_in_transit: bytes) -> List[Dict[str, Any]]:
+    # For each record, validate or mark as invalid
+    return [verify_block(record) for record in json.loads(l4_blocks_in_transit)["l4-blocks"]]
 
 
 def verify_block(l4_block: Dict[str, Any]) -> Dict[str, Any]:
@@ -372,7 +443,7 @@ def has_funds_for_transactions() -> bool:
 
 
 def is_backlog(current_block_id: str) -> bool:
-    return storage.does_superkey_exist(f"BROADCAST/TO_BROADCAST/{current_block_id}/")
+    return int(redis.hget_sync(TO_BROADCAST_MANIFEST_KEY, current_block_id) or 0) > 0
 
 
 def create_l5_block(block_id: str) -> l5_block_model.L5BlockModel:
@@ -393,22 +464,17 @@ def create_l5_block(block_id: str) -> l5_block_model.L5BlockModel:
 
 
 def get_pending_l4_blocks(block_id: str) -> List[str]:
-    all_waiting_verification_keys = storage.list_objects(f"BROADCAST/TO_BROADCAST/{block_id}")
-
-    l4_blocks = []
-    for key in all_waiting_verification_keys:
-        record_list = storage.get_json_from_object(key)
-
-        for record in record_list:
-            item = {
-                "l1_dc_id": record["header"]["l1_dc_id"],
-                "l1_block_id": record["header"]["l1_block_id"],
-                "l4_dc_id": record["header"]["dc_id"],
-                "l4_block_id": record["header"]["block_id"],
-                "l4_proof": record["proof"]["proof"],
-            }
-            if record.get("is_invalid"):
-                item["is_invalid"] = record.get("is_invalid")
-            l4_blocks.append(json.dumps(item, separators=(",", ":")))
-
-    return l4_blocks
+    return redis.lrange_sync(f"{TO_BROADCAST_LOG_KEY}:{block_id}", 0, -1)
+
+
+def compact_l4_record(record: Dict[str, Any]) -> str:
+    item = {
+        "l1_dc_id": record["header"]["l1_dc_id"],
+        "l1_block_id": record["header"]["l1_block_id"],
+        "l4_dc_id": record["header"]["dc_id"],
+        "l4_block_id": record["header"]["block_id"],
+        "l4_proof": record["proof"]["proof"],
+    }
+    if record.get("is_invalid"):
+        item["is_invalid"] = record.get("is_invalid")
+    return json.dumps(item, separators=(",", ":"))
@@ -52,15 +52,17 @@ class TestLevelFiveActions(unittest.TestCase):
     def tearDown(self):
         os.environ["LEVEL"] = "1"
 
+    @patch("dragonchain.transaction_processor.level_5_actions.migrate_legacy_pending_l4_blocks")
     @patch("dragonchain.transaction_processor.level_5_actions.matchmaking.get_matchmaking_config", return_value=matchmaking_mock)
     @patch("dragonchain.transaction_processor.level_5_actions.interchain_dao.get_default_interchain_client", return_value="thing")
-    def test_set_up_sets_module_state_properly(self, mock_interchain, mock_get_config):
+    def test_set_up_sets_module_state_properly(self, mock_interchain, mock_get_config, mock_migrate):
         level_5_actions.setup()
         self.assertEqual(level_5_actions.BROADCAST_INTERVAL, 7200)
         self.assertEqual(level_5_actions.INTERCHAIN_NETWORK, "eth")
         self.assertTrue(level_5_actions.FUNDED)
         self.assertEqual(level_5_actions._interchain_client, "thing")
         mock_get_config.assert_called_once()
+        mock_migrate.assert_called_once()
 
     @patch("dragonchain.transaction_processor.level_5_actions.matchmaking")
     @patch("dragonchain.transaction_processor.level_5_actions.process_claims_backlog")
@@ -168,39 +170,91 @@ class TestLevelFiveActions(unittest.TestCase):
         mock_resolve_claim_check.assert_called_once()
         mock_srem_sync.assert_not_called()
 
-    @patch("dragonchain.transaction_processor.level_5_actions.storage.delete_directory")
+    @patch("dragonchain.transaction_processor.level_5_actions.redis.pipeline_sync")
     @patch("dragonchain.transaction_processor.level_5_actions.set_last_block_number")
     @patch("dragonchain.transaction_processor.level_5_actions.set_last_broadcast_time")
-    def test_broadcast_cleanup_calls_correct_functions(self, mock_set_broadcast_time, mock_set_block, mock_delete_directory):
+    def test_broadcast_cleanup_calls_correct_functions(self, mock_set_broadcast_time, mock_set_block, mock_pipeline):
         mock_block = MagicMock(block_id="123")
         level_5_actions.broadcast_clean_up(mock_block)
 
         mock_set_broadcast_time.assert_called_once()
         mock_set_block.assert_called_once_with("123")
-        mock_delete_directory.assert_called_once_with("BROADCAST/TO_BROADCAST/123")
+        mock_pipeline.return_value.delete.assert_called_once_with("mq:to-broadcast:123")
+        mock_pipeline.return_value.hdel.assert_called_once_with("mq:to-broadcast-manifest", "123")
+        mock_pipeline.return_value.execute.assert_called_once()
+
+    @patch("dragonchain.transaction_processor.level_5_actions.queue")
+    @patch("dragonchain.transaction_processor.level_5_actions.write_verified_records")
+    @patch("dragonchain.transaction_processor.level_5_actions.verify_blocks", return_value=iter([["record1"], ["record2"]]))
+    def test_store_l4_blocks(self, mock_verify_blocks, mock_write, mock_queue):
+        mock_queue.get_new_l4_blocks.return_value = [b"item1", b"item2"]
+        level_5_actions.store_l4_blocks(5)
 
-    @patch("dragonchain.transaction_processor.level_5_actions.queue.check_and_recover_processing_if_necessary")
-    @patch("dragonchain.transaction_processor.level_5_actions.queue.get_new_l4_blocks")
-    @patch("dragonchain.transaction_processor.level_5_actions.queue.clear_processing_queue")
-    @patch("dragonchain.transaction_processor.level_5_actions.storage.put_object_as_json")
-    @patch("dragonchain.transaction_processor.level_5_actions.verify_blocks", return_value="verified_blocks")
-    def test_store_l4_blocks(self, mock_verify_blocks, mock_storage_put, mock_clear, mock_get_blocks, mock_recover):
+        mock_queue.check_and_recover_processing_if_necessary.assert_called_once()
+        mock_queue.get_new_l4_blocks.assert_called_once()
+        mock_queue.clear_processing_queue.assert_called_once()
+        mock_verify_blocks.assert_called_once_with([b"item1", b"item2"])
+        mock_write.assert_called_once_with(5, ["record1", "record2"], [b"item1", b"item2"])
+
+    @patch("dragonchain.transaction_processor.level_5_actions.TO_BROADCAST_FLUSH_RECORDS", 2)
+    @patch("dragonchain.transaction_processor.level_5_actions.queue")
+    @patch("dragonchain.transaction_processor.level_5_actions.write_verified_records")
+    @patch("dragonchain.transaction_processor.level_5_actions.verify_blocks", return_value=iter([["r1", "r2"], ["r3"], ["r4"]]))
+    def test_store_l4_blocks_writes_records_incrementally(self, mock_verify_blocks, mock_write, mock_queue):
+        mock_queue.get_new_l4_blocks.return_value = [b"item1", b"item2", b"item3"]
         level_5_actions.store_l4_blocks(5)
 
-        mock_recover.assert_called_once()
-        mock_get_blocks.assert_called_once()
-        mock_clear.assert_called_once()
-        mock_verify_blocks.assert_called_once()
-        mock_storage_put.assert_called_once()
+        mock_write.assert_has_calls([call(5, ["r1", "r2"], [b"item1"]), call(5, ["r3", "r4"], [b"item2", b"item3"])])
+
+    @patch("dragonchain.transaction_processor.level_5_actions.queue")
+    @patch("dragonchain.transaction_processor.level_5_actions.redis.pipeline_sync")
+    def test_store_l4_blocks_writes_nothing_with_empty_queue(self, mock_pipeline, mock_queue):
+        mock_queue.get_new_l4_blocks.return_value = []
+        level_5_actions.store_l4_blocks(5)
 
+        mock_pipeline.assert_not_called()
+        mock_queue.clear_processing_queue.assert_called_once()
+
+    @patch("dragonchain.transaction_processor.level_5_actions.queue")
+    @patch("dragonchain.transaction_processor.level_5_actions.redis.pipeline_sync")
+    def test_write_verified_records_appends_to_log_and_finishes_items_in_one_transaction(self, mock_pipeline, mock_queue):
+        record = {"header": {"l1_dc_id": "1", "l1_block_id": "2", "dc_id": "3", "block_id": "4"}, "proof": {"proof": "MyProof"}}
+        level_5_actions.write_verified_records("5", [record, record], [b"item1"])
+
+        expected_record = '{"l1_dc_id":"1","l1_block_id":"2","l4_dc_id":"3","l4_block_id":"4","l4_proof":"MyProof"}'
+        mock_pipeline.assert_called_once_with()
+        p = mock_pipeline.return_value
+        p.rpush.assert_called_once_with("mq:to-broadcast:5", expected_record, expected_record)
+        p.hincrby.assert_called_once_with("mq:to-broadcast-manifest", "5", 2)
+        mock_queue.finish_processing_items_pipeline.assert_called_once_with(p, [b"item1"])
+        p.execute.assert_called_once()
+
+    @patch("dragonchain.transaction_processor.level_5_actions.queue")
+    @patch("dragonchain.transaction_processor.level_5_actions.redis.pipeline_sync")
+    def test_write_verified_records_only_finishes_items_without_records(self, mock_pipeline, mock_queue):
+        level_5_actions.write_verified_records("5", [], [b"item1"])
+
+        p = mock_pipeline.return_value
+        p.rpush.assert_not_called()
+        p.hincrby.assert_not_called()
+        mock_queue.finish_processing_items_pipeline.assert_called_once_with(p, [b"item1"])
+        p.execute.assert_called_once()
+
+    @patch("dragonchain.transaction_processor.level_5_actions.crypto_pool.enabled", return_value=False)
     @patch("dragonchain.transaction_processor.level_5_actions.verify_block", return_value="verified_record")
-    def test_verify_blocks_verifies_each(self, mock_verify):
+    def test_verify_blocks_verifies_each(self, mock_verify, mock_enabled):
         mock_l4_blocks = ['{"l4-blocks": ["testblock", "testblock2"]}', '{"l4-blocks": ["testblock3", "testblock4"]}']
-        verifications = level_5_actions.verify_blocks(mock_l4_blocks)
+        verifications = list(level_5_actions.verify_blocks(mock_l4_blocks))
 
-        self.assertEqual(len(verifications), 4)
+        self.assertEqual(verifications, [["verified_record", "verified_record"], ["verified_record", "verified_record"]])
         mock_verify.assert_has_calls([call("testblock"), call("testblock2"), call("testblock3"), call("testblock4")])
 
+    @patch("dragonchain.transaction_processor.level_5_actions.crypto_pool.imap", return_value=iter([["verified"]]))
+    @patch("dragonchain.transaction_processor.level_5_actions.crypto_pool.enabled", return_value=True)
+    def test_verify_blocks_uses_crypto_pool_when_enabled(self, mock_enabled, mock_imap):
+        self.assertEqual(list(level_5_actions.verify_blocks([b"item"])), [["verified"]])
+        mock_imap.assert_called_once_with(level_5_actions.verify_l4_blocks_in_transit, [b"item"])
+
     def test_verify_block_marks_invalid_block(self):
         l4_block = {"invalid!!": "this aint valid"}
         l4_block = level_5_actions.verify_block(l4_block)
@@ -453,10 +507,14 @@ class TestLevelFiveActions(unittest.TestCase):
         self.assertFalse(level_5_actions.is_time_to_watch())
         mock_get.assert_called_once()
 
-    @patch("dragonchain.transaction_processor.level_5_actions.storage.does_superkey_exist")
-    def test_is_backlog_calls_storage_correctly(self, mock_storage_check):
-        level_5_actions.is_backlog(5)
-        mock_storage_check.assert_called_once_with("BROADCAST/TO_BROADCAST/5/")
+    @patch("dragonchain.transaction_processor.level_5_actions.redis.hget_sync", return_value="3")
+    def test_is_backlog_checks_manifest(self, mock_hget):
+        self.assertTrue(level_5_actions.is_backlog("5"))
+        mock_hget.assert_called_once_with("mq:to-broadcast-manifest", "5")
+
+    @patch("dragonchain.transaction_processor.level_5_actions.redis.hget_sync", return_value=None)
+    def test_is_backlog_false_without_staged_records(self, mock_hget):
+        self.assertFalse(level_5_actions.is_backlog("5"))
 
     @patch("dragonchain.transaction_processor.level_5_actions.matchmaking.update_funded_flag")
     @patch("dragonchain.transaction_processor.level_5_actions.set_funds")
@@ -537,30 +595,50 @@ class TestLevelFiveActions(unittest.TestCase):
         self.assertEqual(response.prev_proof, "")
         self.assertEqual(response.l4_blocks, "My L4 Blocks")
 
-    @patch(
-        "dragonchain.transaction_processor.level_5_actions.storage.get_json_from_object",
-        return_value=[{"header": {"l1_dc_id": "1", "l1_block_id": "2", "dc_id": "3", "block_id": "4"}, "proof": {"proof": "MyProof"}}],
-    )
-    @patch("dragonchain.transaction_processor.level_5_actions.storage.list_objects", return_value=["Key1", "Key2", "Key3"])
-    def test_get_pending_l4_blocks_fetches_correctly_from_storage(self, mock_list, mock_get):
-        response = level_5_actions.get_pending_l4_blocks("5")
-
-        mock_list.assert_called_once_with("BROADCAST/TO_BROADCAST/5")
-        mock_get.assert_has_calls([call("Key1"), call("Key2"), call("Key3")])
-        expected_response = '{"l1_dc_id":"1","l1_block_id":"2","l4_dc_id":"3","l4_block_id":"4","l4_proof":"MyProof"}'  # noqa: B950
-        self.assertEqual(response, [expected_response, expected_response, expected_response])
-
-    @patch(
-        "dragonchain.transaction_processor.level_5_actions.storage.get_json_from_object",
-        return_value=[
-            {"is_invalid": True, "header": {"l1_dc_id": "1", "l1_block_id": "2", "dc_id": "3", "block_id": "4"}, "proof": {"proof": "MyProof"}}
-        ],
-    )
-    @patch("dragonchain.transaction_processor.level_5_actions.storage.list_objects", return_value=["Key1", "Key2", "Key3"])
-    def test_get_pending_l4_blocks_marks_invalid_blocks(self, mock_list, mock_get):
-        response = level_5_actions.get_pending_l4_blocks("5")
-
-        mock_list.assert_called_once_with("BROADCAST/TO_BROADCAST/5")
-        mock_get.assert_has_calls([call("Key1"), call("Key2"), call("Key3")])
-        expected_response = '{"l1_dc_id":"1","l1_block_id":"2","l4_dc_id":"3","l4_block_id":"4","l4_proof":"MyProof","is_invalid":true}'  # noqa: B950
-        self.assertEqual(response, [expected_response, expected_response, expected_response])
+    @patch("dragonchain.transaction_processor.level_5_actions.redis.lrange_sync", return_value=["record1", "record2"])
+    def test_get_pending_l4_blocks_reads_staging_log(self, mock_lrange):
+        self.assertEqual(level_5_actions.get_pending_l4_blocks("5"), ["record1", "record2"])
+        mock_lrange.assert_called_once_with("mq:to-broadcast:5", 0, -1)
+
+    @patch("dragonchain.transaction_processor.level_5_actions.redis")
+    @patch("dragonchain.transaction_processor.level_5_actions.storage")
+    def test_migrate_legacy_pending_l4_blocks_moves_records_to_staging_log(self, mock_storage, mock_redis):
+        mock_storage.list_objects.return_value = ["BROADCAST/TO_BROADCAST/5/Key1", "BROADCAST/TO_BROADCAST/5/Key2"]
+        mock_storage.get_json_from_object.return_value = [
+            {"header": {"l1_dc_id": "1", "l1_block_id": "2", "dc_id": "3", "block_id": "4"}, "proof": {"proof": "MyProof"}},
+            {"is_invalid": True, "header": {"l1_dc_id": "1", "l1_block_id": "2", "dc_id": "3", "block_id": "4"}, "proof": {"proof": "MyProof"}},
+        ]
+        mock_redis.sismember_sync.return_value = False
+        level_5_actions.migrate_legacy_pending_l4_blocks()
+
+        mock_storage.list_objects.assert_called_once_with("BROADCAST/TO_BROADCAST/")
+        mock_storage.get_json_from_object.assert_has_calls([call("BROADCAST/TO_BROADCAST/5/Key1"), call("BROADCAST/TO_BROADCAST/5/Key2")])
+        record = '{"l1_dc_id":"1","l1_block_id":"2","l4_dc_id":"3","l4_block_id":"4","l4_proof":"MyProof"}'
+        invalid_record = '{"l1_dc_id":"1","l1_block_id":"2","l4_dc_id":"3","l4_block_id":"4","l4_proof":"MyProof","is_invalid":true}'  # noqa: B950
+        mock_pipeline = mock_redis.pipeline_sync.return_value
+        mock_pipeline.rpush.assert_has_calls([call("mq:to-broadcast:5", record, invalid_record)] * 2)
+        mock_pipeline.hincrby.assert_has_calls([call("mq:to-broadcast-manifest", "5", 2)] * 2)
+        mock_pipeline.sadd.assert_has_calls(
+            [call("mq:to-broadcast-migrated", "BROADCAST/TO_BROADCAST/5/Key1"), call("mq:to-broadcast-migrated", "BROADCAST/TO_BROADCAST/5/Key2")]
+        )
+        self.assertEqual(mock_pipeline.execute.call_count, 2)
+        mock_storage.delete.assert_has_calls([call("BROADCAST/TO_BROADCAST/5/Key1"), call("BROADCAST/TO_BROADCAST/5/Key2")])
+        mock_redis.delete_sync.assert_called_once_with("mq:to-broadcast-migrated")
+
+    @patch("dragonchain.transaction_processor.level_5_actions.redis")
+    @patch("dragonchain.transaction_processor.level_5_actions.storage")
+    def test_migrate_legacy_pending_l4_blocks_only_deletes_already_migrated_objects(self, mock_storage, mock_redis):
+        mock_storage.list_objects.return_value = ["BROADCAST/TO_BROADCAST/5/Key1"]
+        mock_redis.sismember_sync.return_value = True
+        level_5_actions.migrate_legacy_pending_l4_blocks()
+
+        mock_storage.get_json_from_object.assert_not_called()
+        mock_redis.pipeline_sync.assert_not_called()
+        mock_storage.delete.assert_called_once_with("BROADCAST/TO_BROADCAST/5/Key1")
+
+    @patch("dragonchain.transaction_processor.level_5_actions.redis")
+    @patch("dragonchain.transaction_processor.level_5_actions.storage.list_objects", return_value=[])
+    def test_migrate_legacy_pending_l4_blocks_no_op_without_legacy_objects(self, mock_list, mock_redis):
+        level_5_actions.migrate_legacy_pending_l4_blocks()
+        mock_redis.pipeline_sync.assert_not_called()
+        mock_redis.delete_sync.assert_not_called()
@@ -15,9 +15,15 @@
 # KIND, either express or implied. See the Apache License for the specific
 # language governing permissions and limitations under the Apache License.
 
+import concurrent.futures
+from typing import Any, Callable, Iterable, List, Optional
+
 from dragonchain.lib.interfaces import storage
+from dragonchain.lib import queue
 from dragonchain import exceptions
 
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
 
 def sanity_check_empty_chain() -> None:
     """Checks that no blocks exist in storage
@@ -29,3 +35,21 @@ def sanity_check_empty_chain() -> None:
     """
     if storage.does_object_exist("BLOCK/1"):
         raise exceptions.SanityCheckFailure("Block 1 already exists!")
+
+
+def run_concurrently(func: Callable[[Any], Any], items: Iterable[Any]) -> List["concurrent.futures.Future[Any]"]:
+    """Call a function for each item on a shared thread pool sized to the queue processing batch
+
+    Used to verify blocks from different chains at the same time. Block creation
+    should still happen serially (in queue order) with the returned results.
+
+    Args:
+        func: function to call with each item
+        items: items to call the function with
+    Returns:
+        Futures for each call, in the same order as items
+    """
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(max_workers=queue.PROCESSING_BATCH_SIZE, thread_name_prefix="verify")
+    return [_executor.submit(func, item) for item in items]
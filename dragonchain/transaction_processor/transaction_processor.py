@@ -25,6 +25,8 @@ import apscheduler.schedulers.blocking
 from dragonchain import logger
 from dragonchain import exceptions
 from dragonchain.lib import error_reporter
+from dragonchain.lib import metrics
+from dragonchain.lib import crypto_pool
 
 if TYPE_CHECKING:
     import apscheduler.events
@@ -69,9 +71,14 @@ def error_handler(event: "apscheduler.events.JobExecutionEvent") -> bool:
 if __name__ == "__main__":
     try:
         cron_trigger, processor = setup()
-        _scheduler.add_listener(error_handler, apscheduler.events.EVENT_JOB_ERROR)
-        _scheduler.add_job(func=processor.execute, trigger=apscheduler.triggers.cron.CronTrigger(**cron_trigger))
-        _scheduler.start()
+        crypto_pool.start()  # Fork the crypto workers before the metrics and processing threads are started
+        metrics.start("transaction_processor")
+        if LEVEL == "1" and processor.BLOCK_CUTTING == "adaptive":
+            processor.run_adaptive()
+        else:
+            _scheduler.add_listener(error_handler, apscheduler.events.EVENT_JOB_ERROR)
+            _scheduler.add_job(func=processor.execute, trigger=apscheduler.triggers.cron.CronTrigger(**cron_trigger))
+            _scheduler.start()
     except Exception as e:
         error_reporter.report_exception(e, "Uncaught transaction processor scheduler error")
         raise
@@ -16,10 +16,12 @@
 # language governing permissions and limitations under the Apache License.
 
 import os
+import time
 
 import flask
 
 from dragonchain import exceptions
+from dragonchain.lib import metrics
 from dragonchain.webserver.routes import route
 
 LEVEL = os.environ["LEVEL"]
@@ -30,3 +32,16 @@ if LEVEL not in ["1", "2", "3", "4", "5"]:
 app = flask.Flask(__name__)
 
 route(app)
+
+metrics.start("webserver")
+
+
+@app.before_request
+def start_request_timer() -> None:
+    flask.g.request_start_time = time.perf_counter()
+
+
+@app.after_request
+def observe_request_time(response: flask.Response) -> flask.Response:
+    metrics.observe("request", time.perf_counter() - flask.g.request_start_time)
+    return response
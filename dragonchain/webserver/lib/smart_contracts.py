@@ -116,12 +116,14 @@ def update_contract_v1(contract_id: str, update: dict) -> dict:
     # Set state to updating
     contract.set_state(smart_contract_model.ContractState.UPDATING)
     contract.save()
+    smart_contract_dao.invalidate_cached_contract(contract.id)
 
     try:
         job_processor.begin_task(contract_update, task_type=smart_contract_model.ContractActions.UPDATE)
     except RuntimeError:
         contract.set_state(state=smart_contract_model.ContractState.ACTIVE, msg="Contract update failed: could not start update.")
         contract.save()
+        smart_contract_dao.invalidate_cached_contract(contract.id)
         raise
     return contract.export_as_at_rest()
 
@@ -138,6 +140,7 @@ def delete_contract_v1(contract_id: str) -> None:
     _log.info("Setting delete state..")
     contract.set_state(smart_contract_model.ContractState.DELETING)
     contract.save()
+    smart_contract_dao.invalidate_cached_contract(contract.id)
 
     try:
         job_processor.begin_task(contract, task_type=smart_contract_model.ContractActions.DELETE)
@@ -145,6 +148,7 @@ def delete_contract_v1(contract_id: str) -> None:
         _log.exception("Could not begin delete, rolling back state.")
         contract.set_state(state=smart_contract_model.ContractState.ACTIVE, msg="Contract delete failed: could not start deletion")
         contract.save()
+        smart_contract_dao.invalidate_cached_contract(contract.id)
         raise
 
 
@@ -100,17 +100,20 @@ class TestCreateContract(unittest.TestCase):
 
 
 class TestUpdateContract(unittest.TestCase):
+    @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.invalidate_cached_contract")
     @patch("dragonchain.job_processor.begin_task")
     @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.get_contract_by_id", return_value=MagicMock(status={"state": "active"}))
-    def test_update_contract(self, patch_get_by_id, patch_job_proc):
+    def test_update_contract(self, patch_get_by_id, patch_job_proc, mock_invalidate):
         smart_contracts.update_contract_v1("test", get_sc_update_body())
 
         patch_get_by_id.assert_called_once()
         patch_job_proc.assert_called_once()
+        mock_invalidate.assert_called_once_with(patch_get_by_id.return_value.id)
 
+    @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.invalidate_cached_contract")
     @patch("dragonchain.job_processor.begin_task", side_effect=RuntimeError)
     @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.get_contract_by_id", return_value=MagicMock(status={"state": "active"}))
-    def test_update_contract_raises_and_resets_state_on_job_start_failure(self, patch_get_by_id, patch_job_proc):
+    def test_update_contract_raises_and_resets_state_on_job_start_failure(self, patch_get_by_id, patch_job_proc, mock_invalidate):
         self.assertRaises(RuntimeError, smart_contracts.update_contract_v1, "test", get_sc_update_body())
 
         patch_get_by_id.return_value.set_state.assert_called_with(
@@ -119,6 +122,8 @@ class TestUpdateContract(unittest.TestCase):
         patch_get_by_id.return_value.save.assert_called()
         patch_get_by_id.assert_called_once()
         patch_job_proc.assert_called_once()
+        mock_invalidate.assert_called_with(patch_get_by_id.return_value.id)
+        self.assertEqual(mock_invalidate.call_count, 2)
 
     @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.get_contract_by_id", side_effect=Exception)
     def test_update_contract_raises_ise_on_uncaught_error(self, patch_get_by_id):
@@ -127,17 +132,20 @@ class TestUpdateContract(unittest.TestCase):
 
 
 class TestDeleteContract(unittest.TestCase):
+    @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.invalidate_cached_contract")
     @patch("dragonchain.job_processor.begin_task")
     @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.get_contract_by_id", return_value=MagicMock(status={"state": "active"}))
-    def test_delete_contract(self, patch_get_by_id, patch_job_proc):
+    def test_delete_contract(self, patch_get_by_id, patch_job_proc, mock_invalidate):
         smart_contracts.delete_contract_v1("test")
 
         patch_get_by_id.assert_called_once()
         patch_job_proc.assert_called_once()
+        mock_invalidate.assert_called_once_with(patch_get_by_id.return_value.id)
 
+    @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.invalidate_cached_contract")
     @patch("dragonchain.job_processor.begin_task", side_effect=RuntimeError)
     @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.get_contract_by_id", return_value=MagicMock(status={"state": "active"}))
-    def test_delete_contract_raises_and_resets_state_on_job_start_failure(self, patch_get_by_id, patch_job_proc):
+    def test_delete_contract_raises_and_resets_state_on_job_start_failure(self, patch_get_by_id, patch_job_proc, mock_invalidate):
         self.assertRaises(RuntimeError, smart_contracts.delete_contract_v1, "test")
 
         patch_get_by_id.return_value.set_state.assert_called_with(
@@ -146,6 +154,8 @@ class TestDeleteContract(unittest.TestCase):
         patch_get_by_id.return_value.save.assert_called()
         patch_get_by_id.assert_called_once()
         patch_job_proc.assert_called_once()
+        mock_invalidate.assert_called_with(patch_get_by_id.return_value.id)
+        self.assertEqual(mock_invalidate.call_count, 2)
 
     @patch("dragonchain.webserver.lib.smart_contracts.smart_contract_dao.get_contract_by_id", side_effect=Exception)
     def test_delete_contract_raises_ise_on_uncaught_error(self, patch_get_by_id):
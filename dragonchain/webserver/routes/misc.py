@@ -19,6 +19,7 @@ from typing import Tuple, Dict
 
 import flask
 
+from dragonchain.lib import metrics
 from dragonchain.webserver import helpers
 from dragonchain.webserver.lib import misc
 from dragonchain.webserver import request_authorizer
@@ -26,6 +27,7 @@ from dragonchain.webserver import request_authorizer
 
 def apply_routes(app: flask.Flask):
     app.add_url_rule("/health", "health_check", health_check, methods=["GET"])
+    app.add_url_rule("/metrics", "get_metrics", get_metrics, methods=["GET"])
     app.add_url_rule("/status", "get_status_v1", get_status_v1, methods=["GET"])
     app.add_url_rule("/v1/status", "get_status_v1", get_status_v1, methods=["GET"])
 
@@ -37,6 +39,13 @@ def health_check() -> Tuple[str, int]:
     return "OK\n", 200  # Explicitly not HTTP response because this isn't JSON
 
 
+def get_metrics() -> Tuple[str, int, Dict[str, str]]:
+    """
+    Prometheus metrics of the webserver, and of any other process writing its metrics to the same METRICS_DIR (not authenticated)
+    """
+    return metrics.render_all(), 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+
 @request_authorizer.Authenticated(api_resource="misc", api_operation="read", api_name="get_status")
 def get_status_v1(**kwargs) -> Tuple[str, int, Dict[str, str]]:
     """
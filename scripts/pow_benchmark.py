@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import types
+import pathlib
+import argparse
+
+sys.path.insert(0, str(pathlib.Path(os.path.dirname(os.path.realpath(__file__))).parent))
+
+from dragonchain.lib import crypto  # noqa: E402
+
+
+def make_block(transactions):
+    # Only the hashed fields of an L1BlockModel are needed (avoids needing the chain environment to import the model)
+    return types.SimpleNamespace(
+        dc_id="benchmark",
+        block_id="1",
+        timestamp="1",
+        prev_id="0",
+        prev_proof="proof",
+        stripped_transactions=[
+            f'{{"header":{{"txn_id":"{i}"}},"proof":{{"full":"{"a" * 44}","stripped":"{"b" * 96}"}}}}' for i in range(transactions)
+        ],
+    )
+
+
+def rehash_attempts(hash_type, block, seconds):
+    """Attempts per second when every nonce rehashes the whole block (the behavior before search_nonce)"""
+    nonce = 1
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        crypto.check_complexity(crypto.hash_l1_block(hash_type, block, nonce), 256)
+        nonce += 1
+    return (nonce - 1) / seconds
+
+
+def prefix_attempts(hash_type, block, seconds, processes):
+    """Attempts per second when the block prefix is hashed once, and nonces are split across processes"""
+    prefix, suffix = crypto.get_l1_block_pow_parts(block)
+    chunk = 10000
+    attempts = 0
+    start = 1
+    end = time.perf_counter() + seconds
+    if processes <= 1:
+        while time.perf_counter() < end:
+            crypto.search_nonce(hash_type, prefix, suffix, 256, start, start + chunk)
+            start += chunk
+            attempts += chunk
+    else:
+        import multiprocessing
+
+        with multiprocessing.Pool(processes=processes) as pool:
+            while time.perf_counter() < end:
+                pool.starmap(
+                    crypto.search_nonce, [(hash_type, prefix, suffix, 256, start + i * chunk, start + (i + 1) * chunk) for i in range(processes)]
+                )
+                start += processes * chunk
+                attempts += processes * chunk
+    return attempts / seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare proof of work attempts per second")
+    parser.add_argument("--transactions", type=int, default=1000, help="number of stripped transactions in the benchmark block")
+    parser.add_argument("--seconds", type=float, default=3, help="seconds to run each benchmark for")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes for the multi-core benchmark")
+    parser.add_argument("--hash", choices=[h.name for h in crypto.SupportedHashes], default="blake2b")
+    args = parser.parse_args()
+
+    hash_type = crypto.SupportedHashes[args.hash]
+    block = make_block(args.transactions)
+    print(f"{args.hash}, {args.transactions} stripped transactions")
+    print(f"rehash whole block:          {rehash_attempts(hash_type, block, args.seconds):>14,.0f} attempts/sec")
+    print(f"hash state copy (1 process): {prefix_attempts(hash_type, block, args.seconds, 1):>14,.0f} attempts/sec")
+    print(f"hash state copy ({args.processes} processes): {prefix_attempts(hash_type, block, args.seconds, args.processes):>14,.0f} attempts/sec")